@@ -0,0 +1,133 @@
+# backend/app/agent/canonical_artifact.py
+"""
+Persisted, precompiled canonical-set index.
+
+`canonical_sets._compiled_config()` merges the code catalog with the YAML
+and settings overlays and builds the alias / acronym search index. That
+costs ~150 ms (mostly the YAML parse) and used to land on the first request
+in every worker. This module serialises the compiled result (sets map with
+dimension specs, aliases, index, acronyms) into one versioned binary file at
+image build time:
+
+    python -m app.agent.canonical_artifact [PATH]
+
+Workers enable it with ``CANONICAL_INDEX_PATH`` and memory-map the file on
+first use; the mapped pages are shared through the page cache, and the
+decode is one ``marshal.loads``. The header carries a SHA-256 fingerprint of
+everything the compile reads (the catalog and loader sources, the appconfig
+YAML bytes, the settings overlay, the Python marshal version). A missing,
+corrupt or stale artifact is ignored and the index is compiled in-process,
+exactly as before.
+
+Layout (little-endian)::
+
+    magic "QZCANON\\0" | u16 format | u16 marshal version
+    | 32-byte fingerprint | u64 payload length | marshal payload
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+ARTIFACT_ENV = "CANONICAL_INDEX_PATH"
+FORMAT_VERSION = 1
+
+_MAGIC = b"QZCANON\x00"
+_HEADER = struct.Struct("<8sHH32sQ")
+
+
+def artifact_path() -> Path | None:
+    """The configured artifact path, or None when the artifact is disabled."""
+    env = os.getenv(ARTIFACT_ENV)
+    return Path(env).expanduser() if env else None
+
+
+def source_fingerprint(files: Iterable[Path], overlay: Any) -> bytes:
+    """SHA-256 over the compile inputs. A missing file hashes as empty."""
+    h = hashlib.sha256()
+    h.update(f"{FORMAT_VERSION}:{marshal.version}:{sys.version_info[:2]}".encode())
+    for path in files:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    h.update(json.dumps(overlay, sort_keys=True, default=str).encode("utf-8"))
+    return h.digest()
+
+
+def write_artifact(path: Path, compiled: dict[str, Any], fingerprint: bytes) -> int:
+    """Atomically write ``compiled`` to ``path``; returns the file size.
+
+    Raises ValueError if ``compiled`` holds a non-marshallable value.
+    """
+    payload = marshal.dumps(compiled)
+    blob = _HEADER.pack(_MAGIC, FORMAT_VERSION, marshal.version, fingerprint, len(payload)) + payload
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def read_artifact(path: Path, fingerprint: bytes) -> dict[str, Any] | None:
+    """Map ``path`` and decode it if it matches ``fingerprint``.
+
+    Never raises: a missing, truncated, foreign or stale file returns None.
+    """
+    try:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, fmt, mver, digest, size = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC or fmt != FORMAT_VERSION or mver != marshal.version:
+                logger.warning("canonical_sets.artifact.incompatible", path=str(path), format=fmt)
+                return None
+            if digest != fingerprint:
+                logger.info("canonical_sets.artifact.stale", path=str(path))
+                return None
+            if _HEADER.size + size != len(mm):
+                logger.warning("canonical_sets.artifact.truncated", path=str(path))
+                return None
+            with memoryview(mm) as view, view[_HEADER.size :] as payload:
+                # Trusted build output (written by write_artifact), fingerprint
+                # checked above before anything is decoded.
+                compiled = marshal.loads(payload)  # nosec B302
+    except FileNotFoundError:
+        logger.info("canonical_sets.artifact.missing", path=str(path))
+        return None
+    except Exception as e:  # noqa: BLE001 — fail-open to in-process compile
+        logger.warning("canonical_sets.artifact.unreadable", path=str(path), error=str(e))
+        return None
+    return compiled if isinstance(compiled, dict) else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Build step: compile the canonical sets and write the artifact."""
+    from app.agent import canonical_sets  # local import avoids cycle
+
+    args = sys.argv[1:] if argv is None else argv
+    path = Path(args[0]) if args else artifact_path()
+    if path is None:
+        print(f"usage: python -m app.agent.canonical_artifact PATH (or set {ARTIFACT_ENV})", file=sys.stderr)
+        return 2
+    compiled = canonical_sets._compile_config()
+    size = write_artifact(path, compiled, canonical_sets._source_fingerprint())
+    print(f"wrote {path} ({size} bytes, {len(compiled['sets'])} sets, {len(compiled['index'])} keys)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
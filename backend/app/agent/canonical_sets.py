@@ -10,16 +10,21 @@ from __future__ import annotations
 
 import os
 import re
+import time
 import unicodedata
 from collections.abc import Iterable
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import structlog
 import yaml  # PyYAML
 
+from app.agent import canonical_artifact
 from app.agent.canonical_catalog import BUILTIN_CANONICAL_SETS
 
+logger = structlog.get_logger(__name__)
+
 # Primary config object (if available). AC-QUALITY-R2-IMPORT-1: only ImportError
 # is suppressed; other exceptions (e.g. malformed YAML, env var typos) MUST
 # surface so misconfiguration is not silently masked at import time.
@@ -633,8 +638,47 @@ def _build_search_index(
     return index, acronyms
 
 
+def _source_fingerprint() -> bytes:
+    """Fingerprint of every input `_compile_config` reads (artifact check)."""
+    from app.agent import canonical_catalog  # local import: module file path
+
+    return canonical_artifact.source_fingerprint(
+        [Path(__file__), Path(canonical_catalog.__file__), _default_appconfig_path()],
+        _from_settings_object(),
+    )
+
+
 @lru_cache(maxsize=1)
 def _compiled_config() -> dict[str, Any]:
+    """
+    Compiled lookups, from the prebuilt artifact when ``CANONICAL_INDEX_PATH``
+    points at one matching the current sources, else compiled in-process.
+    """
+    t0 = time.perf_counter()
+    source = "compiled"
+    cfg: dict[str, Any] | None = None
+    path = canonical_artifact.artifact_path()
+    if path is not None:
+        cfg = canonical_artifact.read_artifact(path, _source_fingerprint())
+        source = "artifact"
+    if cfg is None:
+        cfg, source = _compile_config(), "compiled"
+    logger.info(
+        "canonical_sets.loaded",
+        source=source,
+        sets=len(cfg["sets"]),
+        keys=len(cfg["index"]),
+        ms=round((time.perf_counter() - t0) * 1000.0, 2),
+    )
+    return cfg
+
+
+def warm_up() -> None:
+    """Load the compiled lookups now (app startup) instead of on first use."""
+    _compiled_config()
+
+
+def _compile_config() -> dict[str, Any]:
     """
     Loads and compiles config into optimized lookups.
     Refactored to use distinct build phases.
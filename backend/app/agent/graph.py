@@ -26,9 +26,11 @@ Design notes:
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 import re
 import time
+from collections.abc import Iterator
 from typing import Any, Literal
 
 import structlog
@@ -83,6 +85,7 @@ from app.core.config import is_production
 from app.core.config import settings as _base_settings
 from app.models.api import FinalResult
 from app.services.llm_service import coerce_json
+from app.services.structured_stream import partial_results
 
 logger = structlog.get_logger(__name__)
 
@@ -296,6 +299,38 @@ def _accept_batch_profile(req_name: str, raw: Any) -> CharacterProfile | None:
         return None
 
 
+def _collect_streamed_profiles(archetypes: list[str], into: dict[str, CharacterProfile]):
+    """Partial-result sink: keep each batch profile as soon as it closes.
+
+    Items are matched by name only (a half-finished list has no reliable
+    positions) and go through the same acceptance as the final batch.
+    """
+    by_key = {(n or "").strip().casefold(): n for n in archetypes}
+
+    def _on_partial(tool: str, path: tuple, raw: Any) -> None:
+        if tool != "profile_batch_writer" or len(path) != 1 or not isinstance(raw, dict):
+            return
+        req_name = by_key.get(str(raw.get("name") or "").strip().casefold())
+        if req_name is not None and req_name not in into:
+            prof = _accept_batch_profile(req_name, raw)
+            if prof is not None:
+                into[req_name] = prof
+
+    return _on_partial
+
+
+@contextlib.contextmanager
+def streamed_character_profiles(archetypes: list[str]) -> Iterator[dict[str, CharacterProfile]]:
+    """Collect batch profiles for ``archetypes`` as they close, in this context.
+
+    For callers that cannot wait for the characters node (``/quiz/start``
+    under its stream budget). The yielded dict fills in while the graph runs.
+    """
+    closed: dict[str, CharacterProfile] = {}
+    with partial_results(_collect_streamed_profiles(archetypes, closed)):
+        yield closed
+
+
 async def _try_batch_generation(
     archetypes: list[str],
     category: str,
@@ -334,6 +369,12 @@ async def _try_batch_generation(
         )
         return results_map
 
+    # Profiles that closed while the batch was still streaming. Used only if
+    # the batch then fails or times out (e.g. truncated JSON on a long
+    # roster): those names skip the per-character fallback. A successful
+    # batch is mapped from its final, fully validated output as before.
+    streamed: dict[str, CharacterProfile] = {}
+
     try:
         t0 = time.perf_counter()
         payload = {
@@ -343,10 +384,11 @@ async def _try_batch_generation(
             "trace_id": trace_id,
             "session_id": str(session_id),
         }
-        raw_batch = await asyncio.wait_for(
-            tool_draft_character_profiles.ainvoke(payload),  # type: ignore
-            timeout=timeout,
-        )
+        with partial_results(_collect_streamed_profiles(archetypes, streamed)):
+            raw_batch = await asyncio.wait_for(
+                tool_draft_character_profiles.ainvoke(payload),  # type: ignore
+                timeout=timeout,
+            )
 
         # Accept list or dict outputs; normalize to name->profile mapping
         pairs = []
@@ -371,7 +413,8 @@ async def _try_batch_generation(
         logger.debug("characters_node.batch.ok", produced=got, duration_ms=dt_ms)
 
     except Exception as e:
-        logger.debug("characters_node.batch.fail", error=str(e))
+        results_map.update(streamed)
+        logger.debug("characters_node.batch.fail", error=str(e), salvaged=len(streamed))
 
     return results_map
 
@@ -573,12 +616,27 @@ async def _bootstrap_node(state: GraphState) -> dict:
 # ---------------------------------------------------------------------------
 
 
+def _existing_profiles(state: GraphState, archetypes: list[str]) -> dict[str, Any]:
+    """Profiles already in state, keyed by the archetype they belong to."""
+    by_key = {}
+    for c in state.get("generated_characters") or []:
+        name = c.get("name") if isinstance(c, dict) else getattr(c, "name", None)
+        by_key[str(name or "").strip().casefold()] = c
+    return {n: by_key[k] for n in archetypes if (k := n.strip().casefold()) in by_key}
+
+
 async def _generate_characters_node(state: GraphState) -> dict:
     """
     Create detailed character profiles for each archetype in an order-preserving, batch-first flow.
-    Idempotent: If characters already exist, returns no-op.
+    Idempotent: existing characters are kept and only archetypes without a
+    profile are generated (``/quiz/start`` may have returned some early);
+    returns no-op when none are missing.
     """
-    if state.get("generated_characters"):
+    archetypes: list[str] = state.get("ideal_archetypes") or []
+    existing = _existing_profiles(state, archetypes)
+    # A roster that shares no names with the plan (e.g. a precompute pack) is
+    # complete as it stands.
+    if state.get("generated_characters") and len(existing) in (0, len(archetypes)):
         logger.debug("characters_node.noop", reason="characters_already_present")
         return {}
 
@@ -586,7 +644,6 @@ async def _generate_characters_node(state: GraphState) -> dict:
     trace_id = state.get("trace_id")
     category = state.get("category")
     analysis = state.get("topic_analysis") or {}
-    archetypes: list[str] = state.get("ideal_archetypes") or []
 
     if not archetypes:
         logger.warning("characters_node.no_archetypes", session_id=session_id, trace_id=trace_id)
@@ -605,13 +662,16 @@ async def _generate_characters_node(state: GraphState) -> dict:
         session_id=session_id,
         trace_id=trace_id,
         target_count=len(archetypes),
+        kept=len(existing),
         category=category,
     )
 
     # 1. Try Batch
+    missing = [n for n in archetypes if n not in existing]
     results_map = await _try_batch_generation(
-        archetypes, category, analysis, trace_id, session_id, per_call_timeout_s
+        missing, category, analysis, trace_id, session_id, per_call_timeout_s
     )
+    results_map.update(existing)
 
     # 2. Fill Missing
     await _fill_missing_with_concurrency(
@@ -892,6 +952,18 @@ def _resolve_winning_character(
     return None
 
 
+def _decision_payloads(state: GraphState) -> tuple[list, list, dict]:
+    """(history, characters, synopsis) payloads for the decision tool."""
+    synopsis = state.get("synopsis")
+    history_payload = [_to_plain(i) for i in (state.get("quiz_history") or [])]
+    characters_payload = [_to_plain(c) for c in (state.get("generated_characters") or [])]
+    synopsis_payload = (
+        synopsis.model_dump() if hasattr(synopsis, "model_dump")
+        else (_to_plain(synopsis) or {"title": "", "summary": ""})
+    )
+    return history_payload, characters_payload, synopsis_payload
+
+
 async def _decide_or_finish_node(state: GraphState) -> dict:
     """Decide whether to finish or ask one more, robust to dict/model hydration."""
     session_id = state.get("session_id")
@@ -902,12 +974,7 @@ async def _decide_or_finish_node(state: GraphState) -> dict:
     analysis = state.get("topic_analysis") or {}
 
     # Normalize payloads
-    history_payload = [_to_plain(i) for i in (history or [])]
-    characters_payload = [_to_plain(c) for c in (characters or [])]
-    synopsis_payload = (
-        synopsis.model_dump() if hasattr(synopsis, "model_dump")
-        else (_to_plain(synopsis) or {"title": "", "summary": ""})
-    )
+    history_payload, characters_payload, synopsis_payload = _decision_payloads(state)
 
     answered = len(history)
     baseline_count = int(state.get("baseline_count") or 0)
@@ -1056,6 +1123,32 @@ async def _generate_adaptive_question_node(state: GraphState) -> dict:
     qd = qq.model_dump(mode="json", exclude_none=True)
     return {"generated_questions": [*existing, qd]}
 
+async def speculate_adaptive_step(state: GraphState) -> tuple[dict[str, Any] | None, float]:
+    """One adaptive step for a HYPOTHETICAL answered state, without finishing.
+
+    Runs the same decision as ``decide_or_finish`` and, when it says ask one
+    more, the same generation as ``generate_adaptive_question``. Returns
+    ``(question, confidence)``; ``question`` is None when the decision would
+    finish (the final profile is never written speculatively). Used by
+    ``app/services/speculative_questions.py``.
+    """
+    history_payload, characters_payload, synopsis_payload = _decision_payloads(state)
+    action, confidence, _name = await _determine_decision_action(
+        history_payload,
+        characters_payload,
+        synopsis_payload,
+        state.get("topic_analysis") or {},
+        state.get("trace_id"),
+        state.get("session_id"),
+        len(history_payload),
+        float(state.get("current_confidence") or 0.0),
+        category=state.get("category"),
+    )
+    if action == "FINISH_NOW":
+        return None, confidence
+    out = await _generate_adaptive_question_node(state)
+    return out["generated_questions"][-1], confidence
+
 # ---------------------------------------------------------------------------
 # Node: assemble_and_finish (sink)
 # ---------------------------------------------------------------------------
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Mapping
 from typing import Any, Union
 
 import structlog
@@ -10,7 +11,9 @@ from pydantic import BaseModel
 from pydantic.type_adapter import TypeAdapter
 
 from app.core.config import settings
+from app.services.llm_semantic_cache import get_semantic_cache
 from app.services.llm_service import llm_service
+from app.services.structured_stream import current_partial_sink
 
 logger = structlog.get_logger(__name__)
 ModelLike = Union[dict, TypeAdapter, type, BaseModel]
@@ -144,6 +147,41 @@ def resolve_fallback_model_for_tool(tool_name: str) -> str | None:
     return _cfg_get(cfg, "fallback_model")
 
 
+def _partial_forwarder(tool_name: str):
+    sink = current_partial_sink()
+    if sink is None:
+        return None
+    return lambda path, value: sink(tool_name, path, value)
+
+
+def _semantic_cache_call(
+    tool_name: str,
+    topic: str | None,
+    variant: Mapping[str, Any] | None,
+    model: Any,
+    response_model: ModelLike,
+) -> tuple[Any, dict[str, Any]] | None:
+    """(cache, key kwargs) when this call may use the topic cache, else None."""
+    if not topic or not isinstance(response_model, (type, TypeAdapter)):
+        return None
+    cache = get_semantic_cache()
+    if cache is None or not cache.cacheable(tool_name):
+        return None
+    try:
+        from app.agent.prompts import prompt_manager
+
+        prompt_version = prompt_manager.version(tool_name)
+    except Exception:
+        return None
+    return cache, {
+        "topic": topic,
+        "variant": dict(variant or {}),
+        "prompt_version": prompt_version,
+        "model": str(model) if model else None,
+        "response_model": response_model,
+    }
+
+
 async def invoke_structured(
     *,
     tool_name: str,
@@ -152,7 +190,19 @@ async def invoke_structured(
     explicit_schema: dict | None = None,
     trace_id: str | None = None,
     session_id: str | None = None,
+    cache_topic: str | None = None,
+    cache_variant: Mapping[str, Any] | None = None,
 ):
+    """Run ``tool_name``'s structured call with its configured model/limits.
+
+    Inside a ``structured_stream.partial_results(...)`` block the call is
+    streamed and each closed value is reported to the sink as
+    ``(tool_name, path, value)``; the return value is unchanged.
+
+    ``cache_topic`` opts a topic-scoped call into ``llm.semantic_cache``:
+    ``cache_variant`` must carry every other input the prompt was rendered
+    from, since a hit is served to any call with the same topic + variant.
+    """
     cfg = _get_tool_cfg(tool_name) or {}
     model = _cfg_get(cfg, "model")
     # Hitlist #4 — per-tool cross-provider runtime failover target (optional).
@@ -175,6 +225,12 @@ async def invoke_structured(
         timeout_s=timeout_s,
     )
 
+    cached = _semantic_cache_call(tool_name, cache_topic, cache_variant, model, response_model)
+    if cached is not None:
+        hit = await cached[0].lookup(tool_name, **cached[1])
+        if hit is not None:
+            return hit
+
     t0 = time.perf_counter()
     try:
         result = await llm_service.get_structured_response(
@@ -191,6 +247,7 @@ async def invoke_structured(
             text_params=text_params,
             reasoning=reasoning,
             tool_choice=tool_choice,
+            on_partial=_partial_forwarder(tool_name),
         )
 
         try:
@@ -219,6 +276,8 @@ async def invoke_structured(
                 f"got {type(result).__name__}"
             )
 
+        if cached is not None:
+            await cached[0].store(tool_name, value=result, **cached[1])
         return result
 
     except Exception as e:
@@ -25,6 +25,8 @@ This version aligns with the updated graph/tooling and hydration logic:
 """
 
 
+import hashlib
+
 import structlog
 from langchain_core.prompts import ChatPromptTemplate
 
@@ -449,5 +451,17 @@ class PromptManager:
             ]
         )
 
+    def version(self, prompt_name: str) -> str:
+        """Short content hash of the effective templates (cache-key component).
+
+        Changes whenever the configured or default prompt text changes, so
+        cached LLM results never outlive the prompt that produced them.
+        """
+        template = self.get_prompt(prompt_name)
+        text = "\x1f".join(
+            getattr(getattr(m, "prompt", None), "template", "") for m in template.messages
+        )
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
 # Singleton instance
 prompt_manager = PromptManager()
@@ -25,7 +25,6 @@ import uuid
 from typing import Annotated, Any
 
 from langchain_core.messages import BaseMessage
-from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
 
 # Canonical content models (live in app.agent.schemas)
@@ -35,6 +34,7 @@ from app.agent.schemas import (
     QuizQuestion,
     Synopsis,
 )
+from app.agent.transcript import add_bounded_messages
 
 # Re-use canonical API models where appropriate
 from app.models.api import FinalResult
@@ -49,8 +49,9 @@ class GraphState(TypedDict, total=False):
     `total=False` allows partial/iterative state updates during graph execution.
     """
 
-    # Conversation history (append-only)
-    messages: Annotated[list[BaseMessage], add_messages]
+    # Conversation history: appended, then bounded to seed + summary + the
+    # recent window (``app/agent/transcript.py``)
+    messages: Annotated[list[BaseMessage], add_bounded_messages]
 
     # Session identifiers & user input
     session_id: uuid.UUID
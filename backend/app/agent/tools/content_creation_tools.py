@@ -669,6 +669,14 @@ async def draft_character_profiles(
             explicit_schema=jsonschema_for("profile_batch_writer"),
             trace_id=trace_id,
             session_id=session_id,
+            cache_topic=analysis["normalized_category"],
+            cache_variant={
+                "outcome_kind": analysis["outcome_kind"],
+                "creativity_mode": analysis["creativity_mode"],
+                "intent": analysis.get("intent", "identify"),
+                "character_names": list(character_names),
+                "character_contexts": hints,
+            },
         )
     except Exception as e:
         logger.error("tool.draft_character_profiles.validation_or_invoke_fail", error=str(e), exc_info=True)
@@ -712,6 +720,13 @@ async def draft_character_profile(
             explicit_schema=jsonschema_for("profile_writer"),
             trace_id=trace_id,
             session_id=session_id,
+            cache_topic=analysis["normalized_category"],
+            cache_variant={
+                "character_name": character_name,
+                "outcome_kind": analysis["outcome_kind"],
+                "creativity_mode": analysis["creativity_mode"],
+                "intent": analysis.get("intent", "identify"),
+            },
         )
         if not getattr(out, "name", None):
             out.name = character_name
@@ -18,7 +18,6 @@ from __future__ import annotations
 from typing import Any
 
 import structlog
-from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
@@ -110,7 +109,19 @@ class CharacterInput(BaseModel):
 # Wikipedia (simple, local)
 # -------------------------
 
-_wikipedia_search = WikipediaAPIWrapper(top_k_results=2, doc_content_chars_max=2000)
+# Built on first use: langchain_community's wrapper + the `wikipedia`
+# package are only imported when retrieval actually calls Wikipedia.
+_wikipedia_search: Any = None
+
+
+def _wikipedia() -> Any:
+    global _wikipedia_search
+    if _wikipedia_search is None:
+        from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
+
+        _wikipedia_search = WikipediaAPIWrapper(top_k_results=2, doc_content_chars_max=2000)
+    return _wikipedia_search
+
 
 @tool
 def wikipedia_search(query: str) -> str:
@@ -138,7 +149,7 @@ def wikipedia_search(query: str) -> str:
 
     logger.info("tool.wikipedia_search.start", query=query)
     try:
-        result = _wikipedia_search.run(query) or ""
+        result = _wikipedia().run(query) or ""
         logger.info("tool.wikipedia_search.ok", has_result=bool(result))
         return result
     except Exception as e:
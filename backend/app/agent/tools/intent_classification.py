@@ -11,7 +11,8 @@ Precedence:
   3) Local appconfig YAML (backend/appconfig.local.yaml or APP_CONFIG_LOCAL_PATH)
   4) Embedded local defaults in this file
 
-The local YAML path is hot-reloaded on mtime changes.
+The local YAML path is hot-reloaded on mtime changes; the intent / shape /
+domain keyword lists are recompiled into one matcher on each reload.
 """
 
 from __future__ import annotations
@@ -356,6 +357,144 @@ def _score_map(text: str, tokens: list[Any]) -> float:
     return total
 
 
+# ---------------------------------------------------------------------
+# Compiled keyword matcher
+# ---------------------------------------------------------------------
+# `_score_map` walks every token of every group on each call. The families
+# below are compiled once per loaded config (i.e. once per `_maybe_reload`
+# mtime change) into one trie-shaped alternation regex over all literal
+# tokens, plus a postings map token -> (family, group, position, weight).
+# Scoring a text is then one regex pass; only the tokens that occur are
+# scored, and each group's total is summed in token order so the floats
+# match `_score_map` exactly.
+
+_SCORED_FAMILIES = ("intents", "shapes", "domains")
+
+
+def _trie_regex(words: list[str]) -> str:
+    """Alternation regex over ``words`` factored as a trie.
+
+    At any position at most one branch can continue, and the "stop here"
+    branch is tried last, so the match is the LONGEST word starting there.
+    """
+    trie: dict[str, Any] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def _emit(node: dict[str, Any]) -> str:
+        alts = [re.escape(ch) + _emit(child) for ch, child in node.items() if ch]
+        if not alts:
+            return ""
+        if "" in node:
+            alts.append("")
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return _emit(trie)
+
+
+class _KeywordMatcher:
+    """Keyword families of one config snapshot, compiled for one-pass scoring."""
+
+    def __init__(self, cfg: dict[str, Any]):
+        # Each family keeps its group names in config order (ties in `max`
+        # resolve to the first group, as before).
+        self.groups: dict[str, list[str]] = {}
+        # literal -> [(family, group_idx, token_idx, weight)]
+        self.postings: dict[str, list[tuple[str, int, int, float]]] = {}
+        self.patterns: list[tuple[re.Pattern[str], tuple[str, int, int, float]]] = []
+        for family in _SCORED_FAMILIES:
+            groups = cfg.get(family) or {}
+            self.groups[family] = list(groups)
+            for g, tokens in enumerate(groups.values()):
+                self._add_group(family, g, tokens)
+        # Literals that are prefixes of a longer literal: the scan only
+        # reports the longest literal per position, the rest are implied.
+        self.implied: dict[str, list[str]] = {
+            lit: [lit[:i] for i in range(1, len(lit)) if lit[:i] in self.postings]
+            for lit in self.postings
+        }
+        body = _trie_regex(sorted(self.postings))
+        self.scanner = re.compile(f"(?=({body}))") if body else None
+        self._last: tuple[str, dict[str, dict[str, float]]] | None = None
+
+    def _add_group(self, family: str, g: int, tokens: list[Any]) -> None:
+        for i, tok in enumerate(tokens or []):
+            if isinstance(tok, dict):
+                t = tok.get("token", "")
+                w = float(tok.get("weight", 1.0))
+            else:
+                t, w = str(tok), 1.0
+            if not t:
+                continue
+            posting = (family, g, i, w)
+            if _is_regex_token(t):
+                try:
+                    self.patterns.append((re.compile(t[1:-1], re.IGNORECASE), posting))
+                except re.error:
+                    pass
+                continue
+            lit = t.casefold()
+            if lit:
+                self.postings.setdefault(lit, []).append(posting)
+
+    def _found(self, text: str) -> set[str]:
+        found: set[str] = set()
+        if self.scanner is not None:
+            for m in self.scanner.finditer(text):
+                lit = m.group(1)
+                if lit not in found:
+                    found.add(lit)
+                    found.update(self.implied[lit])
+        return found
+
+    def scores(self, text: str) -> dict[str, dict[str, float]]:
+        """``{family: {group: total}}`` for every group with a hit, in config
+        order. Groups absent from a family scored 0."""
+        last = self._last
+        if last is not None and last[0] == text:
+            return last[1]
+        hits: dict[tuple[str, int], list[tuple[int, float]]] = {}
+        padded = f" {text} "
+        for lit in self._found(text):
+            score = 1.25 if f" {lit} " in padded else 1.0
+            for family, g, i, w in self.postings[lit]:
+                hits.setdefault((family, g), []).append((i, score * w))
+        for pat, (family, g, i, w) in self.patterns:
+            if pat.search(text):
+                hits.setdefault((family, g), []).append((i, 2.0 * w))
+        out: dict[str, dict[str, float]] = {}
+        for family, names in self.groups.items():
+            fam: dict[str, float] = {}
+            for g, name in enumerate(names):
+                parts = hits.get((family, g))
+                if parts:
+                    total = 0.0
+                    for _, v in sorted(parts, key=lambda p: p[0]):
+                        total += v
+                    fam[name] = total
+            out[family] = fam
+        self._last = (text, out)
+        return out
+
+
+_MATCHER: tuple[dict[str, Any], Path | None, float, _KeywordMatcher] | None = None
+
+
+def _keyword_matcher(cfg: dict[str, Any]) -> _KeywordMatcher:
+    """Compiled matcher for ``cfg``, rebuilt only when `_maybe_reload` hands
+    back another config object or has re-read the YAML (path / mtime)."""
+    global _MATCHER
+    cached = _MATCHER
+    if cached is not None and cached[0] is cfg and cached[1:3] == (_CACHE.path, _CACHE.mtime):
+        return cached[3]
+    matcher = _KeywordMatcher(cfg)
+    _MATCHER = (cfg, _CACHE.path, _CACHE.mtime, matcher)
+    return matcher
+
+
 def _ensure_types_of_prefix(label: str) -> str:
     """Ensures the label starts with 'Types of' if not already present."""
     s = (label or "").strip()
@@ -396,20 +535,13 @@ def classify_intent(category: str, synopsis: dict | None = None) -> dict[str, An
     """
     cfg = _maybe_reload()
     text = _text_corpus(category, synopsis)
+    family_scores = _keyword_matcher(cfg).scores(text)
 
     # Score intents
-    scores: dict[str, float] = {}
-    for intent, tokens in (cfg.get("intents") or {}).items():
-        total = _score_map(text, tokens)
-        if total > 0:
-            scores[intent] = total
+    scores = {k: v for k, v in family_scores["intents"].items() if v > 0}
 
     # Advisory shape
-    shape_scores: dict[str, float] = {}
-    for shape, tokens in (cfg.get("shapes") or {}).items():
-        stotal = _score_map(text, tokens)
-        if stotal > 0:
-            shape_scores[shape] = stotal
+    shape_scores = {k: v for k, v in family_scores["shapes"].items() if v > 0}
     shape = max(shape_scores.items(), key=lambda kv: kv[1])[0] if shape_scores else "unspecified"
 
     # Primary intent with domain-aware fallback
@@ -460,11 +592,8 @@ _TYPE_FOCUSED_DOMAINS = {
 def _primary_domain(category: str, synopsis: dict | None) -> str:
     cfg = _maybe_reload()
     text = _text_corpus(category, synopsis)
-    domains: dict[str, list[Any]] = cfg.get("domains") or {}
-
-    scored: list[tuple[str, float]] = []
-    for name, tokens in domains.items():
-        scored.append((name, _score_map(text, tokens)))
+    # Domains without a hit score 0 and can never be the (positive) best.
+    scored = list(_keyword_matcher(cfg).scores(text)["domains"].items())
 
     # Heuristic bump for media-looking titles
     if _looks_like_media_title(category, cfg.get("media_hints", []) or []):
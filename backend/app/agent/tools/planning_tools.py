@@ -437,6 +437,15 @@ async def plan_quiz(
             explicit_schema=jsonschema_for("initial_planner", category=norm),
             trace_id=trace_id,
             session_id=session_id,
+            # A reinterpret run must never be served the reading it rejects.
+            cache_topic=None if rejected else norm,
+            cache_variant={
+                "outcome_kind": okind,
+                "creativity_mode": cmode,
+                "intent": _intent,
+                "canonical_names": list(canonical_names),
+                "instrument_rigor": rigor_block,
+            },
         )
 
         plan = _ensure_initial_plan(plan)
@@ -0,0 +1,157 @@
+"""Bounded conversation transcript for quiz sessions (``quiz.transcript``).
+
+``messages`` used to be append-only: every agent node adds a status note and
+every answer added a ``HumanMessage``, so the list (serialised into the Redis
+session state, re-parsed on every read, and appended into the LangGraph
+checkpoint on every background run) grew with each question. Nothing reads
+the middle of it: the question/decision tools take ``quiz_history``,
+``character_profiles``, ``synopsis`` and the topic analysis, and the only
+message read back is ``messages[0]`` (the typed category, a fallback in
+``_bootstrap_node``).
+
+:func:`compact_messages` therefore keeps
+
+  * the seed message (``messages[0]``) verbatim,
+  * one summary message standing in for everything older than the window
+    (running count + a short digest of the dropped contents), and
+  * the last ``window`` messages, fewer when they would push the transcript
+    over ``max_bytes``.
+
+It works on plain dicts (the Redis storage shape) and on LangChain messages
+alike, and is applied in two places: ``redis_cache`` on every write, and the
+graph's ``messages`` reducer (:func:`add_bounded_messages`), which bounds the
+checkpoint channel.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from langchain_core.messages import SystemMessage
+from langgraph.graph.message import add_messages
+
+from app.core.config import settings
+
+SUMMARY_NAME = "transcript_summary"
+# Fixed id: a stored summary streamed back into the graph replaces the
+# checkpoint's summary (add_messages matches on id) instead of adding one.
+SUMMARY_ID = "transcript-summary"
+
+# Rough per-message JSON overhead (type/name/keys) on top of the content.
+_MESSAGE_OVERHEAD_BYTES = 48
+# How much of each dropped message the digest keeps.
+_DIGEST_ITEM_CHARS = 80
+
+
+def _field(msg: Any, name: str) -> Any:
+    if isinstance(msg, dict):
+        return msg.get(name)
+    return getattr(msg, name, None)
+
+
+def _content(msg: Any) -> str:
+    content = _field(msg, "content")
+    return content if isinstance(content, str) else str(content or "")
+
+
+def _approx_bytes(msg: Any) -> int:
+    return len(_content(msg).encode("utf-8")) + _MESSAGE_OVERHEAD_BYTES
+
+
+def is_summary(msg: Any) -> bool:
+    return _field(msg, "name") == SUMMARY_NAME
+
+
+def _compacted_count(msg: Any) -> int:
+    extra = _field(msg, "additional_kwargs") or {}
+    try:
+        return max(0, int(extra.get("compacted", 0)))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _summary(prior: Any, dropped: Sequence[Any], *, like: Any, chars: int) -> Any:
+    count = (_compacted_count(prior) if prior is not None else 0) + len(dropped)
+    notes = [" ".join(_content(m).split())[:_DIGEST_ITEM_CHARS] for m in dropped]
+    if prior is not None:
+        prior_digest = _content(prior).split("] ", 1)[-1]
+        notes.insert(0, prior_digest)
+    digest = " | ".join(n for n in notes if n)
+    if len(digest) > chars:
+        # Keep the most recent context.
+        digest = "…" + digest[-(chars - 1):] if chars > 1 else ""
+    content = f"[{count} earlier messages compacted] {digest}".rstrip()
+    extra = {"compacted": count}
+    if isinstance(like, dict):
+        return {
+            "type": "system",
+            "name": SUMMARY_NAME,
+            "id": SUMMARY_ID,
+            "content": content,
+            "additional_kwargs": extra,
+        }
+    return SystemMessage(content=content, name=SUMMARY_NAME, id=SUMMARY_ID, additional_kwargs=extra)
+
+
+def compact_messages(
+    messages: Sequence[Any] | None,
+    *,
+    window: int,
+    max_bytes: int,
+    summary_chars: int,
+) -> list[Any]:
+    """Seed + summary + the newest ``window`` messages (see module docstring).
+
+    A transcript already within bounds is returned unchanged (same items, no
+    new summary), so compaction is idempotent.
+    """
+    msgs = list(messages or [])
+    if len(msgs) <= 1:
+        return msgs
+    seed, rest = msgs[0], msgs[1:]
+    prior = None
+    if rest and is_summary(rest[0]):
+        prior, rest = rest[0], rest[1:]
+
+    keep = rest[-window:] if window > 0 else []
+    dropped = rest[: len(rest) - len(keep)]
+    budget = max_bytes - _approx_bytes(seed) - summary_chars - _MESSAGE_OVERHEAD_BYTES
+    size = sum(_approx_bytes(m) for m in keep)
+    while keep and size > budget:
+        size -= _approx_bytes(keep[0])
+        dropped.append(keep.pop(0))
+
+    if not dropped:
+        return msgs
+    return [seed, _summary(prior, dropped, like=seed, chars=summary_chars), *keep]
+
+
+def compact_for_settings(messages: Sequence[Any] | None) -> list[Any]:
+    """:func:`compact_messages` with the ``quiz.transcript`` settings; a no-op
+    when compaction is disabled."""
+    cfg = settings.quiz.transcript
+    if not cfg.enabled:
+        return list(messages or [])
+    return compact_messages(
+        messages,
+        window=cfg.window,
+        max_bytes=cfg.max_bytes,
+        summary_chars=cfg.summary_chars,
+    )
+
+
+def add_bounded_messages(left: Any, right: Any) -> list[Any]:
+    """``add_messages`` followed by :func:`compact_for_settings` — the
+    ``messages`` reducer of the graph state."""
+    return compact_for_settings(add_messages(left, right))
+
+
+__all__ = [
+    "SUMMARY_ID",
+    "SUMMARY_NAME",
+    "add_bounded_messages",
+    "compact_for_settings",
+    "compact_messages",
+    "is_summary",
+]
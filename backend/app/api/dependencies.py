@@ -38,6 +38,7 @@ from app.services.precompute.lookup import (
     LookupThresholds,
     PrecomputeLookup,
 )
+from app.services.precompute.vector_index import get_topic_vector_index
 
 logger = structlog.get_logger(__name__)
 
@@ -383,7 +384,8 @@ def get_precompute_lookup(
     Threshold values are sourced from `settings.precompute.thresholds` so an
     operator can retune match strictness without a redeploy. The returned
     instance carries no embedder yet — Phase 7 introduces the cached
-    embeddings service that will be injected here.
+    embeddings service that will be injected here. The process-wide
+    `TopicVectorIndex` is wired in so the NN step never rescans `topics`.
     """
 
     cfg = getattr(settings, "precompute", None)
@@ -402,6 +404,7 @@ def get_precompute_lookup(
         redis=redis_client,
         thresholds=thresholds,
         embed_fn=None,
+        vector_index=get_topic_vector_index(),
     )
 
 
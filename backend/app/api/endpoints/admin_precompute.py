@@ -34,6 +34,7 @@ from app.api.dependencies import (
 from app.core.config import settings
 from app.models.db import PrecomputeJob, Topic, TopicPack
 from app.services.precompute import audit, cost, cost_guard, jobs
+from app.services.precompute.vector_index import get_topic_vector_index
 
 logger = structlog.get_logger("app.api.admin.precompute")
 
@@ -176,6 +177,7 @@ async def promote_pack(
         before=before, after=after,
     )
     await db.commit()
+    await get_topic_vector_index().refresh_topics(db, [topic.id])
 
     # Synthesize a job-shaped response so the operator client has a uniform
     # surface; the real promotion happens via the FK update above.
@@ -220,6 +222,7 @@ async def rollback_pack(
         before=before, after=after,
     )
     await db.commit()
+    await get_topic_vector_index().refresh_topics(db, [topic.id])
     fake = PrecomputeJob(
         id=UUID(int=0), topic_id=topic.id, status="succeeded",
         attempt=0, tier=None, cost_cents=0, error_text=None,
@@ -22,6 +22,9 @@ from app.api.dependencies import (
 )
 from app.models.db import TopicPack
 from app.services.precompute import telemetry
+from app.services.precompute.pack_l1 import get_pack_l1
+from app.services.precompute.topic_suggest_index import get_topic_suggest_index
+from app.services.precompute.vector_index import get_topic_vector_index
 
 router = APIRouter(prefix="/healthz", tags=["healthz", "precompute"])
 
@@ -33,6 +36,12 @@ class PrecomputeHealth(BaseModel):
     hit_rate_24h: float
     miss_rate_24h: float
     top_misses_24h: list[dict]
+    vector_index: dict[str, Any] = {}
+    """In-process topic NN index footprint (size, bytes, rebuild ms)."""
+    pack_l1: dict[str, Any] = {}
+    """In-process pack cache counters (hits, misses, evictions) for sizing."""
+    suggest_index: dict[str, Any] = {}
+    """In-process typeahead prefix index (topics, keys, rebuild ms, queries)."""
 
 
 @router.get("/precompute", response_model=PrecomputeHealth)
@@ -54,4 +63,7 @@ async def precompute_health(
         hit_rate_24h=snap["hit_rate_24h"],
         miss_rate_24h=snap["miss_rate_24h"],
         top_misses_24h=snap["top_misses_24h"],
+        vector_index=get_topic_vector_index().stats(),
+        pack_l1=get_pack_l1().stats(),
+        suggest_index=get_topic_suggest_index().stats(),
     )
@@ -14,21 +14,38 @@ Behaviour:
     falling back to `image/png`.
 - Honours `If-None-Match` with `304 Not Modified` and no body
   (`AC-PRECOMP-IMG-3`).
+- Reads metadata only (hash, payload, blob presence) for the 404/304
+  decisions; the blob itself is loaded once per worker per hash, written
+  to the content-addressed disk cache (`app.services.media.disk_cache`)
+  and served from there as a `FileResponse`, with `Range` requests
+  answered as `206`. When the cache is disabled or the write fails the
+  bytes are served from memory; when another worker evicts the file
+  before the response opens it, from the DB blob.
+- `?w=<px>` serves the narrowest resized derivative (WebP/AVIF, see
+  `app.services.media.derivatives`) at least that wide in a format the
+  `Accept` header lists, with `Vary: Accept`; the original when none fits.
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
-from typing import Annotated
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Header, Response, status
+import anyio
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import FileResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_db_session
 from app.core.config import settings
 from app.models.db import MediaAsset
+from app.services.media.derivatives import select_derivative
+from app.services.media.disk_cache import get_media_disk_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["media"])
@@ -46,13 +63,62 @@ _ALLOWED_CONTENT_TYPES = frozenset(
 )
 
 
+class _CachedFileResponse(FileResponse):
+    """A disk-cache file, opened before anything is sent.
+
+    Any worker may evict the file at any time. Once it is open the handle
+    keeps the bytes readable; if it is already gone, ``fallback`` answers
+    instead of a response that dies after its headers went out. For the
+    same reason ``pathsend`` is not offered: the server would re-open the
+    path itself.
+    """
+
+    # Most rehosted images fit in one read: one worker-thread hop instead of
+    # one per 64 KiB (Starlette's default).
+    chunk_size = 1024 * 1024
+
+    def __init__(
+        self, path: Any, *, fallback: Callable[[], Awaitable[Response]], **kwargs: Any
+    ) -> None:
+        super().__init__(path, **kwargs)
+        self._fallback = fallback
+        self._file: anyio.AsyncFile[bytes] | None = None
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            self._file = await anyio.open_file(self.path, mode="rb")
+        except OSError:
+            logger.info("media.disk_cache.gone_at_send path=%s", self.path)
+            response = await self._fallback()
+            return await response(scope, receive, send)
+        try:
+            if self.stat_result is None:
+                self.stat_result = await anyio.to_thread.run_sync(
+                    os.fstat, self._file.wrapped.fileno()
+                )
+                self.set_stat_headers(self.stat_result)
+            extensions = scope.get("extensions") or {}
+            if "http.response.pathsend" in extensions:
+                extensions = {k: v for k, v in extensions.items() if k != "http.response.pathsend"}
+                scope = {**scope, "extensions": extensions}
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self._file.aclose()
+
+    @contextlib.asynccontextmanager
+    async def _open_file(self) -> AsyncIterator[anyio.AsyncFile[bytes]]:
+        # The handle opened in __call__; it is closed there.
+        assert self._file is not None
+        yield self._file
+
+
 def _etag_value(content_hash: str) -> str:
     """RFC 7232 strong validator — wrapped in double quotes, no W/ prefix."""
     return f'"{content_hash}"'
 
 
-def _content_type_for(asset: MediaAsset) -> str:
-    payload = asset.prompt_payload or {}
+def _content_type_for(payload: object) -> str:
     if isinstance(payload, dict):
         ct = payload.get("content_type")
         if isinstance(ct, str) and ct.split(";")[0].strip().lower() in _ALLOWED_CONTENT_TYPES:
@@ -60,6 +126,52 @@ def _content_type_for(asset: MediaAsset) -> str:
     return DEFAULT_CONTENT_TYPE
 
 
+async def _serve_cached(
+    db_session: AsyncSession,
+    *,
+    blob_id: UUID,
+    content_hash: str,
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """Serve `blob_id`'s bytes from the disk cache, filling it on a miss."""
+
+    def _from_memory(data: bytes) -> Response:
+        return Response(
+            content=data,
+            media_type=media_type,
+            headers=headers,
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def _from_db() -> Response:
+        blob = (
+            await db_session.execute(select(MediaAsset.bytes_blob).where(MediaAsset.id == blob_id))
+        ).scalar_one_or_none()
+        if blob is None:
+            return Response(status_code=status.HTTP_404_NOT_FOUND)
+        return _from_memory(bytes(blob))
+
+    cache = get_media_disk_cache()
+    hit = await cache.lookup(content_hash) if cache is not None else None
+    if hit is not None:
+        return _CachedFileResponse(
+            hit[0], stat_result=hit[1], media_type=media_type, headers=headers, fallback=_from_db
+        )
+
+    response = await _from_db()
+    if cache is None or response.status_code != status.HTTP_200_OK:
+        return response
+    path = await cache.fill(content_hash, response.body)
+    if path is None:
+        return response
+
+    async def _filled_bytes() -> Response:
+        return response
+
+    return _CachedFileResponse(path, media_type=media_type, headers=headers, fallback=_filled_bytes)
+
+
 @router.get(
     "/media/{asset_id}",
     summary="Serve a locally-rehosted media asset",
@@ -68,16 +180,34 @@ def _content_type_for(asset: MediaAsset) -> str:
 async def get_media_asset(
     asset_id: UUID,
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    w: Annotated[int | None, Query(ge=1, le=4096)] = None,
+    accept: Annotated[str | None, Header()] = None,
     if_none_match: Annotated[str | None, Header(alias="If-None-Match")] = None,
 ) -> Response:
-    row = (
-        await db_session.execute(select(MediaAsset).where(MediaAsset.id == asset_id))
-    ).scalar_one_or_none()
-
-    if row is None or row.bytes_blob is None:
+    meta = (
+        await db_session.execute(
+            select(
+                MediaAsset.content_hash,
+                MediaAsset.prompt_payload,
+                MediaAsset.bytes_blob.is_not(None),
+            ).where(MediaAsset.id == asset_id)
+        )
+    ).one_or_none()
+
+    if meta is None or not meta[2]:
         return Response(status_code=status.HTTP_404_NOT_FOUND)
-
-    etag = _etag_value(row.content_hash)
+    content_hash, payload = meta[0], meta[1]
+    blob_id, media_type = asset_id, _content_type_for(payload)
+
+    # `?w=` — serve the narrowest derivative at least that wide in a format
+    # the client accepts; the original otherwise.
+    variant = select_derivative(payload, width=w, accept=accept)
+    if variant is not None:
+        blob_id = UUID(variant["id"])
+        content_hash = variant["content_hash"]
+        media_type = _content_type_for(variant)
+
+    etag = _etag_value(content_hash)
     cache_control = settings.precompute.image_storage.cache_control
     common_headers = {
         "ETag": etag,
@@ -85,6 +215,8 @@ async def get_media_asset(
         # Defence in depth — content-addressed bytes never change identity.
         "X-Content-Type-Options": "nosniff",
     }
+    if w is not None:
+        common_headers["Vary"] = "Accept"
 
     # Conditional GET — caller is asking us to confirm their cached copy.
     # Compare verbatim per RFC 7232 (servers MAY do weak compare; we use
@@ -92,9 +224,10 @@ async def get_media_asset(
     if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
         return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=common_headers)
 
-    return Response(
-        content=bytes(row.bytes_blob),
-        media_type=_content_type_for(row),
+    return await _serve_cached(
+        db_session,
+        blob_id=blob_id,
+        content_hash=content_hash,
+        media_type=media_type,
         headers=common_headers,
-        status_code=status.HTTP_200_OK,
     )
@@ -19,7 +19,10 @@ Notes:
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import copy
 import hashlib
+import secrets
 import sys
 import time
 import traceback
@@ -103,6 +106,8 @@ from app.models.api import (
 from app.models.db import character_session_map
 from app.security.rate_limit import RateLimiter, _client_ip
 from app.services import image_pipeline as _image_pipeline
+from app.services import quiz_admission
+from app.services.agent_queue import get_agent_queue
 
 # NEW: use repositories & association table for persistence
 from app.services.database import (
@@ -111,7 +116,17 @@ from app.services.database import (
     SessionQuestionsRepository,
     SessionRepository,
 )
+from app.services.llm_concurrency import PRIORITY_BACKGROUND, llm_priority
+from app.services.quiz_status_notifier import (
+    get_quiz_status_notifier,
+    publish_quiz_status,
+)
 from app.services.redis_cache import CacheRepository
+from app.services.speculative_questions import (
+    SpeculativeBranch,
+    get_question_speculator,
+    history_digest,
+)
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
@@ -478,7 +493,7 @@ _AGENT_OWNED_STATE_FIELDS: tuple[str, ...] = (
 # so there is no need to merge them back and risk widening the write surface.
 
 # Request-owned fields the agent's final save must NEVER clobber. A delayed
-# /quiz/next (records an answer into ``quiz_history``/``messages``) or a
+# /quiz/next (records an answer into ``quiz_history``) or a
 # /quiz/status (advances ``last_served_index``) may land mid-run; a full-state
 # SET here would silently drop those concurrent atomic merges (audit P1).
 _REQUEST_OWNED_STATE_FIELDS: frozenset[str] = frozenset(
@@ -493,7 +508,7 @@ async def _save_final_state_to_cache(cache_repo: CacheRepository, session_id: st
     Background (audit P1, reliability/quiz-flow): the background agent runs for
     several seconds. A ``save_quiz_state`` (full Redis SET of the whole
     snapshot) at the end would overwrite any concurrent atomic merges that
-    ``/quiz/next`` (``quiz_history``/``messages``) and ``/quiz/status``
+    ``/quiz/next`` (``quiz_history``) and ``/quiz/status``
     (``last_served_index``) made while the agent was working — dropping a
     recorded answer or reverting the served pointer. We therefore merge only
     the fields the agent produced, explicitly excluding the request-owned
@@ -566,13 +581,16 @@ async def _save_final_state_to_cache(cache_repo: CacheRepository, session_id: st
                 quiz_id=session_id,
                 save_duration_ms=round((time.perf_counter() - t_save) * 1000, 1),
             )
-            return
-        logger.info(
-            "Final agent state merged to cache (field-scoped, atomic)",
-            quiz_id=session_id,
-            save_duration_ms=save_ms,
-            merged_fields=sorted(merge_fields.keys()),
-        )
+        else:
+            logger.info(
+                "Final agent state merged to cache (field-scoped, atomic)",
+                quiz_id=session_id,
+                save_duration_ms=save_ms,
+                merged_fields=sorted(merge_fields.keys()),
+            )
+        # Wake any /quiz/status/{id}/wait long-poll parked on this session
+        # (fail-open; pollers still converge on their next tick).
+        await publish_quiz_status(getattr(cache_repo, "client", None), session_uuid)
     except Exception as e:
         logger.error(
             "Failed to save final agent state to cache",
@@ -985,8 +1003,11 @@ async def run_agent_in_background(
         config = {"configurable": {"thread_id": session_id_str}}
         logger.debug("Agent background stream starting", quiz_id=session_id_str)
 
-        async for _ in agent_graph.astream(state_dict, config=config):  # type: ignore[attr-defined]
-            steps += 1
+        # The user already has a 202; this run's LLM calls queue behind
+        # interactive ones (still with their own reserved slots).
+        with llm_priority(PRIORITY_BACKGROUND):
+            async for _ in agent_graph.astream(state_dict, config=config):  # type: ignore[attr-defined]
+                steps += 1
 
         final_state_snapshot = await agent_graph.aget_state(config)  # type: ignore[attr-defined]
         final_state = final_state_snapshot.values
@@ -1038,14 +1059,188 @@ async def run_agent_in_background(
             await _finalize_durable_job(
                 session_id, job_ok=job_ok, job_exc=job_exc, job_error=job_error
             )
+            # The cache save above woke long-pollers BEFORE the job row was
+            # marked; wake them again so a failed run surfaces its terminal
+            # 422 instead of waiting out the timeout (a no-op when nobody is
+            # still parked).
+            await publish_quiz_status(redis_client, session_id)
+            # No-op unless the run left a new unanswered adaptive question.
+            await _launch_speculation(final_state)
 
         structlog.contextvars.clear_contextvars()
 
 
+async def _enqueue_agent_run(redis_client: Any, quiz_id: uuid.UUID, *, reason: str) -> bool:
+    """Hand the run to the worker pool when ``agent.queue`` is on.
+
+    False means the caller runs it in-process (queue off, or the enqueue
+    failed — never strand the user's quiz on a queue fault). A quiz that
+    is already queued counts as handed off.
+    """
+    queue = get_agent_queue(redis_client)
+    if queue is None:
+        return False
+    try:
+        await queue.enqueue(quiz_id, reason=reason)
+        return True
+    except Exception as e:
+        logger.warning("agent_queue.enqueue_failed", quiz_id=str(quiz_id), error=str(e))
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Speculative next question (quiz.speculation; off by default)
+# ---------------------------------------------------------------------------
+
+async def _launch_speculation(state: GraphState) -> None:
+    """Pre-generate follow-ups for the displayed question's likely answers."""
+    speculator = get_question_speculator()
+    if speculator is None:
+        return
+    try:
+        await speculator.launch(state)
+    except Exception:
+        logger.debug("quiz.speculation.launch_fail", exc_info=True)
+
+
+async def _claim_speculative_branch(
+    state_dict: dict, new_history: list[dict]
+) -> SpeculativeBranch | None:
+    """The prepared follow-up for the answer just recorded, if any."""
+    speculator = get_question_speculator()
+    answer = new_history[-1] if new_history else {}
+    if speculator is None or answer.get("option_index") is None:
+        return None
+    history = list(state_dict.get("quiz_history") or [])
+    try:
+        return await speculator.claim(
+            str(state_dict.get("session_id")),
+            len(history),
+            int(answer["option_index"]),
+            history_digest(history, str(answer.get("question_text") or "")),
+        )
+    except Exception:
+        logger.debug("quiz.speculation.claim_fail", exc_info=True)
+        return None
+
+
+def _speculative_patch(state_dict: dict, branch: SpeculativeBranch) -> dict[str, Any]:
+    """State fields the agent's decide + generate step would have written."""
+    return {
+        "generated_questions": [*(state_dict.get("generated_questions") or []), branch.question],
+        "current_confidence": branch.confidence,
+    }
+
+
+async def _after_speculative_hit(state: GraphState, redis_client: Any) -> None:
+    """Background tail of a served branch: wake pollers, persist, speculate on."""
+    session_id = state.get("session_id")
+    if isinstance(session_id, uuid.UUID):
+        await publish_quiz_status(redis_client, session_id)
+        await _persist_adaptive_and_final(session_id, str(session_id), state)
+    await _launch_speculation(state)
+
+
+async def _continue_after_answer(
+    state: GraphState, redis_client: Any, agent_graph: object, option_index: int
+) -> None:
+    """Wait for the matching branch still running here; run the agent if it fails."""
+    session_id = state.get("session_id")
+    speculator = get_question_speculator()
+    q_index = len(state.get("quiz_history") or []) - 1
+    branch = (
+        await speculator.await_inflight(str(session_id), q_index, option_index)
+        if speculator is not None
+        else None
+    )
+    if branch is not None and isinstance(session_id, uuid.UUID):
+        updated = await CacheRepository(redis_client).update_quiz_state_atomically(
+            session_id, _speculative_patch(state, branch)
+        )
+        if updated is not None:
+            await _quiz_job_update(session_id, "succeeded")
+            await _after_speculative_hit(_to_state_dict(updated), redis_client)
+            return
+    await run_agent_in_background(state, redis_client, agent_graph)
+
+
+async def _schedule_after_answer(
+    background_tasks: BackgroundTasks,
+    db_session: AsyncSession,
+    state: GraphState,
+    redis_client: Any,
+    agent_graph: object,
+    spec_branch: SpeculativeBranch | None,
+) -> None:
+    """Queue the adaptive step for a recorded answer (or the hit's tail)."""
+    session_id = state.get("session_id")
+    if spec_branch is not None:
+        background_tasks.add_task(_after_speculative_hit, state, redis_client)
+        logger.info("Speculative question served", quiz_id=str(session_id))
+        return
+    # Durably mark the job running BEFORE scheduling + returning 202 so a
+    # crash in the schedule→first-write window still leaves a recoverable
+    # row (audit P1). Same held session as the qa_history snapshot.
+    await _ensure_job_row_before_schedule(db_session, session_id)
+    if await _enqueue_agent_run(redis_client, session_id, reason="answer"):
+        logger.info("Agent run queued", quiz_id=str(session_id))
+        return
+    answer = (state.get("quiz_history") or [{}])[-1]
+    option_index = answer.get("option_index") if isinstance(answer, dict) else None
+    speculator = get_question_speculator()
+    if (
+        speculator is not None
+        and option_index is not None
+        and speculator.has_inflight(
+            str(session_id), len(state.get("quiz_history") or []) - 1, int(option_index)
+        )
+    ):
+        background_tasks.add_task(
+            _continue_after_answer, state, redis_client, agent_graph, int(option_index)
+        )
+    else:
+        background_tasks.add_task(run_agent_in_background, state, redis_client, agent_graph)
+    logger.info("Background task scheduled", quiz_id=str(session_id))
+
+
 # ---------------------------------------------------------------------------
 # Start Quiz Helpers (Extracted to fix C901)
 # ---------------------------------------------------------------------------
 
+async def _persist_streamed_characters(
+    db_session: AsyncSession,
+    session_id: uuid.UUID,
+    category: str,
+    synopsis: Any,
+    characters: list,
+) -> None:
+    try:
+        await _persist_initial_snapshot(
+            db_session,
+            session_id=session_id,
+            category=category,
+            synopsis=synopsis,
+            characters=characters,
+            write_session_row=False,
+            agent_plan=None,
+        )
+        logger.info("Characters persisted post-stream", quiz_id=str(session_id))
+    except Exception:
+        logger.exception("Failed to persist characters post-stream", quiz_id=str(session_id))
+
+
+async def _next_step_before(stream: Any, deadline: float) -> bool:
+    """Advance ``stream`` one step; False once it is exhausted.
+
+    Raises ``asyncio.TimeoutError`` (cancelling the step) at ``deadline``.
+    """
+    try:
+        await asyncio.wait_for(anext(stream), max(deadline - time.perf_counter(), 0.0))
+    except StopAsyncIteration:
+        return False
+    return True
+
+
 async def _stream_characters_until_budget(
     agent_graph: object,
     config: dict,
@@ -1055,56 +1250,66 @@ async def _stream_characters_until_budget(
     db_session: AsyncSession,
     stream_budget_s: float,
 ) -> GraphState:
-    """Streams the graph until characters appear or budget runs out."""
-    state = initial_state
-    t_stream_start = time.perf_counter()
-    steps = 0
-
-    async for _ in agent_graph.astream(state, config=config):  # type: ignore[attr-defined]
-        steps += 1
-        current = await agent_graph.aget_state(config)  # type: ignore[attr-defined]
-        current_values: GraphState = current.values
-        have_characters = bool(current_values.get("generated_characters"))
+    """Streams the graph until characters appear or budget runs out.
 
-        if have_characters:
-            # Gate still closed; ensure it stays that way
-            current_values["ready_for_questions"] = False
-            # We don't need to save to cache here; start_quiz main flow handles final response logic,
-            # but saving here ensures if we crash before return, data is safe.
-            # Note: The main flow relies on returning a response payload.
-
-            logger.info(
-                "Characters generated during start",
-                quiz_id=str(session_id),
-                step=steps,
-                character_count=len(current_values.get("generated_characters", [])),
-            )
-
-            # Persist characters that appeared during streaming
-            try:
-                await _persist_initial_snapshot(
-                    db_session,
-                    session_id=session_id,
-                    category=category,
-                    synopsis=state.get("synopsis"),
-                    characters=current_values.get("generated_characters") or [],
-                    write_session_row=False,
-                    agent_plan=None,
-                )
-                logger.info("Characters persisted post-stream", quiz_id=str(session_id))
-            except Exception:
-                logger.exception("Failed to persist characters post-stream", quiz_id=str(session_id))
+    The budget is a deadline, not a between-steps check: a characters node
+    still running when it expires is cancelled, and the batch profiles that
+    had already closed are returned instead of nothing. The characters node
+    generates only the archetypes still missing on the next run.
+    """
+    from app.agent.graph import streamed_character_profiles
 
-            state = current_values
-            break
+    state = initial_state
+    archetypes = list(initial_state.get("ideal_archetypes") or [])
+    deadline = time.perf_counter() + stream_budget_s
+    steps = 0
 
-        if (time.perf_counter() - t_stream_start) >= stream_budget_s:
+    stream = agent_graph.astream(state, config=config).__aiter__()  # type: ignore[attr-defined]
+    try:
+        with streamed_character_profiles(archetypes) as closed:
+            while await _next_step_before(stream, deadline):
+                steps += 1
+                current = await agent_graph.aget_state(config)  # type: ignore[attr-defined]
+                current_values: GraphState = current.values
+                if current_values.get("generated_characters"):
+                    logger.info(
+                        "Characters generated during start",
+                        quiz_id=str(session_id),
+                        step=steps,
+                        character_count=len(current_values.get("generated_characters", [])),
+                    )
+                    state = current_values
+                    break
+    except asyncio.TimeoutError:
+        if not closed:
             logger.warning(
                 "Character generation exceeded time budget; returning synopsis-only",
                 quiz_id=str(session_id),
             )
-            break
-
+            return state
+        state = dict(initial_state)  # type: ignore[assignment]
+        state["generated_characters"] = [closed[n] for n in archetypes if n in closed]
+        logger.info(
+            "Character budget reached; returning closed profiles",
+            quiz_id=str(session_id),
+            character_count=len(state["generated_characters"]),
+            target_count=len(archetypes),
+        )
+    finally:
+        with contextlib.suppress(Exception):
+            await stream.aclose()
+
+    if state.get("generated_characters"):
+        # Gate still closed; ensure it stays that way
+        state["ready_for_questions"] = False
+        # Persist characters that appeared during streaming
+        await _persist_streamed_characters(
+            db_session,
+            session_id,
+            category,
+            initial_state.get("synopsis"),
+            state.get("generated_characters") or [],
+        )
     return state
 
 
@@ -1335,11 +1540,11 @@ async def _short_circuit_from_pack(
     from app.services.precompute.hydrator import hydrate_pack as _hydrate_pack
 
     # P11 (2026-07-02) — serve-path pack cache. Assembling a HydratedPack
-    # costs ~5 serial DB round-trips (pack → synopsis → character_set →
-    # characters → baseline questions) on EVERY /quiz/start for a popular
-    # topic. Cache the fully hydrated pack in Redis (keyed by pack_id, 1h
-    # TTL) so repeat hits serve from one Redis GET. Fail-open by design:
-    # any cache fault degrades to the DB hydrate below.
+    # joins pack → synopsis → character_set → characters → baseline
+    # questions (one aggregated statement on Postgres) on EVERY /quiz/start
+    # for a popular topic. Cache the fully hydrated pack in Redis (keyed by
+    # pack_id, 1h TTL) so repeat hits serve from one Redis GET. Fail-open by
+    # design: any cache fault degrades to the DB hydrate below.
     pack_cache_hit = False
     hydrated = await _pack_cache.get_hydrated_pack(redis_client, pack_id)
     if hydrated is not None:
@@ -1390,7 +1595,9 @@ async def _short_circuit_from_pack(
     # the legacy v2 case: state stays without ``baseline_ready`` so /proceed
     # falls through to the live agent.
     if hydrated.baseline_questions:
-        state["generated_questions"] = [dict(q) for q in hydrated.baseline_questions]
+        # Deep copy: the HydratedPack may be the shared in-process L1 object
+        # and downstream steps can annotate option dicts in place.
+        state["generated_questions"] = copy.deepcopy(list(hydrated.baseline_questions))
         state["baseline_count"] = len(hydrated.baseline_questions)
         state["baseline_ready"] = True
 
@@ -1947,6 +2154,10 @@ async def start_quiz(  # noqa: C901 — orchestrator: budget/lookup/cache/agent
             # Re-apply the empty-profile filter — characters streamed during
             # Step 2 are subject to the same CHECK-constraint risk.
             _drop_invalid_characters_from_state(state_after_first, quiz_id=quiz_id)
+            if state_after_first.get("generated_characters"):
+                # /quiz/proceed resumes from this state: the characters node
+                # keeps what the client was shown and fills in the rest.
+                await cache_repo.save_quiz_state(state_after_first)
 
         # --- Step 3: Schedule background image generation (non-blocking) ---
         _schedule_image_jobs_safe(
@@ -2002,12 +2213,32 @@ async def start_quiz(  # noqa: C901 — orchestrator: budget/lookup/cache/agent
 # combined /proceed + /next actions per session to the quiz's own question
 # budget plus slack. Best-effort: a counter fault must never break a real quiz
 # (the per-IP limiter and the graph-level max_total_questions still apply).
-async def _enforce_session_action_cap(redis_client: Any, quiz_id_str: str) -> None:
+def _session_action_cap() -> int:
     try:
-        cap = int(getattr(getattr(settings, "quiz", None), "max_total_questions", 24)) + 10
+        return int(getattr(getattr(settings, "quiz", None), "max_total_questions", 24)) + 10
     except Exception:
-        cap = 34
-    key = f"quiz_actions:{quiz_id_str}"
+        return 34
+
+
+def _session_action_key(quiz_id_str: str) -> str:
+    return f"quiz_actions:{quiz_id_str}"
+
+
+def _session_action_cap_429(quiz_id_str: str, count: int, cap: int) -> HTTPException:
+    logger.info(
+        "quiz.session_action_cap.exceeded", quiz_id=quiz_id_str, count=count, cap=cap
+    )
+    return coded_http_exception(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="This quiz has reached its limit. Please start a new quiz.",
+        code=QF_SESSION_ACTION_CAP,
+        headers={"Retry-After": "60"},
+    )
+
+
+async def _enforce_session_action_cap(redis_client: Any, quiz_id_str: str) -> None:
+    cap = _session_action_cap()
+    key = _session_action_key(quiz_id_str)
     try:
         n = int(await redis_client.incr(key))
         if n == 1:
@@ -2015,15 +2246,7 @@ async def _enforce_session_action_cap(redis_client: Any, quiz_id_str: str) -> No
     except Exception:
         return
     if n > cap:
-        logger.info(
-            "quiz.session_action_cap.exceeded", quiz_id=quiz_id_str, count=n, cap=cap
-        )
-        raise coded_http_exception(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="This quiz has reached its limit. Please start a new quiz.",
-            code=QF_SESSION_ACTION_CAP,
-            headers={"Retry-After": "60"},
-        )
+        raise _session_action_cap_429(quiz_id_str, n, cap)
 
 
 # P9 (2026-07-02) — Redis-miss fallback for the mid-quiz endpoints.
@@ -2161,8 +2384,11 @@ async def proceed_quiz(
         await _ensure_job_row_before_schedule(db_session, request.quiz_id)
 
         # Schedule the agent to continue (no answer appended)
-        background_tasks.add_task(run_agent_in_background, current_state_dict, redis_client, agent_graph)
-        logger.info("Background task scheduled for proceed", quiz_id=quiz_id_str)
+        if await _enqueue_agent_run(redis_client, request.quiz_id, reason="proceed"):
+            logger.info("Agent run queued for proceed", quiz_id=quiz_id_str)
+        else:
+            background_tasks.add_task(run_agent_in_background, current_state_dict, redis_client, agent_graph)
+            logger.info("Background task scheduled for proceed", quiz_id=quiz_id_str)
 
         structlog.contextvars.clear_contextvars()
         return ProcessingResponse(status="processing", quiz_id=request.quiz_id)
@@ -2170,6 +2396,116 @@ async def proceed_quiz(
         await _sl.release(redis_client, quiz_id_str, _lock_token)
 
 
+# ---------------------------------------------------------------------------
+# /quiz/next admission
+# ---------------------------------------------------------------------------
+
+def _live_cost_budget_cents() -> int:
+    """The dollar breaker's daily budget in cents (0 when the guard is off)."""
+    cfg = getattr(getattr(settings, "security", None), "live_cost_guard", None)
+    if cfg is None or not getattr(cfg, "enabled", False):
+        return 0
+    try:
+        return int(round(float(getattr(cfg, "daily_budget_usd", 0.0) or 0.0) * 100.0))
+    except Exception:
+        return 0
+
+
+async def _admit_next_scripted(
+    redis_client: Any, quiz_id: uuid.UUID, *, lock_ttl_s: int
+) -> tuple[quiz_admission.Admission | None, str]:
+    """Run the admission script; (None, token) when it faulted."""
+    from app.security import session_lock as _sl
+    from app.services import cost_meter
+
+    token = secrets.token_hex(8)
+    lock_key = _sl._key(str(quiz_id))
+    try:
+        admission = await quiz_admission.admit_next(
+            redis_client,
+            quiz_id,
+            lock_key=lock_key,
+            token=token,
+            lock_ttl_s=lock_ttl_s,
+            actions_key=_session_action_key(str(quiz_id)),
+            action_cap=_session_action_cap(),
+            cents_key=cost_meter.daily_cents_key(),
+            budget_cents=_live_cost_budget_cents(),
+        )
+        return admission, token
+    except Exception as e:
+        logger.warning("quiz.admission.script_failed", quiz_id=str(quiz_id), error=str(e))
+        # The script may have run before the reply was lost.
+        await _sl.release(redis_client, str(quiz_id), token)
+        return None, token
+
+
+def _raise_for_admission(admission: quiz_admission.Admission, quiz_id_str: str) -> None:
+    if admission.outcome == "busy":
+        logger.info("Concurrent /quiz/next rejected by session lock", quiz_id=quiz_id_str)
+        raise SessionBusyError("Another request is currently being processed for this session.")
+    if admission.outcome == "capped":
+        raise _session_action_cap_429(quiz_id_str, admission.actions, _session_action_cap())
+    if admission.outcome == "over_budget":
+        logger.warning(
+            "quiz.live_cost_ceiling.exceeded",
+            reason="daily_budget_usd",
+            spent_cents=admission.spent_cents,
+            budget_usd=_live_cost_budget_cents() / 100.0,
+            is_start=False,
+        )
+        raise _live_cost_503()
+
+
+async def _admit_next_answer(
+    redis_client: Any, cache_repo: CacheRepository, db_session: AsyncSession, quiz_id: uuid.UUID
+) -> tuple[dict[str, Any], str, bool]:
+    """§15.4 lock, P9 state load, P0-1 action cap and the Hitlist #2 dollar
+    breaker for ``/quiz/next``. Returns ``(state_dict, lock_token, scripted)``.
+
+    Patch-mode sessions take all four in one Lua round trip
+    (``quiz_admission.admit_next``) and ``scripted`` tells the caller to
+    commit through ``commit_next`` too. A script fault or a session outside
+    the hash layout takes the sequential path. The lock is released here on
+    any raise; otherwise the caller owns it.
+    """
+    from app.security import session_lock as _sl
+
+    quiz_id_str = str(quiz_id)
+    lock_ttl_s = int(getattr(settings.security, "session_lock_ttl_s", 10))
+    admission = None
+    if cache_repo.patch_mode and bool(getattr(settings.quiz, "next_admission_script", False)):
+        admission, token = await _admit_next_scripted(redis_client, quiz_id, lock_ttl_s=lock_ttl_s)
+    if admission is not None:
+        _raise_for_admission(admission, quiz_id_str)
+        if admission.outcome == "ok" and admission.state is not None:
+            return _to_state_dict(admission.state), token, True
+    else:
+        token = await _sl.acquire(redis_client, quiz_id_str, ttl_s=lock_ttl_s)
+        if token is None:
+            logger.info("Concurrent /quiz/next rejected by session lock", quiz_id=quiz_id_str)
+            raise SessionBusyError("Another request is currently being processed for this session.")
+
+    try:
+        # P9 — fall back to the durable Postgres snapshot on a Redis miss
+        # (TTL expiry / eviction) instead of dead-ending the quiz with a 404.
+        state_dict = await _load_state_with_db_fallback(
+            cache_repo, db_session, quiz_id, endpoint="next"
+        )
+        if not state_dict:
+            raise NotFoundError("Quiz session not found.")
+        if admission is None or admission.outcome == "miss":
+            # P0-1 — bound total paid agent actions for this session.
+            await _enforce_session_action_cap(redis_client, quiz_id_str)
+            # Hitlist #2 — the dollar breaker also gates this paid follow-up (the
+            # agent may run another LLM loop / finalization here). Fail-open.
+            await _enforce_global_daily_cost_ceiling(redis_client, is_start=False)
+    except BaseException:
+        await _sl.release(redis_client, quiz_id_str, token)
+        raise
+    return state_dict, token, False
+
+
 # ---------------------------------------------------------------------------
 # Next Question Helpers (Extracted to fix C901)
 # ---------------------------------------------------------------------------
@@ -2212,8 +2548,13 @@ def _resolve_submitted_answer_text(
         return None
 
 
-def _validate_and_record_answer(state_dict: dict, request: NextQuestionRequest) -> tuple[list[dict], list[Any]]:
-    """Validates the user's answer index and updates history."""
+def _validate_and_record_answer(state_dict: dict, request: NextQuestionRequest) -> list[dict]:
+    """Validates the user's answer index and returns the updated history.
+
+    The answer is recorded in ``quiz_history`` only; it is not echoed into
+    ``messages`` (nothing downstream reads it there, and the transcript is
+    bounded — ``app/agent/transcript.py``).
+    """
     history = list(state_dict.get("quiz_history") or [])
     expected_index = len(history)
     q_index = request.question_index
@@ -2323,10 +2664,7 @@ def _validate_and_record_answer(state_dict: dict, request: NextQuestionRequest)
         "option_index": recorded_option_index,
     }]
 
-    new_messages = list(state_dict.get("messages") or [])
-    new_messages.append(HumanMessage(content=f"Answer to Q{q_index+1}: {ans_text}"))
-
-    return new_history, new_messages
+    return new_history
 
 
 @router.post(
@@ -2342,41 +2680,25 @@ async def next_question(
     redis_client: Annotated[Any, Depends(get_redis_client)],
     db_session: Annotated[AsyncSession, Depends(get_db_session)],
 ):
-    """Append the user's answer to the conversation and continue the agent in the background."""
+    """Record the user's answer and continue the agent in the background."""
     cache_repo = CacheRepository(redis_client)
     quiz_id_str = str(request.quiz_id)
 
     logger.info("Submitting answer for session", quiz_id=quiz_id_str)
 
-    # §15.4 — single-flight session lock (AC-LOCK-1..5).
     from app.security import session_lock as _sl
-    _lock_token = await _sl.acquire(
-        redis_client, quiz_id_str, ttl_s=int(getattr(settings.security, "session_lock_ttl_s", 10))
-    )
-    if _lock_token is None:
-        logger.info("Concurrent /quiz/next rejected by session lock", quiz_id=quiz_id_str)
-        raise SessionBusyError("Another request is currently being processed for this session.")
 
+    # Lock + state + action cap + spend check (one Lua round trip in patch mode).
+    state_dict, _lock_token, scripted = await _admit_next_answer(
+        redis_client, cache_repo, db_session, request.quiz_id
+    )
+    released = False
     try:
-        # P9 — fall back to the durable Postgres snapshot on a Redis miss
-        # (TTL expiry / eviction) instead of dead-ending the quiz with a 404.
-        state_dict = await _load_state_with_db_fallback(
-            cache_repo, db_session, request.quiz_id, endpoint="next"
-        )
-        if not state_dict:
-            raise NotFoundError("Quiz session not found.")
-
-        # P0-1 — bound total paid agent actions for this session.
-        await _enforce_session_action_cap(redis_client, quiz_id_str)
-        # Hitlist #2 — the dollar breaker also gates this paid follow-up (the
-        # agent may run another LLM loop / finalization here). Fail-open.
-        await _enforce_global_daily_cost_ceiling(redis_client, is_start=False)
-
         structlog.contextvars.bind_contextvars(trace_id=state_dict.get("trace_id"))
 
         # Validate and update state
         try:
-            new_history, new_messages = _validate_and_record_answer(state_dict, request)
+            new_history = _validate_and_record_answer(state_dict, request)
         except ValueError as e:
             if str(e) == "DUPLICATE":
                 logger.info("Duplicate answer received", quiz_id=quiz_id_str)
@@ -2397,12 +2719,24 @@ async def next_question(
                 code=QF_QUIZ_BAD_ANSWER,
             ) from e
 
+        # Serve a speculatively prepared follow-up in the same write, if any.
+        spec_branch = await _claim_speculative_branch(state_dict, new_history)
+
         # Persist atomic update
-        updated_state = await cache_repo.update_quiz_state_atomically(request.quiz_id, {
+        answer_patch = {
             "quiz_history": new_history,
-            "messages": new_messages,
             "ready_for_questions": True,
-        })
+            **(_speculative_patch(state_dict, spec_branch) if spec_branch is not None else {}),
+        }
+        if scripted:
+            # Merge + lock release in one EVAL.
+            updated_state = await quiz_admission.commit_next(
+                redis_client, request.quiz_id, answer_patch,
+                lock_key=_sl._key(quiz_id_str), token=_lock_token,
+            )
+            released = updated_state is not None
+        else:
+            updated_state = await cache_repo.update_quiz_state_atomically(request.quiz_id, answer_patch)
         if updated_state is None:
             raise coded_http_exception(
                 status_code=409,
@@ -2427,17 +2761,15 @@ async def next_question(
         new_answered = len(updated_state_dict.get("quiz_history") or [])
         baseline_count = int(updated_state_dict.get("baseline_count") or 0)
         if new_answered >= baseline_count:
-            # Durably mark the job running BEFORE scheduling + returning 202 so a
-            # crash in the schedule→first-write window still leaves a recoverable
-            # row (audit P1). Same held session as the qa_history snapshot above.
-            await _ensure_job_row_before_schedule(db_session, request.quiz_id)
-            background_tasks.add_task(run_agent_in_background, updated_state_dict, redis_client, agent_graph)
-            logger.info("Background task scheduled", quiz_id=quiz_id_str)
+            await _schedule_after_answer(
+                background_tasks, db_session, updated_state_dict, redis_client, agent_graph, spec_branch
+            )
 
         structlog.contextvars.clear_contextvars()
         return ProcessingResponse(status="processing", quiz_id=request.quiz_id)
     finally:
-        await _sl.release(redis_client, quiz_id_str, _lock_token)
+        if not released:
+            await _sl.release(redis_client, quiz_id_str, _lock_token)
 
 
 # ---------------------------------------------------------------------------
@@ -2842,10 +3174,11 @@ async def get_quiz_status(  # noqa: C901 — linear status orchestrator (final/n
     # endpoint, and contends with the background agent's WATCH. The field is
     # only persisted, never read for control logic, so skipping the no-op write
     # is safe. The atomic merge is still used (never a full SET) so a concurrent
-    # agent write is preserved.
+    # agent write is preserved; patch_quiz_state skips the post-merge fetch the
+    # poller never reads (one EVAL in patch mode).
     try:
         if last_served_index_val != target_index:
-            await cache_repo.update_quiz_state_atomically(
+            await cache_repo.patch_quiz_state(
                 quiz_id, {"last_served_index": target_index}
             )
     except Exception:
@@ -2856,6 +3189,49 @@ async def get_quiz_status(  # noqa: C901 — linear status orchestrator (final/n
     return QuizStatusQuestion(status="active", type="question", data=new_question_api)
 
 
+@router.get(
+    "/quiz/status/{quiz_id}/wait",
+    response_model=QuizStatusResponse,
+    summary="Long-poll for the next quiz status change",
+)
+async def wait_for_quiz_status(
+    quiz_id: uuid.UUID,
+    redis_client: Annotated[Any, Depends(get_redis_client)],
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    known_questions_count: Annotated[int, Query(ge=0, description="Client's known question count")] = 0,
+    timeout_s: Annotated[
+        float | None, Query(ge=0, description="Max seconds to wait (server-capped)")
+    ] = None,
+):
+    """Bounded long-poll variant of ``/quiz/status/{quiz_id}``.
+
+    Same payloads and error codes, but a 'processing' answer is held until the
+    background agent publishes on ``quiz_status:{id}`` (see
+    ``app.services.quiz_status_notifier``) or the wait budget runs out, so a
+    client gets the next question / result as soon as it lands with one
+    request instead of a 1–5 s polling loop.
+    """
+    cap = float(settings.quiz.status_long_poll_max_s)
+    budget = cap if timeout_s is None else min(timeout_s, cap)
+    deadline = time.monotonic() + budget
+
+    async with get_quiz_status_notifier().watch(redis_client, quiz_id) as watch:
+        while True:
+            resp = await get_quiz_status(
+                quiz_id, redis_client, db_session, known_questions_count
+            )
+            remaining = deadline - time.monotonic()
+            if not isinstance(resp, ProcessingResponse) or remaining <= 0:
+                return resp
+            # Don't pin a pooled DB connection (taken by the job-status read)
+            # for the whole park.
+            try:
+                await db_session.rollback()
+            except Exception:
+                pass
+            await watch.wait(remaining)
+
+
 # ---------------------------------------------------------------------------
 # Async-image snapshot (AC-MEDIA-1..6)
 # ---------------------------------------------------------------------------
@@ -6,10 +6,12 @@ Public typeahead helper. Hardened per `AC-PRECOMP-SEC-3`:
 - max 8 results.
 - per-IP rate limit: 60 / minute, fail-open on Redis outage.
 
-The lookup walks the precompute resolver's alias→slug indices first
-(cheap exact-prefix), then falls back to `topics.display_name ILIKE`
-when needed. Vector NN is intentionally **not** used here — typeahead
-must stay on the cheapest path.
+The lookup is answered from the per-worker prefix index over topic names
+and aliases (`precompute/topic_suggest_index.py`, popularity-ranked, no DB
+round trip once built). With `precompute.topic_suggest_index` off, or
+before the first build succeeds, it falls back to a
+`topics.display_name LIKE 'q%'` query. Vector NN is intentionally **not**
+used here — typeahead must stay on the cheapest path.
 """
 
 from __future__ import annotations
@@ -22,10 +24,12 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_db_session, get_redis_client
+from app.core.config import settings
 from app.core.error_codes import QF_INVALID_CATEGORY, QF_RATE_LIMITED
 from app.core.errors import coded_http_exception
 from app.models.db import Topic
 from app.security.rate_limit import RateLimiter
+from app.services.precompute.topic_suggest_index import get_topic_suggest_index
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["topics"])
@@ -64,6 +68,20 @@ async def suggest_topics(
             headers={"Retry-After": str(max(1, res.retry_after_s))},
         )
 
+    if settings.precompute.topic_suggest_index:
+        index = get_topic_suggest_index()
+        await index.ensure_fresh(db)
+        if index.ready:
+            hits = index.suggest(
+                q_norm, limit=MAX_RESULTS, fuzzy=settings.precompute.topic_suggest_fuzzy
+            )
+            return {"results": [hit.as_result() for hit in hits]}
+
+    return {"results": await _suggest_from_db(db, q_norm)}
+
+
+async def _suggest_from_db(db: AsyncSession, q_norm: str) -> list[dict[str, str]]:
+    """SQL prefix match on `display_name` (index disabled or not built yet)."""
     # AC-PRECOMP-SEC (deep-review #23) — escape LIKE metacharacters in the raw
     # user input BEFORE composing the prefix pattern. Without this, a `q` of "%"
     # (or "_") becomes a wildcard that matches EVERY row: a public, per-keystroke
@@ -81,7 +99,6 @@ async def suggest_topics(
             .limit(MAX_RESULTS)
         )
     ).all()
-    results = [
+    return [
         {"id": str(r[0]), "slug": r[1], "display_name": r[2]} for r in rows
     ]
-    return {"results": results}
@@ -22,7 +22,7 @@ from pathlib import Path
 from typing import Any, Literal
 
 import yaml
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 from pydantic_core.core_schema import ValidationInfo
 
 # ---------- logging (graceful if structlog missing) ----------
@@ -89,6 +89,64 @@ class ProjectConfig(BaseModel):
     api_prefix: str = "/api"
 
 
+class SpeculativeQuestionsConfig(BaseModel):
+    """Speculative next-question precompute (``app/services/speculative_questions.py``).
+
+    While an adaptive-phase question is on screen, the decision + follow-up
+    question are pre-generated for the ``branches`` most likely answers; a
+    matching answer is served without waiting on the agent. Off by default:
+    every branch the user does not pick is paid for and thrown away.
+    """
+
+    enabled: bool = False
+    # Answer options speculated per displayed question (most likely first).
+    branches: int = 2
+    # Daily cap on speculative LLM spend (its own cents counter); no new
+    # branches start once it is reached.
+    daily_budget_usd: float = 5.0
+    # How long a prepared branch stays claimable.
+    ttl_s: int = 900
+
+    @model_validator(mode="after")
+    def _bounds(self) -> SpeculativeQuestionsConfig:
+        if not (1 <= self.branches <= 2):
+            raise ValueError("quiz.speculation.branches must be 1 or 2")
+        if self.daily_budget_usd < 0:
+            raise ValueError("quiz.speculation.daily_budget_usd must be >= 0")
+        if self.ttl_s < 1:
+            raise ValueError("quiz.speculation.ttl_s must be >= 1")
+        return self
+
+
+class TranscriptConfig(BaseModel):
+    """Bounded ``messages`` transcript for quiz sessions (``app/agent/transcript.py``).
+
+    The seed message (the typed category) is always kept; everything older
+    than the last ``window`` messages is folded into one summary message.
+    Applied on every Redis state write and in the graph's ``messages``
+    reducer (the LangGraph checkpoint).
+    """
+
+    enabled: bool = True
+    # Most recent messages kept verbatim after the seed.
+    window: int = 8
+    # Approximate byte budget for the whole transcript; the oldest windowed
+    # messages are folded into the summary until it fits.
+    max_bytes: int = 16_384
+    # Length cap for the summary's digest of dropped messages.
+    summary_chars: int = 480
+
+    @model_validator(mode="after")
+    def _bounds(self) -> TranscriptConfig:
+        if self.window < 0:
+            raise ValueError("quiz.transcript.window must be >= 0")
+        if self.summary_chars < 0:
+            raise ValueError("quiz.transcript.summary_chars must be >= 0")
+        if self.max_bytes < 1_024:
+            raise ValueError("quiz.transcript.max_bytes must be >= 1024")
+        return self
+
+
 class QuizConfig(BaseModel):
     min_characters: int = 4
     max_characters: int = 6
@@ -150,6 +208,28 @@ class QuizConfig(BaseModel):
     # synopsis screen. Enforced in /quiz/start both on the rejected-list length
     # and via a per-(IP, topic) Redis counter; exceeding it returns a clear 429.
     max_reinterprets_per_chain: int = 3
+    # Field-level patch mode for the Redis session state (redis_cache.py). When
+    # ON, each top-level state field lives in its own hash field and merges are
+    # one Lua EVAL that validates only the changed fields — no WATCH/retry
+    # fight between the background agent and the /status poller. Legacy blob
+    # sessions are migrated on first write. Flip fleet-wide (App Config
+    # quizzical.quiz.session_state_patch_mode): blob-mode replicas never read
+    # the hash layout. Default OFF == today's single-blob behaviour.
+    session_state_patch_mode: bool = False
+    # /quiz/next admission in two Lua round trips (services/quiz_admission.py):
+    # lock + action cap + daily-spend check + state read, then answer merge +
+    # lock release. Only applies to patch-mode sessions; anything else (and
+    # any script fault) takes the sequential path.
+    next_admission_script: bool = True
+    # Upper bound on how long ``GET /quiz/status/{id}/wait`` parks a request
+    # waiting for the agent's ``quiz_status:{id}`` pub/sub notification before
+    # answering 'processing'. Keep it under the FE request timeout and any
+    # proxy idle timeout (Azure Front Door / Container Apps: 30s+).
+    status_long_poll_max_s: float = 25.0
+    # Speculative precompute of the next adaptive question (off by default).
+    speculation: SpeculativeQuestionsConfig = Field(default_factory=lambda: SpeculativeQuestionsConfig())
+    # Rolling-window + summary bound on the session's ``messages`` transcript.
+    transcript: TranscriptConfig = Field(default_factory=lambda: TranscriptConfig())
 
     @field_validator("max_characters")
     @classmethod
@@ -202,8 +282,48 @@ class QuizConfig(BaseModel):
         return v
 
 
+class AgentQueueConfig(BaseModel):
+    """Durable agent job queue + worker pool (``app/services/agent_queue.py``,
+    ``python -m app.jobs.agent_worker``).
+
+    When enabled, ``/quiz/proceed`` and ``/quiz/next`` enqueue the agent run
+    on a Redis Stream instead of running it in the API process, and the
+    recovery sweeper re-enqueues stale jobs. Off by default: turning it on
+    requires at least one worker deployment.
+    """
+
+    enabled: bool = False
+    stream: str = "agent_jobs"
+    group: str = "agent_workers"
+    # Agent runs one worker process executes at once.
+    worker_concurrency: int = 4
+    # A claimed message idle this long (its worker stopped refreshing it) is
+    # redelivered to another worker. Workers refresh at a third of this.
+    visibility_timeout_s: float = 120.0
+    # Deliveries (first + redeliveries) before a job is failed outright.
+    max_deliveries: int = 3
+    # XREADGROUP block while the worker is idle.
+    block_ms: int = 2000
+    # Approximate stream length cap (acknowledged entries are deleted).
+    maxlen: int = 10_000
+
+    @model_validator(mode="after")
+    def _bounds(self) -> AgentQueueConfig:
+        if self.worker_concurrency < 1:
+            raise ValueError("agent.queue.worker_concurrency must be >= 1")
+        if self.visibility_timeout_s < 3:
+            raise ValueError("agent.queue.visibility_timeout_s must be >= 3")
+        if self.max_deliveries < 1:
+            raise ValueError("agent.queue.max_deliveries must be >= 1")
+        if self.block_ms < 0 or self.maxlen < 100:
+            raise ValueError("agent.queue.block_ms must be >= 0 and maxlen >= 100")
+        return self
+
+
 class AgentConfig(BaseModel):
     max_retries: int = 3
+    # Durable job queue for background agent runs (off → in-process tasks).
+    queue: AgentQueueConfig = Field(default_factory=lambda: AgentQueueConfig())
 
 
 class RetryConfig(BaseModel):
@@ -336,6 +456,186 @@ class GlobalLLMConcurrencyConfig(BaseModel):
         return v
 
 
+class AdaptiveLLMConcurrencyConfig(BaseModel):
+    """§17.1 — OPTIONAL token-aware AIMD admission per provider/model.
+
+    When ``enabled``, every provider call (each retry attempt included) also
+    reserves its estimated tokens (``max_output_tokens`` + prompt size) from a
+    per-model budget that grows on fast successes and shrinks on 429s,
+    timeouts and latency blow-ups. The fixed ``llm.max_concurrency`` semaphore
+    stays the outer bound. See ``app/services/llm_adaptive_concurrency.py``.
+    """
+
+    enabled: bool = False
+    # Starting per-model budget of concurrently in-flight estimated tokens.
+    initial_tokens: int = 32_000
+    # Floor / ceiling for the adapted budget.
+    min_tokens: int = 4_000
+    max_tokens: int = 256_000
+    # Additive increase per fully used window of successes.
+    increase_tokens: int = 4_000
+    # Multiplicative cut on a 429 / timeout.
+    decrease_factor: float = 0.7
+    # Gentler cut when a success is slower than ``latency_tolerance`` × the
+    # lane's best observed seconds-per-token.
+    slow_decrease_factor: float = 0.9
+    latency_tolerance: float = 2.5
+    # At most one cut per lane per this many seconds (one burst == one signal).
+    cooldown_s: float = 2.0
+
+    @model_validator(mode="after")
+    def _bounds(self) -> AdaptiveLLMConcurrencyConfig:
+        if not (1 <= self.min_tokens <= self.initial_tokens <= self.max_tokens):
+            raise ValueError(
+                "llm.adaptive_concurrency requires 1 <= min_tokens <= initial_tokens <= max_tokens"
+            )
+        if self.increase_tokens < 1:
+            raise ValueError("llm.adaptive_concurrency.increase_tokens must be >= 1")
+        if not (0 < self.decrease_factor < 1 and 0 < self.slow_decrease_factor <= 1):
+            raise ValueError("llm.adaptive_concurrency decrease factors must be in (0, 1)")
+        if self.latency_tolerance <= 1:
+            raise ValueError("llm.adaptive_concurrency.latency_tolerance must be > 1")
+        if self.cooldown_s < 0:
+            raise ValueError("llm.adaptive_concurrency.cooldown_s must be >= 0")
+        return self
+
+
+class LLMSemanticCacheConfig(BaseModel):
+    """App-level topic-keyed cache in front of ``invoke_structured``.
+
+    Unlike ``response_cache`` (byte-exact LiteLLM payloads), this keys on the
+    normalised topic so spelling/punctuation variants of the same topic share
+    one paid result; ``semantic_threshold`` additionally serves near-duplicate
+    topics by embedding cosine. Off by default for the same variety reason
+    as ``response_cache``. See ``app/services/llm_semantic_cache.py``.
+    """
+
+    enabled: bool = False
+    namespace: str = "quizzical:llmsc"
+    # Per-tool TTL (seconds); only tools listed here are cached. Per-user
+    # adaptive tools (decision / next question / final profile) are refused.
+    tool_ttls_s: dict[str, int] = Field(
+        default_factory=lambda: {
+            "initial_planner": 86_400,
+            "profile_batch_writer": 86_400,
+            "profile_writer": 86_400,
+        }
+    )
+    # Cosine similarity for a near-duplicate topic hit (local bge-small
+    # embedder). None → exact normalised-topic hits only.
+    semantic_threshold: float | None = None
+    # Cap on topic vectors kept per (tool, prompt, model, variant) bucket.
+    max_semantic_entries: int = 256
+
+    @model_validator(mode="after")
+    def _bounds(self) -> LLMSemanticCacheConfig:
+        from app.services.llm_semantic_cache import NEVER_CACHE_TOOLS
+
+        refused = sorted(set(self.tool_ttls_s) & NEVER_CACHE_TOOLS)
+        if refused:
+            raise ValueError(f"llm.semantic_cache cannot cache per-user tools: {refused}")
+        if any(int(ttl) < 1 for ttl in self.tool_ttls_s.values()):
+            raise ValueError("llm.semantic_cache.tool_ttls_s values must be >= 1")
+        if self.semantic_threshold is not None and not (0 < self.semantic_threshold <= 1):
+            raise ValueError("llm.semantic_cache.semantic_threshold must be in (0, 1]")
+        if self.max_semantic_entries < 0:
+            raise ValueError("llm.semantic_cache.max_semantic_entries must be >= 0")
+        return self
+
+
+class LLMPriorityLanesConfig(BaseModel):
+    """§17.1 — priority lanes inside the ``llm.max_concurrency`` semaphore.
+
+    Each lane keeps ``<lane>_reserved`` slots no other lane may take; the
+    remainder of ``max_concurrency`` is shared headroom. Reservations that
+    exceed capacity are scaled down proportionally (at least one per lane when
+    capacity allows, otherwise a shared slot is kept). A waiter queued for
+    ``promote_after_s`` jumps ahead of younger higher-priority waiters, so
+    batch work is never starved. See ``app/services/llm_concurrency.py``.
+    """
+
+    # User is waiting on the response (quiz start, next question, result).
+    interactive_reserved: int = 6
+    # Post-answer agent runs and image-prompt description.
+    background_reserved: int = 3
+    # Precompute builds.
+    batch_reserved: int = 1
+    promote_after_s: float = 10.0
+
+    @model_validator(mode="after")
+    def _bounds(self) -> LLMPriorityLanesConfig:
+        if min(self.interactive_reserved, self.background_reserved, self.batch_reserved) < 0:
+            raise ValueError("llm.priority_lanes reservations must be >= 0")
+        if self.promote_after_s <= 0:
+            raise ValueError("llm.priority_lanes.promote_after_s must be > 0")
+        return self
+
+
+class LLMTransportConfig(BaseModel):
+    """Native-async provider transport (``app/services/llm_transport.py``).
+
+    One keep-alive ``httpx`` pool per provider instead of one executor
+    thread per in-flight call. Size ``max_connections`` at or above
+    ``llm.max_concurrency`` so the limiter, not the pool, is the bound.
+    """
+
+    # False → blocking ``litellm.responses`` in ``asyncio.to_thread`` (old path).
+    native_async: bool = True
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry_s: float = 30.0
+    # Providers negotiated over HTTP/2 (needs the optional ``h2`` package).
+    http2_providers: list[str] = Field(default_factory=lambda: ["openai", "anthropic"])
+
+    @model_validator(mode="after")
+    def _bounds(self) -> LLMTransportConfig:
+        if self.max_connections < 1:
+            raise ValueError("llm.transport.max_connections must be >= 1")
+        if not (0 <= self.max_keepalive_connections <= self.max_connections):
+            raise ValueError(
+                "llm.transport.max_keepalive_connections must be in [0, max_connections]"
+            )
+        if self.keepalive_expiry_s < 0:
+            raise ValueError("llm.transport.keepalive_expiry_s must be >= 0")
+        return self
+
+
+class LLMHedgingConfig(BaseModel):
+    """Hedged calls for tail-latency-critical tools (``app/services/llm_hedging.py``).
+
+    When the primary model has not answered after the ``percentile`` of its
+    recent latency for that tool, the same call is also sent to the
+    cross-provider fallback and the first valid result wins. Off by
+    default: every hedge is a second paid request. Applies only with
+    ``llm.transport.native_async`` (a threaded loser cannot be cancelled).
+    """
+
+    enabled: bool = False
+    tools: list[str] = Field(default_factory=lambda: ["initial_planner", "next_question_generator"])
+    percentile: float = 0.95
+    # Successful samples per (tool, model) before the percentile is trusted.
+    min_samples: int = 20
+    window: int = 200
+    min_delay_s: float = 1.0
+    max_delay_s: float = 20.0
+    # Hedge delay while a (tool, model) has fewer than ``min_samples``.
+    cold_delay_s: float = 8.0
+    # Process-wide cap on hedges fired in any rolling minute.
+    budget_per_minute: int = 30
+
+    @model_validator(mode="after")
+    def _bounds(self) -> LLMHedgingConfig:
+        if not (0 < self.percentile < 1):
+            raise ValueError("llm.hedging.percentile must be in (0, 1)")
+        if self.min_samples < 1 or self.window < self.min_samples:
+            raise ValueError("llm.hedging.window must be >= min_samples >= 1")
+        if not (0 < self.min_delay_s <= self.cold_delay_s <= self.max_delay_s):
+            raise ValueError("llm.hedging delays must satisfy 0 < min <= cold <= max")
+        if self.budget_per_minute < 0:
+            raise ValueError("llm.hedging.budget_per_minute must be >= 0")
+        return self
+
+
 class LLMGlobals(BaseModel):
     # Global per-call timeout used by parallel character creation (and reused by question gen).
     per_call_timeout_s: int = 30
@@ -348,6 +648,27 @@ class LLMGlobals(BaseModel):
     global_concurrency: GlobalLLMConcurrencyConfig = Field(
         default_factory=lambda: GlobalLLMConcurrencyConfig()
     )
+    # §17.1 — OPTIONAL token-aware AIMD admission per provider/model. Off by
+    # default; layered INSIDE the ``max_concurrency`` semaphore.
+    adaptive_concurrency: AdaptiveLLMConcurrencyConfig = Field(
+        default_factory=lambda: AdaptiveLLMConcurrencyConfig()
+    )
+    # Topic-keyed cache in front of ``invoke_structured`` (off by default).
+    semantic_cache: LLMSemanticCacheConfig = Field(
+        default_factory=lambda: LLMSemanticCacheConfig()
+    )
+    # Stream structured calls whose caller consumes partial results
+    # (``app/services/structured_stream.py``). False → always wait for the
+    # whole body (kill switch for providers with broken streaming).
+    stream_structured: bool = True
+    # Pooled native-async provider transport (no executor thread per call).
+    transport: LLMTransportConfig = Field(default_factory=lambda: LLMTransportConfig())
+    # Race the fallback model against a slow primary (off by default).
+    hedging: LLMHedgingConfig = Field(default_factory=lambda: LLMHedgingConfig())
+    # §17.1 — per-lane reservations / starvation guard for ``max_concurrency``.
+    priority_lanes: LLMPriorityLanesConfig = Field(
+        default_factory=lambda: LLMPriorityLanesConfig()
+    )
     # §9.7.6 — hard cap on the size of a single LLM raw response (in bytes,
     # measured against the JSON-serialised payload). Defends against a buggy
     # or compromised provider returning a multi-MB blob that would exhaust
@@ -629,6 +950,18 @@ class PrecomputeConfig(BaseModel):
     """§21 Phase 5 — image storage provider switch + rehost knobs."""
     per_question_images: bool = False
     """`AC-PRECOMP-COST-7` — opt-in per-question image generation. Default off."""
+    pack_l1_max_entries: int = 1024
+    """Per-worker in-process LRU of decoded packs in front of `tk:pack:*` /
+    `tk:hpack:*` (`pack_l1.py`). 0 disables the L1."""
+    pack_l1_ttl_s: float = 300.0
+    """L1 entry lifetime — the staleness bound if a `tk:pack:invalidate`
+    message is lost."""
+    topic_suggest_index: bool = True
+    """`/topics/suggest` answers from the per-worker prefix index over topic
+    names + aliases (`topic_suggest_index.py`) instead of a SQL `LIKE` per
+    keystroke. Off → the SQL path."""
+    topic_suggest_fuzzy: bool = False
+    """Fill free typeahead slots with one-edit (typo-tolerant) matches."""
 
 
 class ImageStorageConfig(BaseModel):
@@ -648,6 +981,22 @@ class ImageStorageConfig(BaseModel):
     cache_control: str = "public, max-age=31536000, immutable"
     """`AC-PRECOMP-IMG-3` / `AC-PRECOMP-PERF-4` — immutable browser cache
     for content-addressed assets."""
+    disk_cache_enabled: bool = True
+    """Serve `GET /api/media/{id}` from a per-worker, content-addressed file
+    cache (`app.services.media.disk_cache`) instead of copying `bytes_blob`
+    out of the DB on every hit."""
+    disk_cache_dir: str | None = None
+    """Cache root; None → `<tempdir>/quizzical-media`."""
+    disk_cache_max_mb: int = Field(default=512, ge=0)
+    """Size bound; least-recently-served files are evicted past it."""
+    derivative_widths: list[int] = Field(default_factory=lambda: [128, 256, 512])
+    """Widths (px) of the resized variants generated at rehost time
+    (`app.services.media.derivatives`); served via `/api/media/{id}?w=`.
+    128 covers the ~56 px cast thumbnails at 2× DPR."""
+    derivative_formats: list[Literal["avif", "webp"]] = Field(
+        default_factory=lambda: ["avif", "webp"]
+    )
+    derivative_quality: int = Field(default=70, ge=1, le=100)
 
 
 class ImagesConfig(BaseModel):
@@ -691,6 +1040,8 @@ class ImagesConfig(BaseModel):
     relevance_gate: "RelevanceGateConfig" = Field(
         default_factory=lambda: RelevanceGateConfig()
     )
+    # Micro-batching for the local embedder — see ``app.services.icons.embedder``.
+    embed_batch: "EmbedBatchConfig" = Field(default_factory=lambda: EmbedBatchConfig())
     # Q&A-image style suffix. The character path's ``image_gen.style_suffix``
     # says "flat illustrated PORTRAIT" — correct for character cards but wrong
     # for Q&A SCENES (objects, landscapes, creatures), where "portrait" biases
@@ -772,6 +1123,29 @@ class FalBudgetConfig(BaseModel):
         return int(round(self.cost_per_image_usd * 100_000))
 
 
+class EmbedBatchConfig(BaseModel):
+    """Micro-batching for ``icons.embedder`` (``EmbedBatcher``).
+
+    Concurrent single-string embeds are held for up to ``window_ms`` (or until
+    ``max_batch`` distinct strings are waiting) and run as ONE fastembed
+    inference on a dedicated pool of ``workers`` threads. ``window_ms=0``
+    still batches whatever arrived in the same event-loop tick."""
+
+    max_batch: int = 32
+    window_ms: float = 5.0
+    workers: int = 1
+
+    @model_validator(mode="after")
+    def _bounds(self) -> EmbedBatchConfig:
+        if self.max_batch < 1:
+            raise ValueError("images.embed_batch.max_batch must be >= 1")
+        if self.window_ms < 0:
+            raise ValueError("images.embed_batch.window_ms must be >= 0")
+        if self.workers < 1:
+            raise ValueError("images.embed_batch.workers must be >= 1")
+        return self
+
+
 class RelevanceGateConfig(BaseModel):
     """Per-string relevance gate for same-universe Q&A generation.
 
@@ -838,6 +1212,39 @@ class RelevanceGateConfig(BaseModel):
         return float(v)
 
 
+class ImageLivenessConfig(BaseModel):
+    """Cached-URL liveness checks (``app/services/image_liveness.py``).
+
+    ``generate_character_images`` reuses a character's stored image when it
+    is still served. Results are shared across workers in Redis; the
+    negative TTL is short so a recovered CDN object is picked up again.
+    """
+
+    # False → every lookup goes to the (pooled) HEAD probe.
+    cache_enabled: bool = True
+    namespace: str = "imgalive"
+    alive_ttl_s: int = 6 * 3600
+    dead_ttl_s: int = 600
+    timeout_s: float = 3.0
+    max_connections_per_host: int = 8
+    keepalive_expiry_s: float = 30.0
+    # URLs we serve ourselves resolve alive without a network call. The blob
+    # container URL (``media_storage.blob``) is added when configured.
+    local_url_prefixes: list[str] = Field(
+        default_factory=lambda: ["/api/v1/media/", "/api/media/"]
+    )
+
+    @model_validator(mode="after")
+    def _bounds(self) -> ImageLivenessConfig:
+        if self.alive_ttl_s < 0 or self.dead_ttl_s < 0:
+            raise ValueError("image_gen.liveness TTLs must be >= 0")
+        if self.timeout_s <= 0:
+            raise ValueError("image_gen.liveness.timeout_s must be > 0")
+        if self.max_connections_per_host < 1:
+            raise ValueError("image_gen.liveness.max_connections_per_host must be >= 1")
+        return self
+
+
 class ImageGenSettings(BaseModel):
     """FAL image generation (§7.8). Speed > fidelity; non-blocking.
 
@@ -895,6 +1302,8 @@ class ImageGenSettings(BaseModel):
     retry: RetryConfig = Field(
         default_factory=lambda: RetryConfig(max_attempts=2, base_ms=200, cap_ms=1500)
     )
+    # Redis-cached, pooled HEAD probes for reusing stored character images.
+    liveness: ImageLivenessConfig = Field(default_factory=lambda: ImageLivenessConfig())
 
 
 class Settings(BaseModel):
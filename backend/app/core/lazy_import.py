@@ -0,0 +1,61 @@
+"""Deferred imports for heavy optional integrations.
+
+`scripts/profile_startup.py` showed optional clients (FAL, Wikipedia) being
+imported by ``app.main`` although most workers never touch them before the
+first request that needs them. `LazyModule` keeps the module-attribute shape
+callers and tests rely on (``image_service.fal_client.subscribe_async``,
+``monkeypatch.setattr(svc.fal_client, ...)``) while the real import happens
+on first attribute access.
+"""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """Stand-in for module ``name``; imports it on first attribute access.
+
+    Attribute reads, writes and deletes are forwarded to the real module, so
+    monkeypatching through the stand-in patches the module itself. Import
+    errors surface at that first access, not at import time.
+    """
+
+    __slots__ = ("_module", "_name")
+
+    def __init__(self, name: str) -> None:
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def _load(self) -> ModuleType:
+        mod = self._module
+        if mod is None:
+            mod = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", mod)
+        return mod
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a `LazyModule` for ``name`` (see the module docstring)."""
+    return LazyModule(name)
+
+
+__all__ = ["LazyModule", "lazy_module"]
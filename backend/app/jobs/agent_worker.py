@@ -0,0 +1,310 @@
+"""Dedicated agent worker (``python -m app.jobs.agent_worker``).
+
+Consumes the ``agent.queue`` Redis Stream (see ``app.services.agent_queue``)
+so LangGraph runs happen outside the API pods. Any number of worker
+processes may join the same consumer group; each runs at most
+``worker_concurrency`` jobs at a time, claims only as many messages as it
+has free slots, and refreshes the visibility of every running job so a
+long run is never handed to a second worker. A job whose run ends
+retryable (``quiz_jobs`` still ``running``) is re-queued straight away; a
+message redelivered past ``max_deliveries`` is marked failed and dropped.
+
+On SIGTERM/SIGINT the worker stops claiming, waits up to
+``shutdown_grace_s`` for running jobs, then closes its resources. Jobs it
+could not finish stay pending and are reclaimed by another worker once
+their visibility timeout lapses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+
+from app.services.agent_queue import AgentJob, AgentJobQueue
+
+logger = structlog.get_logger(__name__)
+
+# ``run_job`` returns True when the run ended retryable and should be re-queued.
+RunJob = Callable[[AgentJob], Awaitable[bool]]
+OnExhausted = Callable[[AgentJob], Awaitable[None]]
+
+
+def default_consumer_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class AgentWorker:
+    """Claim → run → ack loop over one ``AgentJobQueue``."""
+
+    def __init__(
+        self,
+        queue: AgentJobQueue,
+        *,
+        run_job: RunJob,
+        on_exhausted: OnExhausted | None = None,
+        consumer: str | None = None,
+        concurrency: int = 4,
+        block_ms: int = 2000,
+        max_attempts: int | None = None,
+    ) -> None:
+        self.queue = queue
+        self.run_job = run_job
+        self.on_exhausted = on_exhausted
+        self.consumer = consumer or default_consumer_name()
+        self.concurrency = max(1, int(concurrency))
+        self.block_ms = max(0, int(block_ms))
+        self.max_attempts = int(max_attempts or queue.max_deliveries)
+        self._active: set[asyncio.Task] = set()
+        self._slot_freed = asyncio.Event()
+        self._stats = {
+            "processed": 0,
+            "retried": 0,
+            "reclaimed": 0,
+            "dead_lettered": 0,
+            "failed": 0,
+            "peak_in_flight": 0,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._active)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until ``stop`` is set (running jobs are left to ``drain``)."""
+        logger.info("agent_worker.started", consumer=self.consumer, concurrency=self.concurrency)
+        while not stop.is_set():
+            free = self.concurrency - self.in_flight
+            if free <= 0:
+                self._slot_freed.clear()
+                await self._wait_any(stop, self._slot_freed)
+                continue
+            try:
+                jobs = await self.queue.claim(self.consumer, free, block_ms=self.block_ms)
+            except Exception:
+                logger.warning("agent_worker.claim_failed", exc_info=True)
+                await self._wait_any(stop, timeout=1.0)
+                continue
+            for job in jobs:
+                self._spawn(job)
+            if not jobs and not self.block_ms:
+                await self._wait_any(stop, timeout=0.05)
+
+    async def drain(self, grace_s: float) -> int:
+        """Wait up to ``grace_s`` for running jobs; returns how many are left."""
+        if self._active:
+            await asyncio.wait(set(self._active), timeout=max(0.0, float(grace_s)))
+        for task in list(self._active):
+            task.cancel()
+        return len(self._active)
+
+    def _spawn(self, job: AgentJob) -> None:
+        task = asyncio.create_task(self._process(job), name=f"agent-job:{job.quiz_id}")
+        self._active.add(task)
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self.in_flight)
+
+        def _done(t: asyncio.Task) -> None:
+            self._active.discard(t)
+            self._slot_freed.set()
+
+        task.add_done_callback(_done)
+
+    async def _process(self, job: AgentJob) -> None:
+        log = logger.bind(quiz_id=str(job.quiz_id), reason=job.reason, attempt=job.attempt)
+        if job.deliveries > 1:
+            self._stats["reclaimed"] += 1
+        if job.exhausted:
+            await self._dead_letter(job, log)
+            return
+        keepalive = asyncio.create_task(self._keep_visible(job))
+        started = time.perf_counter()
+        try:
+            retry = await self.run_job(job)
+        except asyncio.CancelledError:
+            # Shutdown: leave the message pending for another worker.
+            raise
+        except Exception:
+            log.warning("agent_worker.job_error", exc_info=True)
+            retry = True
+        finally:
+            keepalive.cancel()
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        try:
+            if retry and job.attempt < self.max_attempts:
+                self._stats["retried"] += 1
+                await self.queue.retry(job)
+                log.info("agent_worker.job_retried", duration_ms=elapsed_ms)
+            elif retry:
+                await self._dead_letter(job, log)
+            else:
+                self._stats["processed"] += 1
+                await self.queue.ack(job)
+                log.info("agent_worker.job_done", duration_ms=elapsed_ms)
+        except Exception:
+            # Unacked: the message is redelivered after the visibility timeout.
+            log.warning("agent_worker.ack_failed", exc_info=True)
+
+    async def _dead_letter(self, job: AgentJob, log: Any) -> None:
+        self._stats["dead_lettered"] += 1
+        log.warning("agent_worker.job_exhausted", deliveries=job.deliveries)
+        if self.on_exhausted is not None:
+            try:
+                await self.on_exhausted(job)
+            except Exception:
+                self._stats["failed"] += 1
+                log.warning("agent_worker.on_exhausted_failed", exc_info=True)
+        try:
+            await self.queue.ack(job)
+        except Exception:
+            log.warning("agent_worker.ack_failed", exc_info=True)
+
+    async def _keep_visible(self, job: AgentJob) -> None:
+        interval = max(0.05, self.queue.visibility_timeout_s / 3.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.touch(job, self.consumer)
+            except Exception:
+                logger.debug("agent_worker.touch_failed", quiz_id=str(job.quiz_id))
+
+    @staticmethod
+    async def _wait_any(stop: asyncio.Event, other: asyncio.Event | None = None, *, timeout: float | None = None) -> None:
+        waiters = [asyncio.create_task(stop.wait())]
+        if other is not None:
+            waiters.append(asyncio.create_task(other.wait()))
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for w in waiters:
+                w.cancel()
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "consumer": self.consumer,
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Production job runner + entry point
+# ---------------------------------------------------------------------------
+
+async def _job_status(quiz_id: uuid.UUID) -> str | None:
+    from app.api import dependencies as deps
+    from app.services.database import QuizJobRepository
+
+    factory = deps.async_session_factory
+    if factory is None:
+        return None
+    async with factory() as db:
+        return await QuizJobRepository(db).get_status(quiz_id)
+
+
+def make_agent_runner(agent_graph: Any, redis_client: Any) -> RunJob:
+    """``run_job`` that runs the real agent; retryable when the durable row
+    is still ``running`` afterwards (``_finalize_durable_job`` left it for a
+    retry)."""
+    from app.services.agent_recovery import run_agent_job
+
+    async def _run(job: AgentJob) -> bool:
+        await run_agent_job(job.quiz_id, agent_graph, redis_client)
+        try:
+            return await _job_status(job.quiz_id) == "running"
+        except Exception:
+            logger.debug("agent_worker.status_probe_failed", quiz_id=str(job.quiz_id))
+            return False
+
+    return _run
+
+
+async def _fail_exhausted_job(job: AgentJob) -> None:
+    from app.api.endpoints.quiz import _quiz_job_update
+
+    await _quiz_job_update(
+        job.quiz_id, "failed", error=f"agent queue: {job.deliveries} deliveries exhausted"
+    )
+
+
+async def _close_resources(agent_graph: Any) -> None:
+    from app.agent.graph import aclose_agent_graph
+    from app.api.dependencies import close_db_engine, close_redis_pool
+    from app.services.llm_transport import close_llm_transport
+
+    for name, closer in (
+        ("agent_graph", lambda: aclose_agent_graph(agent_graph) if agent_graph is not None else None),
+        ("llm_transport", close_llm_transport),
+        ("db", close_db_engine),
+        ("redis", close_redis_pool),
+    ):
+        try:
+            result = closer()
+            if result is not None:
+                await result
+        except Exception:
+            logger.warning("agent_worker.close_failed", resource=name, exc_info=True)
+
+
+async def serve() -> None:
+    from app.agent.graph import create_agent_graph
+    from app.api import dependencies as deps
+    from app.core.config import settings
+    from app.main import _init_db, _init_llm_cache, _init_redis
+    from app.services.agent_queue import get_agent_queue
+
+    env = (settings.APP_ENVIRONMENT or "local").lower()
+    _init_db(logger, env)
+    _init_redis(logger, env)
+    _init_llm_cache(logger, env)
+    redis_client = deps.get_redis_client()
+    queue = get_agent_queue(redis_client)
+    if queue is None:
+        logger.error("agent_worker.queue_disabled", hint="set agent.queue.enabled")
+        await _close_resources(None)
+        return
+
+    agent_graph = await create_agent_graph()
+    cfg = settings.agent.queue
+    worker = AgentWorker(
+        queue,
+        run_job=make_agent_runner(agent_graph, redis_client),
+        on_exhausted=_fail_exhausted_job,
+        concurrency=cfg.worker_concurrency,
+        block_ms=cfg.block_ms,
+    )
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await worker.run(stop)
+    finally:
+        grace_s = float(getattr(settings, "shutdown_grace_s", 15.0) or 0.0)
+        left = await worker.drain(grace_s)
+        logger.info("agent_worker.stopped", left_pending=left, **worker.metrics())
+        await _close_resources(agent_graph)
+
+
+def main() -> None:
+    from app.core.logging_config import configure_logging
+
+    configure_logging()
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["AgentWorker", "default_consumer_name", "make_agent_runner", "serve", "main"]
@@ -205,6 +205,23 @@ async def _cancel_task_quietly(task: Any) -> None:
         pass
 
 
+async def _close_http_pools(logger: Any) -> None:
+    """Close the long-lived outbound HTTP pools (LLM providers, image CDN probes)."""
+    try:
+        from app.services.image_liveness import close_liveness_prober
+
+        await close_liveness_prober()
+    except Exception as e:
+        logger.warning("Image liveness prober close failed", error=str(e), exc_info=True)
+
+    try:
+        from app.services.llm_transport import close_llm_transport
+
+        await close_llm_transport()
+    except Exception as e:
+        logger.warning("LLM transport close failed", error=str(e), exc_info=True)
+
+
 async def _shutdown_resources(app: FastAPI, logger: Any) -> None:
     """Teardown resources gracefully."""
     logger.info("--- Application Shutting Down ---")
@@ -216,6 +233,21 @@ async def _shutdown_resources(app: FastAPI, logger: Any) -> None:
     # Cancel the cold-start pre-warm task if it's still running (Hitlist #15).
     await _cancel_task_quietly(getattr(app.state, "llm_warmup_task", None))
 
+    # Release parked /quiz/status/{id}/wait long-polls and drop the shared
+    # pub/sub connection before the Redis pool goes away.
+    try:
+        from app.services.quiz_status_notifier import get_quiz_status_notifier
+
+        await get_quiz_status_notifier().aclose()
+    except Exception as e:
+        logger.warning("Quiz status notifier close failed", error=str(e), exc_info=True)
+    try:
+        from app.services.precompute.pack_l1 import get_pack_l1
+
+        await get_pack_l1().aclose()
+    except Exception as e:
+        logger.warning("Pack L1 close failed", error=str(e), exc_info=True)
+
     # §17.2 (AC-SCALE-SHUTDOWN-1..3) — wait briefly for in-flight LLM/agent
     # work so partial DB/Redis writes can finish before we dispose of pools.
     try:
@@ -241,6 +273,8 @@ async def _shutdown_resources(app: FastAPI, logger: Any) -> None:
     except Exception as e:
         logger.warning("shutdown.drain_failed", error=str(e), exc_info=True)
 
+    await _close_http_pools(logger)
+
     # Close agent graph resources
     try:
         graph = getattr(app.state, "agent_graph", None)
@@ -323,6 +357,17 @@ async def lifespan(app: FastAPI):
     _init_llm_cache(logger, env)
     await _init_agent_graph(app, logger, env)
 
+    # Canonical-set lookups (prebuilt artifact via CANONICAL_INDEX_PATH, else
+    # compiled in-process) are loaded before the worker takes traffic, so the
+    # first /quiz/start after a deploy or scale-out does not pay for them.
+    # Fail-open: on error they are built lazily on first use, as before.
+    try:
+        from app.agent.canonical_sets import warm_up as _canonical_warm_up
+
+        await asyncio.to_thread(_canonical_warm_up)
+    except Exception as e:
+        logger.debug("canonical_sets.warm_up_failed", error=str(e))
+
     # Hitlist #15 — cold-start pre-warm. LiteLLM does a one-time, CPU-bound lazy
     # init (cost-map load + tokenizer) on its FIRST model call; running it on the
     # request worker is what let a cold /quiz/start pin the only worker. Kick it
@@ -0,0 +1,269 @@
+"""Durable agent job queue on a Redis Stream (``agent.queue``).
+
+With the queue off (default) ``/quiz/proceed`` and ``/quiz/next`` run the
+agent in the API process via FastAPI ``BackgroundTasks``: long LangGraph
+runs share the request event loop and die with the pod, leaving
+``agent_recovery`` to rediscover them minutes later. With it on, the API
+only enqueues and the dedicated worker (``python -m app.jobs.agent_worker``) runs them.
+
+Stream semantics:
+
+  * **Enqueue** — ``XADD`` of ``{quiz_id, reason, attempt}`` plus a
+    per-quiz marker (``SET NX``, holding the message id; one Lua call) so a
+    quiz is queued at most once; the sweeper re-enqueueing a job still
+    waiting in the backlog is a no-op. The marker only covers jobs nobody
+    has started: ``claim`` clears it as it hands the message out, so an
+    answer that lands while a run is in flight queues a fresh run.
+  * **Claim** — one consumer group shared by every worker (horizontal
+    scaling): ``XAUTOCLAIM`` first takes messages idle for longer than
+    ``visibility_timeout_s`` (their worker died), then ``XREADGROUP`` takes
+    new ones, never more than the caller's free slots.
+  * **Visibility** — a worker refreshes each running message (``XCLAIM``
+    to itself) well inside the timeout, so a live long run is never
+    handed to a second worker.
+  * **Retry / dead-letter** — ``retry()`` re-adds the job with
+    ``attempt + 1`` immediately; a message delivered more than
+    ``max_deliveries`` times is returned flagged ``exhausted`` for the
+    worker to fail and ``ack()``.
+
+The ``quiz_jobs`` row stays the durable record: the API still writes it
+before enqueueing, and the recovery sweeper re-enqueues stale rows instead
+of running them itself when the queue is on.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_MARKER_PREFIX = "agent_job:"
+
+# KEYS[1] = marker, KEYS[2] = stream
+# ARGV = ttl_s, maxlen, then field/value pairs
+# Returns the new message id, or false when the quiz is already queued.
+_ENQUEUE_LUA = """
+if not redis.call('SET', KEYS[1], '', 'NX', 'EX', tonumber(ARGV[1])) then
+  return false
+end
+local id = redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], '*', unpack(ARGV, 3))
+redis.call('SET', KEYS[1], id, 'KEEPTTL')
+return id
+"""
+
+# KEYS[1] = marker, ARGV[1] = message id. Deletes the marker only while it
+# still points at that message (a newer queued job keeps its own).
+_RELEASE_MARKER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class AgentJob:
+    message_id: str
+    quiz_id: uuid.UUID
+    reason: str
+    attempt: int
+    deliveries: int = 1
+    exhausted: bool = False
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+class AgentJobQueue:
+    """Consumer-group queue of quiz agent runs."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        stream: str = "agent_jobs",
+        group: str = "agent_workers",
+        visibility_timeout_s: float = 120.0,
+        max_deliveries: int = 3,
+        maxlen: int = 10_000,
+    ) -> None:
+        self.client = client
+        self.stream = stream
+        self.group = group
+        self.visibility_timeout_s = float(visibility_timeout_s)
+        self.max_deliveries = int(max_deliveries)
+        self.maxlen = int(maxlen)
+        self._group_ready = False
+
+    def _marker(self, quiz_id: uuid.UUID | str) -> str:
+        return f"{_MARKER_PREFIX}{quiz_id}"
+
+    @property
+    def _marker_ttl_s(self) -> int:
+        # Long enough to cover every redelivery of a queued job.
+        return int(self.visibility_timeout_s * (self.max_deliveries + 1)) + 60
+
+    async def ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def enqueue(
+        self, quiz_id: uuid.UUID | str, *, reason: str, attempt: int = 1
+    ) -> str | None:
+        """Queue one agent run; None when the quiz already has one waiting
+        that no worker has started."""
+        await self.ensure_group()
+        message_id = await self.client.eval(
+            _ENQUEUE_LUA,
+            2,
+            self._marker(quiz_id),
+            self.stream,
+            self._marker_ttl_s,
+            self.maxlen,
+            "quiz_id", str(quiz_id),
+            "reason", reason,
+            "attempt", str(int(attempt)),
+            "enqueued_at", f"{time.time():.3f}",
+        )
+        if not message_id:
+            logger.info("agent_queue.enqueue.deduped", quiz_id=str(quiz_id), reason=reason)
+            return None
+        logger.info("agent_queue.enqueued", quiz_id=str(quiz_id), reason=reason, attempt=attempt)
+        return _text(message_id)
+
+    async def _release_marker(self, job: AgentJob) -> None:
+        await self.client.eval(_RELEASE_MARKER_LUA, 1, self._marker(job.quiz_id), job.message_id)
+
+    def _job(self, message_id: Any, fields: dict[Any, Any], deliveries: int = 1) -> AgentJob | None:
+        data = {_text(k): _text(v) for k, v in (fields or {}).items()}
+        try:
+            quiz_id = uuid.UUID(data["quiz_id"])
+        except (KeyError, ValueError):
+            logger.warning("agent_queue.malformed_message", message_id=_text(message_id))
+            return None
+        return AgentJob(
+            message_id=_text(message_id),
+            quiz_id=quiz_id,
+            reason=data.get("reason", ""),
+            attempt=int(data.get("attempt") or 1),
+            deliveries=deliveries,
+            exhausted=deliveries > self.max_deliveries,
+        )
+
+    async def _deliveries(self, message_id: str) -> int:
+        rows = await self.client.xpending_range(
+            self.stream, self.group, min=message_id, max=message_id, count=1
+        )
+        return int(rows[0]["times_delivered"]) if rows else 1
+
+    async def claim(self, consumer: str, count: int, *, block_ms: int = 0) -> list[AgentJob]:
+        """Up to ``count`` jobs: timed-out messages first, then new ones."""
+        if count <= 0:
+            return []
+        await self.ensure_group()
+        jobs: list[AgentJob] = []
+        dropped: list[str] = []
+        _cursor, reclaimed, *_ = await self.client.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=int(self.visibility_timeout_s * 1000),
+            start_id="0-0",
+            count=count,
+        )
+        for message_id, fields in reclaimed:
+            job = self._job(message_id, fields, await self._deliveries(_text(message_id)))
+            if job is None:
+                dropped.append(_text(message_id))
+                continue
+            logger.info(
+                "agent_queue.reclaimed", quiz_id=str(job.quiz_id), deliveries=job.deliveries
+            )
+            jobs.append(job)
+        if len(jobs) < count:
+            resp = await self.client.xreadgroup(
+                self.group,
+                consumer,
+                {self.stream: ">"},
+                count=count - len(jobs),
+                block=block_ms if not jobs and block_ms > 0 else None,
+            )
+            for _stream, messages in resp or []:
+                for message_id, fields in messages:
+                    job = self._job(message_id, fields)
+                    if job is None:
+                        dropped.append(_text(message_id))
+                    else:
+                        jobs.append(job)
+        if dropped:
+            await self.client.xack(self.stream, self.group, *dropped)
+            await self.client.xdel(self.stream, *dropped)
+        # Started jobs no longer dedupe: an enqueue from here on must queue a
+        # new run, or an answer recorded during this run's tail would be lost.
+        for job in jobs:
+            await self._release_marker(job)
+        return jobs
+
+    async def touch(self, job: AgentJob, consumer: str) -> None:
+        """Reset the message's idle time so it stays invisible to other workers."""
+        await self.client.xclaim(
+            self.stream, self.group, consumer, min_idle_time=0,
+            message_ids=[job.message_id], justid=True,
+        )
+
+    async def ack(self, job: AgentJob) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, job.message_id)
+            pipe.xdel(self.stream, job.message_id)
+            await pipe.execute()
+        await self._release_marker(job)
+
+    async def retry(self, job: AgentJob, *, reason: str = "retry") -> str | None:
+        """Re-queue ``job`` now with ``attempt + 1`` (replaces the message)."""
+        await self.ack(job)
+        return await self.enqueue(job.quiz_id, reason=reason, attempt=job.attempt + 1)
+
+    async def metrics(self) -> dict[str, Any]:
+        await self.ensure_group()
+        summary = await self.client.xpending(self.stream, self.group)
+        return {
+            "stream": self.stream,
+            "depth": int(await self.client.xlen(self.stream)),
+            "pending": int((summary or {}).get("pending") or 0),
+        }
+
+
+def get_agent_queue(client: Any) -> AgentJobQueue | None:
+    """A queue over ``client`` per ``agent.queue``, or None when it is off."""
+    try:
+        from app.core.config import settings
+
+        cfg = getattr(getattr(settings, "agent", None), "queue", None)
+        if client is None or cfg is None or not bool(getattr(cfg, "enabled", False)):
+            return None
+        return AgentJobQueue(
+            client,
+            stream=cfg.stream,
+            group=cfg.group,
+            visibility_timeout_s=cfg.visibility_timeout_s,
+            max_deliveries=cfg.max_deliveries,
+            maxlen=cfg.maxlen,
+        )
+    except Exception:
+        logger.warning("agent_queue.config_invalid", exc_info=True)
+        return None
+
+
+__all__ = ["AgentJob", "AgentJobQueue", "get_agent_queue"]
@@ -1,9 +1,10 @@
 """Crash-recovery sweeper for stalled live agent jobs (``quiz_jobs``).
 
-Agent work runs in-process via FastAPI BackgroundTasks. A web-process death
-(deploy / OOM / Container Apps scale-in) kills the in-flight run, leaving its
-``quiz_jobs`` row ``running`` with a stale heartbeat — and the user's quiz stuck
-``processing`` forever. This sweeper re-runs those jobs, resuming from the
+Agent work runs in-process via FastAPI BackgroundTasks (or in the worker pool
+when ``agent.queue`` is on — see ``agent_queue.py``). A process death (deploy
+/ OOM / Container Apps scale-in) kills the in-flight run, leaving its
+``quiz_jobs`` row ``running`` with a stale heartbeat — and the user's quiz
+stuck ``processing`` forever. This sweeper re-runs those jobs, resuming from the
 Redis live state (or rebuilding from the durable Postgres snapshot if Redis is
 also gone), so the quiz completes. The DB-level atomic claim makes the sweep
 safe across multiple replicas.
@@ -126,6 +127,15 @@ async def _recover_one(quiz_id, agent_graph, redis_client) -> None:  # noqa: C90
     await run_agent_in_background(state, redis_client, agent_graph)
 
 
+async def run_agent_job(quiz_id, agent_graph, redis_client) -> None:
+    """Run the agent once for ``quiz_id`` from its stored state.
+
+    The same load (Redis → Postgres) + already-final short-circuit the sweeper
+    uses; the queue worker (``app/jobs/agent_worker.py``) runs every job through it.
+    """
+    await _recover_one(quiz_id, agent_graph, redis_client)
+
+
 async def sweep_once(app) -> int:
     """Recover up to ``batch`` stalled jobs. Returns the number claimed."""
     from app.api import dependencies as deps
@@ -162,9 +172,17 @@ async def sweep_once(app) -> int:
         logger.warning("agent_recovery.no_redis", exc_info=True)
         return 0
 
+    # With the agent queue on, recovered jobs go to the worker pool like any
+    # other run (a job still waiting in the queue is deduped there).
+    from app.services.agent_queue import get_agent_queue
+
+    queue = get_agent_queue(redis_client)
     for qid in claimed:
         try:
-            await _recover_one(qid, agent_graph, redis_client)
+            if queue is not None:
+                await queue.enqueue(qid, reason="recovery")
+            else:
+                await _recover_one(qid, agent_graph, redis_client)
         except Exception:
             logger.warning("agent_recovery.rerun_failed", quiz_id=str(qid), exc_info=True)
     return len(claimed)
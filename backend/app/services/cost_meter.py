@@ -17,6 +17,10 @@ module closes that gap:
   legacy fallback when a caller passes no model/size.
 * :func:`read_daily_cents` is read by ``_enforce_global_daily_cost_ceiling`` to
   trip a DOLLAR breaker (``security.live_cost_guard.daily_budget_usd``).
+* :func:`spend_bucket` tags LLM spend made inside a block (e.g. speculative
+  question precompute) so it ALSO accrues to a per-bucket daily counter
+  (:func:`bucket_cents_key`) and carries ``bucket=`` on its log line. Bucketed
+  spend still counts toward the aggregate counter above.
 
 Hard contract — FAIL OPEN:
   Cost capture is best-effort instrumentation. A ``litellm.completion_cost``
@@ -27,6 +31,9 @@ Hard contract — FAIL OPEN:
 """
 from __future__ import annotations
 
+import contextlib
+from collections.abc import Iterator
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from typing import Any
 
@@ -42,13 +49,39 @@ logger = structlog.get_logger(__name__)
 _DAILY_TTL_S = 90_000
 
 
+_BUCKET: ContextVar[str | None] = ContextVar("cost_meter_bucket", default=None)
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+
 def daily_cents_key(day: str | None = None) -> str:
     """Redis key for the UTC-dated aggregate live-spend cents counter."""
     if day is None:
-        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        day = _utc_day()
     return f"live_spend:cents:{day}"
 
 
+def bucket_cents_key(bucket: str, day: str | None = None) -> str:
+    """Redis key for one spend bucket's UTC-dated cents counter."""
+    return f"live_spend:bucket:{bucket}:cents:{day or _utc_day()}"
+
+
+def current_spend_bucket() -> str | None:
+    return _BUCKET.get()
+
+
+@contextlib.contextmanager
+def spend_bucket(name: str) -> Iterator[None]:
+    """Meter LLM spend made inside the block (and tasks spawned in it) to ``name`` too."""
+    token = _BUCKET.set(name)
+    try:
+        yield
+    finally:
+        _BUCKET.reset(token)
+
+
 def _extract_usage(resp: Any) -> dict[str, int]:
     """Pull token counts off a LiteLLM response (dict or SDK object). Never raises."""
     out = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
@@ -108,9 +141,11 @@ def _get_redis_for_metering() -> Any | None:
         return None
 
 
-async def record_cents(redis_client: Any, cents: int) -> int | None:
+async def record_cents(redis_client: Any, cents: int, *, key: str | None = None) -> int | None:
     """INCRBY the UTC-dated daily cents counter. Fail-open (returns None on error).
 
+    ``key`` overrides the aggregate counter (per-bucket counters).
+
     The ~25h TTL is set ATOMICALLY with the INCRBY (review item C): on a real
     Redis client we issue ``INCRBY`` + ``EXPIRE`` in a single pipeline so the key
     can never persist TTL-less if the process dies (or EXPIRE faults) between the
@@ -123,7 +158,7 @@ async def record_cents(redis_client: Any, cents: int) -> int | None:
     """
     if redis_client is None or cents <= 0:
         return None
-    key = daily_cents_key()
+    key = key or daily_cents_key()
     delta = int(cents)
 
     # Preferred path — atomic INCRBY + EXPIRE in one pipeline (no TTL-less gap).
@@ -164,12 +199,12 @@ async def record_cents(redis_client: Any, cents: int) -> int | None:
         return None
 
 
-async def read_daily_cents(redis_client: Any) -> int | None:
-    """Read the current UTC-day aggregate spend, in cents. Fail-open (None on error)."""
+async def read_daily_cents(redis_client: Any, *, bucket: str | None = None) -> int | None:
+    """Read the current UTC-day aggregate (or ``bucket``) spend, in cents. Fail-open (None on error)."""
     if redis_client is None:
         return None
     try:
-        raw = await redis_client.get(daily_cents_key())
+        raw = await redis_client.get(bucket_cents_key(bucket) if bucket else daily_cents_key())
         if raw is None:
             return 0
         return int(raw)
@@ -280,6 +315,22 @@ def _usd_to_cents(usd: float) -> int:
         return 0
 
 
+def _bucket_log_fields() -> dict[str, str]:
+    bucket = _BUCKET.get()
+    return {"bucket": bucket} if bucket else {}
+
+
+async def _record_metered_cents(cents: int) -> None:
+    """Aggregate counter, plus the active spend bucket's counter when set."""
+    if cents <= 0:
+        return
+    redis_client = _get_redis_for_metering()
+    await record_cents(redis_client, cents)
+    bucket = _BUCKET.get()
+    if bucket:
+        await record_cents(redis_client, cents, key=bucket_cents_key(bucket))
+
+
 async def record_llm_cost(
     resp: Any,
     *,
@@ -310,15 +361,56 @@ async def record_llm_cost(
             total_tokens=usage["total_tokens"],
             cost_usd=round(usd, 6) if usd is not None else None,
             cents=cents,
+            **_bucket_log_fields(),
         )
-        if cents > 0:
-            redis_client = _get_redis_for_metering()
-            await record_cents(redis_client, cents)
+        await _record_metered_cents(cents)
     except Exception:
         # Instrumentation must never break the LLM path.
         logger.debug("cost_meter.record_llm_cost.fail", exc_info=True)
 
 
+async def record_abandoned_llm_call(
+    *,
+    model: str,
+    prompt_tokens: int,
+    tool: str | None,
+    trace_id: str | None,
+    session_id: str | None,
+) -> None:
+    """Charge a request cancelled in flight (e.g. a losing hedge) its input.
+
+    No response → no ``usage``; providers still bill the prompt once it was
+    sent, so the estimated prompt tokens are priced at the model's input
+    rate. Same fail-open contract as :func:`record_llm_cost`.
+    """
+    try:
+        usd: float | None
+        try:
+            usd = float(
+                litellm.cost_per_token(model=model, prompt_tokens=int(prompt_tokens), completion_tokens=0)[0]
+            )
+        except Exception:
+            usd = None
+        cents = _usd_to_cents(usd) if usd is not None else 0
+        logger.info(
+            "llm.cost.recorded",
+            model=model,
+            tool=tool,
+            trace_id=trace_id,
+            session_id=session_id,
+            input_tokens=int(prompt_tokens),
+            output_tokens=0,
+            total_tokens=int(prompt_tokens),
+            cost_usd=round(usd, 6) if usd is not None else None,
+            cents=cents,
+            abandoned=True,
+            **_bucket_log_fields(),
+        )
+        await _record_metered_cents(cents)
+    except Exception:
+        logger.debug("cost_meter.record_abandoned_llm_call.fail", exc_info=True)
+
+
 async def record_fal_image_cost(
     n_images: int,
     *,
@@ -24,13 +24,25 @@ Contract:
 The CPU-bound embed is bridged off the event loop via ``run_in_executor`` so it
 never blocks FastAPI's async stack — the same pattern used to bridge a sync
 sentence-transformer into async code.
+
+MICRO-BATCHING: concurrent ``embed_one`` / ``raw_embed`` calls are not run one
+ONNX inference each. ``EmbedBatcher`` collects them for up to ``window_ms`` or
+``max_batch`` texts, runs ONE ``embed_many_sync`` on a dedicated bounded thread
+pool (``images.embed_batch.workers`` threads, never the default executor) and
+fans each vector back to its waiter. Results land in the ``_cached`` LRU, so a
+repeated string never reaches the model twice. Callers that ``gather`` their
+embeds (``RelevanceGate``, the icon binder walk) get batching for free.
 """
 
 from __future__ import annotations
 
 import asyncio
-import functools
 import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
 
 MODEL_NAME = "BAAI/bge-small-en-v1.5"
 DIM = 384
@@ -79,20 +91,177 @@ def embed_many_sync(texts: list[str]) -> list[list[float]]:
     return [_normalize(vec) for vec in model.embed(texts)]
 
 
-@functools.lru_cache(maxsize=8192)
-def _cached(text: str) -> tuple[float, ...]:
-    return tuple(embed_one_sync(text))
+class _LRU:
+    """Bounded ``text -> vector`` LRU. Only touched from the event loop thread
+    (lookups in ``embed_one``, inserts when a batch resolves)."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+
+    def get(self, text: str) -> tuple[float, ...] | None:
+        vec = self._data.get(text)
+        if vec is not None:
+            self._data.move_to_end(text)
+        return vec
+
+    def put(self, text: str, vec: list[float] | tuple[float, ...]) -> None:
+        self._data[text] = tuple(vec)
+        self._data.move_to_end(text)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def cache_clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_cached = _LRU(maxsize=8192)
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    batches: int = 0
+    items: int = 0
+    max_batch_seen: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+        }
+
+
+class EmbedBatcher:
+    """Coalesce concurrent single-text embeds into batched inferences.
+
+    Bound to the event loop it is first used on. ``embed_many`` is the sync
+    batch primitive (``embed_many_sync`` in production, a fake in tests); it
+    runs on this batcher's own ``ThreadPoolExecutor`` so a burst of embeds can
+    never occupy the default executor that the rest of the app shares.
+    """
+
+    def __init__(
+        self,
+        *,
+        embed_many: Callable[[list[str]], list[list[float]]] | None = None,
+        max_batch: int = 32,
+        window_ms: float = 5.0,
+        workers: int = 1,
+    ) -> None:
+        self._embed_many = embed_many or embed_many_sync
+        self.max_batch = max(1, int(max_batch))
+        self.window_s = max(0.0, float(window_ms)) / 1000.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(workers)), thread_name_prefix="embed-batch"
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = BatchStats()
+
+    def bound_to(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self._loop is None or self._loop is loop
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self.stats.requests += 1
+        fut: asyncio.Future = loop.create_future()
+        # Identical texts inside one window share a single batch slot.
+        self._pending.setdefault(text, []).append(fut)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        self.stats.batches += 1
+        self.stats.items += len(texts)
+        self.stats.max_batch_seen = max(self.stats.max_batch_seen, len(texts))
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._embed_many, texts
+            )
+            if len(vectors) != len(texts):
+                raise ValueError(f"embed_many returned {len(vectors)} vectors for {len(texts)} texts")
+        except Exception as e:  # noqa: BLE001 — surfaced to every waiter
+            for futs in batch.values():
+                for fut in futs:
+                    if not fut.done():
+                        fut.set_exception(e)
+            return
+        for text, vec in zip(texts, vectors, strict=True):
+            _cached.put(text, vec)
+            for fut in batch[text]:
+                if not fut.done():
+                    fut.set_result(list(vec))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_batcher: EmbedBatcher | None = None
+
+
+def _batch_settings() -> tuple[int, float, int]:
+    try:
+        from app.core.config import settings
+
+        cfg = getattr(getattr(settings, "images", None), "embed_batch", None)
+    except Exception:
+        cfg = None
+    return (
+        int(getattr(cfg, "max_batch", 32)),
+        float(getattr(cfg, "window_ms", 5.0)),
+        int(getattr(cfg, "workers", 1)),
+    )
+
+
+def get_batcher() -> EmbedBatcher:
+    """The process-wide batcher for the running loop (rebuilt if the loop changed)."""
+    global _batcher
+    loop = asyncio.get_running_loop()
+    if _batcher is None or not _batcher.bound_to(loop):
+        if _batcher is not None:
+            _batcher.shutdown()
+        max_batch, window_ms, workers = _batch_settings()
+        _batcher = EmbedBatcher(max_batch=max_batch, window_ms=window_ms, workers=workers)
+    return _batcher
 
 
 async def embed_one(text: str) -> list[float]:
     """Async, non-None primitive matching ``embeddings.cache.EmbedFn``.
 
-    Runs the CPU-bound embed off the event loop. Raises ``ValueError`` on empty
-    text (the caller — ``raw_embed`` — guards before calling)."""
+    Served from the ``_cached`` LRU when possible, otherwise joins the current
+    micro-batch. Raises ``ValueError`` on empty text (the caller — ``raw_embed``
+    — guards before calling)."""
     if not text or not text.strip():
         raise ValueError("embed_one received empty text")
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: list(_cached(text)))
+    hit = _cached.get(text)
+    if hit is not None:
+        return list(hit)
+    return await get_batcher().embed(text)
 
 
 async def raw_embed(text: str) -> list[float] | None:
@@ -23,6 +23,7 @@ mappings each with a ``text`` — and leaves anything it doesn't recognise alone
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 import structlog
@@ -185,7 +186,8 @@ async def _annotate_artefact(artefact: Any, binder: Any) -> int:
     """Walk the artefact's questions/options and attach ``icon_id`` additively.
 
     Mutates ``artefact`` in place (additive optional fields only) and returns the
-    number of strings bound. Tolerant: unrecognised shapes are skipped.
+    number of strings bound. Tolerant: unrecognised shapes are skipped. Every
+    string is bound concurrently so the embedder micro-batches the whole pack.
     """
     if not isinstance(artefact, dict):
         return 0
@@ -193,17 +195,17 @@ async def _annotate_artefact(artefact: Any, binder: Any) -> int:
     if not isinstance(questions, list):
         return 0
 
-    n_bound = 0
+    jobs = []
     for q in questions:
         if not isinstance(q, dict):
             continue
-        n_bound += await _bind_text(q, _question_stem(q), binder)
+        jobs.append(_bind_text(q, _question_stem(q), binder))
         options = q.get("options")
         if isinstance(options, list):
             for opt in options:
                 if isinstance(opt, dict):
-                    n_bound += await _bind_text(opt, opt.get("text"), binder)
-    return n_bound
+                    jobs.append(_bind_text(opt, opt.get("text"), binder))
+    return sum(await asyncio.gather(*jobs))
 
 
 def _attach(target: dict, binding: Any) -> bool:
@@ -34,6 +34,7 @@ in ``QA-SAME-UNIVERSE-RESULTS.md``.
 
 from __future__ import annotations
 
+import asyncio
 import threading
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
@@ -166,18 +167,16 @@ class _AnchorCache:
             return self._concrete, self._abstract  # type: ignore[return-value]
 
         async def _embed_all(texts: tuple[str, ...]) -> list[list[float]]:
-            out: list[list[float]] = []
-            for t in texts:
-                # Anchors are the "documents" side of asymmetric retrieval, so
-                # they are embedded UN-prefixed (mirrors how icon captions are
-                # seeded un-prefixed and only the Q&A query gets the prefix).
-                vec = await embed_fn(t)
-                if vec:
-                    out.append(list(vec))
-            return out
-
-        concrete = await _embed_all(CONCRETE_ANCHORS)
-        abstract = await _embed_all(ABSTRACT_ANCHORS)
+            # Anchors are the "documents" side of asymmetric retrieval, so
+            # they are embedded UN-prefixed (mirrors how icon captions are
+            # seeded un-prefixed and only the Q&A query gets the prefix).
+            # Issued concurrently so the embedder can batch them.
+            vecs = await asyncio.gather(*[embed_fn(t) for t in texts])
+            return [list(v) for v in vecs if v]
+
+        concrete, abstract = await asyncio.gather(
+            _embed_all(CONCRETE_ANCHORS), _embed_all(ABSTRACT_ANCHORS)
+        )
         with self._lock:
             self._concrete = concrete
             self._abstract = abstract
@@ -283,7 +282,8 @@ class RelevanceGate:
             texts = [t for t in (answer_texts or []) if isinstance(t, str) and t.strip()]
             if not texts:
                 return QuestionGateDecision(False, "no_answers")
-            decisions = [await self.score(t) for t in texts]
+            # Concurrent so the answers' embeds share one batched inference.
+            decisions = await asyncio.gather(*[self.score(t) for t in texts])
             n = len(decisions)
             n_concrete = sum(1 for d in decisions if d.generate)
             margins = [d.margin for d in decisions]
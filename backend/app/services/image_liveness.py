@@ -0,0 +1,307 @@
+"""Shared image-URL liveness cache + pooled HEAD prober.
+
+``generate_character_images`` checks that every cached character URL is
+still served before reusing it instead of paying FAL to regenerate it. The
+original probe built a fresh ``httpx.AsyncClient`` per URL, so a 20-character
+precomputed pack cost 20 TLS handshakes to the same CDN host on every
+``/quiz/start``. Here:
+
+  * **Local URLs** — ``/api/v1/media/*`` (and the legacy ``/api/media/*``)
+    plus the configured blob container are assets we host ourselves and
+    are content-addressed; they resolve alive with no network call.
+  * **Redis tier** — ``<namespace>:<sha256(url)>`` → ``"1"`` / ``"0"`` with a
+    long positive TTL and a short negative TTL, shared by every worker.
+  * **Pooled probe** — on a miss, one long-lived keep-alive ``httpx`` client
+    per host sends the HEAD (SSRF-checked, redirects never followed).
+
+``liveness_report()`` scopes per-call counters (probes, cache / local hits,
+estimated time saved) to one quiz start; ``stats()`` is process-wide. Every
+Redis fault fails open to a network probe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Bound on a single Redis round-trip so a stalled connection degrades to a
+# network probe instead of delaying it.
+_REDIS_OP_TIMEOUT_S = 0.5
+# Assumed cost of a probe we skipped before any real probe has been timed.
+_DEFAULT_PROBE_MS = 150.0
+
+_ALIVE = b"1"
+_DEAD = b"0"
+
+
+@dataclass
+class LivenessReport:
+    """Counters for one scope (a quiz start, or the whole process)."""
+
+    lookups: int = 0
+    local_hits: int = 0
+    cache_hits: int = 0
+    probes: int = 0
+    probe_ms: float = 0.0
+    alive: int = 0
+
+    def avg_probe_ms(self) -> float:
+        return (self.probe_ms / self.probes) if self.probes else _DEFAULT_PROBE_MS
+
+    def snapshot(self, *, avg_probe_ms: float | None = None) -> dict[str, Any]:
+        """Counters plus ``saved_ms_est``: avoided probes × mean probe latency.
+
+        A quiz whose URLs all hit the cache timed no probe of its own, so
+        callers pass the process-wide mean as ``avg_probe_ms``.
+        """
+        avoided = self.local_hits + self.cache_hits
+        avg = self.avg_probe_ms() if avg_probe_ms is None else avg_probe_ms
+        return {
+            "lookups": self.lookups,
+            "probes": self.probes,
+            "local_hits": self.local_hits,
+            "cache_hits": self.cache_hits,
+            "hit_rate": (avoided / self.lookups) if self.lookups else 0.0,
+            "alive": self.alive,
+            "probe_ms": round(self.probe_ms, 1),
+            "saved_ms_est": round(avoided * avg, 1),
+        }
+
+
+_report_var: contextvars.ContextVar[LivenessReport | None] = contextvars.ContextVar(
+    "image_liveness_report", default=None
+)
+
+
+@contextlib.contextmanager
+def liveness_report() -> Iterator[LivenessReport]:
+    """Collect counters for every ``alive()`` call in this context.
+
+    Tasks spawned inside (``asyncio.gather``) copy the context and so share
+    the same report object.
+    """
+    report = LivenessReport()
+    token = _report_var.set(report)
+    try:
+        yield report
+    finally:
+        _report_var.reset(token)
+
+
+def _digest(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+async def _bounded(awaitable: Any) -> Any:
+    return await asyncio.wait_for(awaitable, timeout=_REDIS_OP_TIMEOUT_S)
+
+
+class ImageLivenessProber:
+    """Redis-cached, per-host pooled HEAD prober for image URLs."""
+
+    def __init__(
+        self,
+        *,
+        redis_factory: Callable[[], Any],
+        namespace: str = "imgalive",
+        alive_ttl_s: int = 6 * 3600,
+        dead_ttl_s: int = 600,
+        timeout_s: float = 3.0,
+        max_connections_per_host: int = 8,
+        keepalive_expiry_s: float = 30.0,
+        local_prefixes: tuple[str, ...] | list[str] = (),
+        transport_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self._ns = namespace
+        self._alive_ttl = max(0, int(alive_ttl_s))
+        self._dead_ttl = max(0, int(dead_ttl_s))
+        self._timeout_s = float(timeout_s)
+        self._max_conns = max(1, int(max_connections_per_host))
+        self._keepalive_expiry_s = float(keepalive_expiry_s)
+        self._local_prefixes = tuple(p for p in local_prefixes if p)
+        self._transport_factory = transport_factory  # tests inject httpx.MockTransport
+        self._clients: dict[str, Any] = {}
+        self._totals = LivenessReport()
+
+    # ------------------------------------------------------------------
+
+    def is_local(self, url: str) -> bool:
+        return url.startswith(self._local_prefixes)
+
+    def avg_probe_ms(self) -> float:
+        return self._totals.avg_probe_ms()
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._totals.snapshot(), "pooled_hosts": len(self._clients)}
+
+    def _redis(self) -> Any | None:
+        try:
+            return self._redis_factory() or None
+        except Exception:
+            return None
+
+    def _client(self, host: str) -> Any:
+        client = self._clients.get(host)
+        if client is None:
+            import httpx  # local import keeps cold-start light
+
+            limits = httpx.Limits(
+                max_connections=self._max_conns,
+                max_keepalive_connections=self._max_conns,
+                keepalive_expiry=self._keepalive_expiry_s,
+            )
+            transport = (
+                self._transport_factory()
+                if self._transport_factory is not None
+                else httpx.AsyncHTTPTransport(limits=limits)
+            )
+            client = self._clients[host] = httpx.AsyncClient(
+                transport=transport,
+                timeout=self._timeout_s,
+                follow_redirects=False,
+            )
+        return client
+
+    def _count(self, field: str, n: float = 1) -> None:
+        for rep in (self._totals, _report_var.get()):
+            if rep is not None:
+                setattr(rep, field, getattr(rep, field) + n)
+
+    # ------------------------------------------------------------------
+
+    async def alive(self, url: str) -> bool:
+        """True iff ``url`` is ours or answers 2xx/3xx to a HEAD. Never raises."""
+        if not url:
+            return False
+        self._count("lookups")
+        if self.is_local(url):
+            self._count("local_hits")
+            self._count("alive")
+            return True
+
+        redis = self._redis()
+        key = f"{self._ns}:{_digest(url)}"
+        if redis is not None:
+            try:
+                cached = await _bounded(redis.get(key))
+            except Exception:
+                logger.debug("image.liveness.redis_get_failed", exc_info=True)
+                cached = None
+            if cached is not None:
+                ok = cached in (_ALIVE, _ALIVE.decode())
+                self._count("cache_hits")
+                self._count("alive", int(ok))
+                return ok
+
+        ok = await self._probe(url)
+        self._count("alive", int(ok))
+        ttl = self._alive_ttl if ok else self._dead_ttl
+        if redis is not None and ttl > 0:
+            try:
+                await _bounded(redis.set(key, _ALIVE if ok else _DEAD, ex=ttl))
+            except Exception:
+                logger.debug("image.liveness.redis_set_failed", exc_info=True)
+        return ok
+
+    async def _probe(self, url: str) -> bool:
+        started = time.perf_counter()
+        try:
+            # SEC1 (defence-in-depth): validate the URL uses an allowed scheme
+            # and resolves to a public IP before probing (raises on SSRF), and
+            # never follow redirects — a 3xx to a rebound internal target must
+            # not be chased. We only need to know the CDN URL is reachable.
+            from app.services.precompute.outbound import assert_url_safe
+
+            assert_url_safe(url)
+            resp = await self._client(urlsplit(url).netloc.lower()).head(url)
+            return 200 <= resp.status_code < 400
+        except Exception as e:
+            logger.info("image.head_probe.fail", url=url, error=str(e))
+            return False
+        finally:
+            self._count("probes")
+            self._count("probe_ms", (time.perf_counter() - started) * 1000.0)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            with contextlib.suppress(Exception):
+                await client.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_prober: ImageLivenessProber | None = None
+
+
+def _default_redis_factory() -> Any | None:
+    try:
+        from app.api.dependencies import get_redis_client
+
+        return get_redis_client()
+    except Exception:
+        return None
+
+
+def _local_prefixes(cfg: Any) -> list[str]:
+    """Configured local prefixes plus the blob container URL, if any."""
+    from app.core.config import settings
+
+    prefixes = list(getattr(cfg, "local_url_prefixes", None) or [])
+    blob = getattr(getattr(settings, "media_storage", None), "blob", None)
+    base = getattr(blob, "base_url", None) if blob else None
+    container = getattr(blob, "container", None) if blob else None
+    if base and container:
+        prefixes.append(f"{str(base).rstrip('/')}/{container}/")
+    return prefixes
+
+
+def get_liveness_prober() -> ImageLivenessProber:
+    """The process-wide prober (built from ``image_gen.liveness``)."""
+    global _prober
+    if _prober is None:
+        from app.core.config import settings
+
+        cfg = getattr(getattr(settings, "image_gen", None), "liveness", None)
+        cache_on = bool(getattr(cfg, "cache_enabled", True)) if cfg is not None else True
+        _prober = ImageLivenessProber(
+            redis_factory=_default_redis_factory if cache_on else (lambda: None),
+            namespace=str(getattr(cfg, "namespace", "imgalive")),
+            alive_ttl_s=int(getattr(cfg, "alive_ttl_s", 6 * 3600)),
+            dead_ttl_s=int(getattr(cfg, "dead_ttl_s", 600)),
+            timeout_s=float(getattr(cfg, "timeout_s", 3.0)),
+            max_connections_per_host=int(getattr(cfg, "max_connections_per_host", 8)),
+            keepalive_expiry_s=float(getattr(cfg, "keepalive_expiry_s", 30.0)),
+            local_prefixes=_local_prefixes(cfg),
+        )
+    return _prober
+
+
+async def close_liveness_prober() -> None:
+    global _prober
+    prober, _prober = _prober, None
+    if prober is not None:
+        await prober.aclose()
+
+
+__all__ = [
+    "ImageLivenessProber",
+    "LivenessReport",
+    "close_liveness_prober",
+    "get_liveness_prober",
+    "liveness_report",
+]
@@ -31,7 +31,9 @@ from app.agent.tools import image_tools
 from app.api import dependencies as deps
 from app.core.config import settings
 from app.models.api import CharacterProfile, FinalResult, Synopsis
+from app.services.image_liveness import get_liveness_prober, liveness_report
 from app.services.image_service import _client_singleton as _client
+from app.services.llm_concurrency import PRIORITY_BACKGROUND, llm_priority
 
 logger = structlog.get_logger(__name__)
 
@@ -523,29 +525,16 @@ async def _get_character_urls(names: list[str]) -> dict[str, str | None]:
             return dict.fromkeys(names)
 
 
-async def _url_alive(url: str, *, timeout_s: float = 3.0) -> bool:
-    """Cheap HEAD probe. Returns True iff the URL responds 2xx/3xx.
+async def _url_alive(url: str) -> bool:
+    """Cheap liveness check. Returns True iff the URL responds 2xx/3xx.
 
     Used to gate FAL regeneration when the DB already has an image URL --
     avoids spending FAL credits regenerating an asset that is still served
-    by the upstream CDN.
+    by the upstream CDN. Goes through the shared prober: our own media/blob
+    URLs resolve locally, recent answers come from Redis, and misses HEAD
+    over one pooled keep-alive client per host (see ``image_liveness``).
     """
-    if not url:
-        return False
-    try:
-        # SEC1 (defence-in-depth): validate the URL uses an allowed scheme and
-        # resolves to a public IP before probing (raises on SSRF), and never
-        # follow redirects — a 3xx to a rebound internal target must not be
-        # chased. We only need to know the CDN URL is reachable.
-        from app.services.precompute.outbound import assert_url_safe
-        assert_url_safe(url)
-        import httpx  # local import keeps cold-start light
-        async with httpx.AsyncClient(timeout=timeout_s, follow_redirects=False) as client:
-            resp = await client.head(url)
-            return 200 <= resp.status_code < 400
-    except Exception as e:
-        logger.info("image.head_probe.fail", url=url, error=str(e))
-        return False
+    return await get_liveness_prober().alive(url)
 
 
 async def generate_character_images(  # noqa: C901 — linear two-phase fan-out: dedup -> resolve cache (all chars) -> cap misses -> generate -> meter (Hitlist #5 review item B)
@@ -597,6 +586,8 @@ async def generate_character_images(  # noqa: C901 — linear two-phase fan-out:
     # DB), and the cache-hit ``character_set`` refreshes are flushed in a SINGLE
     # batched session afterward — eliminating the per-character N+1 connection
     # fan-out. The set of cache hits and the URLs reused are unchanged.
+    # Liveness answers come from the shared ``image_liveness`` prober (Redis,
+    # then one pooled client per host); per-start counters are logged below.
     # ---------------------------------------------------------------------
     existing_urls = await _get_character_urls([c.name for c in unique])
 
@@ -606,7 +597,13 @@ async def generate_character_images(  # noqa: C901 — linear two-phase fan-out:
             return profile.name, existing
         return profile.name, None
 
-    probe_results = await asyncio.gather(*[_probe(c) for c in unique])
+    with liveness_report() as liveness:
+        probe_results = await asyncio.gather(*[_probe(c) for c in unique])
+    logger.info(
+        "image.character.liveness",
+        session_id=str(session_id),
+        **liveness.snapshot(avg_probe_ms=get_liveness_prober().avg_probe_ms()),
+    )
     cached_urls: dict[str, str] = {
         name: url for name, url in probe_results if url is not None
     }
@@ -767,10 +764,12 @@ async def _generate_character_with_brand_fallback(
         return url, total_calls
     logger.info("image.brand.rung1.empty", name=name, source=source)
 
-    # Rung 2 — LLM physical description (no branded items).
-    desc = await character_describer.describe_character_physically(
-        name=name, source=source, strict_level=0, subject_kind=subject_kind,
-    )
+    # Rung 2 — LLM physical description (no branded items). Image prompts are
+    # never what a user is blocked on, so they queue behind interactive calls.
+    with llm_priority(PRIORITY_BACKGROUND):
+        desc = await character_describer.describe_character_physically(
+            name=name, source=source, strict_level=0, subject_kind=subject_kind,
+        )
     if desc:
         spec2 = image_tools.build_descriptive_attempt_prompt(
             description=desc,
@@ -784,9 +783,10 @@ async def _generate_character_with_brand_fallback(
         logger.info("image.brand.rung2.empty", name=name, source=source)
 
     # Rung 3 — stricter LLM description (no proper nouns at all).
-    desc2 = await character_describer.describe_character_physically(
-        name=name, source=source, strict_level=1, subject_kind=subject_kind,
-    )
+    with llm_priority(PRIORITY_BACKGROUND):
+        desc2 = await character_describer.describe_character_physically(
+            name=name, source=source, strict_level=1, subject_kind=subject_kind,
+        )
     if desc2:
         spec3 = image_tools.build_descriptive_attempt_prompt(
             description=desc2,
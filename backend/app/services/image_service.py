@@ -26,11 +26,14 @@ for _alias in ("FAL_AI_KEY", "FAL_AI_API_KEY"):
     if not os.getenv("FAL_KEY") and os.getenv(_alias):
         os.environ["FAL_KEY"] = os.environ[_alias]
 
-import fal_client  # noqa: E402  (imported after env aliasing)
-
 from app.core.config import settings  # noqa: E402
+from app.core.lazy_import import lazy_module  # noqa: E402
 from app.services.retry import retry_async  # noqa: E402
 
+# Imported on the first FAL call (after the env aliasing above), not at app
+# start: most workers never generate an image before their first quiz.
+fal_client = lazy_module("fal_client")
+
 logger = structlog.get_logger(__name__)
 
 
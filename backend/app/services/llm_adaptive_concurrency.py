@@ -0,0 +1,393 @@
+"""§17.1 — Token-aware adaptive (AIMD) LLM admission, per provider/model.
+
+The global ``LLMConcurrencyLimiter`` counts *calls*, so a 200-token
+``decide_next_step`` and a multi-thousand-token ``write_final_user_profile``
+cost the same slot, and its capacity is a fixed guess. Providers actually
+rate-limit on tokens, and their headroom moves with time of day.
+
+This controller sits around each individual provider call (inside the
+retry loop, so backoff sleeps hold no budget) and admits by *estimated
+tokens* (``max_output_tokens`` + prompt size) against a per-model token
+budget that adapts AIMD-style:
+
+- **Additive increase** — a fast success while the lane was at least half
+  full grows the budget by ``increase_tokens`` per full window
+  (``increase_tokens × tokens / limit`` per call).
+- **Multiplicative decrease** — a 429 or timeout cuts the budget by
+  ``decrease_factor``; a success slower than ``latency_tolerance`` × the
+  lane's best observed seconds-per-token cuts it gently by
+  ``slow_decrease_factor``. Cuts are at most once per ``cooldown_s`` so one
+  burst of 429s from the same window counts once.
+
+Admission is FIFO per lane (no barging), and a call larger than the whole
+budget is still admitted when its lane is idle, so nothing starves.
+
+Off by default (``llm.adaptive_concurrency.enabled``); the fixed call-count
+semaphore stays the outer bound either way. ``metrics()`` is surfaced under
+``LLMConcurrencyLimiter.metrics()["adaptive"]``. A trace-replay harness
+lives in ``scripts/simulate_llm_concurrency.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+from app.services.llm_concurrency import LLMConcurrencyTimeoutError
+
+logger = structlog.get_logger(__name__)
+
+# Rough prompt-size heuristic (chars per token) — good enough for admission
+# weighting; exact counts would need the provider tokenizer on the hot path.
+CHARS_PER_TOKEN = 4
+
+# Fixed per-call cost (time to first token) in token-equivalents, added to
+# the estimate when normalising latency so small calls don't look "slow per
+# token" next to large ones.
+LATENCY_OVERHEAD_TOKENS = 1_000
+
+OUTCOME_OK = "ok"
+OUTCOME_RATE_LIMITED = "rate_limited"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+
+
+def estimate_call_tokens(prompt: Any, max_output_tokens: int | None) -> int:
+    """``max_output_tokens`` plus ~1 token per ``CHARS_PER_TOKEN`` prompt chars."""
+    if prompt is None:
+        prompt_chars = 0
+    elif isinstance(prompt, str):
+        prompt_chars = len(prompt)
+    else:
+        prompt_chars = len(str(prompt))
+    return max(1, int(max_output_tokens or 0) + prompt_chars // CHARS_PER_TOKEN)
+
+
+def classify_outcome(exc: BaseException | None) -> str:
+    """Map a provider-call exception to an AIMD signal.
+
+    Duck-typed on ``status_code`` / ``TimeoutError`` so this module never
+    imports LiteLLM (``RateLimitError`` carries 429, ``Timeout`` 408).
+    """
+    if exc is None:
+        return OUTCOME_OK
+    status = getattr(exc, "status_code", None)
+    if status == 429 or type(exc).__name__ == "RateLimitError":
+        return OUTCOME_RATE_LIMITED
+    if status == 408 or isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return OUTCOME_TIMEOUT
+    return OUTCOME_ERROR
+
+
+@dataclass
+class _Lane:
+    limit: float
+    in_flight: int = 0
+    active: int = 0
+    waiters: deque[tuple[int, asyncio.Future]] = field(default_factory=deque)
+    # Best (lowest) observed seconds per token; drifts up slowly so a
+    # permanently slower provider re-baselines instead of throttling forever.
+    best_s_per_token: float | None = None
+    last_decrease_at: float = float("-inf")
+    admitted: int = 0
+    waited: int = 0
+    wait_timeouts: int = 0
+    rate_limited: int = 0
+    timeouts: int = 0
+    slow: int = 0
+    increases: int = 0
+    decreases: int = 0
+
+
+@dataclass(frozen=True)
+class _Grant:
+    key: str
+    tokens: int
+    fill_at_admit: float
+
+
+class AdaptiveTokenLimiter:
+    """Per-key token budgets with AIMD feedback."""
+
+    # Per-sample upward drift of the latency baseline.
+    _BASELINE_DRIFT = 0.01
+
+    def __init__(
+        self,
+        *,
+        initial_tokens: int = 32_000,
+        min_tokens: int = 4_000,
+        max_tokens: int = 256_000,
+        increase_tokens: int = 4_000,
+        decrease_factor: float = 0.7,
+        slow_decrease_factor: float = 0.9,
+        latency_tolerance: float = 2.5,
+        cooldown_s: float = 2.0,
+        acquire_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not (1 <= min_tokens <= initial_tokens <= max_tokens):
+            raise ValueError("adaptive concurrency requires 1 <= min <= initial <= max tokens")
+        if not (0 < decrease_factor < 1 and 0 < slow_decrease_factor <= 1):
+            raise ValueError("adaptive concurrency decrease factors must be in (0, 1)")
+        self.initial_tokens = int(initial_tokens)
+        self.min_tokens = int(min_tokens)
+        self.max_tokens = int(max_tokens)
+        self.increase_tokens = float(increase_tokens)
+        self.decrease_factor = float(decrease_factor)
+        self.slow_decrease_factor = float(slow_decrease_factor)
+        self.latency_tolerance = float(latency_tolerance)
+        self.cooldown_s = float(cooldown_s)
+        self.acquire_timeout_s = float(acquire_timeout_s)
+        self._clock = clock
+        self._lanes: dict[str, _Lane] = {}
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane(limit=float(self.initial_tokens))
+        return lane
+
+    @staticmethod
+    def _fits(lane: _Lane, tokens: int) -> bool:
+        return lane.in_flight == 0 or lane.in_flight + tokens <= lane.limit
+
+    def _grant(self, key: str, lane: _Lane, tokens: int) -> _Grant:
+        lane.in_flight += tokens
+        lane.active += 1
+        lane.admitted += 1
+        return _Grant(key=key, tokens=tokens, fill_at_admit=lane.in_flight / lane.limit)
+
+    def _drain(self, key: str, lane: _Lane) -> None:
+        while lane.waiters:
+            tokens, fut = lane.waiters[0]
+            if fut.done():
+                lane.waiters.popleft()
+                continue
+            if not self._fits(lane, tokens):
+                return
+            lane.waiters.popleft()
+            fut.set_result(self._grant(key, lane, tokens))
+
+    async def acquire(self, key: str, tokens: int, *, tool: str = "unknown") -> _Grant:
+        """Reserve ``tokens`` on ``key``'s lane, FIFO behind earlier waiters.
+
+        Raises ``LLMConcurrencyTimeoutError`` after ``acquire_timeout_s``.
+        """
+        lane = self._lane(key)
+        tokens = max(1, int(tokens))
+        if not lane.waiters and self._fits(lane, tokens):
+            return self._grant(key, lane, tokens)
+
+        lane.waited += 1
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        lane.waiters.append((tokens, fut))
+        start = time.perf_counter()
+        try:
+            if self.acquire_timeout_s > 0:
+                return await asyncio.wait_for(asyncio.shield(fut), self.acquire_timeout_s)
+            return await fut
+        except BaseException as exc:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                # Granted in the same tick we gave up — hand the budget back.
+                self._return(fut.result())
+            else:
+                fut.cancel()
+                self._drain(key, lane)
+            if isinstance(exc, asyncio.TimeoutError):
+                lane.wait_timeouts += 1
+                waited_s = time.perf_counter() - start
+                logger.warning(
+                    "llm.adaptive.timeout",
+                    key=key,
+                    tool=tool,
+                    tokens=tokens,
+                    limit_tokens=int(lane.limit),
+                    in_flight_tokens=lane.in_flight,
+                    waited_s=round(waited_s, 3),
+                )
+                raise LLMConcurrencyTimeoutError(
+                    tool=tool, capacity=int(lane.limit), waited_s=waited_s
+                ) from exc
+            raise
+
+    def _return(self, grant: _Grant) -> _Lane:
+        lane = self._lane(grant.key)
+        lane.in_flight = max(0, lane.in_flight - grant.tokens)
+        lane.active = max(0, lane.active - 1)
+        return lane
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def release(self, grant: _Grant, outcome: str | None, latency_s: float) -> None:
+        """Return the grant's budget and apply the AIMD update.
+
+        ``outcome=None`` (cancelled call) returns budget without feedback.
+        """
+        lane = self._return(grant)
+        if outcome == OUTCOME_OK:
+            self._on_success(grant, lane, latency_s)
+        elif outcome == OUTCOME_RATE_LIMITED:
+            lane.rate_limited += 1
+            self._decrease(grant.key, lane, self.decrease_factor, OUTCOME_RATE_LIMITED)
+        elif outcome == OUTCOME_TIMEOUT:
+            lane.timeouts += 1
+            self._decrease(grant.key, lane, self.decrease_factor, OUTCOME_TIMEOUT)
+        self._drain(grant.key, lane)
+
+    def _on_success(self, grant: _Grant, lane: _Lane, latency_s: float) -> None:
+        s_per_token = max(0.0, latency_s) / (grant.tokens + LATENCY_OVERHEAD_TOKENS)
+        best = lane.best_s_per_token
+        if best is None or s_per_token < best:
+            lane.best_s_per_token = s_per_token
+        else:
+            lane.best_s_per_token = best * (1 + self._BASELINE_DRIFT)
+            if s_per_token > best * self.latency_tolerance:
+                lane.slow += 1
+                self._decrease(grant.key, lane, self.slow_decrease_factor, "slow")
+                return
+        # Only grow a budget that is actually being used; an idle lane's
+        # success says nothing about the provider's headroom.
+        if grant.fill_at_admit >= 0.5 and lane.limit < self.max_tokens:
+            step = self.increase_tokens * grant.tokens / lane.limit
+            lane.limit = min(float(self.max_tokens), lane.limit + step)
+            lane.increases += 1
+
+    def _decrease(self, key: str, lane: _Lane, factor: float, reason: str) -> None:
+        now = self._clock()
+        if now - lane.last_decrease_at < self.cooldown_s:
+            return
+        lane.last_decrease_at = now
+        before = lane.limit
+        lane.limit = max(float(self.min_tokens), lane.limit * factor)
+        lane.decreases += 1
+        logger.info(
+            "llm.adaptive.decrease",
+            key=key,
+            reason=reason,
+            limit_before=int(before),
+            limit_tokens=int(lane.limit),
+        )
+
+    @contextlib.asynccontextmanager
+    async def admit(self, key: str, tokens: int, *, tool: str = "unknown") -> AsyncIterator[None]:
+        """Hold ``tokens`` of ``key``'s budget around one provider call and
+        feed its outcome/latency back. Always returns the budget."""
+        grant = await self.acquire(key, tokens, tool=tool)
+        start = self._clock()
+        outcome: str | None = None
+        try:
+            yield
+            outcome = OUTCOME_OK
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            outcome = classify_outcome(exc)
+            raise
+        finally:
+            self.release(grant, outcome, self._clock() - start)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def limit_for(self, key: str) -> int:
+        return int(self._lane(key).limit)
+
+    def metrics(self) -> dict[str, Any]:
+        """Live per-lane state. Never raises; intentionally racy."""
+        lanes: dict[str, Any] = {}
+        for key, lane in list(self._lanes.items()):
+            best = lane.best_s_per_token
+            lanes[key] = {
+                "limit_tokens": int(lane.limit),
+                "in_flight_tokens": lane.in_flight,
+                "active": lane.active,
+                "waiting": sum(1 for _, f in lane.waiters if not f.done()),
+                "best_ms_per_ktok": None if best is None else round(best * 1e6, 1),
+                "admitted": lane.admitted,
+                "waited": lane.waited,
+                "wait_timeouts": lane.wait_timeouts,
+                "rate_limited": lane.rate_limited,
+                "timeouts": lane.timeouts,
+                "slow": lane.slow,
+                "increases": lane.increases,
+                "decreases": lane.decreases,
+            }
+        return {
+            "enabled": True,
+            "initial_tokens": self.initial_tokens,
+            "min_tokens": self.min_tokens,
+            "max_tokens": self.max_tokens,
+            "lanes": lanes,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_adaptive: AdaptiveTokenLimiter | None = None
+_adaptive_resolved = False
+
+
+def _build_from_settings() -> AdaptiveTokenLimiter | None:
+    try:
+        from app.core.config import settings
+
+        llm_cfg = getattr(settings, "llm", None)
+        cfg = getattr(llm_cfg, "adaptive_concurrency", None)
+        if cfg is None or not bool(getattr(cfg, "enabled", False)):
+            return None
+        return AdaptiveTokenLimiter(
+            initial_tokens=int(cfg.initial_tokens),
+            min_tokens=int(cfg.min_tokens),
+            max_tokens=int(cfg.max_tokens),
+            increase_tokens=int(cfg.increase_tokens),
+            decrease_factor=float(cfg.decrease_factor),
+            slow_decrease_factor=float(cfg.slow_decrease_factor),
+            latency_tolerance=float(cfg.latency_tolerance),
+            cooldown_s=float(cfg.cooldown_s),
+            acquire_timeout_s=float(getattr(llm_cfg, "acquire_timeout_s", 30.0) or 0.0),
+        )
+    except Exception:
+        logger.warning("llm.adaptive.config_invalid", exc_info=True)
+        return None
+
+
+def get_adaptive_limiter() -> AdaptiveTokenLimiter | None:
+    """Return the process-global controller, or None when disabled."""
+    global _adaptive, _adaptive_resolved
+    if not _adaptive_resolved:
+        _adaptive = _build_from_settings()
+        _adaptive_resolved = True
+    return _adaptive
+
+
+def reset_adaptive_limiter_for_tests() -> None:
+    """Test helper — re-read settings on next access."""
+    global _adaptive, _adaptive_resolved
+    _adaptive = None
+    _adaptive_resolved = False
+
+
+__all__ = [
+    "AdaptiveTokenLimiter",
+    "classify_outcome",
+    "estimate_call_tokens",
+    "get_adaptive_limiter",
+    "reset_adaptive_limiter_for_tests",
+]
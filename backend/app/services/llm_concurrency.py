@@ -1,6 +1,6 @@
 """§17.1 — Global LLM Concurrency Semaphore (AC-SCALE-LLM-*).
 
-A thin, observable wrapper around ``asyncio.Semaphore`` that bounds the number
+A thin, observable counting semaphore that bounds the number
 of concurrent LLM calls process-wide. Acquiring is timeout-aware so requests
 fail fast under saturation rather than blocking the event loop indefinitely.
 
@@ -12,7 +12,25 @@ Design notes
 - ``acquire()`` is an async context manager that records counters and emits
   structured logs. It releases on exception so the counter can never leak.
 - ``metrics()`` returns a snapshot dict — no locks, intentionally racy, used
-  for tests/observability not for control flow.
+  for tests/observability not for control flow. It also carries the
+  per-model token controller's state under ``"adaptive"``
+  (``llm_adaptive_concurrency.py``; off unless enabled).
+
+Priority lanes
+--------------
+Slots are split across three lanes — ``interactive`` (a user is waiting on
+the response), ``background`` (the post-answer agent run, image prompts) and
+``batch`` (precompute builds). Each lane has a reserved minimum no other lane
+may take; the rest of ``capacity`` is shared headroom any lane may borrow.
+Reservations that don't fit are scaled down proportionally (one slot per lane
+where capacity allows), and a slot is always left shared when some lane ends
+up without a reservation, so no lane can be shut out of an idle limiter.
+Freed slots go to the highest-priority eligible waiter, except that a waiter
+queued for ``promote_after_s`` or longer is served first (oldest first), so
+batch work is never shut out indefinitely by a steady stream of interactive
+calls. Callers pick a lane with ``llm_priority(...)`` (a contextvar, so it
+flows into tasks spawned inside the block); unmarked calls are interactive.
+``metrics()["lanes"]`` carries per-lane queue-wait histograms.
 
 Cluster-wide cap (P1, Scalability)
 ----------------------------------
@@ -32,9 +50,12 @@ LLM calls cluster-wide.
 from __future__ import annotations
 
 import asyncio
+import bisect
 import contextlib
 import time
-from collections.abc import AsyncIterator
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextvars import ContextVar
 from typing import Any
 
 import structlog
@@ -109,6 +130,197 @@ class LLMConcurrencyTimeoutError(RuntimeError):
         self.waited_s = waited_s
 
 
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITY_BATCH = "batch"
+# Highest priority first; also the dispatch order for un-aged waiters.
+PRIORITY_LANES: tuple[str, ...] = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BATCH)
+# A waiter queued this long jumps ahead of younger higher-priority waiters.
+DEFAULT_PROMOTE_AFTER_S = 10.0
+# Queue-wait histogram bucket upper bounds (ms); the last bucket is +inf.
+WAIT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 50, 100, 500, 1_000, 5_000, 30_000)
+
+_PRIORITY: ContextVar[str] = ContextVar("llm_priority", default=PRIORITY_INTERACTIVE)
+
+
+def current_llm_priority() -> str:
+    """The lane LLM calls made from the current context are admitted under."""
+    return _PRIORITY.get()
+
+
+@contextlib.contextmanager
+def llm_priority(lane: str) -> Iterator[None]:
+    """Admit LLM calls made inside the block (and tasks spawned in it) under ``lane``."""
+    if lane not in PRIORITY_LANES:
+        raise ValueError(f"unknown LLM priority lane {lane!r}")
+    token = _PRIORITY.set(lane)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class _WaitHistogram:
+    """Fixed-bucket histogram of queue waits in milliseconds."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._sum_ms = 0.0
+
+    def observe(self, wait_s: float) -> None:
+        ms = max(0.0, wait_s * 1000.0)
+        self._counts[bisect.bisect_left(WAIT_BUCKETS_MS, ms)] += 1
+        self._sum_ms += ms
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{b:g}" for b in WAIT_BUCKETS_MS] + ["le_inf"]
+        return {
+            "buckets_ms": dict(zip(labels, self._counts, strict=True)),
+            "count": sum(self._counts),
+            "sum_ms": round(self._sum_ms, 3),
+        }
+
+
+def _scale_reservations(want: Mapping[str, int], budget: int) -> dict[str, int]:
+    """Fit ``want`` into ``budget``: one slot per asking lane (priority order)
+    first, then the rest in proportion to what each lane asked beyond that."""
+    out = dict.fromkeys(PRIORITY_LANES, 0)
+    left = budget
+    for lane in PRIORITY_LANES:
+        if want[lane] > 0 and left > 0:
+            out[lane], left = 1, left - 1
+    extra = {lane: want[lane] - out[lane] for lane in PRIORITY_LANES if out[lane]}
+    total_extra = sum(extra.values())
+    if left <= 0 or total_extra <= 0:
+        return out
+    shares = {lane: left * e / total_extra for lane, e in extra.items()}
+    for lane, share in shares.items():
+        out[lane] += int(share)
+    # Largest remainder, ties to the higher-priority lane.
+    remaining = left - sum(int(share) for share in shares.values())
+    for lane in sorted(shares, key=lambda ln: -(shares[ln] - int(shares[ln])))[:remaining]:
+        out[lane] += 1
+    return out
+
+
+def _clamp_reservations(capacity: int, reserved: Mapping[str, int] | None) -> dict[str, int]:
+    """Per-lane reservations that fit in ``capacity`` without starving a lane.
+
+    A lane with no reservation can only borrow shared headroom, so whenever
+    one exists at least one slot stays unreserved. Over-asked reservations
+    are scaled down proportionally, keeping one slot per lane where capacity
+    allows.
+    """
+    want = {lane: max(0, int((reserved or {}).get(lane, 0) or 0)) for lane in PRIORITY_LANES}
+    capacity = max(0, int(capacity))
+    budget = capacity if all(want.values()) else capacity - 1
+    if sum(want.values()) <= budget:
+        return want
+    out = _scale_reservations(want, budget)
+    if budget == capacity and not all(out.values()):
+        # Too few slots for one per lane: leave a shared one instead.
+        out = _scale_reservations(want, capacity - 1)
+    return out
+
+
+class _PrioritySlots:
+    """Counting semaphore with per-lane reservations, priority and aging.
+
+    A lane may take a free slot while it is under its reservation, or when
+    the free slots exceed the OTHER lanes' unused reservations (i.e. it is
+    borrowing shared headroom). Waiters are FIFO within a lane.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        reserved: Mapping[str, int] | None = None,
+        *,
+        promote_after_s: float = DEFAULT_PROMOTE_AFTER_S,
+    ) -> None:
+        self.capacity = capacity
+        self.reserved = _clamp_reservations(capacity, reserved)
+        self.promote_after_s = float(promote_after_s)
+        self.in_use = dict.fromkeys(PRIORITY_LANES, 0)
+        self._waiters: dict[str, deque[tuple[asyncio.Future, float]]] = {
+            lane: deque() for lane in PRIORITY_LANES
+        }
+
+    def waiting(self, lane: str) -> int:
+        return sum(1 for fut, _ in self._waiters[lane] if not fut.done())
+
+    def _can_admit(self, lane: str) -> bool:
+        free = self.capacity - sum(self.in_use.values())
+        if free <= 0:
+            return False
+        if self.in_use[lane] < self.reserved[lane]:
+            return True
+        held_back = sum(
+            max(0, self.reserved[other] - self.in_use[other])
+            for other in PRIORITY_LANES
+            if other != lane
+        )
+        return free > held_back
+
+    def _head(self, lane: str) -> tuple[asyncio.Future, float] | None:
+        queue = self._waiters[lane]
+        while queue and queue[0][0].done():  # timed out / cancelled
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def _next_lane(self) -> str | None:
+        heads = {lane: head for lane in PRIORITY_LANES if (head := self._head(lane))}
+        if not heads:
+            return None
+        aged_before = time.monotonic() - self.promote_after_s
+        aged = [
+            lane
+            for enqueued_at, lane in sorted((at, lane) for lane, (_, at) in heads.items())
+            if enqueued_at <= aged_before
+        ]
+        order = aged + [lane for lane in heads if lane not in aged]
+        for lane in order:
+            if self._can_admit(lane):
+                return lane
+        return None
+
+    def _dispatch(self) -> None:
+        while (lane := self._next_lane()) is not None:
+            fut, _ = self._waiters[lane].popleft()
+            self.in_use[lane] += 1
+            fut.set_result(None)
+
+    def try_acquire(self, lane: str) -> bool:
+        """Take a slot without queueing, unless someone eligible is already waiting."""
+        if any(self._head(other) for other in PRIORITY_LANES) or not self._can_admit(lane):
+            return False
+        self.in_use[lane] += 1
+        return True
+
+    async def acquire(self, lane: str, timeout_s: float | None) -> None:
+        """Wait for a slot in ``lane``. Raises ``asyncio.TimeoutError``."""
+        if self.try_acquire(lane):
+            return
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters[lane].append((fut, time.monotonic()))
+        # Arrivals may be dispatchable right away (e.g. an empty reservation
+        # while higher lanes queue for shared headroom).
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=timeout_s)
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                # Granted in the same tick we gave up: hand the slot on.
+                self.release(lane)
+            else:
+                fut.cancel()
+            raise
+
+    def release(self, lane: str) -> None:
+        self.in_use[lane] = max(0, self.in_use[lane] - 1)
+        self._dispatch()
+
+
 class _ClusterConcurrencyGate:
     """Best-effort Redis-backed cluster-wide concurrency gate.
 
@@ -271,6 +483,8 @@ class LLMConcurrencyLimiter:
         capacity: int,
         acquire_timeout_s: float,
         cluster_gate: _ClusterConcurrencyGate | None = None,
+        reserved: Mapping[str, int] | None = None,
+        promote_after_s: float = DEFAULT_PROMOTE_AFTER_S,
     ) -> None:
         if capacity is None or int(capacity) < 1:
             raise ValueError("LLM concurrency capacity must be >= 1")
@@ -278,7 +492,13 @@ class LLMConcurrencyLimiter:
             raise ValueError("LLM concurrency acquire_timeout_s must be >= 0")
         self._capacity = int(capacity)
         self._acquire_timeout_s = float(acquire_timeout_s)
-        self._sem = asyncio.Semaphore(self._capacity)
+        # Reservations beyond ``capacity`` are clamped, highest lane first.
+        self._slots = _PrioritySlots(
+            self._capacity, reserved, promote_after_s=promote_after_s
+        )
+        self._lane_acquired = dict.fromkeys(PRIORITY_LANES, 0)
+        self._lane_timeouts = dict.fromkeys(PRIORITY_LANES, 0)
+        self._lane_waits = {lane: _WaitHistogram() for lane in PRIORITY_LANES}
         self._cluster_gate = cluster_gate
         self._in_flight = 0
         self._total_acquired = 0
@@ -305,15 +525,30 @@ class LLMConcurrencyLimiter:
             "cluster_enabled": self._cluster_gate is not None,
             "total_cluster_acquired": self._total_cluster_acquired,
             "total_cluster_fallbacks": self._total_cluster_fallbacks,
+            "adaptive": _adaptive_metrics(),
+            "lanes": {
+                lane: {
+                    "reserved": self._slots.reserved[lane],
+                    "in_use": self._slots.in_use[lane],
+                    "waiting": self._slots.waiting(lane),
+                    "acquired": self._lane_acquired[lane],
+                    "timeouts": self._lane_timeouts[lane],
+                    "queue_wait": self._lane_waits[lane].snapshot(),
+                }
+                for lane in PRIORITY_LANES
+            },
         }
 
     @contextlib.asynccontextmanager
-    async def acquire(self, *, tool: str = "unknown") -> AsyncIterator[None]:
+    async def acquire(
+        self, *, tool: str = "unknown", priority: str | None = None
+    ) -> AsyncIterator[None]:
         """Acquire a slot, waiting up to ``acquire_timeout_s`` seconds.
 
         Raises ``LLMConcurrencyTimeoutError`` on timeout of the *local*
         semaphore. The slot is always released on exit, even when the wrapped
-        block raises.
+        block raises. ``priority`` picks the lane (default: the
+        ``llm_priority`` contextvar, i.e. interactive unless marked).
 
         When a cluster gate is configured, a Redis-backed slot is ALSO acquired
         (after the local semaphore) and released on exit. The cluster gate is
@@ -326,6 +561,9 @@ class LLMConcurrencyLimiter:
         cancelled cluster poll-wait nor a cancelled cluster release can leak the
         local slot.
         """
+        lane = priority or _PRIORITY.get()
+        if lane not in PRIORITY_LANES:
+            lane = PRIORITY_INTERACTIVE
         start = time.perf_counter()
         # Fast path: no waiters → log at debug; else log at info with wait estimate.
         currently_used = self._in_flight
@@ -333,23 +571,24 @@ class LLMConcurrencyLimiter:
             logger.info(
                 "llm.concurrency.wait",
                 tool=tool,
+                lane=lane,
                 in_flight=currently_used,
                 capacity=self._capacity,
             )
 
         try:
-            if self._acquire_timeout_s > 0:
-                await asyncio.wait_for(
-                    self._sem.acquire(), timeout=self._acquire_timeout_s
-                )
-            else:
-                await self._sem.acquire()
+            await self._slots.acquire(
+                lane, self._acquire_timeout_s if self._acquire_timeout_s > 0 else None
+            )
         except asyncio.TimeoutError as exc:
             self._total_timeouts += 1
+            self._lane_timeouts[lane] += 1
             waited_s = time.perf_counter() - start
+            self._lane_waits[lane].observe(waited_s)
             logger.warning(
                 "llm.concurrency.timeout",
                 tool=tool,
+                lane=lane,
                 capacity=self._capacity,
                 in_flight=self._in_flight,
                 waited_s=round(waited_s, 3),
@@ -357,6 +596,8 @@ class LLMConcurrencyLimiter:
             raise LLMConcurrencyTimeoutError(
                 tool=tool, capacity=self._capacity, waited_s=waited_s
             ) from exc
+        self._lane_acquired[lane] += 1
+        self._lane_waits[lane].observe(time.perf_counter() - start)
 
         # The local semaphore is now held. EVERYTHING from here on lives inside a
         # single try/finally whose finally ALWAYS releases the local semaphore —
@@ -388,7 +629,7 @@ class LLMConcurrencyLimiter:
         finally:
             if in_flight_incremented:
                 self._in_flight -= 1
-            await self._release_slots(tool=tool, cluster_held=cluster_held)
+            await self._release_slots(tool=tool, lane=lane, cluster_held=cluster_held)
 
     async def _reserve_cluster_slot(self, *, tool: str) -> bool:
         """Best-effort cluster-slot acquire + counter bookkeeping.
@@ -417,8 +658,8 @@ class LLMConcurrencyLimiter:
             self._total_cluster_fallbacks += 1
         return cluster_held
 
-    async def _release_slots(self, *, tool: str, cluster_held: bool) -> None:
-        """Release the LOCAL semaphore FIRST (synchronously), then the cluster.
+    async def _release_slots(self, *, tool: str, lane: str, cluster_held: bool) -> None:
+        """Release the LOCAL slot FIRST (synchronously), then the cluster.
 
         The local release must never be gated behind the awaited cluster
         release: if that await raised ``CancelledError`` the local slot would
@@ -427,8 +668,8 @@ class LLMConcurrencyLimiter:
         the cluster-release point from aborting it mid-flight.
         """
         try:
-            self._sem.release()
-        except Exception:  # pragma: no cover — Semaphore.release never raises in practice.
+            self._slots.release(lane)
+        except Exception:  # pragma: no cover — release never raises in practice.
             logger.warning("llm.concurrency.release_failed", tool=tool, exc_info=True)
         if cluster_held and self._cluster_gate is not None:
             try:
@@ -442,6 +683,17 @@ class LLMConcurrencyLimiter:
                 )
 
 
+def _adaptive_metrics() -> dict[str, Any]:
+    """Live state of the per-model token controller (if enabled)."""
+    try:
+        from app.services.llm_adaptive_concurrency import get_adaptive_limiter
+
+        adaptive = get_adaptive_limiter()
+        return adaptive.metrics() if adaptive is not None else {"enabled": False}
+    except Exception:
+        return {"enabled": False}
+
+
 # ---------------------------------------------------------------------------
 # Process-global accessor
 # ---------------------------------------------------------------------------
@@ -498,10 +750,20 @@ def _build_limiter_from_settings() -> LLMConcurrencyLimiter:
         capacity = int(getattr(llm_cfg, "max_concurrency", 16) or 16)
         timeout_s = float(getattr(llm_cfg, "acquire_timeout_s", 30.0) or 30.0)
         cluster_gate = _build_cluster_gate(llm_cfg)
+        lanes_cfg = getattr(llm_cfg, "priority_lanes", None)
+        reserved = {
+            lane: int(getattr(lanes_cfg, f"{lane}_reserved", 0) or 0)
+            for lane in PRIORITY_LANES
+        }
+        promote_after_s = float(
+            getattr(lanes_cfg, "promote_after_s", DEFAULT_PROMOTE_AFTER_S)
+        )
     except Exception:
         capacity = 16
         timeout_s = 30.0
         cluster_gate = None
+        reserved = None
+        promote_after_s = DEFAULT_PROMOTE_AFTER_S
     if cluster_gate is not None:
         logger.info(
             "llm.concurrency.cluster.enabled",
@@ -509,7 +771,11 @@ def _build_limiter_from_settings() -> LLMConcurrencyLimiter:
             key=cluster_gate._key,
         )
     return LLMConcurrencyLimiter(
-        capacity=capacity, acquire_timeout_s=timeout_s, cluster_gate=cluster_gate
+        capacity=capacity,
+        acquire_timeout_s=timeout_s,
+        cluster_gate=cluster_gate,
+        reserved=reserved,
+        promote_after_s=promote_after_s,
     )
 
 
@@ -528,8 +794,14 @@ def reset_global_limiter_for_tests() -> None:
 
 
 __all__ = [
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_BATCH",
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_LANES",
     "LLMConcurrencyLimiter",
     "LLMConcurrencyTimeoutError",
+    "current_llm_priority",
     "get_global_limiter",
+    "llm_priority",
     "reset_global_limiter_for_tests",
 ]
@@ -0,0 +1,193 @@
+"""Hedged structured LLM calls for tail-latency-critical tools.
+
+``LLMService`` fails over to the cross-provider fallback only after the
+primary exhausts its retries, so a slow-but-alive provider costs the user
+the whole timeout. For tools listed in ``llm.hedging.tools`` the service
+instead races:
+
+  1. start the primary attempt;
+  2. if it has not finished after ``delay_for(tool, model)`` — the
+     configured percentile of that (tool, model)'s recent successful
+     latencies, clamped to ``[min_delay_s, max_delay_s]`` (``cold_delay_s``
+     until ``min_samples`` are seen) — and the per-minute hedge budget
+     allows, start the same call on the fallback model;
+  3. the first attempt to return a VALID structured result wins and the
+     other is cancelled.
+
+Both attempts share the caller's concurrency slot. A completed attempt is
+metered by ``cost_meter.record_llm_cost`` as usual; a cancelled in-flight
+loser is charged its estimated prompt tokens via
+``cost_meter.record_abandoned_llm_call`` (providers bill input for
+abandoned requests), including when the caller itself is cancelled.
+
+Hedging needs the native async transport (``llm.transport.native_async``):
+on the threaded path cancelling an attempt does not stop its worker
+thread, so the loser would run to completion and be billed in full. With
+that switch off, calls take the plain path.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class _LatencyWindow:
+    __slots__ = ("samples",)
+
+    def __init__(self, size: int) -> None:
+        self.samples: deque[float] = deque(maxlen=max(1, size))
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class HedgeBudget:
+    """At most ``per_minute`` hedges in any rolling 60 s window."""
+
+    def __init__(self, per_minute: int, *, clock: Any = time.monotonic) -> None:
+        self.per_minute = max(0, int(per_minute))
+        self._clock = clock
+        self._spent: deque[float] = deque()
+
+    def try_spend(self) -> bool:
+        now = self._clock()
+        while self._spent and now - self._spent[0] >= 60.0:
+            self._spent.popleft()
+        if len(self._spent) >= self.per_minute:
+            return False
+        self._spent.append(now)
+        return True
+
+    def remaining(self) -> int:
+        now = self._clock()
+        return self.per_minute - sum(1 for t in self._spent if now - t < 60.0)
+
+
+class LLMHedger:
+    """Per-(tool, model) latency tracking + hedge decision and stats."""
+
+    def __init__(
+        self,
+        *,
+        tools: frozenset[str] | set[str] | tuple[str, ...],
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay_s: float = 1.0,
+        max_delay_s: float = 20.0,
+        cold_delay_s: float = 8.0,
+        budget_per_minute: int = 30,
+        clock: Any = time.monotonic,
+    ) -> None:
+        self.tools = frozenset(tools)
+        self.percentile = float(percentile)
+        self.min_samples = int(min_samples)
+        self.min_delay_s = float(min_delay_s)
+        self.max_delay_s = float(max_delay_s)
+        self.cold_delay_s = float(cold_delay_s)
+        self.budget = HedgeBudget(budget_per_minute, clock=clock)
+        self._window = int(window)
+        self._latency: dict[tuple[str, str], _LatencyWindow] = {}
+        self._stats = {
+            "hedges_fired": 0,
+            "hedge_wins": 0,
+            "primary_wins": 0,
+            "budget_denied": 0,
+            "losers_cancelled": 0,
+        }
+
+    def applies_to(self, tool: str) -> bool:
+        return tool in self.tools
+
+    def observe(self, tool: str, model: str, latency_s: float) -> None:
+        """Record one SUCCESSFUL attempt's latency."""
+        key = (tool, model)
+        window = self._latency.get(key)
+        if window is None:
+            window = self._latency[key] = _LatencyWindow(self._window)
+        window.samples.append(float(latency_s))
+
+    def delay_for(self, tool: str, model: str) -> float:
+        window = self._latency.get((tool, model))
+        if window is None or len(window.samples) < self.min_samples:
+            delay = self.cold_delay_s
+        else:
+            delay = window.percentile(self.percentile)
+        return min(self.max_delay_s, max(self.min_delay_s, delay))
+
+    def allow_hedge(self, tool: str) -> bool:
+        if self.budget.try_spend():
+            self._stats["hedges_fired"] += 1
+            return True
+        self._stats["budget_denied"] += 1
+        logger.info("llm.hedge.budget_denied", tool=tool)
+        return False
+
+    def record_outcome(self, *, hedge_won: bool, loser_cancelled: bool) -> None:
+        self._stats["hedge_wins" if hedge_won else "primary_wins"] += 1
+        self._stats["losers_cancelled"] += int(loser_cancelled)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "budget_per_minute": self.budget.per_minute,
+            "budget_remaining": self.budget.remaining(),
+            "delay_s": {
+                f"{tool}:{model}": round(self.delay_for(tool, model), 3)
+                for tool, model in sorted(self._latency)
+            },
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_hedger: LLMHedger | None = None
+_built = False
+
+
+def get_llm_hedger() -> LLMHedger | None:
+    """The process-wide hedger, or None when ``llm.hedging`` is off."""
+    global _hedger, _built
+    if not _built:
+        _built = True
+        try:
+            from app.core.config import settings
+
+            cfg = getattr(getattr(settings, "llm", None), "hedging", None)
+            if cfg is not None and bool(getattr(cfg, "enabled", False)):
+                _hedger = LLMHedger(
+                    tools=tuple(cfg.tools),
+                    percentile=cfg.percentile,
+                    min_samples=cfg.min_samples,
+                    window=cfg.window,
+                    min_delay_s=cfg.min_delay_s,
+                    max_delay_s=cfg.max_delay_s,
+                    cold_delay_s=cfg.cold_delay_s,
+                    budget_per_minute=cfg.budget_per_minute,
+                )
+        except Exception:
+            logger.warning("llm.hedge.config_invalid", exc_info=True)
+            _hedger = None
+    return _hedger
+
+
+def reset_llm_hedger_for_tests() -> None:
+    global _hedger, _built
+    _hedger, _built = None, False
+
+
+__all__ = [
+    "HedgeBudget",
+    "LLMHedger",
+    "get_llm_hedger",
+    "reset_llm_hedger_for_tests",
+]
@@ -0,0 +1,329 @@
+"""App-level response cache for topic-scoped structured LLM tools.
+
+LiteLLM's Redis cache (``_init_llm_cache``) keys on the byte-exact payload,
+so "hogwarts houses", "Hogwarts Houses!" and "Which Hogwarts house am I"
+each pay for a full ``initial_planner`` / profile run. This cache sits in
+front of ``invoke_structured`` and keys on the TOPIC instead:
+
+  * **Exact tier** — ``normalize_topic`` (``canonical_key_for_name`` plus
+    punctuation folding) → one Redis GET.
+  * **Semantic tier** (optional, ``semantic_threshold``) — on an exact
+    miss, the topic is embedded with the local icon embedder and compared
+    against the vectors of topics already cached in the same bucket; the
+    nearest one at or above the cosine threshold is served.
+
+A bucket is ``(tool, prompt version, model, variant)``: ``variant`` carries
+every non-topic prompt input (outcome kind, character names, …) so a hit is
+only ever served to a call that would have sent the same prompt modulo the
+topic's spelling. Values are stored as JSON and re-validated against the
+caller's response model on the way out.
+
+Only tools with a configured TTL are cached, and per-user adaptive tools
+(`NEVER_CACHE_TOOLS`) are refused outright. Off by default: identical
+output for "the same" topic trades away variety (see
+``LLMSemanticCacheConfig``). Every Redis / embedding fault fails open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import re
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+import orjson
+import structlog
+from pydantic import TypeAdapter
+
+from app.services.precompute.canonicalize import canonical_key_for_name
+
+logger = structlog.get_logger(__name__)
+
+# Tools whose prompts carry a user's answers / history: a cached response
+# would leak one user's quiz into another's. Refused even if configured.
+NEVER_CACHE_TOOLS: frozenset[str] = frozenset({
+    "decision_maker",
+    "next_question_generator",
+    "final_profile_writer",
+    "blended_profile_writer",
+    "profile_improver",
+})
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+_WS_RE = re.compile(r"\s+")
+# Bound on a single Redis round-trip so a stalled connection degrades to a
+# miss instead of delaying the paid call behind it.
+_REDIS_OP_TIMEOUT_S = 0.5
+
+EmbedFn = Callable[[str], Awaitable[list[float] | None]]
+
+
+def normalize_topic(topic: str) -> str:
+    """``canonical_key_for_name`` with punctuation folded to spaces."""
+    key = canonical_key_for_name(topic)
+    return _WS_RE.sub(" ", _PUNCT_RE.sub(" ", key)).strip()
+
+
+def _digest(obj: Any) -> str:
+    raw = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _pack_vector(vec: list[float]) -> str:
+    import numpy as np  # lazy: only on the semantic path
+
+    return base64.b64encode(np.asarray(vec, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _nearest(query: list[float], packed: Mapping[Any, Any]) -> tuple[str | None, float]:
+    """Best (field, cosine) among ``packed`` vectors (all L2-normalised)."""
+    import numpy as np
+
+    if not packed:
+        return None, 0.0
+    fields = [f.decode() if isinstance(f, bytes) else str(f) for f in packed]
+    matrix = np.stack(
+        [np.frombuffer(base64.b64decode(v), dtype=np.float32) for v in packed.values()]
+    )
+    scores = matrix @ np.asarray(query, dtype=np.float32)
+    best = int(np.argmax(scores))
+    return fields[best], float(scores[best])
+
+
+class _ToolStats:
+    __slots__ = ("hits", "semantic_hits", "misses", "stores", "errors")
+
+    def __init__(self) -> None:
+        self.hits = self.semantic_hits = self.misses = self.stores = self.errors = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+
+class SemanticLLMCache:
+    """Topic-keyed Redis cache of validated structured tool results."""
+
+    def __init__(
+        self,
+        *,
+        redis_factory: Callable[[], Any],
+        namespace: str,
+        tool_ttls_s: Mapping[str, int],
+        semantic_threshold: float | None = None,
+        max_semantic_entries: int = 256,
+        embed_fn: EmbedFn | None = None,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self._ns = namespace
+        self._ttls = {
+            tool: int(ttl)
+            for tool, ttl in tool_ttls_s.items()
+            if tool not in NEVER_CACHE_TOOLS and int(ttl) > 0
+        }
+        self._threshold = semantic_threshold
+        self._max_semantic = max(0, int(max_semantic_entries))
+        self._embed_fn = embed_fn
+        self._stats: dict[str, _ToolStats] = {}
+
+    # ------------------------------------------------------------------
+
+    def cacheable(self, tool: str) -> bool:
+        return tool in self._ttls
+
+    def stats(self) -> dict[str, Any]:
+        return {tool: s.snapshot() for tool, s in sorted(self._stats.items())}
+
+    def _stat(self, tool: str) -> _ToolStats:
+        return self._stats.setdefault(tool, _ToolStats())
+
+    def _redis(self) -> Any | None:
+        try:
+            return self._redis_factory() or None
+        except Exception:
+            return None
+
+    def _bucket(self, tool: str, prompt_version: str, model: str | None, variant: Any) -> str:
+        return f"{self._ns}:{tool}:{_digest([prompt_version, model, variant])}"
+
+    async def _embed(self, topic: str) -> list[float] | None:
+        if self._threshold is None or self._embed_fn is None:
+            return None
+        try:
+            return await self._embed_fn(topic)
+        except Exception:  # noqa: BLE001 — model missing / not installed → exact tier only
+            logger.debug("llm.semantic_cache.embed_failed", exc_info=True)
+            return None
+
+    # ------------------------------------------------------------------
+
+    async def lookup(
+        self,
+        tool: str,
+        *,
+        topic: str,
+        variant: Any,
+        prompt_version: str,
+        model: str | None,
+        response_model: Any,
+    ) -> Any | None:
+        """Validated cached result for this call, or None. Never raises."""
+        if not self.cacheable(tool):
+            return None
+        stat = self._stat(tool)
+        redis = self._redis()
+        norm = normalize_topic(topic)
+        if redis is None or not norm:
+            stat.misses += 1
+            return None
+        bucket = self._bucket(tool, prompt_version, model, variant)
+        try:
+            raw = await _bounded(redis.get(f"{bucket}:{_digest(norm)}"))
+            semantic_from = None
+            if raw is None:
+                raw, semantic_from = await self._semantic_lookup(redis, bucket, norm)
+            if raw is None:
+                stat.misses += 1
+                return None
+            adapter = response_model if isinstance(response_model, TypeAdapter) else TypeAdapter(response_model)
+            value = adapter.validate_python(orjson.loads(raw))
+        except Exception as exc:  # noqa: BLE001 — fail open to a live call
+            stat.errors += 1
+            stat.misses += 1
+            logger.debug("llm.semantic_cache.lookup_failed", tool=tool, error=str(exc))
+            return None
+        stat.hits += 1
+        if semantic_from is not None:
+            stat.semantic_hits += 1
+        logger.info(
+            "llm.semantic_cache.hit",
+            tool=tool,
+            topic=norm,
+            semantic=semantic_from is not None,
+        )
+        return value
+
+    async def _semantic_lookup(self, redis: Any, bucket: str, norm: str) -> tuple[Any, str | None]:
+        vec = await self._embed(norm)
+        if vec is None:
+            return None, None
+        field, score = _nearest(vec, await _bounded(redis.hgetall(f"{bucket}:vec")))
+        if field is None or score < float(self._threshold or 1.0):
+            return None, None
+        raw = await _bounded(redis.get(f"{bucket}:{field}"))
+        return raw, (field if raw is not None else None)
+
+    async def store(
+        self,
+        tool: str,
+        *,
+        topic: str,
+        variant: Any,
+        prompt_version: str,
+        model: str | None,
+        response_model: Any,
+        value: Any,
+    ) -> None:
+        """Cache ``value`` under the topic's exact key (and vector). Never raises."""
+        if not self.cacheable(tool):
+            return
+        redis = self._redis()
+        norm = normalize_topic(topic)
+        if redis is None or not norm or value is None:
+            return
+        stat = self._stat(tool)
+        bucket = self._bucket(tool, prompt_version, model, variant)
+        field = _digest(norm)
+        ttl = self._ttls[tool]
+        try:
+            adapter = response_model if isinstance(response_model, TypeAdapter) else TypeAdapter(response_model)
+            blob = orjson.dumps(adapter.dump_python(value, mode="json"))
+            await _bounded(redis.set(f"{bucket}:{field}", blob, ex=ttl))
+            vec = await self._embed(norm)
+            if vec is not None and self._max_semantic:
+                index = f"{bucket}:vec"
+                if await _bounded(redis.hlen(index)) >= self._max_semantic:
+                    # Full: the index is a hint, not the data — start over
+                    # rather than track per-entry recency.
+                    await _bounded(redis.delete(index))
+                await _bounded(redis.hset(index, field, _pack_vector(vec)))
+                await _bounded(redis.expire(index, ttl))
+            stat.stores += 1
+        except Exception as exc:  # noqa: BLE001
+            stat.errors += 1
+            logger.debug("llm.semantic_cache.store_failed", tool=tool, error=str(exc))
+
+
+async def _bounded(awaitable: Any) -> Any:
+    return await asyncio.wait_for(awaitable, timeout=_REDIS_OP_TIMEOUT_S)
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_cache: SemanticLLMCache | None = None
+_built = False
+
+
+def _default_redis_factory() -> Any | None:
+    try:
+        from app.api.dependencies import get_redis_client
+
+        return get_redis_client()
+    except Exception:
+        return None
+
+
+async def _default_embed(text: str) -> list[float] | None:
+    from app.services.icons.embedder import raw_embed  # lazy: loads fastembed
+
+    return await raw_embed(text)
+
+
+def get_semantic_cache() -> SemanticLLMCache | None:
+    """The process-wide cache, or None when ``llm.semantic_cache`` is off."""
+    global _cache, _built
+    if not _built:
+        _built = True
+        try:
+            from app.core.config import settings
+
+            cfg = getattr(getattr(settings, "llm", None), "semantic_cache", None)
+            if cfg is not None and bool(getattr(cfg, "enabled", False)):
+                _cache = SemanticLLMCache(
+                    redis_factory=_default_redis_factory,
+                    namespace=cfg.namespace,
+                    tool_ttls_s=dict(cfg.tool_ttls_s),
+                    semantic_threshold=cfg.semantic_threshold,
+                    max_semantic_entries=cfg.max_semantic_entries,
+                    embed_fn=_default_embed,
+                )
+        except Exception:
+            logger.warning("llm.semantic_cache.config_invalid", exc_info=True)
+            _cache = None
+    return _cache
+
+
+def reset_semantic_cache_for_tests() -> None:
+    global _cache, _built
+    _cache, _built = None, False
+
+
+__all__ = [
+    "NEVER_CACHE_TOOLS",
+    "SemanticLLMCache",
+    "get_semantic_cache",
+    "normalize_topic",
+    "reset_semantic_cache_for_tests",
+]
@@ -7,7 +7,8 @@ import json
 import logging as _logging
 import os
 import re
-from collections.abc import Iterable
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 import litellm
@@ -17,6 +18,7 @@ from pydantic.type_adapter import TypeAdapter
 
 from app.core.config import settings
 from app.services.retry import retry_async
+from app.services.structured_stream import IncrementalJSONParser, Path
 
 """
 A resilient wrapper over LiteLLM Responses API that guarantees structured
@@ -629,6 +631,135 @@ def _apply_text_params_top_level(payload: dict[str, Any], text_params: dict[str,
 # Service
 # ---------------------------------------------------------------------
 
+def _stream_structured_enabled() -> bool:
+    return bool(getattr(getattr(settings, "llm", None), "stream_structured", True))
+
+
+def _stream_step(
+    event: Any,
+    parser: IncrementalJSONParser,
+    parts: list[str],
+    emit: Callable[[Path, Any], None],
+) -> Any:
+    """Handle one Responses stream event; return the final response if done."""
+    etype = _get(event, "type")
+    if etype == "response.output_text.delta":
+        delta = _get(event, "delta") or ""
+        parts.append(delta)
+        for path, value in parser.feed(delta):
+            emit(path, value)
+    elif etype == "response.completed":
+        return _get(event, "response")
+    return None
+
+
+def _stream_responses(payload: dict[str, Any], emit: Callable[[Path, Any], None]) -> Any:
+    """Blocking streamed ``litellm.responses`` call (runs in a worker thread).
+
+    Feeds each output-text delta to an ``IncrementalJSONParser`` and hands
+    every closed value to ``emit``. Returns the ``response.completed``
+    response object so parsing, size-capping and cost metering see the same
+    shape as a non-streamed call; a stream that ends without one yields a
+    minimal ``{"output_text": ...}`` dict.
+    """
+    parser = IncrementalJSONParser()
+    parts: list[str] = []
+    final: Any = None
+    for event in litellm.responses(**payload, stream=True):
+        final = _stream_step(event, parser, parts, emit) or final
+    if final is None:
+        final = {"output_text": "".join(parts)}
+    return final
+
+
+async def _astream_responses(
+    transport: Any, payload: dict[str, Any], emit: Callable[[Path, Any], None]
+) -> Any:
+    """``_stream_responses`` on the native-async transport (no worker thread)."""
+    parser = IncrementalJSONParser()
+    parts: list[str] = []
+    final: Any = None
+    async with transport.lease(payload.get("model")) as client:
+        stream = await litellm.aresponses(**payload, stream=True, client=client)
+        async for event in stream:
+            final = _stream_step(event, parser, parts, emit) or final
+    if final is None:
+        final = {"output_text": "".join(parts)}
+    return final
+
+
+def _partial_deliverer(on_partial: Callable[[Path, Any], None]) -> Callable[[Path, Any], None]:
+    def _deliver(path: Path, value: Any) -> None:
+        try:
+            on_partial(path, value)
+        except Exception:  # noqa: BLE001 — previews never fail the call
+            logger.debug("llm.stream.on_partial_failed", path=path, exc_info=True)
+
+    return _deliver
+
+
+def _provider_call(
+    payload: dict[str, Any],
+    *,
+    on_partial: Callable[[Path, Any], None] | None,
+    cache: bool | None,
+) -> Callable[[], Awaitable[Any]]:
+    """The awaitable provider round-trip for one attempt: plain or streamed.
+
+    Streaming is used only when a caller wants partials, the kill switch
+    (``llm.stream_structured``) is on, and the call is not a cache opt-in
+    (the LiteLLM response cache stores whole responses). With
+    ``llm.transport.native_async`` (default) the call runs on the pooled
+    async transport; otherwise the blocking client runs in a worker thread.
+    """
+    from app.services.llm_transport import get_llm_transport
+
+    transport = get_llm_transport()
+    stream = on_partial is not None and cache is not True and _stream_structured_enabled()
+
+    if transport is not None:
+        if stream:
+            deliver = _partial_deliverer(on_partial)
+            return lambda: _astream_responses(transport, payload, deliver)
+
+        async def _native() -> Any:
+            async with transport.lease(payload.get("model")) as client:
+                return await litellm.aresponses(**payload, client=client)
+
+        return _native
+
+    if not stream:
+        return lambda: asyncio.to_thread(litellm.responses, **payload)
+
+    async def _streamed() -> Any:
+        loop = asyncio.get_running_loop()
+        deliver = _partial_deliverer(on_partial)
+
+        def emit(path: Path, value: Any) -> None:
+            loop.call_soon_threadsafe(deliver, path, value)
+
+        return await asyncio.to_thread(_stream_responses, payload, emit)
+
+    return _streamed
+
+
+def _hedger_for(tool_name: str, fb: str | None, on_partial: Any) -> Any:
+    """The hedger when this call may be hedged: opted-in tool, a fallback to
+    race, no partial-result consumer (two streams would interleave), and the
+    native async transport. On the threaded path a cancelled loser keeps
+    running in its worker thread and is billed in full, so no hedging."""
+    if fb is None or on_partial is not None:
+        return None
+    from app.services.llm_hedging import get_llm_hedger
+    from app.services.llm_transport import get_llm_transport
+
+    if get_llm_transport() is None:
+        return None
+
+    hedger = get_llm_hedger()
+    return hedger if hedger is not None and hedger.applies_to(tool_name) else None
+
+
 class LLMService:
     """
     Resilient structured-output wrapper around LiteLLM Responses API.
@@ -728,7 +859,15 @@ class LLMService:
         tool_choice: str | dict[str, Any] | None = None,  # ignored for structured calls
         metadata: dict[str, Any] | None = None,
         cache: bool | None = None,
+        on_partial: Callable[[Path, Any], None] | None = None,
     ):
+        """Structured call under the global concurrency limiter.
+
+        ``on_partial`` switches the provider call to streaming: it is invoked
+        on the event loop with ``(path, value)`` for each shallow JSON value
+        as it closes (see ``structured_stream``). The return value is the
+        same validated object either way.
+        """
         # §17.1 (AC-SCALE-LLM-1..3) — bound process-wide LLM concurrency.
         from app.services.llm_concurrency import get_global_limiter
 
@@ -751,6 +890,7 @@ class LLMService:
                 tool_choice=tool_choice,
                 metadata=metadata,
                 cache=cache,
+                on_partial=on_partial,
             )
 
     async def _do_structured_response(
@@ -772,6 +912,7 @@ class LLMService:
         tool_choice: str | dict[str, Any] | None = None,
         metadata: dict[str, Any] | None = None,
         cache: bool | None = None,
+        on_partial: Callable[[Path, Any], None] | None = None,
     ):
         """Run a structured call on the primary model with in-provider retries,
         then — ONLY on a TERMINAL provider error (transient class after retries
@@ -816,54 +957,179 @@ class LLMService:
             "truncation": truncation,
             "metadata": metadata,
             "cache": cache,
+            "on_partial": on_partial,
         }
 
+        hedger = _hedger_for(tool_name, fb, on_partial)
+        if hedger is not None:
+            return await self._hedged_response(primary, fb, common, hedger)
         try:
             return await self._attempt_for_model(model=primary, **common)
         except Exception as primary_exc:
-            # Fail over EXACTLY ONCE, and ONLY for a terminal provider error
-            # (transient class). Deterministic errors (schema/validation/
-            # programming, e.g. StructuredOutputError / ValidationError) are NOT
-            # retried — a different provider can't fix a schema bug, and retrying
-            # would just waste a paid call. No fallback configured → re-raise.
-            if fb is None or not _is_llm_transient(primary_exc):
-                raise
-            logger.warning(
-                "llm.structured.failover.attempt",
+            return await self._fail_over(primary, fb, primary_exc, common)
+
+    async def _fail_over(
+        self,
+        primary: str,
+        fb: str | None,
+        primary_exc: Exception,
+        common: dict[str, Any],
+    ) -> Any:
+        """The single cross-provider retry after ``primary`` failed with ``primary_exc``."""
+        tool_name = common["tool_name"]
+        trace_id = common["trace_id"]
+        session_id = common["session_id"]
+        # Fail over EXACTLY ONCE, and ONLY for a terminal provider error
+        # (transient class). Deterministic errors (schema/validation/
+        # programming, e.g. StructuredOutputError / ValidationError) are NOT
+        # retried — a different provider can't fix a schema bug, and retrying
+        # would just waste a paid call. No fallback configured → re-raise.
+        if fb is None or not _is_llm_transient(primary_exc):
+            raise primary_exc
+        logger.warning(
+            "llm.structured.failover.attempt",
+            primary_model=primary,
+            fallback_model=fb,
+            tool=tool_name,
+            trace_id=trace_id,
+            session_id=session_id,
+            error=str(primary_exc),
+        )
+        try:
+            result = await self._attempt_for_model(model=fb, **common)
+        except Exception as fb_exc:
+            # Both providers down for this call — emit a terminal-exhaustion
+            # metric/log so an OpenAI incident is observable even when the
+            # fallback ALSO fails, then surface the FALLBACK error.
+            logger.error(
+                "llm.structured.failover.exhausted",
                 primary_model=primary,
                 fallback_model=fb,
                 tool=tool_name,
                 trace_id=trace_id,
                 session_id=session_id,
-                error=str(primary_exc),
+                primary_error=str(primary_exc),
+                fallback_error=str(fb_exc),
+                fallback_transient=_is_llm_transient(fb_exc),
             )
-            try:
-                result = await self._attempt_for_model(model=fb, **common)
-            except Exception as fb_exc:
-                # Both providers down for this call — emit a terminal-exhaustion
-                # metric/log so an OpenAI incident is observable even when the
-                # fallback ALSO fails, then surface the FALLBACK error.
-                logger.error(
-                    "llm.structured.failover.exhausted",
-                    primary_model=primary,
-                    fallback_model=fb,
-                    tool=tool_name,
-                    trace_id=trace_id,
-                    session_id=session_id,
-                    primary_error=str(primary_exc),
-                    fallback_error=str(fb_exc),
-                    fallback_transient=_is_llm_transient(fb_exc),
-                )
-                raise
+            raise
+        logger.info(
+            "llm.structured.failover.ok",
+            primary_model=primary,
+            fallback_model=fb,
+            tool=tool_name,
+            trace_id=trace_id,
+            session_id=session_id,
+        )
+        return result
+
+    async def _timed_attempt(self, model: str, common: dict[str, Any], hedger: Any) -> Any:
+        t0 = time.perf_counter()
+        result = await self._attempt_for_model(model=model, **common)
+        hedger.observe(common["tool_name"], model, time.perf_counter() - t0)
+        return result
+
+    async def _hedged_response(
+        self,
+        primary: str,
+        fb: str,
+        common: dict[str, Any],
+        hedger: Any,
+    ) -> Any:
+        """Primary attempt, raced by the fallback once it runs past the hedge delay.
+
+        If the primary finishes (or fails) before the delay, or the hedge
+        budget is spent, this is exactly the un-hedged path including its
+        single failover. Otherwise the first VALID result of the two wins.
+        Attempts still in flight when the caller is cancelled are abandoned
+        and charged like a losing hedge.
+        """
+        tool_name = common["tool_name"]
+        delay_s = hedger.delay_for(tool_name, primary)
+        primary_task = asyncio.create_task(self._timed_attempt(primary, common, hedger))
+        models = {primary_task: primary}
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay_s)
+            if done or not hedger.allow_hedge(tool_name):
+                try:
+                    return await primary_task
+                except Exception as primary_exc:
+                    return await self._fail_over(primary, fb, primary_exc, common)
             logger.info(
-                "llm.structured.failover.ok",
-                primary_model=primary,
-                fallback_model=fb,
+                "llm.hedge.fired",
                 tool=tool_name,
-                trace_id=trace_id,
-                session_id=session_id,
+                primary_model=primary,
+                hedge_model=fb,
+                delay_s=round(delay_s, 3),
+                trace_id=common["trace_id"],
+                session_id=common["session_id"],
+            )
+            hedge_task = asyncio.create_task(self._timed_attempt(fb, common, hedger))
+            models[hedge_task] = fb
+            return await self._race(models, hedge_task, common, hedger)
+        finally:
+            await self._abandon({t for t in models if not t.done()}, models, common)
+
+    async def _race(
+        self,
+        tasks: dict[asyncio.Task, str],
+        hedge_task: asyncio.Task,
+        common: dict[str, Any],
+        hedger: Any,
+    ) -> Any:
+        pending = set(tasks)
+        errors: dict[str, BaseException] = {}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.exception() is None), None)
+            errors.update({tasks[t]: t.exception() for t in done if t.exception() is not None})
+            if winner is None:
+                continue
+            await self._abandon(pending, tasks, common)
+            hedger.record_outcome(hedge_won=winner is hedge_task, loser_cancelled=bool(pending))
+            logger.info(
+                "llm.hedge.won",
+                tool=common["tool_name"],
+                model=tasks[winner],
+                hedge=winner is hedge_task,
+                trace_id=common["trace_id"],
+                session_id=common["session_id"],
+            )
+            return winner.result()
+        primary_exc = errors[tasks[next(t for t in tasks if t is not hedge_task)]]
+        hedge_exc = errors[tasks[hedge_task]]
+        logger.error(
+            "llm.hedge.exhausted",
+            tool=common["tool_name"],
+            trace_id=common["trace_id"],
+            session_id=common["session_id"],
+            primary_error=str(primary_exc),
+            fallback_error=str(hedge_exc),
+        )
+        raise hedge_exc
+
+    @staticmethod
+    async def _abandon(
+        losers: set[asyncio.Task], models: dict[asyncio.Task, str], common: dict[str, Any]
+    ) -> None:
+        """Cancel in-flight losers and charge each its estimated prompt tokens."""
+        if not losers:
+            return
+        for task in losers:
+            task.cancel()
+        await asyncio.gather(*losers, return_exceptions=True)
+        from app.services import cost_meter
+        from app.services.llm_adaptive_concurrency import estimate_call_tokens
+
+        prompt_tokens = estimate_call_tokens(_messages_to_input(common["messages"]), 0)
+        for task in losers:
+            await cost_meter.record_abandoned_llm_call(
+                model=models[task],
+                prompt_tokens=prompt_tokens,
+                tool=common["tool_name"],
+                trace_id=common["trace_id"],
+                session_id=common["session_id"],
             )
-            return result
 
     async def _attempt_for_model(  # noqa: C901
         self,
@@ -882,6 +1148,7 @@ class LLMService:
         truncation: str | None = None,
         metadata: dict[str, Any] | None = None,
         cache: bool | None = None,
+        on_partial: Callable[[Path, Any], None] | None = None,
     ):
         """One full structured attempt against a SINGLE model: build payload →
         in-provider retry → log → cost-meter → size-cap → parse → validate.
@@ -923,8 +1190,23 @@ class LLMService:
                     session_id=session_id,
                 )
 
+            from app.services.llm_adaptive_concurrency import (
+                estimate_call_tokens,
+                get_adaptive_limiter,
+            )
+
+            adaptive = get_adaptive_limiter()
+            est_tokens = estimate_call_tokens(payload.get("input"), payload.get("max_output_tokens"))
+
+            send = _provider_call(payload, on_partial=on_partial, cache=cache)
+
             async def _call() -> Any:
-                return await asyncio.to_thread(litellm.responses, **payload)
+                if adaptive is None:
+                    return await send()
+                # Per-attempt token admission: retry backoff holds no budget,
+                # and each 429/timeout feeds the model's AIMD lane.
+                async with adaptive.admit(mdl, est_tokens, tool=tool_name):
+                    return await send()
 
             resp = await retry_async(
                 _call,
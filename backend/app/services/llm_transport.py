@@ -0,0 +1,205 @@
+"""Native-async LLM transport: pooled keep-alive HTTP clients per provider.
+
+The original call path ran the blocking ``litellm.responses`` in
+``asyncio.to_thread``, so every in-flight LLM call pinned a thread of the
+default executor — ``min(32, cpu + 4)`` per worker, i.e. 5 on a one-vCPU
+container — no matter how many slots ``LLMConcurrencyLimiter`` granted.
+
+Here the call goes through ``litellm.aresponses`` with an explicit
+``AsyncHTTPHandler`` per provider, each wrapping one ``httpx`` connection
+pool:
+
+  * keep-alive pool sized by ``llm.transport`` (``max_connections`` /
+    ``max_keepalive_connections`` / ``keepalive_expiry_s``);
+  * HTTP/2 for providers listed in ``http2_providers`` when the optional
+    ``h2`` package is installed (otherwise HTTP/1.1, silently);
+  * ``metrics()`` — per-provider pool size, open / idle connections and
+    calls in use.
+
+``llm.transport.native_async = False`` restores the threaded path.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_DEFAULT_PROVIDER = "openai"
+
+
+def provider_for(model: str | None) -> str:
+    """LiteLLM provider name for ``model`` (``"openai"`` when unknown)."""
+    if not model:
+        return _DEFAULT_PROVIDER
+    try:
+        import litellm
+
+        return str(litellm.get_llm_provider(model)[1] or _DEFAULT_PROVIDER)
+    except Exception:
+        prefix, sep, _ = model.partition("/")
+        return prefix if sep else _DEFAULT_PROVIDER
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class _ProviderPool:
+    handler: Any
+    transport: Any
+    http2: bool
+    in_use: int = 0
+    peak_in_use: int = 0
+    calls: int = 0
+
+    def connection_counts(self) -> tuple[int, int]:
+        """(open, idle) connections in the underlying httpcore pool."""
+        try:
+            conns = list(self.transport._pool.connections)
+        except Exception:
+            return 0, 0
+        idle = 0
+        for conn in conns:
+            with contextlib.suppress(Exception):
+                idle += bool(conn.is_idle())
+        return len(conns), idle
+
+
+class LLMTransportPool:
+    """Lazily-built per-provider ``AsyncHTTPHandler`` + httpx pool."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        keepalive_expiry_s: float = 30.0,
+        http2_providers: frozenset[str] | set[str] | tuple[str, ...] = (),
+    ) -> None:
+        self.max_connections = int(max_connections)
+        self.max_keepalive_connections = int(max_keepalive_connections)
+        self.keepalive_expiry_s = float(keepalive_expiry_s)
+        self._http2_providers = frozenset(http2_providers)
+        self._pools: dict[str, _ProviderPool] = {}
+
+    def _build(self, provider: str) -> _ProviderPool:
+        import httpx
+        from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler
+
+        http2 = provider in self._http2_providers and http2_available()
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry_s,
+            ),
+        )
+        handler = AsyncHTTPHandler(transport=transport, client_alias=f"quizzical-{provider}")
+        logger.info(
+            "llm.transport.pool_created",
+            provider=provider,
+            http2=http2,
+            max_connections=self.max_connections,
+        )
+        return _ProviderPool(handler=handler, transport=transport, http2=http2)
+
+    def _pool(self, provider: str) -> _ProviderPool:
+        pool = self._pools.get(provider)
+        if pool is None:
+            pool = self._pools[provider] = self._build(provider)
+        return pool
+
+    @contextlib.asynccontextmanager
+    async def lease(self, model: str | None) -> AsyncIterator[Any]:
+        """Yield the provider's handler (pass as ``client=``) for one call."""
+        pool = self._pool(provider_for(model))
+        pool.in_use += 1
+        pool.calls += 1
+        pool.peak_in_use = max(pool.peak_in_use, pool.in_use)
+        try:
+            yield pool.handler
+        finally:
+            pool.in_use -= 1
+
+    def metrics(self) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for provider, pool in sorted(self._pools.items()):
+            open_conns, idle = pool.connection_counts()
+            out[provider] = {
+                "http2": pool.http2,
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "connections": open_conns,
+                "idle_connections": idle,
+                "in_use": pool.in_use,
+                "peak_in_use": pool.peak_in_use,
+                "calls": pool.calls,
+            }
+        return out
+
+    async def aclose(self) -> None:
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            with contextlib.suppress(Exception):
+                await pool.handler.client.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_transport: LLMTransportPool | None = None
+_built = False
+
+
+def get_llm_transport() -> LLMTransportPool | None:
+    """The process-wide pool, or None when ``llm.transport.native_async`` is off."""
+    global _transport, _built
+    if not _built:
+        _built = True
+        try:
+            from app.core.config import settings
+
+            cfg = getattr(getattr(settings, "llm", None), "transport", None)
+            if cfg is None or bool(getattr(cfg, "native_async", True)):
+                _transport = LLMTransportPool(
+                    max_connections=getattr(cfg, "max_connections", 64),
+                    max_keepalive_connections=getattr(cfg, "max_keepalive_connections", 32),
+                    keepalive_expiry_s=getattr(cfg, "keepalive_expiry_s", 30.0),
+                    http2_providers=tuple(getattr(cfg, "http2_providers", ()) or ()),
+                )
+        except Exception:
+            logger.warning("llm.transport.config_invalid", exc_info=True)
+            _transport = None
+    return _transport
+
+
+async def close_llm_transport() -> None:
+    global _transport, _built
+    transport, _transport, _built = _transport, None, False
+    if transport is not None:
+        await transport.aclose()
+
+
+def reset_llm_transport_for_tests() -> None:
+    global _transport, _built
+    _transport, _built = None, False
+
+
+__all__ = [
+    "LLMTransportPool",
+    "close_llm_transport",
+    "get_llm_transport",
+    "http2_available",
+    "provider_for",
+    "reset_llm_transport_for_tests",
+]
@@ -0,0 +1,160 @@
+"""Responsive derivatives (resized WebP / AVIF) for locally-rehosted images.
+
+Character art is generated at 256–512 px and shown in the cast at ~56 CSS px,
+yet `/api/media/{id}` only ever served the full-size blob. At rehost time
+(`scripts/rehost_fal_images.py`, and `scripts/backfill_prod_images.py` through
+it) each original now also gets a few downscaled variants at the fixed widths
+in `image_storage.derivative_widths`. Every variant is its own
+content-addressed `media_assets` row (sha256 over the encoded bytes, so the
+disk cache, ETag and blob migration all treat it like any other asset), and
+the original's `prompt_payload.derivatives` lists them:
+
+    {"id": "<uuid>", "content_hash": "<sha256>", "width": 128,
+     "content_type": "image/avif", "bytes": 3120}
+
+`GET /api/media/{id}?w=128` picks the narrowest listed variant at least that
+wide in a format the client `Accept`s (smallest first when two formats tie),
+and falls back to the original when none qualifies — so the URL stays valid
+whether or not an asset has derivatives yet.
+
+Pillow is optional (`pip install -e '.[image-derivatives]'`); without it, or
+without an encoder for a format, generation returns fewer (or no) variants
+and serving is unchanged.
+"""
+
+from __future__ import annotations
+
+import io
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from app.services.media.local_provider import compute_content_hash
+
+logger = structlog.get_logger(__name__)
+
+# Pillow format name → served Content-Type, in preference order.
+_FORMATS: dict[str, str] = {"avif": "image/avif", "webp": "image/webp"}
+
+
+@dataclass(frozen=True)
+class Derivative:
+    width: int
+    height: int
+    content_type: str
+    data: bytes
+
+    @property
+    def content_hash(self) -> str:
+        return compute_content_hash(self.data)
+
+    def manifest_entry(self, asset_id: str) -> dict[str, Any]:
+        """The `prompt_payload.derivatives[]` entry for this variant's row."""
+        return {
+            "id": str(asset_id),
+            "content_hash": self.content_hash,
+            "width": self.width,
+            "content_type": self.content_type,
+            "bytes": len(self.data),
+        }
+
+
+def available_formats() -> list[str]:
+    """Formats this interpreter can encode; empty when Pillow is missing."""
+    try:
+        from PIL import features
+    except ImportError:
+        return []
+    return [fmt for fmt in _FORMATS if features.check(fmt)]
+
+
+def generate_derivatives(
+    data: bytes,
+    *,
+    widths: Iterable[int],
+    formats: Iterable[str],
+    quality: int = 70,
+) -> list[Derivative]:
+    """Downscale `data` to each width (narrower than the source) per format.
+
+    A variant that would not be smaller than the original is dropped. Never
+    raises: undecodable input or a missing encoder yields fewer variants.
+    """
+    wanted = [f for f in formats if f in available_formats()]
+    if not wanted:
+        return []
+    try:
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(data)) as src:
+            img = ImageOps.exif_transpose(src)
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    except Exception as e:
+        logger.warning("media.derivatives.decode_failed", error=str(e))
+        return []
+
+    out: list[Derivative] = []
+    for width in sorted({int(w) for w in widths if int(w) > 0}):
+        if width >= img.width:
+            continue
+        height = max(1, round(img.height * width / img.width))
+        resized = img.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in wanted:
+            try:
+                buf = io.BytesIO()
+                resized.save(buf, format=fmt.upper(), quality=quality)
+            except Exception as e:
+                logger.warning("media.derivatives.encode_failed", format=fmt, error=str(e))
+                continue
+            encoded = buf.getvalue()
+            if len(encoded) < len(data):
+                out.append(Derivative(width, height, _FORMATS[fmt], encoded))
+    return out
+
+
+def _accepted_types(accept: str | None) -> set[str]:
+    # Browsers that decode AVIF/WebP advertise them explicitly; `*/*` alone
+    # doesn't promise either, so it never selects a variant.
+    if not accept:
+        return set()
+    types = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+    return types & set(_FORMATS.values())
+
+
+def _valid_entry(e: object) -> bool:
+    if not isinstance(e, dict) or not isinstance(e.get("width"), int):
+        return False
+    try:
+        uuid.UUID(str(e.get("id")))
+    except ValueError:
+        return False
+    return isinstance(e.get("content_hash"), str) and bool(e["content_hash"])
+
+
+def select_derivative(
+    payload: object, *, width: int | None, accept: str | None
+) -> dict[str, Any] | None:
+    """Manifest entry to serve for `?w=width` under `accept`; None → original."""
+    if not width or width <= 0 or not isinstance(payload, dict):
+        return None
+    entries: Sequence[Any] = payload.get("derivatives") or ()
+    accepted = _accepted_types(accept)
+    fits = [
+        e
+        for e in entries
+        if _valid_entry(e) and e.get("content_type") in accepted and e["width"] >= width
+    ]
+    if not fits:
+        return None
+    return min(fits, key=lambda e: (e["width"], e.get("bytes") or 0))
+
+
+__all__ = [
+    "Derivative",
+    "available_formats",
+    "generate_derivatives",
+    "select_derivative",
+]
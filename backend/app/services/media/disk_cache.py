@@ -0,0 +1,188 @@
+"""Content-addressed on-disk cache for locally-rehosted media bytes.
+
+`GET /api/media/{id}` used to pull the whole `bytes_blob` out of Postgres
+and copy it into the response on every non-304 hit. The bytes behind a
+`content_hash` never change, so each worker keeps a file per hash under
+`image_storage.disk_cache_dir` and serves it with `FileResponse` (Range
+support, streamed from a handle opened before the headers go out). A miss
+reads the blob once, verifies it against the hash, and writes the file
+atomically (temp file + `os.replace`) so concurrent workers never serve a
+partial file.
+
+Layout: `<root>/<hash[:2]>/<hash>`. The directory is bounded by
+`disk_cache_max_mb`; when a fill pushes it over, the least-recently-served
+files (by mtime, touched on hit) are evicted down to 90 % of the bound.
+Every filesystem fault degrades to serving the bytes from memory. Lookups,
+fills and evictions all run in worker threads, off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import structlog
+
+from app.services.media.local_provider import compute_content_hash
+
+logger = structlog.get_logger(__name__)
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+# Re-touch a hit's mtime at most this often (LRU signal; saves a syscall per hit).
+_TOUCH_INTERVAL_S = 60.0
+
+
+class MediaDiskCache:
+    """`content_hash` → file path, filled on first read."""
+
+    def __init__(self, root: str | os.PathLike[str], *, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._approx_bytes: int | None = None
+        self.hits = self.fills = self.evictions = self.errors = 0
+
+    def path_for(self, content_hash: str) -> Path | None:
+        """Cache path for a sha256 hex digest; None for anything else."""
+        if not isinstance(content_hash, str) or not _HASH_RE.match(content_hash):
+            return None
+        return self.root / content_hash[:2] / content_hash
+
+    async def lookup(self, content_hash: str) -> tuple[Path, os.stat_result] | None:
+        """`(path, stat)` for a cached hash; the stat saves the server a re-stat."""
+        path = self.path_for(content_hash)
+        if path is None:
+            return None
+        hit = await asyncio.to_thread(self._lookup_sync, path)
+        if hit is not None:
+            self.hits += 1
+        return hit
+
+    def _lookup_sync(self, path: Path) -> tuple[Path, os.stat_result] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        now = time.time()
+        if now - st.st_mtime > _TOUCH_INTERVAL_S:
+            with contextlib.suppress(OSError):
+                os.utime(path, (now, now))
+        return path, st
+
+    async def fill(self, content_hash: str, data: bytes) -> Path | None:
+        """Write `data` for `content_hash`; None when it can't be cached."""
+        path = self.path_for(content_hash)
+        if path is None or self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return None
+        try:
+            return await asyncio.to_thread(self._fill_sync, path, content_hash, data)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("media.disk_cache.fill_failed", content_hash=content_hash, error=str(e))
+            return None
+
+    def _fill_sync(self, path: Path, content_hash: str, data: bytes) -> Path | None:
+        # Never let a mislabelled row poison the file another asset will serve.
+        if compute_content_hash(data) != content_hash:
+            logger.warning("media.disk_cache.hash_mismatch", content_hash=content_hash)
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".fill-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        self.fills += 1
+        self._account(len(data))
+        return path
+
+    def _account(self, added: int) -> None:
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan_bytes()
+            else:
+                self._approx_bytes += added
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out: list[tuple[float, int, Path]] = []
+        for shard in self.root.iterdir() if self.root.is_dir() else ():
+            if not shard.is_dir():
+                continue
+            for f in shard.iterdir():
+                if f.name.startswith(".fill-"):
+                    continue
+                with contextlib.suppress(OSError):
+                    st = f.stat()
+                    out.append((st.st_mtime, st.st_size, f))
+        return out
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, f in entries:
+            if total <= target:
+                break
+            with contextlib.suppress(OSError):
+                f.unlink()
+                total -= size
+                self.evictions += 1
+        self._approx_bytes = total
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "fills": self.fills,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "approx_bytes": self._approx_bytes or 0,
+        }
+
+
+_cache: MediaDiskCache | None = None
+_built = False
+
+
+def get_media_disk_cache() -> MediaDiskCache | None:
+    """The process-wide cache, or None when disabled in settings."""
+    global _cache, _built
+    if not _built:
+        _built = True
+        from app.core.config import settings
+
+        cfg = getattr(getattr(settings, "precompute", None), "image_storage", None)
+        if cfg is not None and getattr(cfg, "disk_cache_enabled", True):
+            root = getattr(cfg, "disk_cache_dir", None) or os.path.join(
+                tempfile.gettempdir(), "quizzical-media"
+            )
+            _cache = MediaDiskCache(
+                root, max_bytes=int(getattr(cfg, "disk_cache_max_mb", 512)) * 1024 * 1024
+            )
+    return _cache
+
+
+def reset_media_disk_cache_for_tests() -> None:
+    global _cache, _built
+    _cache, _built = None, False
+
+
+__all__ = [
+    "MediaDiskCache",
+    "get_media_disk_cache",
+    "reset_media_disk_cache_for_tests",
+]
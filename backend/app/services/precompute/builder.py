@@ -32,6 +32,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db import PrecomputeJob, Topic
 from app.services.icons.hook import maybe_bind_icons
+from app.services.llm_concurrency import PRIORITY_BATCH, llm_priority
 from app.services.precompute import canonical_gate, cost_guard, jobs
 from app.services.precompute.evaluator import (
     EscalateToTier3,
@@ -154,7 +155,8 @@ async def run_build(  # noqa: C901 — orchestrator: branching is inherent to th
         await jobs.transition(db, job, to=jobs.JobStatus.RUNNING, tier=next_tier)
         current_tier = next_tier
         try:
-            artefact, cost_cents = await generate_fn(topic, current_tier)
+            with llm_priority(PRIORITY_BATCH):
+                artefact, cost_cents = await generate_fn(topic, current_tier)
         except Exception as exc:  # noqa: BLE001 — generator failures are logged + re-queued
             logger.exception("precompute.build.generate_failed", topic_id=str(topic.id), tier=current_tier)
             await jobs.transition(
@@ -177,9 +179,10 @@ async def run_build(  # noqa: C901 — orchestrator: branching is inherent to th
         artefact, _ = await maybe_bind_icons(db, artefact)
 
         try:
-            result = await evaluate_fn(
-                artefact, current_tier, pass_score, False
-            )
+            with llm_priority(PRIORITY_BATCH):
+                result = await evaluate_fn(
+                    artefact, current_tier, pass_score, False
+                )
         except EscalateToTier3 as esc:
             logger.info(
                 "precompute.build.escalate_tier3",
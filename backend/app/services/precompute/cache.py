@@ -14,6 +14,10 @@ that cost in two layers:
    storage_uri pinned at `media:hot:{asset_id}` so renderers never miss
    the asset on first paint (`AC-PRECOMP-PERF-6`).
 
+`get_pack` / `get_hydrated_pack` sit behind a per-worker in-process L1
+of decoded objects (`pack_l1.py`); the invalidate helpers also broadcast
+on `tk:pack:invalidate` so every worker drops its copy.
+
 All Redis interactions tolerate transient outages by returning
 `None` / treating the cache as a MISS — the caller falls back to the
 DB JOIN. We never raise from this module on a Redis fault, matching
@@ -25,7 +29,7 @@ Keys & TTLs (single source of truth):
 |------------------------------|----------------------------------|-----|
 | `tk:pack:{topic_id}`         | resolved pack JSON               | 1h  |
 | `tk:pack:lock:{topic_id}`    | SETNX fill lock                  | 30s |
-| `tk:hpack:{pack_id}`         | fully hydrated pack JSON (P11)   | 1h  |
+| `tk:hpack:{pack_id}`         | hydrated pack (compact orjson)   | 1h  |
 | `media:hot:{asset_id}`       | pinned `storage_uri` for hot ref | 24h |
 """
 
@@ -39,6 +43,10 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+import orjson
+
+from app.services.precompute.pack_l1 import get_pack_l1
+
 if TYPE_CHECKING:  # import only for typing — keep runtime imports lazy/cheap
     from app.services.precompute.hydrator import HydratedPack
 
@@ -127,6 +135,11 @@ async def get_pack(redis, topic_id: UUID | str) -> ResolvedPack | None:
     if redis is None:
         return None
     key = PACK_KEY_FMT.format(topic_id=_to_str(topic_id))
+    l1 = get_pack_l1()
+    cached = await l1.get(redis, key)
+    if cached is not None:
+        return cached
+    generation = l1.generation
     try:
         raw = await redis.get(key)
     except Exception:  # noqa: BLE001 — fail-open by design
@@ -134,7 +147,9 @@ async def get_pack(redis, topic_id: UUID | str) -> ResolvedPack | None:
         return None
     if raw is None:
         return None
-    return ResolvedPack.from_json(raw)
+    pack = ResolvedPack.from_json(raw)
+    l1.put(key, pack, generation=generation)
+    return pack
 
 
 async def set_pack(
@@ -148,8 +163,11 @@ async def set_pack(
     if redis is None:
         return False
     key = PACK_KEY_FMT.format(topic_id=pack.topic_id)
+    l1 = get_pack_l1()
+    generation = l1.generation
     try:
         await redis.set(key, pack.to_json(), ex=ttl_s)
+        l1.put(key, pack, generation=generation)
         return True
     except Exception:  # noqa: BLE001
         logger.debug("precompute.cache.set_failed key=%s", key, exc_info=True)
@@ -166,9 +184,11 @@ async def invalidate_pack(redis, topic_id: UUID | str) -> bool:
     key = PACK_KEY_FMT.format(topic_id=_to_str(topic_id))
     try:
         await redis.delete(key)
+        await get_pack_l1().invalidate(redis, key)
         return True
     except Exception:  # noqa: BLE001
         logger.debug("precompute.cache.invalidate_failed key=%s", key, exc_info=True)
+        get_pack_l1().cache.discard(key)
         return False
 
 
@@ -187,44 +207,87 @@ async def invalidate_pack(redis, topic_id: UUID | str) -> bool:
 # ---------------------------------------------------------------------------
 
 
-def _hydrated_pack_to_json(pack: "HydratedPack") -> str:
-    return json.dumps(
-        {
-            "pack_id": str(pack.pack_id),
-            "topic_id": str(pack.topic_id),
-            "synopsis": dict(pack.synopsis),
-            "characters": [dict(c) for c in pack.characters],
-            "baseline_questions": [dict(q) for q in pack.baseline_questions],
-        },
-        separators=(",", ":"),
-        ensure_ascii=False,
+# Compact positional encoding (orjson bytes) for `tk:hpack:*`. Field names
+# are written once here instead of once per character/question, and orjson
+# encodes/decodes several times faster than the stdlib. Readers still accept
+# the legacy JSON-object form so a rolling deploy keeps its warm entries.
+# Bump `_HPACK_FORMAT` whenever the field tuples change.
+_HPACK_FORMAT = 1
+_HPACK_SYNOPSIS_FIELDS = ("title", "summary")
+_HPACK_CHARACTER_FIELDS = ("name", "short_description", "profile_text", "image_url")
+_HPACK_QUESTION_FIELDS = ("question_text", "options", "progress_phrase")
+
+
+def _pack_rows(items: Any, fields: tuple[str, ...]) -> list[list[Any]]:
+    return [[item.get(f) for f in fields] for item in items]
+
+
+def _unpack_rows(rows: Any, fields: tuple[str, ...]) -> tuple[dict[str, Any], ...]:
+    # strict zip: a width mismatch raises ValueError → read as a MISS.
+    return tuple(dict(zip(fields, row, strict=True)) for row in rows)
+
+
+def _hydrated_pack_to_bytes(pack: "HydratedPack") -> bytes:
+    return orjson.dumps(
+        [
+            _HPACK_FORMAT,
+            str(pack.pack_id),
+            str(pack.topic_id),
+            [pack.synopsis.get(f) for f in _HPACK_SYNOPSIS_FIELDS],
+            _pack_rows(pack.characters, _HPACK_CHARACTER_FIELDS),
+            _pack_rows(pack.baseline_questions, _HPACK_QUESTION_FIELDS),
+        ]
     )
 
 
-def _hydrated_pack_from_json(raw: str | bytes) -> "HydratedPack | None":
+def _hydrated_pack_from_bytes(raw: str | bytes) -> "HydratedPack | None":
     from app.services.precompute.hydrator import HydratedPack
 
     try:
-        data = json.loads(raw)
+        data = orjson.loads(raw)
+        if isinstance(data, dict):
+            return _hydrated_pack_from_legacy(data)
+        fmt, pack_id, topic_id, synopsis, characters, questions = data
+        if fmt != _HPACK_FORMAT:
+            return None
         return HydratedPack(
-            pack_id=UUID(str(data["pack_id"])),
-            topic_id=UUID(str(data["topic_id"])),
-            synopsis=dict(data["synopsis"]),
-            characters=tuple(dict(c) for c in data.get("characters") or ()),
-            baseline_questions=tuple(
-                dict(q) for q in data.get("baseline_questions") or ()
-            ),
+            pack_id=UUID(str(pack_id)),
+            topic_id=UUID(str(topic_id)),
+            synopsis=dict(zip(_HPACK_SYNOPSIS_FIELDS, synopsis, strict=True)),
+            characters=_unpack_rows(characters, _HPACK_CHARACTER_FIELDS),
+            baseline_questions=_unpack_rows(questions, _HPACK_QUESTION_FIELDS),
         )
     except (KeyError, TypeError, ValueError, AttributeError):
         return None
 
 
+def _hydrated_pack_from_legacy(data: dict[str, Any]) -> "HydratedPack":
+    """Decode the pre-compact JSON-object form (entries written before the
+    orjson encoding shipped; they age out within `HYDRATED_PACK_TTL_S`)."""
+    from app.services.precompute.hydrator import HydratedPack
+
+    return HydratedPack(
+        pack_id=UUID(str(data["pack_id"])),
+        topic_id=UUID(str(data["topic_id"])),
+        synopsis=dict(data["synopsis"]),
+        characters=tuple(dict(c) for c in data.get("characters") or ()),
+        baseline_questions=tuple(
+            dict(q) for q in data.get("baseline_questions") or ()
+        ),
+    )
+
+
 async def get_hydrated_pack(redis, pack_id: UUID | str) -> "HydratedPack | None":
     """Return the cached `HydratedPack` or `None` on MISS / Redis error /
     corrupt payload. Never raises."""
     if redis is None:
         return None
     key = HYDRATED_PACK_KEY_FMT.format(pack_id=_to_str(pack_id))
+    l1 = get_pack_l1()
+    cached = await l1.get(redis, key)
+    if cached is not None:
+        return cached
+    generation = l1.generation
     try:
         raw = await redis.get(key)
     except Exception:  # noqa: BLE001 — fail-open by design
@@ -232,7 +295,9 @@ async def get_hydrated_pack(redis, pack_id: UUID | str) -> "HydratedPack | None"
         return None
     if raw is None:
         return None
-    return _hydrated_pack_from_json(raw)
+    pack = _hydrated_pack_from_bytes(raw)
+    l1.put(key, pack, generation=generation)
+    return pack
 
 
 async def set_hydrated_pack(
@@ -246,8 +311,11 @@ async def set_hydrated_pack(
     if redis is None or pack is None:
         return False
     key = HYDRATED_PACK_KEY_FMT.format(pack_id=_to_str(pack.pack_id))
+    l1 = get_pack_l1()
+    generation = l1.generation
     try:
-        await redis.set(key, _hydrated_pack_to_json(pack), ex=ttl_s)
+        await redis.set(key, _hydrated_pack_to_bytes(pack), ex=ttl_s)
+        l1.put(key, pack, generation=generation)
         return True
     except Exception:  # noqa: BLE001
         logger.debug("precompute.cache.hset_failed key=%s", key, exc_info=True)
@@ -263,9 +331,11 @@ async def invalidate_hydrated_pack(redis, pack_id: UUID | str) -> bool:
     key = HYDRATED_PACK_KEY_FMT.format(pack_id=_to_str(pack_id))
     try:
         await redis.delete(key)
+        await get_pack_l1().invalidate(redis, key)
         return True
     except Exception:  # noqa: BLE001
         logger.debug("precompute.cache.hinvalidate_failed key=%s", key, exc_info=True)
+        get_pack_l1().cache.discard(key)
         return False
 
 
@@ -23,7 +23,8 @@ from dataclasses import dataclass
 from typing import Any
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import Uuid, select, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db import (
@@ -34,6 +35,7 @@ from app.models.db import (
     Synopsis,
     TopicPack,
 )
+from app.services.precompute.mv_refresh import _is_postgres
 
 logger = structlog.get_logger("app.services.precompute.hydrator")
 
@@ -107,6 +109,11 @@ async def hydrate_pack(
       - the synopsis row is missing;
       - the character set composition has no ``character_ids``;
       - none of the referenced character rows exist.
+
+    On Postgres this is ONE round trip (`_HYDRATE_SQL`: the pack header
+    joined to its synopsis/sets, with the composition id lists expanded and
+    aggregated server-side). Other dialects (the SQLite test bench) run the
+    joined header SELECT plus one SELECT each for characters and questions.
     """
     # Coerce string ids (resolver returns ``str``) into ``uuid.UUID`` for the
     # native ``UUID`` column comparison; SQLAlchemy's bind processor calls
@@ -117,49 +124,149 @@ async def hydrate_pack(
         except ValueError:
             return None
 
-    pack = (
-        await db.execute(select(TopicPack).where(TopicPack.id == pack_id))
-    ).scalar_one_or_none()
-    if pack is None or pack.status != "published":
-        return None
+    if _is_postgres(db):
+        return await _hydrate_single_query(db, pack_id)
+    return await _hydrate_joined(db, pack_id)
 
-    syn = (
-        await db.execute(select(Synopsis).where(Synopsis.id == pack.synopsis_id))
-    ).scalar_one_or_none()
-    if syn is None or not isinstance(syn.body, dict):
-        logger.info(
-            "precompute.hydrator.synopsis_missing",
-            pack_id=str(pack_id),
-            synopsis_id=str(pack.synopsis_id) if pack.synopsis_id else None,
-        )
+
+# Composition ids are stored as JSON strings; guard the ``::uuid`` cast so a
+# malformed id is skipped (as `_coerce_uuid_list` does) instead of failing
+# the whole statement. ``WITH ORDINALITY`` keeps composition order.
+_UUID_RE = r"^\{?[0-9a-fA-F]{8}-?([0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}\}?$"
+
+_HYDRATE_SQL = text(
+    """
+    SELECT
+      tp.id        AS pack_id,
+      tp.topic_id  AS topic_id,
+      tp.status    AS status,
+      tp.synopsis_id AS synopsis_id,
+      s.body       AS synopsis_body,
+      (
+        SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                 'name', c.name,
+                 'short_description', c.short_description,
+                 'profile_text', c.profile_text,
+                 'image_url', c.image_url
+               ) ORDER BY ids.ord), '[]'::jsonb)
+        FROM jsonb_array_elements_text(
+               CASE WHEN jsonb_typeof(cs.composition -> 'character_ids') = 'array'
+                    THEN cs.composition -> 'character_ids' ELSE '[]'::jsonb END
+             ) WITH ORDINALITY AS ids(raw_id, ord)
+        JOIN characters c
+          ON c.id = CASE WHEN ids.raw_id ~ :uuid_re THEN ids.raw_id::uuid END
+      ) AS characters,
+      (
+        SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                 'question_text', q.text,
+                 'options', q.options -> 'items'
+               ) ORDER BY ids.ord), '[]'::jsonb)
+        FROM jsonb_array_elements_text(
+               CASE WHEN jsonb_typeof(b.composition -> 'question_ids') = 'array'
+                    THEN b.composition -> 'question_ids' ELSE '[]'::jsonb END
+             ) WITH ORDINALITY AS ids(raw_id, ord)
+        JOIN questions q
+          ON q.id = CASE WHEN ids.raw_id ~ :uuid_re THEN ids.raw_id::uuid END
+        WHERE jsonb_typeof(q.options -> 'items') = 'array'
+          AND jsonb_array_length(q.options -> 'items') > 0
+      ) AS questions
+    FROM topic_packs tp
+    LEFT JOIN synopses s ON s.id = tp.synopsis_id
+    LEFT JOIN character_sets cs ON cs.id = tp.character_set_id
+    LEFT JOIN baseline_question_sets b ON b.id = tp.baseline_question_set_id
+    WHERE tp.id = :pack_id
+    """
+).bindparams(uuid_re=_UUID_RE).columns(
+    pack_id=Uuid(as_uuid=True),
+    topic_id=Uuid(as_uuid=True),
+    synopsis_id=Uuid(as_uuid=True),
+    synopsis_body=JSONB,
+    characters=JSONB,
+    questions=JSONB,
+)
+
+
+async def _hydrate_single_query(
+    db: AsyncSession, pack_id: uuid.UUID
+) -> HydratedPack | None:
+    row = (await db.execute(_HYDRATE_SQL, {"pack_id": pack_id})).mappings().first()
+    if row is None or not _header_ok(row):
         return None
+    return _assemble(
+        row,
+        characters=list(row["characters"] or []),
+        questions=_with_progress_phrases(row["questions"] or []),
+    )
+
 
-    char_set = (
+async def _hydrate_joined(db: AsyncSession, pack_id: uuid.UUID) -> HydratedPack | None:
+    row = (
         await db.execute(
-            select(CharacterSet).where(CharacterSet.id == pack.character_set_id)
+            select(
+                TopicPack.id.label("pack_id"),
+                TopicPack.topic_id,
+                TopicPack.status,
+                TopicPack.synopsis_id,
+                Synopsis.body.label("synopsis_body"),
+                CharacterSet.composition.label("character_composition"),
+                BaselineQuestionSet.composition.label("question_composition"),
+            )
+            .outerjoin(Synopsis, Synopsis.id == TopicPack.synopsis_id)
+            .outerjoin(CharacterSet, CharacterSet.id == TopicPack.character_set_id)
+            .outerjoin(
+                BaselineQuestionSet,
+                BaselineQuestionSet.id == TopicPack.baseline_question_set_id,
+            )
+            .where(TopicPack.id == pack_id)
         )
-    ).scalar_one_or_none()
-    if char_set is None or not isinstance(char_set.composition, dict):
+    ).mappings().first()
+    if row is None or not _header_ok(row):
         return None
 
-    char_ids = _coerce_character_ids(char_set.composition.get("character_ids"))
+    char_comp = row["character_composition"]
+    char_ids = _coerce_character_ids(
+        char_comp.get("character_ids") if isinstance(char_comp, dict) else None
+    )
     if not char_ids:
         return None
-
     characters = await _resolve_characters(db, char_ids)
     if not characters:
         return None
 
-    baseline_questions = await _resolve_baseline_questions(
-        db, pack.baseline_question_set_id
-    )
+    q_comp = row["question_composition"]
+    q_ids = _coerce_uuid_list(q_comp.get("question_ids") if isinstance(q_comp, dict) else None)
+    questions = await _resolve_baseline_questions(db, q_ids)
+    return _assemble(row, characters=characters, questions=questions)
+
+
+def _header_ok(row: Any) -> bool:
+    """Pack is published and its synopsis body is present."""
+    if row["status"] != "published":
+        return False
+    if not isinstance(row["synopsis_body"], dict):
+        logger.info(
+            "precompute.hydrator.synopsis_missing",
+            pack_id=str(row["pack_id"]),
+            synopsis_id=str(row["synopsis_id"]) if row["synopsis_id"] else None,
+        )
+        return False
+    return True
+
 
+def _assemble(
+    row: Any,
+    *,
+    characters: list[dict[str, Any]],
+    questions: list[dict[str, Any]],
+) -> HydratedPack | None:
+    if not characters:
+        return None
     return HydratedPack(
-        pack_id=pack.id,
-        topic_id=pack.topic_id,
-        synopsis=_clean_synopsis(syn.body),
+        pack_id=row["pack_id"],
+        topic_id=row["topic_id"],
+        synopsis=_clean_synopsis(row["synopsis_body"]),
         characters=tuple(characters),
-        baseline_questions=tuple(baseline_questions),
+        baseline_questions=tuple(questions),
     )
 
 
@@ -180,22 +287,14 @@ def _clean_synopsis(body: dict[str, Any]) -> dict[str, Any]:
 
 
 async def _resolve_baseline_questions(
-    db: AsyncSession, bqs_id: uuid.UUID | None
+    db: AsyncSession, q_ids: list[uuid.UUID]
 ) -> list[dict[str, Any]]:
-    """Load pre-baked baseline questions for a pack's BaselineQuestionSet.
+    """Load pre-baked baseline questions in composition order.
 
     Returns ``[]`` (caller falls back to the live agent path for question
-    generation) when the BQS has no ``question_ids``, when no Question rows
-    are found, or when the BQS row itself is missing.
+    generation) when there are no ``question_ids`` or no usable Question
+    rows.
     """
-    if bqs_id is None:
-        return []
-    bqs = (
-        await db.execute(select(BaselineQuestionSet).where(BaselineQuestionSet.id == bqs_id))
-    ).scalar_one_or_none()
-    if bqs is None or not isinstance(bqs.composition, dict):
-        return []
-    q_ids = _coerce_uuid_list(bqs.composition.get("question_ids"))
     if not q_ids:
         return []
     rows = (
@@ -203,12 +302,6 @@ async def _resolve_baseline_questions(
     ).scalars().all()
     by_id = {q.id: q for q in rows}
     out: list[dict[str, Any]] = []
-    # AC-PROD-R6-PRECOMP-PHRASE-1 — keep the precomputed-pack flow visually
-    # identical to the live agent path by injecting the same deterministic
-    # baseline progress phrases the agent uses (see
-    # `app.agent.tools.content_creation_tools.generate_baseline_questions`).
-    from app.agent.progress_phrases import baseline_phrase_for_index
-
     for qid in q_ids:
         q = by_id.get(qid)
         if q is None:
@@ -219,14 +312,25 @@ async def _resolve_baseline_questions(
         items = opts_raw.get("items")
         if not isinstance(items, list) or not items:
             continue
-        out.append(
-            {
-                "question_text": q.text,
-                "options": list(items),
-                "progress_phrase": baseline_phrase_for_index(len(out)),
-            }
-        )
-    return out
+        out.append({"question_text": q.text, "options": list(items)})
+    return _with_progress_phrases(out)
+
+
+def _with_progress_phrases(questions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # AC-PROD-R6-PRECOMP-PHRASE-1 — keep the precomputed-pack flow visually
+    # identical to the live agent path by injecting the same deterministic
+    # baseline progress phrases the agent uses (see
+    # `app.agent.tools.content_creation_tools.generate_baseline_questions`).
+    from app.agent.progress_phrases import baseline_phrase_for_index
+
+    return [
+        {
+            "question_text": q["question_text"],
+            "options": list(q["options"]),
+            "progress_phrase": baseline_phrase_for_index(i),
+        }
+        for i, q in enumerate(questions)
+    ]
 
 
 __all__ = ["HydratedPack", "hydrate_pack"]
@@ -29,6 +29,13 @@ Phase 2 scope:
     SQLite (the test bench) the service loads the candidate embeddings into
     Python and computes cosine via the injected `cosine_fn`. Both paths
     return identical results above `τ_match`.
+
+In-process vector index:
+  - When a `TopicVectorIndex` is injected (the FastAPI dependency wires the
+    process-wide one) and no custom `cosine_fn` is given, the NN step is a
+    single matrix-vector product over pre-normalised published embeddings
+    instead of a per-miss SELECT + Python cosine loop. See
+    `vector_index.py`.
 """
 
 from __future__ import annotations
@@ -44,6 +51,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.db import Topic, TopicAlias, TopicPack
 from app.services.precompute.canonicalize import canonical_key_for_name
+from app.services.precompute.vector_index import TopicVectorIndex
 
 logger = structlog.get_logger(__name__)
 
@@ -118,12 +126,16 @@ class PrecomputeLookup:
         thresholds: LookupThresholds = DEFAULT_THRESHOLDS,
         embed_fn: EmbedFn | None = None,
         cosine_fn: CosineFn | None = None,
+        vector_index: TopicVectorIndex | None = None,
     ) -> None:
         self._db = db
         self._redis = redis
         self._thresholds = thresholds
         self._embed_fn = embed_fn
         self._cosine_fn = cosine_fn or _default_cosine
+        # A custom metric cannot be answered by the cosine matrix, so an
+        # injected `cosine_fn` keeps the scan path.
+        self._vector_index = vector_index if cosine_fn is None else None
 
     async def resolve_topic(self, raw_text: str) -> TopicResolution | None:
         canonical = canonical_key_for_name(raw_text or "")
@@ -213,15 +225,49 @@ class PrecomputeLookup:
 
         On Postgres + pgvector, this would dispatch a single
         ``ORDER BY embedding <=> :q LIMIT 1`` query; under SQLite (tests) we
-        load all candidate embeddings and compute cosine in Python. Both
-        paths apply the same τ_match threshold and the same `published`-pack
-        guard.
+        load all candidate embeddings and compute cosine in Python. With a
+        `TopicVectorIndex` injected, the in-process matrix answers instead.
+        All paths apply the same τ_match threshold and the same
+        `published`-pack guard.
         """
         assert self._embed_fn is not None  # caller checked
         query_emb = await self._embed_fn(raw_text)
         if not query_emb:
             return None
 
+        if self._vector_index is not None:
+            best = await self._indexed_best(query_emb)
+        else:
+            best = await self._scanned_best(query_emb)
+
+        if best is None or best[2] < self._thresholds.match:
+            return None
+
+        # Re-validate the candidate pack is still published (defence in depth).
+        pack_id = await self._published_pack_id(best[0])
+        if pack_id is None or pack_id != best[1]:
+            return None
+
+        return TopicResolution(
+            topic_id=best[0],
+            pack_id=pack_id,
+            via="vector",
+            similarity=best[2],
+        )
+
+    async def _indexed_best(
+        self, query_emb: list[float]
+    ) -> tuple[UUID, UUID, float] | None:
+        assert self._vector_index is not None
+        await self._vector_index.ensure_fresh(self._db)
+        hits = self._vector_index.top_k(query_emb, k=1)
+        if not hits:
+            return None
+        return (hits[0].topic_id, hits[0].pack_id, hits[0].similarity)
+
+    async def _scanned_best(
+        self, query_emb: list[float]
+    ) -> tuple[UUID, UUID, float] | None:
         stmt = (
             select(Topic.id, Topic.embedding, Topic.current_pack_id)
             .where(
@@ -240,21 +286,7 @@ class PrecomputeLookup:
             sim = self._cosine_fn(list(query_emb), parsed)
             if best is None or sim > best[2]:
                 best = (topic_id, candidate_pack, sim)
-
-        if best is None or best[2] < self._thresholds.match:
-            return None
-
-        # Re-validate the candidate pack is still published (defence in depth).
-        pack_id = await self._published_pack_id(best[0])
-        if pack_id is None or pack_id != best[1]:
-            return None
-
-        return TopicResolution(
-            topic_id=best[0],
-            pack_id=pack_id,
-            via="vector",
-            similarity=best[2],
-        )
+        return best
 
 
 # ---------------------------------------------------------------------------
@@ -150,6 +150,15 @@ async def import_archive(
             await pack_cache.invalidate_pack(redis, topic_id)
             await pack_cache.invalidate_hydrated_pack(redis, pack_id)
 
+    if touched:
+        from app.services.precompute.topic_suggest_index import get_topic_suggest_index
+        from app.services.precompute.vector_index import get_topic_vector_index
+
+        touched_topics = [topic_id for topic_id, _ in touched]
+        await get_topic_vector_index().refresh_topics(session, touched_topics)
+        # New topics / aliases become typeahead candidates right away.
+        await get_topic_suggest_index().refresh_topics(session, touched_topics)
+
     return {
         "packs_inserted": inserted,
         "packs_skipped": skipped,
@@ -0,0 +1,284 @@
+"""In-process L1 in front of the Redis pack caches (`tk:pack:*`, `tk:hpack:*`).
+
+Packs only change on publish / import, yet every `/quiz/start` hit for a
+popular topic paid a Redis GET plus a full decode. This module keeps a small
+per-worker LRU of the DECODED `ResolvedPack` / `HydratedPack` objects, keyed
+by their Redis key, so repeat hits cost a dict lookup.
+
+Bounds:
+  - **Size** — at most ``max_entries`` keys; the least-recently-used entry is
+    evicted on overflow.
+  - **TTL** — entries expire ``ttl_s`` after they were stored, which also
+    caps staleness if an invalidation message is lost.
+
+Invalidation: `cache.invalidate_pack` / `invalidate_hydrated_pack` drop the
+local entry and PUBLISH the Redis key on `INVALIDATE_CHANNEL`; every worker
+runs one subscriber that drops the key from its own L1. Readers capture
+`PackL1.generation` before their Redis GET and hand it to `put`, so a value
+fetched before an invalidation arrived is never cached after it. When that subscriber
+dies the L1 is cleared (we may have missed messages) and the next cache read
+restarts it. Never raises — a pub/sub fault degrades to TTL-bounded
+staleness.
+
+Cached objects are shared between requests: callers must copy before
+mutating (`HydratedPack` is already documented as a read-only view).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger("app.services.precompute.pack_l1")
+
+INVALIDATE_CHANNEL = "tk:pack:invalidate"
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_S = 300.0
+# After a failed subscribe, wait this long before trying again so a Redis
+# outage doesn't add a SUBSCRIBE attempt to every cache read.
+_RESTART_BACKOFF_S = 5.0
+
+
+class PackL1Cache:
+    """Bounded TTL + LRU map of Redis key → decoded pack object."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_s: float = DEFAULT_TTL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # Bumped by every invalidation or clear, cached key or not, so a fill
+        # that read Redis before an invalidation can tell and skip its put.
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_s > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any, *, generation: int | None = None) -> None:
+        """Store ``value``. With ``generation`` (read before the value was
+        fetched), the put is dropped if any invalidation landed in between."""
+        if not self.enabled or value is None:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (self._clock() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: str) -> bool:
+        self.generation += 1
+        if self._entries.pop(key, None) is None:
+            return False
+        self.invalidations += 1
+        return True
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class _InvalidationListener:
+    """One SUBSCRIBE per worker that drops invalidated keys from the L1."""
+
+    def __init__(self, l1: PackL1Cache) -> None:
+        self._l1 = l1
+        self._task: asyncio.Task | None = None
+        self._pubsub: Any = None
+        self._pool: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._start_lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+        self._retry_at = 0.0
+        self.restarts = 0
+
+    @property
+    def listening(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def ensure(self, redis: Any) -> None:
+        loop = asyncio.get_running_loop()
+        pool = getattr(redis, "connection_pool", redis)
+        if self.listening and self._loop is loop and self._pool is pool:
+            return
+        if self._start_lock is None or self._lock_loop is not loop:
+            self._start_lock, self._lock_loop = asyncio.Lock(), loop
+        # Concurrent cold reads must share one SUBSCRIBE (and one L1 clear).
+        async with self._start_lock:
+            if self.listening and self._loop is loop and self._pool is pool:
+                return
+            if time.monotonic() < self._retry_at:
+                return
+            await self._start(redis, pool, loop)
+
+    async def _start(self, redis: Any, pool: Any, loop: asyncio.AbstractEventLoop) -> None:
+        await self.stop()
+        try:
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+        except Exception:  # noqa: BLE001 — TTL still bounds staleness
+            self._retry_at = time.monotonic() + _RESTART_BACKOFF_S
+            logger.debug("precompute.pack_l1.subscribe_failed", exc_info=True)
+            return
+        # Entries cached while nobody was listening may have missed an
+        # invalidation; start from a clean slate.
+        self._l1.clear()
+        self._pubsub, self._pool, self._loop = pubsub, pool, loop
+        self._task = asyncio.create_task(self._run(pubsub))
+        self.restarts += 1
+
+    async def _run(self, pubsub: Any) -> None:
+        try:
+            async for msg in pubsub.listen():
+                if msg.get("type") != "message":
+                    continue
+                data = msg.get("data")
+                if isinstance(data, (bytes, bytearray)):
+                    data = data.decode("utf-8", errors="replace")
+                self._l1.discard(str(data))
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            logger.warning("precompute.pack_l1.listener_died", exc_info=True)
+        finally:
+            self._l1.clear()
+
+    async def stop(self) -> None:
+        task, pubsub = self._task, self._pubsub
+        self._task = self._pubsub = self._pool = None
+        if task is not None and not task.done():
+            # Suppress around cancel() too: a task left over from a closed
+            # event loop (tests, reloads) raises on cancel.
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                task.cancel()
+                await task
+        if pubsub is not None:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+
+class PackL1:
+    """The per-worker L1 plus its invalidation subscriber."""
+
+    def __init__(self, cache: PackL1Cache) -> None:
+        self.cache = cache
+        self._listener = _InvalidationListener(cache)
+
+    async def get(self, redis: Any, key: str) -> Any | None:
+        if not self.cache.enabled:
+            return None
+        await self._listener.ensure(redis)
+        # Only trust the L1 while invalidations can reach it.
+        return self.cache.get(key) if self._listener.listening else None
+
+    @property
+    def generation(self) -> int:
+        """Capture before a Redis read; pass to `put` to drop a raced fill."""
+        return self.cache.generation
+
+    def put(self, key: str, value: Any, *, generation: int | None = None) -> None:
+        if self._listener.listening:
+            self.cache.put(key, value, generation=generation)
+
+    async def invalidate(self, redis: Any, key: str) -> None:
+        """Drop ``key`` here and on every other worker. Never raises."""
+        self.cache.discard(key)
+        try:
+            await redis.publish(INVALIDATE_CHANNEL, key)
+        except Exception:  # noqa: BLE001
+            logger.debug("precompute.pack_l1.publish_failed key=%s", key, exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.cache.stats(),
+            "listening": self._listener.listening,
+            "listener_restarts": self._listener.restarts,
+        }
+
+    async def aclose(self) -> None:
+        await self._listener.stop()
+        self.cache.clear()
+
+
+_L1: PackL1 | None = None
+
+
+def get_pack_l1() -> PackL1:
+    """Process-wide singleton sized from ``settings.precompute``."""
+    global _L1
+    if _L1 is None:
+        from app.core.config import settings
+
+        cfg = getattr(settings, "precompute", None)
+        _L1 = PackL1(
+            PackL1Cache(
+                max_entries=int(getattr(cfg, "pack_l1_max_entries", DEFAULT_MAX_ENTRIES)),
+                ttl_s=float(getattr(cfg, "pack_l1_ttl_s", DEFAULT_TTL_S)),
+            )
+        )
+    return _L1
+
+
+def reset_pack_l1() -> None:
+    """Drop the singleton (test isolation)."""
+    global _L1
+    _L1 = None
+
+
+__all__ = [
+    "INVALIDATE_CHANNEL",
+    "PackL1",
+    "PackL1Cache",
+    "get_pack_l1",
+    "reset_pack_l1",
+]
@@ -19,17 +19,37 @@ Concrete providers:
 - `DualWriteResolver`    — prefers blob, falls back to local during the
                             7-day transition window (`AC-PRECOMP-MIGR-1`)
 
+Bulk work (the local→blob migrator) opens one `AzureBlobProvider.session()`
+so every upload shares a single SDK client — one connection pool and one
+auth setup instead of one per image — and goes through `upload_many`:
+bounded concurrency, a batched existence check that lists the container
+by hash prefix instead of re-sending bytes that are already there, an
+optional JSONL manifest that makes an interrupted run resumable, and a
+`BulkUploadReport` with throughput. `scripts/_azurite_stub.py` is an
+Azurite-compatible endpoint the real SDK can be pointed at in tests.
+
 Azure SDK is loaded lazily so importing this module never fails when
 the optional `azure-storage-blob` dependency is absent.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import os
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
 from typing import Any, Protocol, runtime_checkable
 
+import structlog
+
 from app.core.config import settings
 from app.models.db import MediaAsset
 
+logger = structlog.get_logger("app.services.precompute.storage")
+
 
 @runtime_checkable
 class StorageProvider(Protocol):
@@ -88,6 +108,68 @@ class AzureBlobConfigError(RuntimeError):
     """Raised when Azure config is missing at the moment of an operation."""
 
 
+@dataclass(frozen=True)
+class BlobUpload:
+    """One `upload_many` item; `content_hash` is the blob name."""
+
+    content_hash: str
+    data: bytes
+    content_type: str
+
+
+@dataclass
+class BulkUploadReport:
+    """Outcome of one `upload_many` call.
+
+    `uris` maps every content hash that is now in the container (uploaded,
+    already there, or recorded in the manifest) to its storage_uri;
+    `failed` maps the rest to the error.
+    """
+
+    uploaded: int = 0
+    existing: int = 0
+    resumed: int = 0
+    bytes_uploaded: int = 0
+    elapsed_s: float = 0.0
+    failed: dict[str, str] = field(default_factory=dict)
+    uris: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def uploads_per_s(self) -> float:
+        return round(self.uploaded / self.elapsed_s, 1) if self.elapsed_s else 0.0
+
+    @property
+    def bytes_per_s(self) -> float:
+        return round(self.bytes_uploaded / self.elapsed_s, 1) if self.elapsed_s else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "uploaded": self.uploaded,
+            "existing": self.existing,
+            "resumed": self.resumed,
+            "failed": len(self.failed),
+            "bytes_uploaded": self.bytes_uploaded,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "uploads_per_s": self.uploads_per_s,
+            "bytes_per_s": self.bytes_per_s,
+        }
+
+
+def _load_manifest(path: str | os.PathLike[str] | None) -> dict[str, str]:
+    """content_hash → uri from a previous run's JSONL manifest."""
+    done: dict[str, str] = {}
+    if path is None or not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+                done[str(entry["content_hash"])] = str(entry["uri"])
+            except (ValueError, KeyError, TypeError):
+                continue  # a run killed mid-write leaves a torn last line
+    return done
+
+
 class AzureBlobProvider:
     """Azure Blob Storage provider.
 
@@ -95,9 +177,15 @@ class AzureBlobProvider:
     deferred to the first `upload` call so unit tests, environments
     without the SDK, and CI builds without `azure-storage-blob` installed
     can still import this module.
+
+    Outside `session()` every call builds and closes its own client.
     """
 
     name = "blob"
+    # Existence checks list the container once per this many leading hash
+    # characters (4096 shards for hex digests), so a shard's listing stays
+    # around one page even for a container of millions of blobs.
+    exists_prefix_len = 3
 
     def __init__(
         self,
@@ -115,6 +203,8 @@ class AzureBlobProvider:
         self._container = container
         self._credential = credential
         self._client_factory = client_factory  # for tests; injects mock SDK
+        self._shared: Any | None = None
+        self._session_depth = 0
 
     @classmethod
     def from_settings(cls) -> "AzureBlobProvider":
@@ -127,6 +217,38 @@ class AzureBlobProvider:
             )
         return cls(base_url=base_url, container=container)
 
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AzureBlobProvider]:
+        """Share one SDK client across every call made inside the block.
+
+        Re-entrant: nested sessions reuse the outer client, which is closed
+        when the outermost block exits.
+        """
+        if self._shared is None:
+            self._shared = self._build_client()
+        self._session_depth += 1
+        try:
+            yield self
+        finally:
+            self._session_depth -= 1
+            if self._session_depth == 0:
+                client, self._shared = self._shared, None
+                await _close_quietly(client)
+
+    @contextlib.asynccontextmanager
+    async def _client(self) -> AsyncIterator[Any]:
+        if self._shared is not None:
+            yield self._shared
+            return
+        client = self._build_client()
+        try:
+            yield client
+        finally:
+            await _close_quietly(client)
+
+    def uri_for(self, content_hash: str) -> str:
+        return f"{self._base_url}/{self._container}/{content_hash}"
+
     async def upload(
         self, *, content_hash: str, data: bytes, content_type: str
     ) -> str:
@@ -134,32 +256,131 @@ class AzureBlobProvider:
 
         Returns the public storage_uri (`base_url/container/content_hash`).
         """
-        client = self._build_client()
+        async with self._client() as client:
+            await self._put(client, content_hash, data, content_type)
+        return self.uri_for(content_hash)
+
+    async def _put(self, client: Any, content_hash: str, data: bytes, content_type: str) -> bool:
+        """Conditional put; False when the blob was already there."""
+        from azure.core.exceptions import (  # local import — optional dep
+            ResourceExistsError,
+        )
+
+        blob_client = client.get_blob_client(container=self._container, blob=content_hash)
         try:
-            blob_client = client.get_blob_client(
-                container=self._container, blob=content_hash
-            )
-            from azure.core.exceptions import (  # local import — optional dep
-                ResourceExistsError,
+            await blob_client.upload_blob(
+                data,
+                overwrite=False,
+                content_settings=_make_content_settings(content_type),
             )
+        except ResourceExistsError:
+            # Idempotent — content addressed.
+            return False
+        return True
+
+    async def existing_hashes(
+        self, content_hashes: Iterable[str], *, concurrency: int = 8
+    ) -> set[str]:
+        """The subset of `content_hashes` already in the container.
+
+        One List Blobs call per `exists_prefix_len`-character prefix shared
+        by two or more hashes (a lone hash lists by its full name), at most
+        `concurrency` in flight.
+        """
+        groups: dict[str, set[str]] = {}
+        for h in content_hashes:
+            groups.setdefault(h[: self.exists_prefix_len], set()).add(h)
+        found: set[str] = set()
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async with self._client() as client:
+            container = client.get_container_client(self._container)
+
+            async def scan(prefix: str, wanted: set[str]) -> None:
+                name_prefix = next(iter(wanted)) if len(wanted) == 1 else prefix
+                async with sem:
+                    async for props in container.list_blobs(name_starts_with=name_prefix):
+                        if props.name in wanted:
+                            found.add(props.name)
+
+            await asyncio.gather(*(scan(p, w) for p, w in groups.items()))
+        return found
+
+    async def upload_many(
+        self,
+        items: Iterable[BlobUpload],
+        *,
+        concurrency: int = 8,
+        skip_existing: bool = True,
+        manifest: str | os.PathLike[str] | None = None,
+    ) -> BulkUploadReport:
+        """Upload `items` over one shared client, `concurrency` at a time.
+
+        Hashes recorded in `manifest` (JSONL, appended as each blob lands)
+        are skipped without a request; with `skip_existing` the rest are
+        checked via `existing_hashes` first, and a failed listing (e.g. a
+        write-only SAS) falls back to conditional puts. Never raises for a
+        single item — it lands in `report.failed`.
+        """
+        started = time.perf_counter()
+        report = BulkUploadReport()
+        done = _load_manifest(manifest)
+        pending: dict[str, BlobUpload] = {}
+        for item in items:
+            if item.content_hash in done:
+                if item.content_hash not in report.uris:
+                    report.resumed += 1
+                report.uris[item.content_hash] = done[item.content_hash]
+            else:
+                pending.setdefault(item.content_hash, item)
+
+        with _ManifestWriter(manifest) as record:
+            async with self.session():
+                if skip_existing and pending:
+                    for h in await self._existing_or_none(pending, concurrency):
+                        del pending[h]
+                        report.existing += 1
+                        report.uris[h] = record(h, self.uri_for(h))
+                await self._upload_pending(list(pending.values()), concurrency, report, record)
+
+        report.elapsed_s = time.perf_counter() - started
+        logger.info("precompute.storage.upload_many", **report.as_dict())
+        return report
+
+    async def _existing_or_none(self, pending: dict[str, BlobUpload], concurrency: int) -> set[str]:
+        try:
+            return await self.existing_hashes(pending, concurrency=concurrency)
+        except Exception as e:
+            logger.warning("precompute.storage.exists_check_failed", error=str(e))
+            return set()
 
-            try:
-                await blob_client.upload_blob(
-                    data,
-                    overwrite=False,
-                    content_settings=_make_content_settings(content_type),
-                )
-            except ResourceExistsError:
-                # Idempotent — content addressed.
-                pass
-        finally:
-            close = getattr(client, "close", None)
-            if close is not None:
+    async def _upload_pending(
+        self,
+        pending: list[BlobUpload],
+        concurrency: int,
+        report: BulkUploadReport,
+        record: Any,
+    ) -> None:
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(item: BlobUpload) -> None:
+            async with sem:
                 try:
-                    await close()
-                except Exception:
-                    pass
-        return f"{self._base_url}/{self._container}/{content_hash}"
+                    async with self._client() as client:
+                        created = await self._put(
+                            client, item.content_hash, item.data, item.content_type
+                        )
+                except Exception as e:
+                    report.failed[item.content_hash] = str(e) or type(e).__name__
+                    return
+            if created:
+                report.uploaded += 1
+                report.bytes_uploaded += len(item.data)
+            else:
+                report.existing += 1
+            report.uris[item.content_hash] = record(item.content_hash, self.uri_for(item.content_hash))
+
+        await asyncio.gather(*(one(item) for item in pending))
 
     def resolve(self, asset: MediaAsset) -> str:
         # storage_uri was populated at upload time; just hand it back.
@@ -184,6 +405,38 @@ class AzureBlobProvider:
         )
 
 
+class _ManifestWriter:
+    """Appends `{"content_hash", "uri"}` lines; a no-op without a path."""
+
+    def __init__(self, path: str | os.PathLike[str] | None) -> None:
+        self._path = path
+        self._fh: Any | None = None
+
+    def __enter__(self) -> _ManifestWriter:
+        if self._path is not None:
+            self._fh = open(self._path, "a", encoding="utf-8")  # noqa: SIM115
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+    def __call__(self, content_hash: str, uri: str) -> str:
+        if self._fh is not None:
+            self._fh.write(json.dumps({"content_hash": content_hash, "uri": uri}) + "\n")
+            self._fh.flush()
+        return uri
+
+
+async def _close_quietly(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if close is not None:
+        try:
+            await close()
+        except Exception:
+            pass
+
+
 def _make_content_settings(content_type: str) -> Any:
     try:
         from azure.storage.blob import ContentSettings  # type: ignore[import-not-found]
@@ -237,6 +490,8 @@ class DualWriteResolver:
 __all__ = [
     "AzureBlobConfigError",
     "AzureBlobProvider",
+    "BlobUpload",
+    "BulkUploadReport",
     "DualWriteResolver",
     "FalProvider",
     "LocalProvider",
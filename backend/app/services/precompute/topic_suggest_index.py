@@ -0,0 +1,394 @@
+"""In-process prefix index for `/topics/suggest` typeahead.
+
+The endpoint used to run ``lower(display_name) LIKE 'q%'`` against Postgres
+on every keystroke: a table scan without a matching functional index, no
+alias matches and no ranking. This module keeps one process-wide snapshot
+of ``topics`` + ``topic_aliases``:
+
+  - every display name and alias is folded with `canonical_key_for_name`
+    into one **sorted key array**; a prefix query is two ``bisect`` calls
+    and a slice;
+  - topics are numbered by **popularity** (``popularity_rank`` ascending,
+    unranked last, then name), and each key maps to its topic's number, so
+    ranking a prefix range is ``heapq.nsmallest`` over a de-duplicated
+    ``set`` of ints (a topic matched by its name and an alias counts once);
+  - ranges for the short prefixes (``HOT_PREFIX_LEN`` chars and under) are
+    ranked once at build time, since those are the widest;
+  - optional **fuzzy** backfill: when fewer than ``limit`` topics match
+    exactly, keys whose prefix is one edit (insert / delete / substitute /
+    adjacent swap) away from the query fill the remaining slots.
+
+Freshness follows `vector_index.py`: a full rebuild lazily on first use
+and again after ``max_age_s``, `refresh_topics()` after a publish / import
+/ rollback commit, and `invalidate()` to force the next query to rebuild.
+Only the first build blocks a request: once a snapshot exists, an expired
+or invalidated one keeps serving while a single background task rebuilds
+it on its own session. All DB faults are fail-open: a failed build keeps
+the previous snapshot, and the endpoint falls back to the SQL query while
+no snapshot exists.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.db import Topic, TopicAlias
+from app.services.precompute.canonicalize import canonical_key_for_name
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_AGE_S = 300.0  # 5 min — cross-replica convergence bound
+HOT_PREFIX_LEN = 3
+HOT_TOP_K = 8
+# Fuzzy matching only kicks in from this query length (shorter queries are
+# one edit away from nearly everything).
+FUZZY_MIN_LEN = 3
+_UNRANKED = 1 << 30
+_KEY_END = "\U0010ffff"
+
+
+@dataclass(frozen=True)
+class TopicRow:
+    """One topic as loaded from the DB (``aliases`` are display strings)."""
+
+    topic_id: UUID
+    slug: str
+    display_name: str
+    popularity_rank: int | None = None
+    aliases: tuple[str, ...] = ()
+
+    def as_result(self) -> dict[str, str]:
+        return {"id": str(self.topic_id), "slug": self.slug, "display_name": self.display_name}
+
+
+class _Snapshot:
+    """Immutable build output; queries read one snapshot reference."""
+
+    __slots__ = ("alphabet", "hot", "hot_top_k", "keys", "pos", "topics")
+
+    def __init__(self, rows: Iterable[TopicRow], hot_top_k: int) -> None:
+        self.hot_top_k = hot_top_k
+        self.topics: list[TopicRow] = sorted(
+            rows,
+            key=lambda r: (
+                _UNRANKED if r.popularity_rank is None else r.popularity_rank,
+                r.display_name.casefold(),
+            ),
+        )
+        raw_keys: list[str] = []
+        raw_pos: list[int] = []
+        for pos, row in enumerate(self.topics):
+            for key in map(fold_key, (row.display_name, *row.aliases)):
+                if key:
+                    raw_keys.append(key)
+                    raw_pos.append(pos)
+        # A topic may sit under the same key twice (name == alias); queries
+        # de-duplicate positions, so no need to here.
+        order = sorted(range(len(raw_keys)), key=raw_keys.__getitem__)
+        self.keys: list[str] = [raw_keys[i] for i in order]
+        self.pos: list[int] = [raw_pos[i] for i in order]
+        self.alphabet: str = "".join(sorted(set("".join(self.keys))))
+        self.hot: dict[str, list[int]] = self._rank_hot_prefixes(hot_top_k)
+
+    def _rank_hot_prefixes(self, k: int) -> dict[str, list[int]]:
+        # Keys sharing a prefix are contiguous: walk each prefix length in
+        # jumps of one group, ranking the group's slice.
+        hot: dict[str, list[int]] = {}
+        keys, pos = self.keys, self.pos
+        for n in range(1, HOT_PREFIX_LEN + 1):
+            i = 0
+            while i < len(keys):
+                prefix = keys[i][:n]
+                j = bisect.bisect_left(keys, prefix + _KEY_END, i)
+                hot[prefix] = heapq.nsmallest(k, set(pos[i:j]))
+                i = j
+        return hot
+
+    def positions(self, prefix: str) -> set[int]:
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + _KEY_END, lo)
+        return set(self.pos[lo:hi])
+
+    def top(self, prefix: str, limit: int) -> list[int]:
+        ranked = self.hot.get(prefix)
+        if ranked is not None and limit <= self.hot_top_k:
+            return ranked[:limit]
+        return heapq.nsmallest(limit, self.positions(prefix))
+
+    def fuzzy(self, prefix: str, limit: int, exclude: set[int]) -> list[int]:
+        # The best ``limit`` of a union of ranges is among each range's own
+        # best ``limit + len(exclude)``, so wide variant ranges stay cheap.
+        want = limit + len(exclude)
+        found: set[int] = set()
+        for variant in _one_edit_variants(prefix, self.alphabet):
+            found.update(self.top(variant, want))
+        return heapq.nsmallest(limit, found - exclude)
+
+
+def fold_key(text: str) -> str:
+    """`canonical_key_for_name`, with a fast path for ASCII text (no accents
+    to fold)."""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    return canonical_key_for_name(text)
+
+
+def _one_edit_variants(word: str, alphabet: str) -> set[str]:
+    """Strings one insert / delete / substitute / adjacent swap from ``word``.
+
+    Appending a character is left out: its matches are a subset of
+    ``word``'s own prefix range.
+    """
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = {a + b[1:] for a, b in splits if b}
+    swaps = {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+    subs = {a + c + b[1:] for a, b in splits if b for c in alphabet}
+    inserts = {a + c + b for a, b in splits if b for c in alphabet}
+    variants = deletes | swaps | subs | inserts
+    variants.discard(word)
+    variants.discard("")
+    return variants
+
+
+class TopicSuggestIndex:
+    """Popularity-ranked prefix index over topic names and aliases.
+
+    Rebuilds and refreshes are serialised by an `asyncio.Lock` and swap in a
+    whole new `_Snapshot`, so a query never sees a half-built index.
+    """
+
+    def __init__(self, *, max_age_s: float = DEFAULT_MAX_AGE_S, hot_top_k: int = HOT_TOP_K) -> None:
+        self._max_age_s = max_age_s
+        self._hot_top_k = hot_top_k
+        self._lock = asyncio.Lock()
+        self._rebuild_task: asyncio.Task | None = None
+        self._snap: _Snapshot | None = None
+        self._rows: dict[UUID, TopicRow] = {}
+        self._built_at: float | None = None  # monotonic seconds
+        self._stale = True
+        self._last_rebuild_ms: float | None = None
+        self._rebuilds = 0
+        self._incremental_updates = 0
+        self._queries = 0
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def ready(self) -> bool:
+        """True once a snapshot has been built (even if it is now stale)."""
+        return self._snap is not None
+
+    def needs_rebuild(self) -> bool:
+        if self._stale or self._built_at is None:
+            return True
+        return (time.monotonic() - self._built_at) > self._max_age_s
+
+    def stats(self) -> dict[str, Any]:
+        """Footprint + rebuild timings for `/healthz/precompute`."""
+        snap = self._snap
+        age = None if self._built_at is None else time.monotonic() - self._built_at
+        return {
+            "topics": len(self),
+            "keys": len(snap.keys) if snap else 0,
+            "hot_prefixes": len(snap.hot) if snap else 0,
+            "last_rebuild_ms": self._last_rebuild_ms,
+            "age_s": age,
+            "stale": self.needs_rebuild(),
+            "rebuilds": self._rebuilds,
+            "incremental_updates": self._incremental_updates,
+            "queries": self._queries,
+        }
+
+    # ------------------------------------------------------------------
+    # Build / refresh
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale; the next `ensure_fresh` rebuilds."""
+        self._stale = True
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """Rebuild from the DB when stale/expired. Never raises.
+
+        Blocks only while there is no snapshot yet; after that a stale one
+        keeps serving and the rebuild runs in the background.
+        """
+        if not self.needs_rebuild():
+            return
+        if self.ready:
+            self._schedule_rebuild()
+            return
+        async with self._lock:
+            if not self.needs_rebuild():  # another waiter rebuilt it
+                return
+            await self._rebuild(db)
+
+    def _schedule_rebuild(self) -> None:
+        task = self._rebuild_task
+        if task is not None and not task.done():
+            return
+        self._rebuild_task = asyncio.create_task(self._rebuild_in_background())
+
+    async def _rebuild_in_background(self) -> None:
+        # The request that noticed the stale snapshot may finish (and close
+        # its session) before we get to run: use a session of our own.
+        from app.api import dependencies as deps
+
+        factory = deps.async_session_factory
+        if factory is None:
+            return
+        async with self._lock:
+            if not self.needs_rebuild():
+                return
+            try:
+                async with factory() as db:
+                    await self._rebuild(db)
+            except Exception:  # noqa: BLE001 — keep serving the old snapshot
+                logger.warning("precompute.suggest_index.rebuild_failed", exc_info=True)
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        try:
+            rows = await _load_rows(db)
+        except Exception:  # noqa: BLE001 — fail-open, keep old snapshot
+            logger.warning("precompute.suggest_index.rebuild_failed", exc_info=True)
+            return
+        by_id = {r.topic_id: r for r in rows}
+        # The build is pure CPU (~1s at 100k topics); keep it off the
+        # event loop thread.
+        self._install(by_id, *await asyncio.to_thread(self._build, by_id))
+        self._rebuilds += 1
+
+    def load(self, rows: Iterable[TopicRow]) -> None:
+        """Replace the snapshot. Synchronous so tests / benchmarks can seed
+        the index without a DB."""
+        by_id = {r.topic_id: r for r in rows}
+        self._install(by_id, *self._build(by_id))
+        self._rebuilds += 1
+
+    async def refresh_topics(self, db: AsyncSession, topic_ids: Iterable[UUID]) -> None:
+        """Re-read only ``topic_ids`` (rows + aliases) and re-index.
+
+        Called after a publish / import / rollback commit. A no-op before
+        the first build. Never raises; a DB fault marks the index stale.
+        """
+        ids = list(dict.fromkeys(topic_ids))
+        if not ids or self._built_at is None:
+            return
+        async with self._lock:
+            try:
+                rows = await _load_rows(db, topic_ids=ids)
+            except Exception:  # noqa: BLE001
+                logger.warning("precompute.suggest_index.refresh_failed", exc_info=True)
+                self._stale = True
+                return
+            found = {r.topic_id: r for r in rows}
+            by_id = dict(self._rows)
+            for tid in ids:
+                if tid in found:
+                    by_id[tid] = found[tid]
+                else:
+                    by_id.pop(tid, None)
+            self._install(by_id, *await asyncio.to_thread(self._build, by_id))
+            self._incremental_updates += 1
+
+    def _build(self, by_id: dict[UUID, TopicRow]) -> tuple[_Snapshot, float]:
+        t0 = time.perf_counter()
+        snap = _Snapshot(by_id.values(), self._hot_top_k)
+        return snap, (time.perf_counter() - t0) * 1000.0
+
+    def _install(self, by_id: dict[UUID, TopicRow], snap: _Snapshot, build_ms: float) -> None:
+        self._rows, self._snap = by_id, snap
+        self._built_at = time.monotonic()
+        self._stale = False
+        self._last_rebuild_ms = build_ms
+        logger.info(
+            "precompute.suggest_index.rebuilt",
+            topics=len(by_id),
+            keys=len(snap.keys),
+            rebuild_ms=round(build_ms, 3),
+        )
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def suggest(self, query: str, *, limit: int = 8, fuzzy: bool = False) -> list[TopicRow]:
+        """Up to ``limit`` topics whose name or alias starts with ``query``,
+        most popular first; fuzzy matches (if enabled) fill any free slots."""
+        snap = self._snap
+        prefix = fold_key(query or "")
+        if snap is None or not prefix or limit <= 0:
+            return []
+        self._queries += 1
+        ranked = snap.top(prefix, limit)
+        if fuzzy and len(ranked) < limit and len(prefix) >= FUZZY_MIN_LEN:
+            ranked = ranked + snap.fuzzy(prefix, limit - len(ranked), set(ranked))
+        return [snap.topics[p] for p in ranked]
+
+
+# ---------------------------------------------------------------------------
+# Module-private helpers
+# ---------------------------------------------------------------------------
+
+
+async def _load_rows(db: AsyncSession, *, topic_ids: list[UUID] | None = None) -> list[TopicRow]:
+    topic_stmt = select(Topic.id, Topic.slug, Topic.display_name, Topic.popularity_rank)
+    alias_stmt = select(TopicAlias.topic_id, TopicAlias.display_alias)
+    if topic_ids is not None:
+        topic_stmt = topic_stmt.where(Topic.id.in_(topic_ids))
+        alias_stmt = alias_stmt.where(TopicAlias.topic_id.in_(topic_ids))
+    aliases: dict[UUID, list[str]] = {}
+    for tid, alias in (await db.execute(alias_stmt)).all():
+        aliases.setdefault(tid, []).append(alias)
+    return [
+        TopicRow(
+            topic_id=tid,
+            slug=slug,
+            display_name=name,
+            popularity_rank=rank,
+            aliases=tuple(aliases.get(tid, ())),
+        )
+        for tid, slug, name, rank in (await db.execute(topic_stmt)).all()
+    ]
+
+
+_INDEX: TopicSuggestIndex | None = None
+
+
+def get_topic_suggest_index() -> TopicSuggestIndex:
+    """Process-wide singleton (one snapshot per worker)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = TopicSuggestIndex()
+    return _INDEX
+
+
+def reset_topic_suggest_index() -> None:
+    """Drop the singleton (test isolation)."""
+    global _INDEX
+    _INDEX = None
+
+
+__all__ = [
+    "DEFAULT_MAX_AGE_S",
+    "TopicRow",
+    "TopicSuggestIndex",
+    "get_topic_suggest_index",
+    "reset_topic_suggest_index",
+]
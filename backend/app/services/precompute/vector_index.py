@@ -0,0 +1,349 @@
+"""In-process topic vector index for the lookup NN path (`AC-PRECOMP-LOOKUP-1`).
+
+`PrecomputeLookup._vector_nn` used to SELECT every topic embedding on each
+alias/slug MISS, coerce each row with `_coerce_vector`, and score it with the
+pure-Python `_default_cosine` — O(topics × 384) interpreter work per
+`/quiz/start` miss that grew with every published pack.
+
+This module keeps one process-wide, pre-normalised ``float32`` matrix of
+published topic embeddings. A top-k query is a single matrix-vector product
+(``M @ q``) over unit rows, so the result is the cosine similarity for every
+candidate at once.
+
+Freshness:
+  - **Full rebuild** — lazily on first use, and again once the snapshot is
+    older than ``max_age_s`` (so replicas that never see a local publish
+    still converge).
+  - **Incremental refresh** — `refresh_topics()` re-reads only the given
+    topic rows; the pack importer and the admin promote/rollback endpoints
+    call it after commit.
+  - **Invalidate** — `invalidate()` marks the snapshot stale; the next query
+    rebuilds.
+
+The caller still applies the τ_match cutoff and re-validates the winning
+pack is ``published`` (defence in depth), so the resolution contract is
+unchanged. All DB faults are fail-open: a failed (re)build leaves the
+previous snapshot in place and the lookup degrades to a MISS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.db import Topic, TopicPack
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_AGE_S = 300.0  # 5 min — cross-replica convergence bound
+
+
+@dataclass(frozen=True)
+class VectorHit:
+    """One top-k candidate: topic + its current pack + cosine similarity."""
+
+    topic_id: UUID
+    pack_id: UUID
+    similarity: float
+
+
+def _normalise(vec: Any) -> np.ndarray | None:
+    """Return a unit-length ``float32`` copy of ``vec`` or None when the
+    vector is empty / zero / non-finite (matches `_default_cosine` → 0.0)."""
+    if vec is None:
+        return None
+    try:
+        arr = np.asarray(vec, dtype=np.float32).reshape(-1)
+    except (TypeError, ValueError):
+        return None
+    if arr.size == 0 or not np.all(np.isfinite(arr)):
+        return None
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return None
+    return arr / norm
+
+
+class TopicVectorIndex:
+    """Pre-normalised matrix index over published `topics.embedding` rows.
+
+    Rows are kept contiguous: removal swaps the last row into the hole so
+    `top_k` never has to mask tombstones. Mutations and rebuilds are
+    serialised by an `asyncio.Lock`; queries read a consistent snapshot
+    (the matrix and id arrays are swapped together).
+    """
+
+    def __init__(self, *, max_age_s: float = DEFAULT_MAX_AGE_S) -> None:
+        self._max_age_s = max_age_s
+        self._lock = asyncio.Lock()
+        self._matrix: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._topic_ids: list[UUID] = []
+        self._pack_ids: list[UUID] = []
+        self._row_of: dict[UUID, int] = {}
+        self._built_at: float | None = None  # monotonic seconds
+        self._stale = True
+        self._last_rebuild_ms: float | None = None
+        self._rebuilds = 0
+        self._incremental_updates = 0
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._topic_ids)
+
+    @property
+    def dim(self) -> int:
+        return int(self._matrix.shape[1]) if self._matrix.ndim == 2 else 0
+
+    def needs_rebuild(self) -> bool:
+        if self._stale or self._built_at is None:
+            return True
+        return (time.monotonic() - self._built_at) > self._max_age_s
+
+    def stats(self) -> dict[str, Any]:
+        """Memory footprint + rebuild timings for `/healthz/precompute`."""
+        age = None if self._built_at is None else time.monotonic() - self._built_at
+        return {
+            "topics": len(self),
+            "dim": self.dim,
+            "matrix_bytes": int(self._matrix.nbytes),
+            "last_rebuild_ms": self._last_rebuild_ms,
+            "age_s": age,
+            "stale": self.needs_rebuild(),
+            "rebuilds": self._rebuilds,
+            "incremental_updates": self._incremental_updates,
+        }
+
+    # ------------------------------------------------------------------
+    # Build / refresh
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale; the next `ensure_fresh` rebuilds."""
+        self._stale = True
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """Rebuild from the DB when stale/expired. Never raises."""
+        if not self.needs_rebuild():
+            return
+        async with self._lock:
+            if not self.needs_rebuild():  # another waiter rebuilt it
+                return
+            try:
+                rows = await _load_rows(db)
+            except Exception:  # noqa: BLE001 — fail-open, keep old snapshot
+                logger.warning("precompute.vector_index.rebuild_failed", exc_info=True)
+                return
+            self.load(rows)
+
+    def load(self, rows: Iterable[tuple[UUID, Any, UUID]]) -> None:
+        """Replace the snapshot with ``(topic_id, embedding, pack_id)`` rows.
+
+        Synchronous so tests / offline tools can seed the index without a
+        DB. Rows with malformed or mismatched-dim embeddings are skipped.
+        """
+        t0 = time.perf_counter()
+        vecs: list[np.ndarray] = []
+        topic_ids: list[UUID] = []
+        pack_ids: list[UUID] = []
+        dim = 0
+        for topic_id, raw_emb, pack_id in rows:
+            vec = _normalise(_coerce(raw_emb))
+            if vec is None:
+                continue
+            if dim == 0:
+                dim = int(vec.size)
+            elif vec.size != dim:
+                continue
+            vecs.append(vec)
+            topic_ids.append(topic_id)
+            pack_ids.append(pack_id)
+
+        matrix = (
+            np.vstack(vecs).astype(np.float32, copy=False)
+            if vecs
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        self._matrix = matrix
+        self._topic_ids = topic_ids
+        self._pack_ids = pack_ids
+        self._row_of = {tid: i for i, tid in enumerate(topic_ids)}
+        self._built_at = time.monotonic()
+        self._stale = False
+        self._rebuilds += 1
+        self._last_rebuild_ms = (time.perf_counter() - t0) * 1000.0
+        logger.info(
+            "precompute.vector_index.rebuilt",
+            topics=len(topic_ids),
+            dim=dim,
+            matrix_bytes=int(matrix.nbytes),
+            rebuild_ms=round(self._last_rebuild_ms, 3),
+        )
+
+    async def refresh_topics(
+        self, db: AsyncSession, topic_ids: Iterable[UUID]
+    ) -> None:
+        """Re-read only ``topic_ids`` and upsert/remove their rows.
+
+        Called after a publish / import / rollback commit. If the index has
+        never been built, this is a no-op (the first query builds it in
+        full). Never raises; a DB fault marks the index stale instead.
+        """
+        ids = list(dict.fromkeys(topic_ids))
+        if not ids or self._built_at is None:
+            return
+        async with self._lock:
+            try:
+                rows = await _load_rows(db, topic_ids=ids)
+            except Exception:  # noqa: BLE001
+                logger.warning("precompute.vector_index.refresh_failed", exc_info=True)
+                self._stale = True
+                return
+            found = {tid: (emb, pid) for tid, emb, pid in rows}
+            for tid in ids:
+                if tid in found:
+                    emb, pid = found[tid]
+                    self.upsert(tid, emb, pid)
+                else:
+                    self.remove(tid)
+
+    def upsert(self, topic_id: UUID, embedding: Any, pack_id: UUID) -> bool:
+        """Insert or replace one row. Returns False when the embedding is
+        unusable (in which case any existing row for the topic is dropped)."""
+        vec = _normalise(_coerce(embedding))
+        if vec is None or (len(self) and vec.size != self.dim):
+            self.remove(topic_id)
+            return False
+        row = self._row_of.get(topic_id)
+        if row is not None:
+            matrix = self._matrix.copy()
+            matrix[row] = vec
+            pack_ids = list(self._pack_ids)
+            pack_ids[row] = pack_id
+            self._matrix, self._pack_ids = matrix, pack_ids
+        else:
+            base = self._matrix if len(self) else np.zeros((0, vec.size), np.float32)
+            self._matrix = np.vstack([base, vec[None, :]])
+            self._topic_ids = [*self._topic_ids, topic_id]
+            self._pack_ids = [*self._pack_ids, pack_id]
+            self._row_of[topic_id] = len(self._topic_ids) - 1
+        self._incremental_updates += 1
+        return True
+
+    def remove(self, topic_id: UUID) -> bool:
+        """Drop one row (swap-with-last). Returns False when absent."""
+        row = self._row_of.pop(topic_id, None)
+        if row is None:
+            return False
+        last = len(self._topic_ids) - 1
+        matrix = self._matrix.copy()
+        topic_ids = list(self._topic_ids)
+        pack_ids = list(self._pack_ids)
+        if row != last:
+            matrix[row] = matrix[last]
+            topic_ids[row] = topic_ids[last]
+            pack_ids[row] = pack_ids[last]
+            self._row_of[topic_ids[row]] = row
+        self._matrix = matrix[:last]
+        self._topic_ids = topic_ids[:last]
+        self._pack_ids = pack_ids[:last]
+        self._incremental_updates += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def top_k(self, query: Any, k: int = 1) -> list[VectorHit]:
+        """Return up to ``k`` candidates ordered by descending cosine.
+
+        A zero / malformed / wrong-dim query returns ``[]`` (the legacy path
+        scored such queries as 0.0, which can never clear τ_match).
+        """
+        matrix, topic_ids, pack_ids = self._matrix, self._topic_ids, self._pack_ids
+        if k <= 0 or not topic_ids:
+            return []
+        q = _normalise(query)
+        if q is None or q.size != matrix.shape[1]:
+            return []
+        sims = matrix @ q
+        n = sims.shape[0]
+        if k >= n:
+            order = np.argsort(-sims, kind="stable")
+        else:
+            part = np.argpartition(-sims, k - 1)[:k]
+            order = part[np.argsort(-sims[part], kind="stable")]
+        return [
+            VectorHit(
+                topic_id=topic_ids[i],
+                pack_id=pack_ids[i],
+                similarity=float(sims[i]),
+            )
+            for i in order
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Module-private helpers
+# ---------------------------------------------------------------------------
+
+
+def _coerce(raw: Any) -> list[float] | None:
+    # Local import: lookup.py imports this module at load time.
+    from app.services.precompute.lookup import _coerce_vector
+
+    return _coerce_vector(raw)
+
+
+async def _load_rows(
+    db: AsyncSession, *, topic_ids: list[UUID] | None = None
+) -> list[tuple[UUID, Any, UUID]]:
+    stmt = (
+        select(Topic.id, Topic.embedding, Topic.current_pack_id)
+        .join(TopicPack, TopicPack.id == Topic.current_pack_id)
+        .where(
+            Topic.embedding.isnot(None),
+            TopicPack.status == "published",
+        )
+    )
+    if topic_ids is not None:
+        stmt = stmt.where(Topic.id.in_(topic_ids))
+    result = await db.execute(stmt)
+    return [(tid, emb, pid) for tid, emb, pid in result.all()]
+
+
+_INDEX: TopicVectorIndex | None = None
+
+
+def get_topic_vector_index() -> TopicVectorIndex:
+    """Process-wide singleton (one matrix per worker)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = TopicVectorIndex()
+    return _INDEX
+
+
+def reset_topic_vector_index() -> None:
+    """Drop the singleton (test isolation)."""
+    global _INDEX
+    _INDEX = None
+
+
+__all__ = [
+    "DEFAULT_MAX_AGE_S",
+    "TopicVectorIndex",
+    "VectorHit",
+    "get_topic_vector_index",
+    "reset_topic_vector_index",
+]
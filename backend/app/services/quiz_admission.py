@@ -0,0 +1,182 @@
+"""Single-round-trip admission for ``/quiz/next`` (patch-mode sessions).
+
+The sequential path costs one Redis round trip per guard before any agent
+work: lock ``SET NX``, state read, session-action ``INCR`` (+ ``EXPIRE``),
+daily-cents ``GET``, the merge ``EVAL`` and the lock-release ``EVAL``. With
+``quiz.next_admission_script`` on and the session in the hash layout, the
+handler instead makes two:
+
+  1. ``_ADMIT_LUA`` — take the session lock, bump the action counter, read
+     the daily spend and return the whole state hash, refusing (and
+     releasing the lock) when a cap trips;
+  2. ``_COMMIT_LUA`` — apply the validated answer fields, refresh the TTL,
+     release the lock (token-matched) and return the post-merge hash.
+
+The answer itself is still validated in Python between the two (it needs
+the stored questions and the display-order permutation). A session that is
+not in the hash layout comes back ``miss`` with the lock held, and the
+caller continues on the sequential path.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+
+from app.agent.schemas import AgentGraphStateModel
+from app.services.redis_cache import (
+    _fields_to_json,
+    _key_session_fields,
+    _pairs_to_dict,
+    _validate_fields,
+)
+
+logger = structlog.get_logger(__name__)
+
+# KEYS: lock, action counter, daily cents, state hash.
+# ARGV: token, lock ttl, action cap, budget cents (0 = off), counter ttl.
+_ADMIT_LUA = """
+if not redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', tonumber(ARGV[2])) then
+  return {'busy'}
+end
+if redis.call('EXISTS', KEYS[4]) == 0 then
+  return {'miss'}
+end
+local n = redis.call('INCR', KEYS[2])
+if n == 1 then
+  redis.call('EXPIRE', KEYS[2], tonumber(ARGV[5]))
+end
+if n > tonumber(ARGV[3]) then
+  redis.call('DEL', KEYS[1])
+  return {'capped', n}
+end
+local spent = tonumber(redis.call('GET', KEYS[3]) or '0') or 0
+local budget = tonumber(ARGV[4])
+if budget > 0 and spent >= budget then
+  redis.call('DEL', KEYS[1])
+  return {'over_budget', n, spent}
+end
+return {'ok', n, spent, redis.call('HGETALL', KEYS[4])}
+"""
+
+# KEYS: lock, state hash. ARGV: token, ttl, field/json pairs.
+_COMMIT_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+  return false
+end
+for i = 3, #ARGV, 2 do
+  redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[2], tonumber(ARGV[2]))
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  redis.call('DEL', KEYS[1])
+end
+return redis.call('HGETALL', KEYS[2])
+"""
+
+ACTION_COUNTER_TTL_S = 3600
+
+
+@dataclass
+class Admission:
+    """``outcome`` is ok / busy / capped / over_budget / miss / invalid."""
+
+    outcome: str
+    actions: int = 0
+    spent_cents: int = 0
+    state: AgentGraphStateModel | None = None
+
+
+async def admit_next(
+    client: Any,
+    session_id: uuid.UUID | str,
+    *,
+    lock_key: str,
+    token: str,
+    lock_ttl_s: int,
+    actions_key: str,
+    action_cap: int,
+    cents_key: str,
+    budget_cents: int,
+) -> Admission:
+    """Lock + caps + state read in one EVAL.
+
+    Redis faults propagate (the caller falls back to the sequential path).
+    A stored state that fails validation comes back ``invalid``: lock held
+    and caps already counted, state left for the caller's DB fallback.
+    """
+    t0 = time.perf_counter()
+    reply = await client.eval(
+        _ADMIT_LUA,
+        4,
+        lock_key,
+        actions_key,
+        cents_key,
+        _key_session_fields(session_id),
+        token,
+        int(lock_ttl_s),
+        int(action_cap),
+        int(budget_cents),
+        ACTION_COUNTER_TTL_S,
+    )
+    outcome = str(reply[0])
+    admission = Admission(
+        outcome=outcome,
+        actions=int(reply[1]) if len(reply) > 1 else 0,
+        spent_cents=int(reply[2]) if len(reply) > 2 else 0,
+    )
+    if outcome == "ok":
+        try:
+            admission.state = AgentGraphStateModel.model_validate_json(
+                _fields_to_json(_pairs_to_dict(reply[3]))
+            )
+        except ValidationError as e:
+            logger.warning("quiz.admission.invalid_state", session_id=str(session_id), error=str(e))
+            admission.outcome = "invalid"
+    logger.debug(
+        "quiz.admission.admit",
+        session_id=str(session_id),
+        outcome=admission.outcome,
+        actions=admission.actions,
+        duration_ms=round((time.perf_counter() - t0) * 1000, 1),
+    )
+    return admission
+
+
+async def commit_next(
+    client: Any,
+    session_id: uuid.UUID | str,
+    fields: dict[str, Any],
+    *,
+    lock_key: str,
+    token: str,
+    ttl_seconds: int = 3600,
+) -> AgentGraphStateModel | None:
+    """Merge ``fields`` and release the lock in one EVAL.
+
+    Returns the post-merge state, or None on a missing session or any
+    fault (same contract as ``update_quiz_state_atomically``); the lock is
+    released only when a state is returned.
+    """
+    fkey = _key_session_fields(session_id)
+    try:
+        args: list[Any] = [token, int(ttl_seconds)]
+        for name, value in _validate_fields(fields).items():
+            args.extend((name, value))
+        reply = await client.eval(_COMMIT_LUA, 2, lock_key, fkey, *args)
+        if reply is None:
+            logger.warning("redis.state_update.missing", key=fkey, layout="hash")
+            return None
+        return AgentGraphStateModel.model_validate_json(_fields_to_json(_pairs_to_dict(reply)))
+    except (ValidationError, RedisError) as e:
+        logger.error("quiz.admission.commit_fail", key=fkey, error=str(e), exc_info=True)
+        return None
+
+
+__all__ = ["Admission", "admit_next", "commit_next"]
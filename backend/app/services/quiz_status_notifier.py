@@ -0,0 +1,266 @@
+"""Push-based quiz status wake-ups over Redis pub/sub.
+
+``GET /quiz/status/{id}`` is polled every 1–5 s by each active client, and
+every poll is a Redis read + JSON parse of the session state even though the
+state only changes when the background agent saves. The bounded long-poll
+endpoint (``GET /quiz/status/{id}/wait``) instead parks the request until the
+agent announces a save on ``quiz_status:{id}``, then answers with the same
+payload ``/quiz/status`` would.
+
+Design:
+  * **Publish** — `publish_quiz_status()` is a fire-once ``PUBLISH`` called by
+    `_save_final_state_to_cache` (question/result landed) and by
+    `run_agent_in_background` once the durable job is closed out (so a
+    failed run wakes waiters into the terminal 422). Fail-open: a publish
+    fault only costs waiters their timeout, never the agent run.
+  * **Subscribe** — ONE pattern subscription (``quiz_status:*``) per worker,
+    shared by every parked request via in-process `asyncio.Event`s, so N
+    waiters cost one Redis connection, not N.
+  * **Degrade** — when the listener cannot start (Redis down, a client
+    without pub/sub) `wait()` sleeps at most ``fallback_wait_s`` and returns,
+    so the endpoint behaves like a fast poll rather than hanging or spinning.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CHANNEL_PREFIX = "quiz_status:"
+# Bound on the PUBLISH round-trip. The shared client retries with backoff;
+# the agent's finally block must not stall on a Redis outage.
+_PUBLISH_TIMEOUT_S = 0.5
+# How long listener start-up waits for the PSUBSCRIBE confirmation.
+_SUBSCRIBE_CONFIRM_TIMEOUT_S = 1.0
+# Degraded wait when the shared listener is unavailable (≈ the fastest FE poll).
+DEFAULT_FALLBACK_WAIT_S = 1.0
+
+
+def status_channel(session_id: uuid.UUID | str) -> str:
+    return f"{CHANNEL_PREFIX}{session_id}"
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+async def publish_quiz_status(client: Any, session_id: uuid.UUID | str) -> bool:
+    """Announce that the session's state changed. Never raises.
+
+    Returns True when the PUBLISH reached Redis (regardless of how many
+    subscribers received it).
+    """
+    channel = status_channel(session_id)
+    try:
+        receivers = await asyncio.wait_for(
+            client.publish(channel, "1"), timeout=_PUBLISH_TIMEOUT_S
+        )
+        logger.debug("quiz.status.notify.published", channel=channel, receivers=receivers)
+        return True
+    except Exception as e:  # noqa: BLE001 — fail-open
+        logger.debug("quiz.status.notify.publish_failed", channel=channel, error=str(e))
+        return False
+
+
+class StatusWatch:
+    """One parked request's view of the shared listener."""
+
+    def __init__(self, notifier: QuizStatusNotifier, event: asyncio.Event) -> None:
+        self._notifier = notifier
+        self._event = event
+
+    async def wait(self, timeout_s: float) -> bool:
+        """Block until a notification for this session or ``timeout_s``.
+
+        Returns True when woken by a notification. A notification that
+        arrived since the previous `wait()` returns immediately, so a save
+        landing between the caller's state check and this call is never lost.
+        """
+        if self._event.is_set():
+            self._event.clear()
+            return True
+        if timeout_s <= 0:
+            return False
+        if not self._notifier.listening:
+            await asyncio.sleep(min(timeout_s, self._notifier.fallback_wait_s))
+            return False
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class QuizStatusNotifier:
+    """Per-worker fan-out of ``quiz_status:*`` notifications to waiters."""
+
+    def __init__(self, *, fallback_wait_s: float = DEFAULT_FALLBACK_WAIT_S) -> None:
+        self.fallback_wait_s = fallback_wait_s
+        self._waiters: dict[str, set[asyncio.Event]] = {}
+        self._start_lock: asyncio.Lock | None = None
+        self._pubsub: Any = None
+        self._task: asyncio.Task | None = None
+        self._pool: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._delivered = 0
+        self._restarts = 0
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def listening(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "listening": self.listening,
+            "sessions": len(self._waiters),
+            "waiters": sum(len(s) for s in self._waiters.values()),
+            "delivered": self._delivered,
+            "restarts": self._restarts,
+        }
+
+    # ------------------------------------------------------------------
+    # Waiting
+    # ------------------------------------------------------------------
+
+    @contextlib.asynccontextmanager
+    async def watch(
+        self, client: Any, session_id: uuid.UUID | str
+    ) -> AsyncIterator[StatusWatch]:
+        """Register for wake-ups on ``session_id`` for the block's duration.
+
+        Registration happens BEFORE the caller reads state, so a save that
+        lands between that read and `StatusWatch.wait()` still wakes it.
+        """
+        key = str(session_id)
+        event = asyncio.Event()
+        self._waiters.setdefault(key, set()).add(event)
+        try:
+            await self._ensure_listener(client)
+            yield StatusWatch(self, event)
+        finally:
+            bucket = self._waiters.get(key)
+            if bucket is not None:
+                bucket.discard(event)
+                if not bucket:
+                    self._waiters.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Listener lifecycle
+    # ------------------------------------------------------------------
+
+    async def _ensure_listener(self, client: Any) -> None:
+        """Start (or restart) the shared PSUBSCRIBE listener. Never raises."""
+        loop = asyncio.get_running_loop()
+        pool = getattr(client, "connection_pool", client)
+        if self.listening and self._loop is loop and self._pool is pool:
+            return
+        if self._start_lock is None or self._loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._loop = loop
+        async with self._start_lock:
+            if self.listening and self._pool is pool:
+                return
+            await self._stop_listener()
+            try:
+                pubsub = client.pubsub()
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                await self._await_confirmation(pubsub)
+            except Exception as e:  # noqa: BLE001 — degrade to timed waits
+                logger.warning("quiz.status.notify.listen_failed", error=str(e))
+                return
+            self._pubsub, self._pool = pubsub, pool
+            self._task = asyncio.create_task(self._listen(pubsub))
+            self._restarts += 1
+            logger.info("quiz.status.notify.listening", restarts=self._restarts)
+
+    @staticmethod
+    async def _await_confirmation(pubsub: Any) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _SUBSCRIBE_CONFIRM_TIMEOUT_S
+        while loop.time() < deadline:
+            msg = await pubsub.get_message(timeout=_SUBSCRIBE_CONFIRM_TIMEOUT_S)
+            if msg and msg.get("type") == "psubscribe":
+                return
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for msg in pubsub.listen():
+                if msg.get("type") != "pmessage":
+                    continue
+                channel = _text(msg.get("channel", ""))
+                self._wake(channel[len(CHANNEL_PREFIX):])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.warning("quiz.status.notify.listener_died", error=str(e))
+        finally:
+            # Wake everyone so parked requests re-check now and then fall
+            # back to timed waits until the next `watch()` restarts us.
+            for key in list(self._waiters):
+                self._wake(key)
+
+    def _wake(self, key: str) -> None:
+        for event in self._waiters.get(key, ()):
+            event.set()
+            self._delivered += 1
+
+    async def _stop_listener(self) -> None:
+        task, pubsub = self._task, self._pubsub
+        self._task = self._pubsub = self._pool = None
+        if task is not None and not task.done():
+            # Suppress around cancel() too: a task left over from a closed
+            # event loop (tests, reloads) raises on cancel.
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                task.cancel()
+                await task
+        if pubsub is not None:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    async def aclose(self) -> None:
+        """Stop listening and release every parked request (shutdown)."""
+        await self._stop_listener()
+        for key in list(self._waiters):
+            self._wake(key)
+
+
+_NOTIFIER: QuizStatusNotifier | None = None
+
+
+def get_quiz_status_notifier() -> QuizStatusNotifier:
+    """Process-wide singleton (one subscription per worker)."""
+    global _NOTIFIER
+    if _NOTIFIER is None:
+        _NOTIFIER = QuizStatusNotifier()
+    return _NOTIFIER
+
+
+def reset_quiz_status_notifier() -> None:
+    """Drop the singleton (test isolation)."""
+    global _NOTIFIER
+    _NOTIFIER = None
+
+
+__all__ = [
+    "CHANNEL_PREFIX",
+    "QuizStatusNotifier",
+    "StatusWatch",
+    "get_quiz_status_notifier",
+    "publish_quiz_status",
+    "reset_quiz_status_notifier",
+    "status_channel",
+]
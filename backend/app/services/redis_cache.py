@@ -7,6 +7,9 @@ Responsibilities
   * Validate against AgentGraphStateModel
   * JSON serialize; store with TTL
   * Atomic updates via WATCH/MULTI/EXEC + bounded retry
+  * Optional field-level patch mode (``quiz.session_state_patch_mode``): one
+    Redis hash field per top-level state field, merged by a single Lua script
+    so a patch validates and writes only the fields it changes
 - RAG cache: simple string values with TTL
 
 V0 alignment
@@ -22,6 +25,7 @@ Operational notes
 from __future__ import annotations
 
 import asyncio
+import bisect
 import json
 import random
 import time
@@ -37,6 +41,8 @@ from redis.exceptions import RedisError, WatchError
 
 from app.agent.schemas import AgentGraphStateModel
 from app.agent.state import GraphState
+from app.agent.transcript import compact_for_settings
+from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
@@ -78,10 +84,15 @@ def _message_to_dict(msg: Any) -> dict[str, Any]:
             mtype = cls
 
     name = getattr(msg, "name", None)
+    msg_id = getattr(msg, "id", None)
     additional = getattr(msg, "additional_kwargs", None)
     data: dict[str, Any] = {"type": str(mtype), "content": content}
     if name:
         data["name"] = name
+    # Keep the id so re-streaming the stored state into the graph replaces
+    # the checkpointed message instead of appending a copy (add_messages).
+    if isinstance(msg_id, str) and msg_id:
+        data["id"] = msg_id
     if isinstance(additional, dict) and additional:
         data["additional_kwargs"] = additional
     return data
@@ -102,7 +113,8 @@ def _to_plain(obj: Any) -> Any:
 def _normalize_graph_state_for_storage(state_like: GraphState | dict[str, Any] | AgentGraphStateModel) -> dict[str, Any]:
     """
     Produce a JSON-serializable dict suitable for Pydantic validation & Redis storage.
-    - Messages list is normalized to plain dicts.
+    - Messages list is normalized to plain dicts and bounded to seed + summary
+      + recent window (``app/agent/transcript.py``).
     - Pydantic instances are dumped.
     - No legacy field aliases; expects v0 keys (e.g., 'synopsis').
     """
@@ -118,7 +130,7 @@ def _normalize_graph_state_for_storage(state_like: GraphState | dict[str, Any] |
     # Normalize messages
     msgs = out.get("messages")
     if isinstance(msgs, list):
-        out["messages"] = [_message_to_dict(m) for m in msgs]
+        out["messages"] = compact_for_settings([_message_to_dict(m) for m in msgs])
 
     # Dump known model-ish fields into plain dicts
     if out.get("synopsis") is not None:
@@ -188,6 +200,11 @@ def _key_session(session_id: uuid.UUID | str) -> str:
     return f"quiz_session:{session_id}"
 
 
+def _key_session_fields(session_id: uuid.UUID | str) -> str:
+    """Hash-layout key used by patch mode (one hash field per state field)."""
+    return f"quiz_session:{session_id}:fields"
+
+
 def _key_rag(category_slug: str) -> str:
     return f"rag_cache:{category_slug}"
 
@@ -199,6 +216,170 @@ def _jittered_backoff(attempt: int, base: float = 0.05, cap: float = 0.5) -> flo
     return d + random.random() * 0.01
 
 
+# ---------------------------------------------------------------------------
+# Saved-state size histogram
+# ---------------------------------------------------------------------------
+
+# ``redis.save_state.ok`` size bucket upper bounds (bytes); the last bucket is +inf.
+SAVE_STATE_BYTES_BUCKETS: tuple[int, ...] = (
+    4_096, 8_192, 16_384, 32_768, 65_536, 131_072, 262_144, 1_048_576,
+)
+
+
+class _BytesHistogram:
+    """Fixed-bucket histogram of saved session-state sizes in bytes."""
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(SAVE_STATE_BYTES_BUCKETS) + 1)
+        self._sum = 0
+        self._max = 0
+
+    def observe(self, nbytes: int) -> str:
+        """Record one save; returns its bucket label (for the log line)."""
+        i = bisect.bisect_left(SAVE_STATE_BYTES_BUCKETS, nbytes)
+        self._counts[i] += 1
+        self._sum += nbytes
+        self._max = max(self._max, nbytes)
+        return _BYTES_LABELS[i]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "buckets": dict(zip(_BYTES_LABELS, self._counts, strict=True)),
+            "count": sum(self._counts),
+            "sum_bytes": self._sum,
+            "max_bytes": self._max,
+        }
+
+
+_BYTES_LABELS: tuple[str, ...] = tuple(f"le_{b}" for b in SAVE_STATE_BYTES_BUCKETS) + ("le_inf",)
+_save_state_bytes = _BytesHistogram()
+
+
+def save_state_bytes_histogram() -> dict[str, Any]:
+    """Process-wide histogram of ``save_quiz_state`` payload sizes."""
+    return _save_state_bytes.snapshot()
+
+
+def reset_save_state_bytes_histogram_for_tests() -> None:
+    global _save_state_bytes
+    _save_state_bytes = _BytesHistogram()
+
+
+# ---------------------------------------------------------------------------
+# Patch mode (field-level hash layout)
+# ---------------------------------------------------------------------------
+#
+# The blob layout stores the whole state as one JSON string, so every merge —
+# even a one-field ``last_served_index`` bump — is WATCH/GET, a full
+# ``model_validate_json``, ``model_dump``, normalize, ``model_validate`` and
+# ``model_dump_json``, and the background agent and the poller keep tripping
+# each other's WATCH. Patch mode stores each top-level ``AgentGraphStateModel``
+# field as its own hash field (value = that field's JSON) under
+# ``quiz_session:{id}:fields``. A patch validates ONLY the changed fields and
+# applies them with one EVAL: no WATCH, no retry loop, no re-validation of the
+# untouched questions/history/messages.
+#
+# Migration: readers try the hash first and fall back to the legacy
+# ``quiz_session:{id}`` string; the first patch against a legacy-only session
+# converts it in place (``_MIGRATE_LUA`` is a no-op if another writer already
+# did). ``scripts/migrate_quiz_sessions_to_hash.py`` drains the rest. Flip the
+# flag fleet-wide: a blob-mode replica never reads the hash layout.
+
+# KEYS[1] = fields hash; ARGV[1] = ttl; ARGV[2] = "1" to return HGETALL;
+# ARGV[3..] = field, json pairs. Returns nil when the session is missing.
+_PATCH_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return false
+end
+for i = 3, #ARGV, 2 do
+  redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+if ARGV[2] == '1' then
+  return redis.call('HGETALL', KEYS[1])
+end
+return 1
+"""
+
+# KEYS[1] = fields hash; KEYS[2] = legacy blob key; ARGV[1] = ttl;
+# ARGV[2..] = field, json pairs. Returns 1 when converted, 0 when the hash
+# already existed (a concurrent migrator/writer won — keep its data).
+_MIGRATE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return 0
+end
+for i = 2, #ARGV, 2 do
+  redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
+# Fields ``/quiz/status`` reads on every poll (HMGET, never the messages list).
+_STATUS_FIELDS: tuple[str, ...] = (
+    "trace_id",
+    "final_result",
+    "generated_questions",
+    "quiz_history",
+    "current_confidence",
+    "last_served_index",
+    "category",
+)
+
+
+def _patch_mode_enabled() -> bool:
+    try:
+        return bool(getattr(settings.quiz, "session_state_patch_mode", False))
+    except Exception:
+        return False
+
+
+def _field_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _validate_fields(fields: dict[str, Any]) -> dict[str, str]:
+    """Validate ONLY ``fields`` against their ``AgentGraphStateModel`` field
+    types and return ``{field: json}`` ready for HSET.
+
+    Uses the model's own validator (``validate_assignment`` on an unvalidated
+    shell) so per-field coercion and config (strip whitespace, extra=forbid on
+    nested models) match a full-model validate exactly. Unknown keys are
+    dropped, mirroring ``_normalize_graph_state_for_storage``.
+    """
+    normalized = _normalize_graph_state_for_storage(fields)
+    shell = AgentGraphStateModel.model_construct()
+    validator = AgentGraphStateModel.__pydantic_validator__
+    for name, value in normalized.items():
+        validator.validate_assignment(shell, name, value)
+    dumped = shell.model_dump(mode="json", include=set(normalized))
+    return {name: _field_json(dumped[name]) for name in normalized}
+
+
+def _model_to_fields(model: AgentGraphStateModel) -> dict[str, str]:
+    return {k: _field_json(v) for k, v in model.model_dump(mode="json").items()}
+
+
+def _fields_to_json(fields: dict[Any, Any]) -> str:
+    """Reassemble hash fields into the blob-layout JSON document."""
+    parts = [
+        f"{_field_json(_ensure_text(k))}:{_ensure_text(v)}" for k, v in fields.items()
+    ]
+    return "{" + ",".join(parts) + "}"
+
+
+def _pairs_to_dict(reply: Any) -> dict[str, str]:
+    """HGETALL via EVAL returns a flat [k1, v1, k2, v2, ...] list."""
+    if isinstance(reply, dict):
+        return {_ensure_text(k): _ensure_text(v) for k, v in reply.items()}
+    items = list(reply or [])
+    return {
+        _ensure_text(items[i]): _ensure_text(items[i + 1])
+        for i in range(0, len(items) - 1, 2)
+    }
+
+
 # ---------------------------------------------------------------------------
 # Repository
 # ---------------------------------------------------------------------------
@@ -206,7 +387,7 @@ def _jittered_backoff(attempt: int, base: float = 0.05, cap: float = 0.5) -> flo
 class CacheRepository:
     """Handles all Redis cache operations."""
 
-    def __init__(self, client: redis.Redis):
+    def __init__(self, client: redis.Redis, *, patch_mode: bool | None = None):
         """
         Initialize the repository with a Redis client.
 
@@ -214,8 +395,11 @@ class CacheRepository:
           - decode_responses=True (preferred)
           - timeouts, health_check_interval
           - client-side Retry for transient errors
+
+        ``patch_mode`` defaults to ``settings.quiz.session_state_patch_mode``.
         """
         self.client = client
+        self.patch_mode = _patch_mode_enabled() if patch_mode is None else bool(patch_mode)
 
     # ---------------------------------------------------------------------
     # Quiz session state (JSON)
@@ -237,15 +421,30 @@ class CacheRepository:
             normalized = _normalize_graph_state_for_storage(state)
             # Validate (will coerce UUID from str when needed)
             state_pyd = AgentGraphStateModel.model_validate(normalized)
-            payload = state_pyd.model_dump_json()
-            await self.client.set(key, payload, ex=ttl_seconds)
+            if self.patch_mode:
+                key = _key_session_fields(session_id)
+                fields = _model_to_fields(state_pyd)
+                nbytes = sum(len(v) for v in fields.values())
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=fields)
+                    pipe.expire(key, ttl_seconds)
+                    pipe.delete(_key_session(session_id))
+                    await pipe.execute()
+            else:
+                payload = state_pyd.model_dump_json()
+                nbytes = len(payload)
+                await self.client.set(key, payload, ex=ttl_seconds)
 
+            bucket = _save_state_bytes.observe(nbytes)
             logger.info(
                 "redis.save_state.ok",
                 session_id=str(state_pyd.session_id),
                 key=key,
                 ttl_seconds=ttl_seconds,
-                bytes=len(payload),
+                bytes=nbytes,
+                bytes_bucket=bucket,
+                messages=len(state_pyd.messages),
                 duration_ms=round((time.perf_counter() - t0) * 1000, 1),
             )
         except (ValidationError, RedisError) as e:
@@ -263,7 +462,7 @@ class CacheRepository:
         key = _key_session(session_id)
         try:
             t0 = time.perf_counter()
-            raw = await self.client.get(key)
+            raw = await self._read_state_text(session_id)
             if raw is None:
                 logger.debug("redis.get_state.miss", key=key)
                 return None
@@ -298,6 +497,10 @@ class CacheRepository:
         corrupt blob we're trying to repair. Preserves the existing TTL. Returns
         True when the field was present and cleared, False otherwise. Never raises
         (best-effort repair)."""
+        if self.patch_mode:
+            cleared = await self._clear_final_result_field(session_id)
+            if cleared is not None:
+                return cleared
         key = _key_session(session_id)
         try:
             raw = await self.client.get(key)
@@ -346,7 +549,20 @@ class CacheRepository:
         key = _key_session(session_id)
         try:
             t0 = time.perf_counter()
-            raw = await self.client.get(key)
+            if self.patch_mode:
+                # HMGET only the polled fields — the (large) messages list is
+                # never transferred or parsed.
+                values = await self.client.hmget(
+                    _key_session_fields(session_id), list(_STATUS_FIELDS)
+                )
+                if any(v is not None for v in values):
+                    raw = _fields_to_json(
+                        {k: v for k, v in zip(_STATUS_FIELDS, values, strict=True) if v is not None}
+                    )
+                else:
+                    raw = await self.client.get(key)
+            else:
+                raw = await self.client.get(key)
             if raw is None:
                 logger.debug("redis.get_status_snapshot.miss", key=key)
                 return None
@@ -395,7 +611,20 @@ class CacheRepository:
         """
         Atomically merge `new_data` into the stored state with optimistic concurrency.
         Shallow merge (dict.update); callers should pass fully formed fields for lists.
+
+        In patch mode the merge is a single Lua EVAL (no WATCH/retry) that also
+        returns the post-merge hash, validated once into the returned model.
         """
+        if self.patch_mode:
+            return await self._patch_and_fetch(session_id, new_data, ttl_seconds)
+        return await self._update_blob_atomically(session_id, new_data, ttl_seconds)
+
+    async def _update_blob_atomically(
+        self,
+        session_id: uuid.UUID,
+        new_data: dict[str, Any],
+        ttl_seconds: int,
+    ) -> AgentGraphStateModel | None:
         key = _key_session(session_id)
         max_retries = 8
         attempt = 0
@@ -467,6 +696,161 @@ class CacheRepository:
         logger.warning("redis.state_update.gave_up", key=key, attempts=attempt)
         return None
 
+    async def patch_quiz_state(
+        self,
+        session_id: uuid.UUID,
+        fields: dict[str, Any],
+        ttl_seconds: int = 3600,
+    ) -> bool:
+        """Merge ``fields`` into the stored state without returning it.
+
+        Patch mode validates only ``fields`` and applies them with one EVAL;
+        blob mode falls back to :meth:`update_quiz_state_atomically`. Returns
+        True when the merge landed, False on a missing session or any fault
+        (same fail-soft contract as the atomic merge — never raises).
+        """
+        if not self.patch_mode:
+            return await self.update_quiz_state_atomically(session_id, fields, ttl_seconds) is not None
+
+        fkey = _key_session_fields(session_id)
+        try:
+            encoded = _validate_fields(fields)
+            if not encoded:
+                return False
+            reply = await self._eval_patch(fkey, ttl_seconds=ttl_seconds, fields=encoded)
+            if reply is None and await self._migrate_legacy(session_id, ttl_seconds) is not None:
+                reply = await self._eval_patch(fkey, ttl_seconds=ttl_seconds, fields=encoded)
+            if reply is None:
+                logger.warning("redis.state_patch.missing", key=fkey)
+                return False
+            logger.debug(
+                "redis.state_patch.ok",
+                key=fkey,
+                fields=sorted(encoded),
+                bytes=sum(len(v) for v in encoded.values()),
+            )
+            return True
+        except (ValidationError, RedisError) as e:
+            logger.error("redis.state_patch.fail", key=fkey, error=str(e), exc_info=True)
+            return False
+
+    async def migrate_session_to_fields(
+        self, session_id: uuid.UUID | str, ttl_seconds: int = 3600
+    ) -> bool:
+        """Convert a legacy blob session to the hash layout (idempotent).
+
+        Keeps the legacy key's remaining TTL when it has one. Returns True only
+        when this call performed the conversion.
+        """
+        return bool(await self._migrate_legacy(session_id, ttl_seconds))
+
+    # ---------------------------------------------------------------------
+    # Patch-mode internals
+    # ---------------------------------------------------------------------
+
+    async def _read_state_text(self, session_id: uuid.UUID | str) -> str | None:
+        """Full-state JSON text from whichever layout holds the session."""
+        if self.patch_mode:
+            fields = await self.client.hgetall(_key_session_fields(session_id))
+            if fields:
+                return _fields_to_json(fields)
+        raw = await self.client.get(_key_session(session_id))
+        return None if raw is None else _ensure_text(raw)
+
+    async def _clear_final_result_field(self, session_id: uuid.UUID) -> bool | None:
+        """Hash-layout half of :meth:`clear_final_result`; None when the session
+        is not in the hash layout (caller falls through to the blob path)."""
+        fkey = _key_session_fields(session_id)
+        try:
+            current = await self.client.hget(fkey, "final_result")
+            if current is None:
+                return None
+            if _ensure_text(current) == "null":
+                return False
+            # Raw HSET (not patch_quiz_state): the corrupt value must not be
+            # re-validated on the way out.
+            await self._eval_patch(fkey, ttl_seconds=None, fields={"final_result": "null"})
+            logger.info("redis.clear_final_result.ok", key=fkey, layout="hash")
+            return True
+        except Exception as e:
+            logger.warning("redis.clear_final_result.fail", key=fkey, error=str(e))
+            return False
+
+    async def _eval_patch(
+        self,
+        fkey: str,
+        *,
+        ttl_seconds: int | None,
+        fields: dict[str, str],
+        return_state: bool = False,
+    ) -> Any:
+        if ttl_seconds is None:
+            t = await self.client.ttl(fkey)
+            ttl_seconds = t if isinstance(t, int) and t > 0 else 3600
+        args: list[Any] = [int(ttl_seconds), "1" if return_state else "0"]
+        for name, value in fields.items():
+            args.extend((name, value))
+        return await self.client.eval(_PATCH_LUA, 1, fkey, *args)
+
+    async def _patch_and_fetch(
+        self,
+        session_id: uuid.UUID,
+        new_data: dict[str, Any],
+        ttl_seconds: int,
+    ) -> AgentGraphStateModel | None:
+        fkey = _key_session_fields(session_id)
+        try:
+            encoded = _validate_fields(new_data)
+            reply = await self._eval_patch(
+                fkey, ttl_seconds=ttl_seconds, fields=encoded, return_state=True
+            )
+            if reply is None and await self._migrate_legacy(session_id, ttl_seconds) is not None:
+                reply = await self._eval_patch(
+                    fkey, ttl_seconds=ttl_seconds, fields=encoded, return_state=True
+                )
+            if reply is None:
+                logger.warning("redis.state_update.missing", key=fkey, layout="hash")
+                return None
+            text = _fields_to_json(_pairs_to_dict(reply))
+            model = AgentGraphStateModel.model_validate_json(text)
+            logger.debug(
+                "redis.state_update.ok",
+                session_id=str(model.session_id),
+                key=fkey,
+                attempt=1,
+                ttl_seconds=ttl_seconds,
+                bytes=sum(len(v) for v in encoded.values()),
+            )
+            return model
+        except (ValidationError, RedisError) as e:
+            logger.error("redis.state_update.fail", key=fkey, attempt=1, error=str(e), exc_info=True)
+            return None
+
+    async def _migrate_legacy(
+        self, session_id: uuid.UUID | str, ttl_seconds: int
+    ) -> bool | None:
+        """Returns None when there is no (valid) legacy blob, True when this
+        call converted it, False when the hash layout already existed."""
+        key = _key_session(session_id)
+        raw = await self.client.get(key)
+        if raw is None:
+            return None
+        try:
+            model = AgentGraphStateModel.model_validate_json(_ensure_text(raw))
+        except ValidationError as e:
+            logger.warning("redis.state_migrate.invalid", key=key, error=str(e))
+            return None
+        t = await self.client.ttl(key)
+        ttl = t if isinstance(t, int) and t > 0 else ttl_seconds
+        args: list[Any] = [int(ttl)]
+        for name, value in _model_to_fields(model).items():
+            args.extend((name, value))
+        converted = await self.client.eval(
+            _MIGRATE_LUA, 2, _key_session_fields(session_id), key, *args
+        )
+        logger.info("redis.state_migrate.ok", key=key, converted=bool(converted))
+        return bool(converted)
+
     # ---------------------------------------------------------------------
     # RAG cache (string)
     # ---------------------------------------------------------------------
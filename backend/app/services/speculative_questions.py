@@ -0,0 +1,422 @@
+"""Speculative precompute of the next adaptive question.
+
+In the adaptive phase every ``/quiz/next`` schedules ``run_agent_in_background``
+(``decide_or_finish`` → ``generate_adaptive_question``), so the user waits a
+full LLM round trip for each follow-up. While a question is on screen this
+module instead pre-runs that step for the most likely answers:
+
+  1. ``launch(state)`` — after the agent has persisted a new unanswered
+     question — ranks its options (``rank_options``), and for the top
+     ``branches`` starts one task per option that calls
+     ``graph.speculate_adaptive_step`` on the state with that answer
+     appended. Tasks run in the ``batch`` LLM lane and under the
+     ``speculative`` spend bucket; none start once that bucket's daily
+     counter reaches the budget.
+  2. A finished branch is stored in the hash ``quiz_spec:{quiz}:{q_index}``
+     (field = canonical option index) with the digest of the history it
+     was built on. Branches whose decision would FINISH are dropped: the
+     final profile is never written speculatively.
+  3. ``claim(...)`` — from ``/quiz/next`` — returns the branch for the
+     recorded answer when its digest matches and cancels every other
+     in-flight branch of that quiz. If the matching branch is still running
+     in this process, ``await_inflight`` lets the background step wait for
+     it instead of starting the agent from scratch.
+
+``metrics()`` reports hit rate and the generation time hits saved. Every
+Redis fault fails open (a miss).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+import structlog
+
+from app.services import cost_meter
+from app.services.llm_concurrency import PRIORITY_BATCH, llm_priority
+
+logger = structlog.get_logger(__name__)
+
+SPECULATIVE_BUCKET = "speculative"
+_CLAIMED_FIELD = "claimed"
+_REDIS_OP_TIMEOUT_S = 0.5
+
+_WORD_RE = re.compile(r"[a-z]{4,}")
+_STOPWORDS = frozenset({
+    "about", "also", "always", "been", "being", "from", "have", "into", "just",
+    "like", "more", "most", "much", "only", "other", "over", "really", "some",
+    "such", "than", "that", "their", "them", "then", "there", "they", "this",
+    "very", "what", "when", "where", "which", "while", "will", "with", "would",
+    "your", "yours",
+})
+
+StepFn = Callable[[Mapping[str, Any]], Awaitable[tuple[dict[str, Any] | None, float]]]
+
+
+@dataclass
+class SpeculativeBranch:
+    option_index: int
+    question: dict[str, Any]
+    confidence: float
+    built_ms: float
+
+
+def _plain(obj: Any) -> Any:
+    return obj.model_dump() if hasattr(obj, "model_dump") else obj
+
+
+def _get(obj: Any, key: str, default: Any = None) -> Any:
+    if isinstance(obj, Mapping):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _tokens(*texts: Any) -> set[str]:
+    words: set[str] = set()
+    for text in texts:
+        if text:
+            words.update(_WORD_RE.findall(str(text).lower()))
+    return words - _STOPWORDS
+
+
+def history_digest(history: list[Any], question_text: str) -> str:
+    """Identity of (answers so far, displayed question) a branch was built on."""
+    payload = [
+        [_get(h, "question_index"), _get(h, "option_index"), _get(h, "answer_text")]
+        for h in history
+    ]
+    raw = orjson.dumps([payload, question_text or ""])
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def rank_options(state: Mapping[str, Any], question: Mapping[str, Any]) -> list[int]:
+    """Option indexes of ``question``, most likely answer first.
+
+    Cheap lexical heuristic, no LLM call: the character whose profile shares
+    the most words with the answers given so far is the current leader, and
+    options are ranked by word overlap with that leader (then with the
+    answers themselves, then stored order).
+    """
+    options = list(question.get("options") or [])
+    answered = _tokens(*(_get(h, "answer_text") for h in state.get("quiz_history") or []))
+    leader: set[str] = set()
+    best = 0
+    for ch in state.get("generated_characters") or []:
+        words = _tokens(_get(ch, "name"), _get(ch, "short_description"), _get(ch, "profile_text"))
+        overlap = len(words & answered)
+        if overlap > best:
+            best, leader = overlap, words
+
+    def score(i: int) -> tuple[int, int, int]:
+        words = _tokens(_get(options[i], "text"))
+        return (-len(words & leader), -len(words & answered), i)
+
+    return sorted(range(len(options)), key=score)
+
+
+def _pending_question(state: Mapping[str, Any]) -> tuple[int, dict[str, Any]] | None:
+    """(index, question) of the displayed adaptive-phase question, if any."""
+    if state.get("final_result"):
+        return None
+    history = state.get("quiz_history") or []
+    questions = state.get("generated_questions") or []
+    if len(questions) != len(history) + 1:
+        return None
+    if len(history) + 1 < int(state.get("baseline_count") or 0):
+        return None
+    question = _plain(questions[-1])
+    if not isinstance(question, Mapping) or len(question.get("options") or []) < 2:
+        return None
+    return len(history), dict(question)
+
+
+async def _default_step(state: Mapping[str, Any]) -> tuple[dict[str, Any] | None, float]:
+    from app.agent.graph import speculate_adaptive_step  # lazy: graph import is heavy
+
+    return await speculate_adaptive_step(dict(state))  # type: ignore[arg-type]
+
+
+class QuestionSpeculator:
+    """Launches, stores, claims and cancels speculative branches."""
+
+    def __init__(
+        self,
+        *,
+        redis_factory: Callable[[], Any],
+        branches: int = 2,
+        daily_budget_cents: int = 500,
+        ttl_s: int = 900,
+        step_fn: StepFn | None = None,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self.branches = int(branches)
+        self.daily_budget_cents = int(daily_budget_cents)
+        self.ttl_s = int(ttl_s)
+        self._step = step_fn or _default_step
+        # quiz_id -> {(q_index, option_index): task}
+        self._inflight: dict[str, dict[tuple[int, int], asyncio.Task]] = {}
+        self._stats = {
+            "launched": 0,
+            "stored": 0,
+            "hits": 0,
+            "misses": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "finish_branches": 0,
+            "skipped_budget": 0,
+        }
+        self._latency_saved_ms = 0.0
+
+    @staticmethod
+    def _key(quiz_id: str, q_index: int) -> str:
+        return f"quiz_spec:{quiz_id}:{q_index}"
+
+    async def _redis_op(self, fn: Callable[[Any], Awaitable[Any]]) -> Any:
+        client = self._redis_factory()
+        if client is None:
+            return None
+        try:
+            return await asyncio.wait_for(fn(client), _REDIS_OP_TIMEOUT_S)
+        except Exception:
+            logger.debug("quiz.speculation.redis_fail", exc_info=True)
+            return None
+
+    async def _within_budget(self) -> bool:
+        if self.daily_budget_cents <= 0:
+            return False
+        spent = await cost_meter.read_daily_cents(self._redis_factory(), bucket=SPECULATIVE_BUCKET)
+        return spent is None or spent < self.daily_budget_cents
+
+    async def launch(self, state: Mapping[str, Any]) -> int:
+        """Start branches for the displayed question; returns how many."""
+        pending = _pending_question(state)
+        if pending is None:
+            return 0
+        q_index, question = pending
+        quiz_id = str(state.get("session_id"))
+        self.cancel(quiz_id)
+        if not await self._within_budget():
+            self._stats["skipped_budget"] += 1
+            logger.info("quiz.speculation.budget_exhausted", quiz_id=quiz_id)
+            return 0
+
+        history = [_plain(h) for h in state.get("quiz_history") or []]
+        question_text = str(question.get("question_text") or "")
+        digest = history_digest(history, question_text)
+        tasks = self._inflight.setdefault(quiz_id, {})
+        ranked = rank_options(state, question)[: self.branches]
+        with llm_priority(PRIORITY_BATCH), cost_meter.spend_bucket(SPECULATIVE_BUCKET):
+            for idx in ranked:
+                answer = {
+                    "question_index": q_index,
+                    "question_text": question_text,
+                    "answer_text": str(_get(question["options"][idx], "text") or ""),
+                    "option_index": idx,
+                }
+                hypothetical = {**state, "quiz_history": [*history, answer]}
+                task = asyncio.create_task(self._build(hypothetical, quiz_id, q_index, idx, digest))
+                tasks[(q_index, idx)] = task
+                task.add_done_callback(lambda t, k=(q_index, idx): self._forget(quiz_id, k, t))
+        self._stats["launched"] += len(ranked)
+        logger.info("quiz.speculation.launched", quiz_id=quiz_id, q_index=q_index, options=ranked)
+        return len(ranked)
+
+    def _forget(self, quiz_id: str, key: tuple[int, int], task: asyncio.Task) -> None:
+        tasks = self._inflight.get(quiz_id)
+        if tasks is not None and tasks.get(key) is task:
+            del tasks[key]
+            if not tasks:
+                self._inflight.pop(quiz_id, None)
+
+    async def _build(
+        self,
+        state: Mapping[str, Any],
+        quiz_id: str,
+        q_index: int,
+        option_index: int,
+        digest: str,
+    ) -> SpeculativeBranch | None:
+        t0 = time.perf_counter()
+        try:
+            question, confidence = await self._step(state)
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.info("quiz.speculation.branch_failed", quiz_id=quiz_id, error=str(e))
+            return None
+        if question is None:
+            self._stats["finish_branches"] += 1
+            return None
+        branch = SpeculativeBranch(
+            option_index=option_index,
+            question=question,
+            confidence=float(confidence),
+            built_ms=round((time.perf_counter() - t0) * 1000.0, 1),
+        )
+        key = self._key(quiz_id, q_index)
+        value = orjson.dumps({**branch.__dict__, "digest": digest}).decode()
+
+        async def _store(r: Any) -> bool:
+            if await r.hexists(key, _CLAIMED_FIELD):
+                return False
+            await r.hset(key, str(option_index), value)
+            await r.expire(key, self.ttl_s)
+            return True
+
+        if await self._redis_op(_store):
+            self._stats["stored"] += 1
+        return branch
+
+    def cancel(self, quiz_id: str, *, keep: tuple[int, int] | None = None) -> int:
+        """Cancel the quiz's in-flight branches except ``keep``."""
+        cancelled = 0
+        for key, task in list(self._inflight.get(quiz_id, {}).items()):
+            if key != keep and task.cancel():
+                cancelled += 1
+        self._stats["cancelled"] += cancelled
+        return cancelled
+
+    def has_inflight(self, quiz_id: str, q_index: int, option_index: int) -> bool:
+        task = self._inflight.get(quiz_id, {}).get((q_index, option_index))
+        return task is not None and not task.done()
+
+    async def claim(
+        self, quiz_id: str, q_index: int, option_index: int, digest: str
+    ) -> SpeculativeBranch | None:
+        """The prepared branch for the recorded answer, or None.
+
+        Marks the question claimed (late branches are not stored) and cancels
+        the other in-flight branches. A matching branch still running here is
+        left to ``await_inflight`` and not yet counted.
+        """
+        mine = (q_index, option_index)
+        self.cancel(quiz_id, keep=mine)
+        key = self._key(quiz_id, q_index)
+
+        async def _take(r: Any) -> Any:
+            raw = await r.hget(key, str(option_index))
+            await r.delete(key)
+            await r.hset(key, _CLAIMED_FIELD, "1")
+            await r.expire(key, self.ttl_s)
+            return raw
+
+        branch = self._decode(await self._redis_op(_take), digest)
+        if branch is not None:
+            self._record_hit(quiz_id, q_index, branch.built_ms)
+        elif not self.has_inflight(quiz_id, q_index, option_index):
+            self._stats["misses"] += 1
+        return branch
+
+    async def await_inflight(
+        self, quiz_id: str, q_index: int, option_index: int
+    ) -> SpeculativeBranch | None:
+        """Wait for this process's still-running matching branch."""
+        task = self._inflight.get(quiz_id, {}).get((q_index, option_index))
+        if task is None:
+            return None
+        t0 = time.perf_counter()
+        try:
+            branch = await task
+        except (asyncio.CancelledError, Exception):
+            branch = None
+        if branch is None:
+            self._stats["misses"] += 1
+            return None
+        waited_ms = (time.perf_counter() - t0) * 1000.0
+        self._record_hit(quiz_id, q_index, max(0.0, branch.built_ms - waited_ms))
+        return branch
+
+    def _decode(self, raw: Any, digest: str) -> SpeculativeBranch | None:
+        if not raw:
+            return None
+        try:
+            data = orjson.loads(raw)
+            if data.get("digest") != digest:
+                return None
+            return SpeculativeBranch(
+                option_index=int(data["option_index"]),
+                question=dict(data["question"]),
+                confidence=float(data["confidence"]),
+                built_ms=float(data["built_ms"]),
+            )
+        except Exception:
+            logger.debug("quiz.speculation.decode_fail", exc_info=True)
+            return None
+
+    def _record_hit(self, quiz_id: str, q_index: int, saved_ms: float) -> None:
+        self._stats["hits"] += 1
+        self._latency_saved_ms += saved_ms
+        logger.info("quiz.speculation.hit", quiz_id=quiz_id, q_index=q_index, saved_ms=round(saved_ms, 1))
+
+    def metrics(self) -> dict[str, Any]:
+        served = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / served, 3) if served else 0.0,
+            "latency_saved_ms": round(self._latency_saved_ms, 1),
+            "in_flight": sum(
+                1 for tasks in self._inflight.values() for t in tasks.values() if not t.done()
+            ),
+            "daily_budget_cents": self.daily_budget_cents,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-global accessor
+# ---------------------------------------------------------------------------
+
+_speculator: QuestionSpeculator | None = None
+_built = False
+
+
+def _default_redis_factory() -> Any | None:
+    try:
+        from app.api.dependencies import get_redis_client
+
+        return get_redis_client()
+    except Exception:
+        return None
+
+
+def get_question_speculator() -> QuestionSpeculator | None:
+    """The process-wide speculator, or None when ``quiz.speculation`` is off."""
+    global _speculator, _built
+    if not _built:
+        _built = True
+        try:
+            from app.core.config import settings
+
+            cfg = getattr(getattr(settings, "quiz", None), "speculation", None)
+            if cfg is not None and bool(getattr(cfg, "enabled", False)):
+                _speculator = QuestionSpeculator(
+                    redis_factory=_default_redis_factory,
+                    branches=cfg.branches,
+                    daily_budget_cents=round(cfg.daily_budget_usd * 100),
+                    ttl_s=cfg.ttl_s,
+                )
+        except Exception:
+            logger.warning("quiz.speculation.config_invalid", exc_info=True)
+            _speculator = None
+    return _speculator
+
+
+def reset_question_speculator_for_tests() -> None:
+    global _speculator, _built
+    _speculator, _built = None, False
+
+
+__all__ = [
+    "SPECULATIVE_BUCKET",
+    "QuestionSpeculator",
+    "SpeculativeBranch",
+    "get_question_speculator",
+    "history_digest",
+    "rank_options",
+    "reset_question_speculator_for_tests",
+]
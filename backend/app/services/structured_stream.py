@@ -0,0 +1,237 @@
+"""Incremental JSON parsing for streamed structured LLM output.
+
+``LLMService`` normally waits for the whole Responses-API body before
+parsing, so a caller producing a list of character profiles sees nothing
+until the last profile is written. In streaming mode the output text is
+fed here chunk by chunk and every value that CLOSES at a shallow path is
+reported immediately:
+
+    {"synopsis": {...}, "characters": [{...}, {...}]}
+      → ("synopsis",) as soon as its ``}`` arrives,
+        ("characters", 0), ("characters", 1), ... one per closed profile,
+        and ("characters",) once the list closes.
+
+Partials are previews: the final result is still parsed and validated from
+the complete body exactly as before, and a retried attempt may re-emit the
+same paths (consumers should treat them as idempotent, keyed by path).
+
+`partial_results(sink)` registers a per-context consumer; structured calls
+made inside the block (``invoke_structured``) stream and report
+``(tool_name, path, value)`` to it. Outside such a block nothing streams.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+Path = tuple[str | int, ...]
+PartialSink = Callable[[str, Path, Any], None]
+
+_WS = " \t\r\n"
+
+
+@dataclass
+class _Frame:
+    kind: str  # "{" or "["
+    key: str | int | None = None  # current key (object) / index (array)
+    expect_key: bool = False  # object: next string is a key
+    elem_start: int | None = None
+    elem_done: bool = False
+
+
+class IncrementalJSONParser:
+    """Feed JSON text in chunks; get back values as they close.
+
+    Only values at depth ``1..max_depth`` are reported (the root document is
+    the caller's final parse), which bounds the re-parse cost to the items
+    callers care about. Leading prose / code fences before the first ``{`` or
+    ``[`` are skipped. Invalid JSON never raises: the offending value is
+    simply not reported.
+    """
+
+    def __init__(self, *, max_depth: int = 2) -> None:
+        self.max_depth = max_depth
+        self._parts: list[str] = []
+        self._joined: str | None = ""
+        self._len = 0
+        self._stack: list[_Frame] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._str_start = 0
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> list[tuple[Path, Any]]:
+        if self._done or not chunk:
+            return []
+        base = self._len
+        self._parts.append(chunk)
+        self._len += len(chunk)
+        self._joined = None
+        out: list[tuple[Path, Any]] = []
+        i, n = 0, len(chunk)
+        while i < n and not self._done:
+            if self._in_string and not self._escape:
+                # Skip string bodies in bulk — they are most of the bytes.
+                j = _next_special(chunk, i)
+                if j < 0:
+                    return out
+                i = j
+            self._step(chunk[i], base + i, out)
+            i += 1
+        return out
+
+    # -- internals ---------------------------------------------------------
+
+    def _slice(self, start: int, end: int) -> str:
+        if self._joined is None:
+            self._joined = "".join(self._parts)
+            self._parts = [self._joined]
+        return self._joined[start:end]
+
+    def _path(self) -> Path:
+        return tuple(f.key for f in self._stack if f.key is not None)
+
+    def _emit(self, out: list[tuple[Path, Any]], start: int, end: int) -> None:
+        frame = self._stack[-1]
+        frame.elem_done = True
+        if len(self._stack) > self.max_depth or frame.key is None:
+            return
+        try:
+            value = json.loads(self._slice(start, end))
+        except ValueError:
+            return
+        out.append((self._path(), value))
+
+    def _finish_scalar(self, out: list[tuple[Path, Any]], end: int) -> None:
+        frame = self._stack[-1]
+        if frame.elem_start is not None and not frame.elem_done:
+            self._emit(out, frame.elem_start, end)
+
+    def _push(self, ch: str) -> None:
+        self._stack.append(_Frame(kind=ch, expect_key=ch == "{", key=None if ch == "{" else 0))
+
+    def _close_string(self, i: int) -> None:
+        self._in_string = False
+        frame = self._stack[-1]
+        if frame.kind == "{" and frame.expect_key:
+            frame.expect_key = False
+            if len(self._stack) <= self.max_depth:
+                raw = self._slice(self._str_start, i + 1)
+                try:
+                    frame.key = json.loads(raw)
+                except ValueError:
+                    frame.key = raw[1:-1]
+            else:
+                frame.key = ""  # never reported; just marks "has a key"
+
+    def _step(self, ch: str, i: int, out: list[tuple[Path, Any]]) -> None:  # noqa: C901 — one branch per JSON token
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._close_string(i)
+            return
+        if not self._started:
+            if ch in "{[":
+                self._started = True
+                self._push(ch)
+            return
+        if ch in _WS:
+            return
+        frame = self._stack[-1]
+        if ch == '"':
+            self._in_string = True
+            self._str_start = i
+            if not (frame.kind == "{" and frame.expect_key) and frame.elem_start is None:
+                frame.elem_start = i
+        elif ch in "{[":
+            if frame.elem_start is None:
+                frame.elem_start = i
+            self._push(ch)
+        elif ch in "}]":
+            self._finish_scalar(out, i)
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+                return
+            parent = self._stack[-1]
+            if parent.elem_start is not None and not parent.elem_done:
+                self._emit(out, parent.elem_start, i + 1)
+        elif ch == ":":
+            frame.elem_start, frame.elem_done = None, False
+        elif ch == ",":
+            self._finish_scalar(out, i)
+            frame.elem_start, frame.elem_done = None, False
+            if frame.kind == "{":
+                frame.expect_key, frame.key = True, None
+            else:
+                frame.key = int(frame.key or 0) + 1
+        elif frame.elem_start is None:
+            frame.elem_start = i  # number / true / false / null
+
+
+def _next_special(chunk: str, i: int) -> int:
+    q = chunk.find('"', i)
+    b = chunk.find("\\", i)
+    if q < 0:
+        return b
+    return q if b < 0 else min(q, b)
+
+
+_SINK: ContextVar[PartialSink | None] = ContextVar("structured_partial_sink", default=None)
+
+
+def current_partial_sink() -> PartialSink | None:
+    return _SINK.get()
+
+
+@contextlib.contextmanager
+def partial_results(sink: PartialSink) -> Iterator[None]:
+    """Stream structured calls in this context and report partials to ``sink``.
+
+    Nested registrations chain: the outer sink still sees every partial.
+    """
+    outer = _SINK.get()
+
+    def _chained(tool: str, path: Path, value: Any) -> None:
+        _deliver(sink, tool, path, value)
+        if outer is not None:
+            outer(tool, path, value)
+
+    token = _SINK.set(_chained)
+    try:
+        yield
+    finally:
+        _SINK.reset(token)
+
+
+def _deliver(sink: PartialSink, tool: str, path: Path, value: Any) -> None:
+    try:
+        sink(tool, path, value)
+    except Exception:  # noqa: BLE001 — a preview consumer must never fail the call
+        logger.debug("llm.stream.partial_sink_failed", tool=tool, path=path, exc_info=True)
+
+
+__all__ = [
+    "IncrementalJSONParser",
+    "PartialSink",
+    "Path",
+    "current_partial_sink",
+    "partial_results",
+]
@@ -0,0 +1,190 @@
+"""In-process Azurite-compatible Blob endpoint for tests and benchmarks.
+
+Speaks just enough of the Blob REST API for `azure.storage.blob.aio` to
+run `AzureBlobProvider` against it unmodified:
+
+* ``PUT /{account}/{container}/{blob}`` — Put Blob; ``If-None-Match: *``
+  (what ``upload_blob(overwrite=False)`` sends) answers 409
+  ``BlobAlreadyExists`` for an existing key;
+* ``HEAD /{account}/{container}/{blob}`` — Get Blob Properties;
+* ``GET /{account}/{container}?restype=container&comp=list&prefix=…`` —
+  List Blobs (single page);
+* ``PUT /{account}/{container}?restype=container`` — Create Container.
+
+Containers spring into existence on first write and auth headers are
+ignored, so point the provider at ``AzuriteStub.base_url`` with the
+well-known Azurite account key. ``latency_s`` delays every response to
+stand in for the network round trip to a real account; ``connections``
+counts the TCP connections requests arrived on, so a caller can see
+client reuse, and ``peak_in_flight`` the most requests served at once.
+Usage:
+
+    async with AzuriteStub(latency_s=0.005) as stub:
+        provider = AzureBlobProvider(base_url=stub.base_url, container="media",
+                                     credential=AZURITE_CREDENTIAL)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+from email.utils import formatdate
+from typing import Any
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+
+AZURITE_ACCOUNT = "devstoreaccount1"
+# Azurite's published development key (not a secret).
+AZURITE_CREDENTIAL = {
+    "account_name": AZURITE_ACCOUNT,
+    "account_key": (
+        "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/"
+        "K1SZFPTOtr/KBHBeksoGMGw=="
+    ),
+}
+
+
+class AzuriteStub:
+    """A Blob endpoint on 127.0.0.1 backed by a dict."""
+
+    def __init__(self, *, latency_s: float = 0.0) -> None:
+        self.latency_s = latency_s
+        self.blobs: dict[tuple[str, str], tuple[bytes, str]] = {}
+        self.requests: dict[str, int] = {}
+        self._protocols: set[Any] = set()
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self._runner: web.AppRunner | None = None
+        self._port = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._port}/{AZURITE_ACCOUNT}"
+
+    async def __aenter__(self) -> AzuriteStub:
+        app = web.Application(client_max_size=256 * 1024 * 1024, middlewares=[self._track])
+        app.router.add_route("*", "/{account}/{container}", self._container)
+        app.router.add_route("*", "/{account}/{container}/{blob:.+}", self._blob)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self._port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @property
+    def connections(self) -> int:
+        return len(self._protocols)
+
+    # -- handlers -----------------------------------------------------------
+
+    @web.middleware
+    async def _track(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self._protocols.add(request.protocol)
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            return await handler(request)
+        finally:
+            self._in_flight -= 1
+
+    def _count(self, op: str) -> None:
+        self.requests[op] = self.requests.get(op, 0) + 1
+
+    async def _delay(self) -> None:
+        if self.latency_s > 0:
+            await asyncio.sleep(self.latency_s)
+
+    @staticmethod
+    def _headers(**extra: str) -> dict[str, str]:
+        return {
+            "x-ms-version": "2025-01-05",
+            "x-ms-request-id": "00000000-0000-0000-0000-000000000000",
+            "Date": formatdate(usegmt=True),
+            **extra,
+        }
+
+    @staticmethod
+    def _error(status: int, code: str) -> web.Response:
+        body = f'<?xml version="1.0" encoding="utf-8"?><Error><Code>{code}</Code><Message>{code}</Message></Error>'
+        return web.Response(
+            status=status, body=body.encode(), content_type="application/xml",
+            headers=AzuriteStub._headers(**{"x-ms-error-code": code}),
+        )
+
+    async def _container(self, request: web.Request) -> web.Response:
+        await self._delay()
+        container = request.match_info["container"]
+        if request.method == "PUT":
+            self._count("create_container")
+            return web.Response(status=201, headers=self._headers(ETag='"0x1"'))
+        if request.method == "GET" and request.query.get("comp") == "list":
+            self._count("list")
+            return self._list(container, request.query.get("prefix", ""))
+        return self._error(405, "UnsupportedHttpVerb")
+
+    def _list(self, container: str, prefix: str) -> web.Response:
+        items = []
+        for (c, name), (data, content_type) in sorted(self.blobs.items()):
+            if c != container or not name.startswith(prefix):
+                continue
+            items.append(
+                f"<Blob><Name>{escape(name)}</Name><Properties>"
+                f"<Content-Length>{len(data)}</Content-Length>"
+                f"<Content-Type>{escape(content_type)}</Content-Type>"
+                f"<BlobType>BlockBlob</BlobType></Properties></Blob>"
+            )
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<EnumerationResults ContainerName="{escape(container)}">'
+            f"<Prefix>{escape(prefix)}</Prefix><Blobs>{''.join(items)}</Blobs>"
+            "<NextMarker /></EnumerationResults>"
+        )
+        return web.Response(
+            body=body.encode(), content_type="application/xml", headers=self._headers()
+        )
+
+    async def _blob(self, request: web.Request) -> web.Response:
+        key = (request.match_info["container"], request.match_info["blob"])
+        if request.method == "PUT":
+            data = await request.read()
+            await self._delay()
+            self._count("put")
+            if request.headers.get("If-None-Match") == "*" and key in self.blobs:
+                return self._error(409, "BlobAlreadyExists")
+            content_type = request.headers.get("x-ms-blob-content-type", "application/octet-stream")
+            self.blobs[key] = (data, content_type)
+            md5 = base64.b64encode(hashlib.md5(data).digest()).decode()  # noqa: S324 - wire format
+            return web.Response(
+                status=201,
+                headers=self._headers(**{
+                    "ETag": f'"0x{hashlib.sha1(data).hexdigest()[:16].upper()}"',  # noqa: S324
+                    "Last-Modified": formatdate(usegmt=True),
+                    "Content-MD5": md5,
+                    "x-ms-request-server-encrypted": "true",
+                }),
+            )
+        if request.method == "HEAD":
+            await self._delay()
+            self._count("head")
+            if key not in self.blobs:
+                return web.Response(status=404, headers=self._headers(**{"x-ms-error-code": "BlobNotFound"}))
+            data, content_type = self.blobs[key]
+            return web.Response(
+                status=200,
+                headers=self._headers(**{
+                    "Content-Length": str(len(data)), "Content-Type": content_type,
+                    "x-ms-blob-type": "BlockBlob", "Last-Modified": formatdate(usegmt=True),
+                }),
+            )
+        await self._delay()
+        return self._error(405, "UnsupportedHttpVerb")
+
+
+__all__ = ["AZURITE_ACCOUNT", "AZURITE_CREDENTIAL", "AzuriteStub"]
@@ -0,0 +1,188 @@
+"""Backfill responsive derivatives for rehosted images and report bytes saved.
+
+Character images rehosted before derivatives existed have only the
+full-size original in ``media_assets``. For every published pack's cast
+(``topics.current_pack_id`` → ``character_sets.composition.character_ids``
+→ ``characters.image_asset_id``) this:
+
+  1. generates the resized WebP/AVIF variants the rehost scripts now write
+     (``rehost_fal_images._upsert_derivatives``) for originals that have
+     none yet — skipped with ``--report-only``;
+  2. reports, per pack and in total, the bytes a quiz start downloads for
+     the cast at the original size versus through
+     ``/api/v1/media/{id}?w=<--width>`` for a browser that accepts AVIF and
+     WebP (the same ``select_derivative`` the endpoint uses).
+
+$0 FAL — local resize only.
+
+USAGE (from backend/, PROD_DB_URL or DATABASE_URL in env)
+---------------------------------------------------------
+    python -m scripts.backfill_image_derivatives --report-only
+    python -m scripts.backfill_image_derivatives --limit 200 --width 128
+    python -m scripts.backfill_image_derivatives --slugs hogwarts-houses,star-wars
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any
+
+from scripts.rehost_fal_images import _normalize_dsn, _upsert_derivatives
+
+BROWSER_ACCEPT = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
+
+_CAST_SQL = """
+SELECT t.slug AS slug, m.id::text AS asset_id,
+       octet_length(m.bytes_blob) AS bytes,
+       m.prompt_payload AS payload
+FROM topics t
+JOIN topic_packs p ON p.id = t.current_pack_id AND p.status = 'published'
+JOIN character_sets cs ON cs.id = p.character_set_id
+CROSS JOIN LATERAL jsonb_array_elements_text(cs.composition -> 'character_ids') cid
+JOIN characters c ON c.id = CAST(cid AS uuid)
+JOIN media_assets m ON m.id = c.image_asset_id
+WHERE m.bytes_blob IS NOT NULL
+"""
+
+
+def summarize_savings(
+    rows: list[dict[str, Any]], *, width: int, accept: str = BROWSER_ACCEPT
+) -> dict[str, Any]:
+    """Bytes per pack at original size vs `?w=width`; rows are `_CAST_SQL` rows."""
+    from app.services.media.derivatives import select_derivative
+
+    packs: dict[str, dict[str, int]] = {}
+    for r in rows:
+        original = int(r["bytes"] or 0)
+        variant = select_derivative(r.get("payload"), width=width, accept=accept)
+        served = int(variant["bytes"]) if variant and variant.get("bytes") else original
+        p = packs.setdefault(
+            r["slug"], {"images": 0, "with_derivatives": 0, "original_bytes": 0, "served_bytes": 0}
+        )
+        p["images"] += 1
+        p["with_derivatives"] += int(variant is not None)
+        p["original_bytes"] += original
+        p["served_bytes"] += served
+
+    total = {k: sum(p[k] for p in packs.values()) for k in
+             ("images", "with_derivatives", "original_bytes", "served_bytes")}
+    total["saved_bytes"] = total["original_bytes"] - total["served_bytes"]
+    total["saved_pct"] = (
+        round(100.0 * total["saved_bytes"] / total["original_bytes"], 1)
+        if total["original_bytes"] else 0.0
+    )
+    return {"width": width, "packs": len(packs), "total": total, "per_pack": packs}
+
+
+async def _load_rows(conn: Any, slugs: list[str] | None) -> list[dict[str, Any]]:
+    from sqlalchemy import text
+
+    sql = _CAST_SQL + (" AND t.slug = ANY(:slugs)" if slugs else "") + " ORDER BY t.slug"
+    rows = (await conn.execute(text(sql), {"slugs": slugs} if slugs else {})).mappings().all()
+    out = []
+    for r in rows:
+        payload = r["payload"]
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        out.append({**r, "payload": payload or {}})
+    return out
+
+
+async def run(
+    *,
+    db_url: str,
+    slugs: list[str] | None,
+    width: int,
+    limit: int,
+    report_only: bool,
+) -> dict[str, Any]:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(_normalize_dsn(db_url), connect_args={"ssl": True})
+    generated = failed = 0
+    try:
+        async with engine.connect() as conn:
+            rows = await _load_rows(conn, slugs)
+        pending = list(
+            {r["asset_id"]: r for r in rows if not r["payload"].get("derivatives")}.values()
+        )
+        if limit > 0:
+            pending = pending[:limit]
+        print(f"cast images: {len(rows)}; originals without derivatives: {len(pending)}")
+
+        for i, r in enumerate([] if report_only else pending, start=1):
+            async with engine.begin() as conn:
+                blob = (
+                    await conn.execute(
+                        text("SELECT bytes_blob FROM media_assets WHERE id = CAST(:id AS uuid)"),
+                        {"id": r["asset_id"]},
+                    )
+                ).scalar_one()
+                source = ((r["payload"].get("rehost") or {}).get("source_url")) or ""
+                manifest = await _upsert_derivatives(
+                    conn, asset_id=r["asset_id"], data=bytes(blob), source_url=source
+                )
+            if manifest:
+                generated += 1
+            else:
+                failed += 1
+            if i % 25 == 0:
+                print(f"progress: {i}/{len(pending)}", flush=True)
+
+        if generated:
+            async with engine.connect() as conn:
+                rows = await _load_rows(conn, slugs)
+    finally:
+        await engine.dispose()
+
+    summary = summarize_savings(rows, width=width)
+    summary["derivatives"] = {"generated": generated, "none_or_failed": failed}
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--slugs", default="",
+                   help="comma-separated topic slugs (default: every published pack)")
+    p.add_argument("--width", type=int, default=128,
+                   help="?w= the cast thumbnails request (default 128 = 56 px at 2x)")
+    p.add_argument("--limit", type=int, default=0,
+                   help="max originals to backfill this run (0 = all)")
+    p.add_argument("--report-only", action="store_true",
+                   help="report savings for what exists; generate nothing")
+    p.add_argument("--json", type=argparse.FileType("w", encoding="utf-8"),
+                   default=None, help="write the JSON summary here")
+    args = p.parse_args(argv)
+
+    db_url = os.environ.get("PROD_DB_URL") or os.environ.get("DATABASE_URL")
+    if not db_url:
+        print("error: set PROD_DB_URL (or DATABASE_URL)", file=sys.stderr)
+        return 2
+
+    summary = asyncio.run(
+        run(
+            db_url=db_url,
+            slugs=[s.strip() for s in args.slugs.split(",") if s.strip()] or None,
+            width=args.width,
+            limit=args.limit,
+            report_only=args.report_only,
+        )
+    )
+    t = summary["total"]
+    print(f"packs={summary['packs']} images={t['images']} "
+          f"with_derivatives={t['with_derivatives']} "
+          f"original={t['original_bytes']}B served@w={summary['width']}={t['served_bytes']}B "
+          f"saved={t['saved_bytes']}B ({t['saved_pct']}%)")
+    if args.json:
+        json.dump(summary, args.json, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,7 +16,8 @@ behind).
 Flow per character:
   1. build prompt (object-aware) -> FAL generate (seed = slug|name)
   2. LLM concept judge (gemini) -> drop on fail (never ship un-judged art)
-  3. download bytes (SSRF-guarded) -> media_assets (sha256 dedup)
+  3. download bytes (SSRF-guarded) -> media_assets (sha256 dedup), plus
+     resized WebP/AVIF derivatives (``rehost_fal_images._upsert_derivatives``)
   4. UPDATE characters SET image_url = <api media url>, image_asset_id = ...
      + mirror session_history.character_set snapshots
 
@@ -0,0 +1,250 @@
+"""Benchmark agent-queue throughput as worker processes are added.
+
+Enqueues ``--jobs`` agent jobs on the ``agent.queue`` stream and drains them
+with N separate worker processes (``AgentWorker`` from
+``app/jobs/agent_worker``, ``--concurrency`` jobs each) for every
+``--workers`` level. Each simulated job awaits ``--latency-ms`` (the LLM
+round-trips) and burns ``--cpu-ms`` of CPU (state (de)serialisation, graph
+bookkeeping), so the per-process event loop becomes the bottleneck the way
+it does for a single API pod.
+
+Without ``--redis-url`` a local fakeredis TCP server is started, so nothing
+leaves localhost. Usage:
+
+    python -m scripts.benchmark_agent_workers
+    python -m scripts.benchmark_agent_workers --workers 1 2 4 8 --jobs 400 --json
+    python -m scripts.benchmark_agent_workers --redis-url redis://localhost:6379/15
+
+``jobs/s`` is completed jobs per wall second from the first enqueue to the
+last ack; the ideal is ``min(workers x concurrency / latency,
+cpus / cpu_time)``. Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+_STREAM = "bench_agent_jobs"
+_GROUP = "bench_agent_workers"
+_DONE_KEY = "bench_agent:done"
+_READY_KEY = "bench_agent:ready"
+_STOP_KEY = "bench_agent:stop"
+
+
+def _queue(client: Any) -> Any:
+    from app.services.agent_queue import AgentJobQueue
+
+    return AgentJobQueue(client, stream=_STREAM, group=_GROUP, visibility_timeout_s=30)
+
+
+async def _worker_main(url: str, index: int, concurrency: int, latency_s: float, cpu_s: float) -> None:
+    import redis.asyncio as redis
+
+    from app.jobs.agent_worker import AgentWorker
+
+    client = redis.from_url(url, decode_responses=True)
+
+    async def run_job(_job: Any) -> bool:
+        await asyncio.sleep(latency_s)
+        deadline = time.perf_counter() + cpu_s
+        while time.perf_counter() < deadline:
+            pass
+        await client.incr(_DONE_KEY)
+        return False
+
+    worker = AgentWorker(
+        _queue(client), run_job=run_job, consumer=f"bench-{index}", concurrency=concurrency, block_ms=100
+    )
+    stop = asyncio.Event()
+
+    async def watch_stop() -> None:
+        while not await client.exists(_STOP_KEY):
+            await asyncio.sleep(0.05)
+        stop.set()
+
+    await client.incr(_READY_KEY)
+    watcher = asyncio.create_task(watch_stop())
+    await worker.run(stop)
+    await worker.drain(5.0)
+    watcher.cancel()
+    await client.aclose()
+
+
+def _quiet_logs() -> None:
+    import logging
+
+    import structlog
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+
+
+def _worker_process(url: str, index: int, concurrency: int, latency_s: float, cpu_s: float) -> None:
+    _quiet_logs()
+    asyncio.run(_worker_main(url, index, concurrency, latency_s, cpu_s))
+
+
+class LocalRedis:
+    """fakeredis TCP server on 127.0.0.1 running in its own thread."""
+
+    def __init__(self) -> None:
+        from fakeredis import TcpFakeServer
+
+        self._server = TcpFakeServer(("127.0.0.1", 0))
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    def __enter__(self) -> LocalRedis:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@dataclass
+class LevelReport:
+    workers: int
+    concurrency: int
+    jobs: int
+    completed: int
+    seconds: float
+    jobs_per_s: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+async def _wait_for(client: Any, key: str, target: int, timeout_s: float) -> int:
+    deadline = time.perf_counter() + timeout_s
+    value = 0
+    while time.perf_counter() < deadline:
+        value = int(await client.get(key) or 0)
+        if value >= target:
+            break
+        await asyncio.sleep(0.02)
+    return value
+
+
+async def run_level(
+    url: str, *, workers: int, concurrency: int, jobs: int, latency_s: float, cpu_s: float, timeout_s: float
+) -> LevelReport:
+    import redis.asyncio as redis
+
+    client = redis.from_url(url, decode_responses=True)
+    await client.delete(_STREAM, _DONE_KEY, _READY_KEY, _STOP_KEY)
+    queue = _queue(client)
+    await queue.ensure_group()
+
+    ctx = mp.get_context("spawn")
+    procs = [
+        ctx.Process(target=_worker_process, args=(url, i, concurrency, latency_s, cpu_s), daemon=True)
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    try:
+        await _wait_for(client, _READY_KEY, workers, 60.0)
+        start = time.perf_counter()
+        for _ in range(jobs):
+            await queue.enqueue(uuid.uuid4(), reason="bench")
+        completed = await _wait_for(client, _DONE_KEY, jobs, timeout_s)
+        wall = time.perf_counter() - start
+    finally:
+        await client.set(_STOP_KEY, "1")
+        for p in procs:
+            p.join(15)
+            if p.is_alive():
+                p.terminate()
+        await client.delete(_STREAM, _DONE_KEY, _READY_KEY, _STOP_KEY)
+        await client.aclose()
+    return LevelReport(
+        workers=workers,
+        concurrency=concurrency,
+        jobs=jobs,
+        completed=completed,
+        seconds=round(wall, 2),
+        jobs_per_s=round(completed / wall, 1) if wall else 0.0,
+    )
+
+
+async def benchmark(
+    url: str,
+    *,
+    levels: list[int],
+    concurrency: int = 4,
+    jobs: int = 200,
+    latency_s: float = 0.2,
+    cpu_s: float = 0.02,
+    timeout_s: float = 300.0,
+) -> list[LevelReport]:
+    return [
+        await run_level(
+            url,
+            workers=n,
+            concurrency=concurrency,
+            jobs=jobs,
+            latency_s=latency_s,
+            cpu_s=cpu_s,
+            timeout_s=timeout_s,
+        )
+        for n in levels
+    ]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--concurrency", type=int, default=4, help="jobs in flight per worker")
+    p.add_argument("--jobs", type=int, default=200)
+    p.add_argument("--latency-ms", type=float, default=200.0, help="simulated await per job")
+    p.add_argument("--cpu-ms", type=float, default=20.0, help="simulated CPU per job")
+    p.add_argument("--redis-url", default=None, help="default: local fakeredis TCP server")
+    p.add_argument("--timeout-s", type=float, default=300.0, help="per level")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    _quiet_logs()
+    kwargs: dict[str, Any] = {
+        "levels": args.workers,
+        "concurrency": args.concurrency,
+        "jobs": args.jobs,
+        "latency_s": args.latency_ms / 1000.0,
+        "cpu_s": args.cpu_ms / 1000.0,
+        "timeout_s": args.timeout_s,
+    }
+    if args.redis_url:
+        reports = asyncio.run(benchmark(args.redis_url, **kwargs))
+    else:
+        with LocalRedis() as server:
+            reports = asyncio.run(benchmark(server.url, **kwargs))
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'workers':>8}{'conc':>6}{'jobs':>7}{'done':>7}{'secs':>8}{'jobs/s':>9}")
+    for r in reports:
+        print(
+            f"{r.workers:>8}{r.concurrency:>6}{r.jobs:>7}{r.completed:>7}"
+            f"{r.seconds:>8.2f}{r.jobs_per_s:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Benchmark `AzureBlobProvider` bulk uploads: client-per-upload vs pooled.
+
+Runs every mode against a fresh in-process Azurite-compatible endpoint
+(`scripts/_azurite_stub.py`) whose responses are delayed by
+``--latency-ms`` to stand in for the round trip to a real account, with
+``--files`` random blobs of ``--size-kb``:
+
+* ``per_call`` — the previous migrator: sequential ``upload`` calls, each
+  building (and closing) its own ``BlobServiceClient``;
+* ``shared_client`` — the same sequential loop inside one ``session()``;
+* ``upload_many`` — ``upload_many(concurrency=--concurrency)``;
+* ``upload_many_nocheck`` — the same with ``skip_existing=False`` (what
+  the migrator uses: its WHERE filter already excludes migrated rows);
+* ``rerun_existing`` — ``upload_many`` again over a container that already
+  holds every blob: the prefix-listing existence check skips re-sending.
+
+Reports uploads/s, MB/s, the TCP connections the endpoint accepted, the
+requests it served and the most it served at once. Point ``--latency-ms`` at your account's RTT to
+read the numbers against a real deployment. Usage:
+
+    python -m scripts.benchmark_blob_upload
+    python -m scripts.benchmark_blob_upload --files 500 --size-kb 200 --latency-ms 20 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+MODES = ("per_call", "shared_client", "upload_many", "upload_many_nocheck", "rerun_existing")
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    files: int
+    elapsed_ms: float
+    bytes_sent: int
+    connections: int
+    requests: int
+    peak_in_flight: int
+
+    @property
+    def uploads_per_s(self) -> float:
+        return round(self.files / (self.elapsed_ms / 1000.0), 1) if self.elapsed_ms else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        if not self.elapsed_ms:
+            return 0.0
+        return round(self.bytes_sent / (1024 * 1024) / (self.elapsed_ms / 1000.0), 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "uploads_per_s": self.uploads_per_s, "mb_per_s": self.mb_per_s}
+
+
+def make_items(files: int, size_kb: int) -> list[Any]:
+    from app.services.precompute.storage import BlobUpload
+
+    items = []
+    for _ in range(files):
+        data = os.urandom(size_kb * 1024)
+        items.append(BlobUpload(hashlib.sha256(data).hexdigest(), data, "image/webp"))
+    return items
+
+
+async def run_mode(mode: str, items: list[Any], *, latency_s: float, concurrency: int) -> ModeReport:
+    from app.services.precompute.storage import AzureBlobProvider
+    from scripts._azurite_stub import AZURITE_CREDENTIAL, AzuriteStub
+
+    async with AzuriteStub(latency_s=latency_s) as stub:
+        provider = AzureBlobProvider(
+            base_url=stub.base_url, container="media", credential=AZURITE_CREDENTIAL
+        )
+        if mode == "rerun_existing":
+            await provider.upload_many(items, concurrency=concurrency)
+        connections_before = stub.connections
+        requests_before = sum(stub.requests.values())
+        puts_before = stub.requests.get("put", 0)
+        stub.peak_in_flight = 0
+
+        started = time.perf_counter()
+        if mode == "per_call":
+            for it in items:
+                await provider.upload(
+                    content_hash=it.content_hash, data=it.data, content_type=it.content_type
+                )
+        elif mode == "shared_client":
+            async with provider.session():
+                for it in items:
+                    await provider.upload(
+                        content_hash=it.content_hash, data=it.data, content_type=it.content_type
+                    )
+        else:
+            await provider.upload_many(
+                items, concurrency=concurrency, skip_existing=mode != "upload_many_nocheck"
+            )
+        elapsed = (time.perf_counter() - started) * 1000.0
+
+        puts = stub.requests.get("put", 0) - puts_before
+        return ModeReport(
+            mode=mode,
+            files=len(items),
+            elapsed_ms=round(elapsed, 1),
+            bytes_sent=puts * len(items[0].data) if items else 0,
+            connections=stub.connections - connections_before,
+            requests=sum(stub.requests.values()) - requests_before,
+            peak_in_flight=stub.peak_in_flight,
+        )
+
+
+async def benchmark(
+    *, files: int = 200, size_kb: int = 100, latency_ms: float = 10.0, concurrency: int = 16,
+    modes: tuple[str, ...] = MODES,
+) -> list[ModeReport]:
+    items = make_items(files, size_kb)
+    return [
+        await run_mode(m, items, latency_s=latency_ms / 1000.0, concurrency=concurrency)
+        for m in modes
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--files", type=int, default=200)
+    p.add_argument("--size-kb", type=int, default=100)
+    p.add_argument("--latency-ms", type=float, default=10.0)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    reports = asyncio.run(
+        benchmark(
+            files=args.files, size_kb=args.size_kb,
+            latency_ms=args.latency_ms, concurrency=args.concurrency,
+        )
+    )
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<22}{'files':>8}{'ms':>10}{'uploads/s':>11}{'MB/s':>9}{'conns':>8}{'requests':>10}{'peak':>6}")
+    for r in reports:
+        print(
+            f"{r.mode:<22}{r.files:>8}{r.elapsed_ms:>10.1f}{r.uploads_per_s:>11.1f}"
+            f"{r.mb_per_s:>9.2f}{r.connections:>8}{r.requests:>10}{r.peak_in_flight:>6}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Benchmark canonical-set loading: in-process compile vs the prebuilt artifact.
+
+Writes the artifact (`app.agent.canonical_artifact`) to a temp file, then
+measures ``--runs`` times each:
+
+* ``compile`` — `_compiled_config()` without ``CANONICAL_INDEX_PATH``: merge
+  the code catalog with the YAML / settings overlays and build the index
+  (what the first request in every worker used to pay);
+* ``artifact`` — `_compiled_config()` with the artifact: fingerprint the
+  sources, map the file, one ``marshal.loads``.
+
+Each run is a FRESH interpreter (the default) so the numbers are
+the real cold-start cost per worker; ``--in-process`` clears the caches
+instead (faster, used by the perf test). The loaded lookups are checked to be
+equal. Usage:
+
+    python -m scripts.benchmark_canonical_index
+    python -m scripts.benchmark_canonical_index --runs 5 --json
+
+Exit code 0 always (this is a report, not a gate); a mismatch raises.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = (
+    "import time, app.agent.canonical_sets as cs; "
+    "t0 = time.perf_counter(); cs._compiled_config(); "
+    "print((time.perf_counter() - t0) * 1000.0)"
+)
+
+
+@dataclass
+class LoadReport:
+    mode: str
+    artifact_bytes: int
+    compile_ms_p50: float
+    artifact_ms_p50: float
+
+    @property
+    def speedup(self) -> float:
+        return round(self.compile_ms_p50 / self.artifact_ms_p50, 1) if self.artifact_ms_p50 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "speedup": self.speedup}
+
+
+def _fresh_ms(artifact: Path | None) -> float:
+    env = dict(os.environ)
+    env.pop("CANONICAL_INDEX_PATH", None)
+    if artifact is not None:
+        env["CANONICAL_INDEX_PATH"] = str(artifact)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=_BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _in_process_ms(artifact: Path | None) -> float:
+    from app.agent import canonical_sets as cs
+
+    if artifact is None:
+        os.environ.pop("CANONICAL_INDEX_PATH", None)
+    else:
+        os.environ["CANONICAL_INDEX_PATH"] = str(artifact)
+    cs._compiled_config.cache_clear()
+    cs._norm_key.cache_clear()
+    cs._norm_key_light.cache_clear()
+    t0 = time.perf_counter()
+    cs._compiled_config()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def run(*, runs: int = 3, fresh: bool = True) -> LoadReport:
+    from app.agent import canonical_artifact as ca
+    from app.agent import canonical_sets as cs
+
+    saved = os.environ.get("CANONICAL_INDEX_PATH")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "canonical_index.bin"
+        compiled = cs._compile_config()
+        size = ca.write_artifact(path, compiled, cs._source_fingerprint())
+        if ca.read_artifact(path, cs._source_fingerprint()) != compiled:
+            raise SystemExit("artifact does not round-trip")
+        measure = _fresh_ms if fresh else _in_process_ms
+        try:
+            compile_ms = [measure(None) for _ in range(runs)]
+            artifact_ms = [measure(path) for _ in range(runs)]
+        finally:
+            if saved is None:
+                os.environ.pop("CANONICAL_INDEX_PATH", None)
+            else:
+                os.environ["CANONICAL_INDEX_PATH"] = saved
+            cs._compiled_config.cache_clear()
+    return LoadReport(
+        mode="fresh" if fresh else "in-process",
+        artifact_bytes=size,
+        compile_ms_p50=round(statistics.median(compile_ms), 2),
+        artifact_ms_p50=round(statistics.median(artifact_ms), 2),
+    )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--runs", type=int, default=3)
+    p.add_argument("--in-process", action="store_true", help="clear caches instead of spawning interpreters")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    args = _parse_args(argv)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    r = run(runs=args.runs, fresh=not args.in_process)
+    if args.json:
+        print(json.dumps(r.as_dict(), indent=2))
+        return 0
+    print(f"{'mode':<11}{'artifact B':>11}{'compile ms':>12}{'artifact ms':>13}{'speedup':>9}")
+    print(f"{r.mode:<11}{r.artifact_bytes:>11}{r.compile_ms_p50:>12.2f}{r.artifact_ms_p50:>13.2f}{r.speedup:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""Benchmark the Q&A image build path's embeds: per-string inference vs `EmbedBatcher`.
+
+Drives the real build-path code — ``RelevanceGate.score_question`` for every
+question, then the icon binder walk (``hook._annotate_artefact``) — over a
+synthetic pack, with two embed functions:
+
+* ``unbatched`` — one inference per string on the default executor (the
+  previous ``embed_one``);
+* ``batched`` — an ``EmbedBatcher`` on its own thread pool.
+
+fastembed needs a model download, so by default the model is a synthetic
+ONNX stand-in: each inference holds one "CPU" lock for
+``fixed_ms + per_item_ms * batch`` (bge-small on one vCPU is roughly 6 ms of
+per-call overhead plus ~1.5 ms per short string). ``--real`` uses
+``embed_many_sync`` instead when fastembed and the model are available.
+Usage:
+
+    python -m scripts.benchmark_embed_batcher
+    python -m scripts.benchmark_embed_batcher --questions 25 --options 4 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+DIM = 384
+
+
+class SyntheticModel:
+    """Deterministic unit vectors at a fixed-plus-linear cost per inference."""
+
+    def __init__(self, *, fixed_ms: float = 6.0, per_item_ms: float = 1.5) -> None:
+        self.fixed_s = fixed_ms / 1000.0
+        self.per_item_s = per_item_ms / 1000.0
+        self.inferences = 0
+        self._cpu = threading.Lock()
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        with self._cpu:
+            self.inferences += 1
+            time.sleep(self.fixed_s + self.per_item_s * len(texts))
+        return [_vector(t) for t in texts]
+
+
+def _vector(text: str) -> list[float]:
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    raw = [(seed[i % 32] - 127.5) / 127.5 + (i % 7) * 0.01 for i in range(DIM)]
+    norm = sum(x * x for x in raw) ** 0.5
+    return [x / norm for x in raw]
+
+
+def synthetic_pack(questions: int, options: int) -> dict[str, Any]:
+    return {
+        "questions": [
+            {
+                "question_text": f"Question {q}: which place in the story would you visit first?",
+                "options": [
+                    {"text": f"A lantern-lit workshop full of tools, option {q}.{o}"}
+                    for o in range(options)
+                ],
+            }
+            for q in range(questions)
+        ]
+    }
+
+
+@dataclass
+class PathReport:
+    mode: str
+    strings: int
+    inferences: int
+    elapsed_ms: float
+
+    @property
+    def strings_per_s(self) -> float:
+        return round(self.strings / (self.elapsed_ms / 1000.0), 1) if self.elapsed_ms else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "strings_per_s": self.strings_per_s}
+
+
+async def _build_path(pack: dict[str, Any], embed_fn: Any) -> None:
+    """Gate every question, then bind icons over the whole pack."""
+    from app.services.icons import hook
+    from app.services.icons import relevance_gate as rg
+    from app.services.icons.binder import IconBinder
+    from app.services.icons.index import IconCandidate
+
+    # A fresh embed_fn per mode, so the anchor cache re-embeds its anchors.
+    gate = rg.RelevanceGate(embed_fn=embed_fn, query_prefix="q: ")
+    for q in pack["questions"]:
+        await gate.score_question([o["text"] for o in q["options"]])
+    icons = [
+        IconCandidate(
+            id=f"icon-{i}", lucide="star", concept=f"c{i}", caption=f"icon {i}",
+            palette_variant="default", embedding=_vector(f"icon {i}"),
+        )
+        for i in range(8)
+    ]
+    binder = IconBinder(index=icons, embed_fn=embed_fn, tau=0.99, query_prefix="q: ")
+    await hook._annotate_artefact(json.loads(json.dumps(pack)), binder)
+
+
+async def run_mode(mode: str, pack: dict[str, Any], *, model: Any, max_batch: int, window_ms: float) -> PathReport:
+    from app.services.icons import embedder
+
+    embedder._cached.cache_clear()
+    calls = {"n": 0}
+
+    if mode == "unbatched":
+        async def embed_fn(text: str) -> list[float]:
+            calls["n"] += 1
+            loop = asyncio.get_running_loop()
+            return (await loop.run_in_executor(None, model.embed_many, [text]))[0]
+    else:
+        batcher = embedder.EmbedBatcher(embed_many=model.embed_many, max_batch=max_batch, window_ms=window_ms)
+
+        async def embed_fn(text: str) -> list[float]:
+            calls["n"] += 1
+            return await batcher.embed(text)
+
+    before = model.inferences
+    started = time.perf_counter()
+    await _build_path(pack, embed_fn)
+    elapsed = (time.perf_counter() - started) * 1000.0
+    if mode == "batched":
+        batcher.shutdown()
+    return PathReport(mode=mode, strings=calls["n"], inferences=model.inferences - before, elapsed_ms=round(elapsed, 1))
+
+
+async def benchmark(
+    *, questions: int = 25, options: int = 4, max_batch: int = 32, window_ms: float = 5.0,
+    real: bool = False, fixed_ms: float = 6.0, per_item_ms: float = 1.5,
+) -> list[PathReport]:
+    if real:
+        from app.services.icons.embedder import embed_many_sync
+
+        class _Real:
+            inferences = 0
+
+            def embed_many(self, texts: list[str]) -> list[list[float]]:
+                self.inferences += 1
+                return embed_many_sync(texts)
+
+        model: Any = _Real()
+        model.embed_many(["warm-up"])
+    else:
+        model = SyntheticModel(fixed_ms=fixed_ms, per_item_ms=per_item_ms)
+    pack = synthetic_pack(questions, options)
+    return [
+        await run_mode(m, pack, model=model, max_batch=max_batch, window_ms=window_ms)
+        for m in ("unbatched", "batched")
+    ]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--questions", type=int, default=25)
+    p.add_argument("--options", type=int, default=4)
+    p.add_argument("--max-batch", type=int, default=32)
+    p.add_argument("--window-ms", type=float, default=5.0)
+    p.add_argument("--fixed-ms", type=float, default=6.0, help="synthetic per-inference overhead")
+    p.add_argument("--per-item-ms", type=float, default=1.5, help="synthetic per-string cost")
+    p.add_argument("--real", action="store_true", help="use fastembed (needs the model)")
+    p.add_argument("--json", action="store_true")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    reports = asyncio.run(
+        benchmark(
+            questions=args.questions, options=args.options, max_batch=args.max_batch,
+            window_ms=args.window_ms, real=args.real, fixed_ms=args.fixed_ms,
+            per_item_ms=args.per_item_ms,
+        )
+    )
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<10}{'strings':>9}{'inferences':>12}{'ms':>10}{'strings/s':>11}")
+    for r in reports:
+        print(f"{r.mode:<10}{r.strings:>9}{r.inferences:>12}{r.elapsed_ms:>10.1f}{r.strings_per_s:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Benchmark cold-cache pack hydration: legacy serial SELECT walk vs `hydrate_pack`.
+
+A cold ``tk:hpack:*`` entry makes ``/quiz/start`` hydrate from the DB. The
+legacy hydrator awaited six serial SELECTs (pack, synopsis, character set,
+characters, baseline set, questions); each is a network round trip in
+production. SQLite has no network, so ``--rtt-ms`` of sleep is charged per
+SELECT to model the RTT. The new hydrator's portable path runs three
+statements here (on Postgres `_HYDRATE_SQL` does it in one), so the numbers
+are a floor on the production win.
+
+Also compares the cached form: the legacy stdlib JSON object vs the compact
+positional orjson payload (bytes and decode time over ``--decode-iters``).
+Usage:
+
+    python -m scripts.benchmark_hydrate
+    python -m scripts.benchmark_hydrate --rtt-ms 1 --rounds 50 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+CHARACTERS = 8
+QUESTIONS = 6
+
+
+@dataclass
+class HydrateReport:
+    rtt_ms: float
+    rounds: int
+    legacy_round_trips: int
+    new_round_trips: int
+    legacy_p50_ms: float
+    new_p50_ms: float
+    legacy_blob_bytes: int
+    compact_blob_bytes: int
+    legacy_decode_us: float
+    compact_decode_us: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+async def seed(db, *, characters: int = CHARACTERS, questions: int = QUESTIONS) -> uuid.UUID:
+    """Insert one published pack (synopsis, characters, baseline set)."""
+    from app.models.db import (
+        BaselineQuestionSet,
+        Character,
+        CharacterSet,
+        Question,
+        Synopsis,
+        Topic,
+        TopicPack,
+    )
+
+    topic = Topic(id=uuid.uuid4(), slug=f"t-{uuid.uuid4().hex[:8]}", display_name="T")
+    db.add(topic)
+    await db.flush()
+    syn = Synopsis(
+        id=uuid.uuid4(),
+        topic_id=topic.id,
+        content_hash=uuid.uuid4().hex,
+        body={"title": "T", "summary": "S" * 400},
+    )
+    chars = [
+        Character(
+            id=uuid.uuid4(),
+            name=f"C{i}-{uuid.uuid4().hex[:6]}",
+            short_description="short " * 5,
+            profile_text="profile " * 120,
+            canonical_key=uuid.uuid4().hex,
+        )
+        for i in range(characters)
+    ]
+    qs = [
+        Question(
+            id=uuid.uuid4(),
+            text_hash=uuid.uuid4().hex,
+            text=f"Q{i}?",
+            options={"items": [{"text": f"O{i}-{j}"} for j in range(4)]},
+            kind="baseline",
+        )
+        for i in range(questions)
+    ]
+    db.add_all([syn, *chars, *qs])
+    await db.flush()
+    cs = CharacterSet(
+        id=uuid.uuid4(),
+        composition_hash=uuid.uuid4().hex,
+        composition={"character_ids": [str(c.id) for c in chars]},
+    )
+    bqs = BaselineQuestionSet(
+        id=uuid.uuid4(),
+        composition_hash=uuid.uuid4().hex,
+        composition={"question_ids": [str(q.id) for q in qs]},
+    )
+    db.add_all([cs, bqs])
+    await db.flush()
+    pack = TopicPack(
+        id=uuid.uuid4(),
+        topic_id=topic.id,
+        version=1,
+        status="published",
+        synopsis_id=syn.id,
+        character_set_id=cs.id,
+        baseline_question_set_id=bqs.id,
+        model_provenance={"source": "perf"},
+        built_in_env="test",
+    )
+    db.add(pack)
+    await db.flush()
+    return pack.id
+
+
+async def legacy_hydrate(db, pack_id: uuid.UUID) -> int:
+    """The pre-rewrite serial walk (content assembly elided)."""
+    from sqlalchemy import select
+
+    from app.models.db import (
+        BaselineQuestionSet,
+        Character,
+        CharacterSet,
+        Question,
+        Synopsis,
+        TopicPack,
+    )
+
+    pack = (await db.execute(select(TopicPack).where(TopicPack.id == pack_id))).scalar_one()
+    (await db.execute(select(Synopsis).where(Synopsis.id == pack.synopsis_id))).scalar_one()
+    cs = (
+        await db.execute(select(CharacterSet).where(CharacterSet.id == pack.character_set_id))
+    ).scalar_one()
+    char_ids = [uuid.UUID(x) for x in cs.composition["character_ids"]]
+    chars = (await db.execute(select(Character).where(Character.id.in_(char_ids)))).scalars().all()
+    bqs = (
+        await db.execute(
+            select(BaselineQuestionSet).where(
+                BaselineQuestionSet.id == pack.baseline_question_set_id
+            )
+        )
+    ).scalar_one()
+    q_ids = [uuid.UUID(x) for x in bqs.composition["question_ids"]]
+    (await db.execute(select(Question).where(Question.id.in_(q_ids)))).scalars().all()
+    return len(chars)
+
+
+class SelectCounter:
+    """Counts SELECTs on an engine, sleeping ``rtt_s`` per statement."""
+
+    def __init__(self, engine: Any, *, rtt_s: float = 0.0) -> None:
+        self.engine = engine
+        self.rtt_s = rtt_s
+        self.n = 0
+
+    def _on_execute(self, _conn, _cursor, statement, *_a) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.n += 1
+            if self.rtt_s:
+                time.sleep(self.rtt_s)
+
+    def __enter__(self) -> SelectCounter:
+        from sqlalchemy import event
+
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        from sqlalchemy import event
+
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    async def count(self, fn: Callable[[], Awaitable[Any]]) -> int:
+        before = self.n
+        await fn()
+        return self.n - before
+
+
+def legacy_blob(hydrated: Any) -> str:
+    """The pre-rewrite cached form: a stdlib JSON object."""
+    return json.dumps(
+        {
+            "pack_id": str(hydrated.pack_id),
+            "topic_id": str(hydrated.topic_id),
+            "synopsis": hydrated.synopsis,
+            "characters": list(hydrated.characters),
+            "baseline_questions": list(hydrated.baseline_questions),
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+async def _p50_ms(fn: Callable[[], Awaitable[Any]], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1000.0, 3)
+
+
+def _decode_us(fn: Callable[[], Any], iters: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return round((time.perf_counter() - t0) * 1e6 / iters, 2)
+
+
+async def benchmark(
+    db, *, rtt_ms: float = 2.0, rounds: int = 15, decode_iters: int = 500
+) -> HydrateReport:
+    """Run both hydrators against an open session (seeds one pack)."""
+    from app.services.precompute.cache import (
+        _hydrated_pack_from_bytes,
+        _hydrated_pack_to_bytes,
+    )
+    from app.services.precompute.hydrator import hydrate_pack
+
+    pack_id = await seed(db)
+    with SelectCounter(db.get_bind(), rtt_s=rtt_ms / 1000.0) as counter:
+        legacy_rt = await counter.count(lambda: legacy_hydrate(db, pack_id))
+        new_rt = await counter.count(lambda: hydrate_pack(db, pack_id=pack_id))
+        legacy_p50 = await _p50_ms(lambda: legacy_hydrate(db, pack_id), rounds)
+        new_p50 = await _p50_ms(lambda: hydrate_pack(db, pack_id=pack_id), rounds)
+
+    hydrated = await hydrate_pack(db, pack_id=pack_id)
+    legacy = legacy_blob(hydrated)
+    compact = _hydrated_pack_to_bytes(hydrated)
+    return HydrateReport(
+        rtt_ms=rtt_ms,
+        rounds=rounds,
+        legacy_round_trips=legacy_rt,
+        new_round_trips=new_rt,
+        legacy_p50_ms=legacy_p50,
+        new_p50_ms=new_p50,
+        legacy_blob_bytes=len(legacy.encode()),
+        compact_blob_bytes=len(compact),
+        legacy_decode_us=_decode_us(lambda: json.loads(legacy), decode_iters),
+        compact_decode_us=_decode_us(lambda: _hydrated_pack_from_bytes(compact), decode_iters),
+    )
+
+
+def _compile_for_sqlite() -> None:
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.dialects.postgresql import UUID as PGUUID
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb(type_, compiler, **kw):  # pragma: no cover - dialect shim
+        return "JSON"
+
+    @compiles(PGUUID, "sqlite")
+    def _uuid(type_, compiler, **kw):  # pragma: no cover - dialect shim
+        return "TEXT"
+
+
+async def _run(*, rtt_ms: float, rounds: int, decode_iters: int) -> HydrateReport:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models.db import (
+        BaselineQuestionSet,
+        Character,
+        CharacterSet,
+        Question,
+        Synopsis,
+        Topic,
+        TopicPack,
+    )
+
+    _compile_for_sqlite()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [
+        m.__table__
+        for m in (Topic, Synopsis, Character, Question, CharacterSet, BaselineQuestionSet, TopicPack)
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: tables[0].metadata.create_all(c, tables=tables))
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            return await benchmark(db, rtt_ms=rtt_ms, rounds=rounds, decode_iters=decode_iters)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rtt-ms", type=float, default=2.0)
+    p.add_argument("--rounds", type=int, default=15)
+    p.add_argument("--decode-iters", type=int, default=500)
+    p.add_argument("--json", action="store_true")
+    args = p.parse_args(argv)
+
+    r = asyncio.run(_run(rtt_ms=args.rtt_ms, rounds=args.rounds, decode_iters=args.decode_iters))
+    if args.json:
+        print(json.dumps(r.as_dict(), indent=2))
+        return 0
+    print(f"{'path':<10}{'round trips':>13}{'p50 ms':>10}{'blob B':>9}{'decode us':>11}")
+    print(
+        f"{'legacy':<10}{r.legacy_round_trips:>13}{r.legacy_p50_ms:>10.2f}"
+        f"{r.legacy_blob_bytes:>9}{r.legacy_decode_us:>11.2f}"
+    )
+    print(
+        f"{'hydrator':<10}{r.new_round_trips:>13}{r.new_p50_ms:>10.2f}"
+        f"{r.compact_blob_bytes:>9}{r.compact_decode_us:>11.2f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
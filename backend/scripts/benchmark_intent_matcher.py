@@ -0,0 +1,134 @@
+"""Benchmark keyword scoring in `intent_classification`: per-token loop vs compiled matcher.
+
+Runs every ``scripts/eval_resolution`` acceptance topic (plus each topic
+with a short synopsis) through:
+
+* ``legacy`` — the previous scoring: `_score_map` over every intent,
+  shape and domain token list on each call (the same code that
+  `classify_intent` / `_primary_domain` used to run);
+* ``compiled`` — `_keyword_matcher(cfg).scores(text)`: one regex pass over
+  the text against the config compiled once per reload.
+
+Checks the two give bit-identical group scores (hence identical
+``classify_intent`` / ``_primary_domain`` outputs) for every text and
+reports per-call timings. The compiled matcher's single-entry memo is
+bypassed so each call does the full scan. Usage:
+
+    python -m scripts.benchmark_intent_matcher
+    python -m scripts.benchmark_intent_matcher --rounds 50 --json
+
+Exit code 0 always (this is a report, not a gate); a mismatch raises.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+@dataclass
+class MatcherReport:
+    texts: int
+    tokens: int
+    legacy_us: float
+    compiled_us: float
+    compile_ms: float
+    mismatches: int
+
+    @property
+    def speedup(self) -> float:
+        return round(self.legacy_us / self.compiled_us, 1) if self.compiled_us else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "speedup": self.speedup}
+
+
+def acceptance_texts() -> list[str]:
+    from app.agent.tools import intent_classification as ic
+    from scripts.eval_resolution import build_categories
+
+    topics = [c.topic for cases in build_categories().values() for c in cases]
+    synopses = [{"title": t, "summary": f"Find out which of the {t} you are."} for t in topics]
+    return [ic._text_corpus(t, None) for t in topics] + [
+        ic._text_corpus(t, s) for t, s in zip(topics, synopses, strict=True)
+    ]
+
+
+def legacy_scores(cfg: dict[str, Any], text: str) -> dict[str, dict[str, float]]:
+    from app.agent.tools.intent_classification import _SCORED_FAMILIES, _score_map
+
+    return {f: {name: _score_map(text, toks) for name, toks in (cfg.get(f) or {}).items()} for f in _SCORED_FAMILIES}
+
+
+def _nonzero(scores: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Every group score `classify_intent` / `_primary_domain` can act on
+    (a zero-scored group never wins a ``max`` and is never reported)."""
+    return {f: {k: v for k, v in fam.items() if v != 0} for f, fam in scores.items()}
+
+
+def run(*, rounds: int = 20) -> MatcherReport:
+    from app.agent.tools import intent_classification as ic
+
+    cfg = ic._maybe_reload()
+    texts = acceptance_texts()
+    t0 = time.perf_counter()
+    matcher = ic._KeywordMatcher(cfg)
+    compile_ms = (time.perf_counter() - t0) * 1000.0
+
+    def _compiled(text: str) -> dict[str, dict[str, float]]:
+        matcher._last = None
+        return matcher.scores(text)
+
+    mismatches = sum(_nonzero(legacy_scores(cfg, t)) != _nonzero(_compiled(t)) for t in texts)
+
+    def _time(fn) -> float:
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for t in texts:
+                fn(t)
+        return (time.perf_counter() - t0) * 1e6 / (rounds * len(texts))
+
+    return MatcherReport(
+        texts=len(texts),
+        tokens=sum(len(p) for p in matcher.postings.values()) + len(matcher.patterns),
+        legacy_us=round(_time(lambda t: legacy_scores(cfg, t)), 1),
+        compiled_us=round(_time(_compiled), 1),
+        compile_ms=round(compile_ms, 2),
+        mismatches=mismatches,
+    )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rounds", type=int, default=20)
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    report = run(rounds=args.rounds)
+    if report.mismatches:
+        raise SystemExit(f"{report.mismatches} texts scored differently")
+    if args.json:
+        print(json.dumps(report.as_dict(), indent=2))
+        return 0
+    print(f"{'texts':>6}{'tokens':>8}{'legacy µs':>11}{'compiled µs':>13}{'speedup':>9}{'compile ms':>12}")
+    print(
+        f"{report.texts:>6}{report.tokens:>8}{report.legacy_us:>11.1f}"
+        f"{report.compiled_us:>13.1f}{report.speedup:>8.1f}x{report.compile_ms:>12.2f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
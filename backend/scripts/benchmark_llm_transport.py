@@ -0,0 +1,276 @@
+"""Benchmark the LLM transport: worker threads vs the native-async pool.
+
+Starts a local fake Responses-API provider (aiohttp, own thread + loop,
+fixed ``--latency-ms`` per call) and drives real ``litellm`` calls at it at
+each ``--concurrency`` level, two ways:
+
+* ``thread`` — ``asyncio.to_thread(litellm.responses, ...)``, the old path:
+  in-flight calls are capped by the default executor (``min(32, cpu+4)``).
+* ``native`` — ``litellm.aresponses`` on ``LLMTransportPool``
+  (``app/services/llm_transport``), the default path.
+
+No tokens are spent and nothing leaves localhost. Usage:
+
+    python -m scripts.benchmark_llm_transport
+    python -m scripts.benchmark_llm_transport --concurrency 50 500 --calls-per-level 1000 --json
+
+``calls/s`` is completed calls per wall second; with a fixed provider
+latency, the ideal is ``concurrency / latency``. Exit code 0 always (this is
+a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import litellm  # noqa: E402
+
+from app.services.llm_transport import LLMTransportPool  # noqa: E402
+
+_MODEL = "openai/gpt-4o-mini"
+
+
+def _response_body(model: str) -> dict[str, Any]:
+    return {
+        "id": "resp_bench",
+        "object": "response",
+        "created_at": 0,
+        "status": "completed",
+        "model": model,
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_bench",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": '{"ok": true}', "annotations": []}],
+            }
+        ],
+        "usage": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    }
+
+
+class FakeProvider:
+    """aiohttp Responses endpoint on 127.0.0.1 running in its own thread."""
+
+    def __init__(self, *, latency_s: float) -> None:
+        self.latency_s = latency_s
+        self.port = 0
+        self.requests = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ready = threading.Event()
+        self._stop: asyncio.Event | None = None
+        self._thread = threading.Thread(target=self._run, name="fake-llm-provider", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> FakeProvider:
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(10)
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        from aiohttp import web
+
+        async def handle(request: web.Request) -> web.Response:
+            body = await request.json()
+            self.requests += 1
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            try:
+                await asyncio.sleep(self.latency_s)
+            finally:
+                self._in_flight -= 1
+            return web.json_response(_response_body(body.get("model", "m")))
+
+        app = web.Application()
+        app.router.add_post("/v1/responses", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=2048)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._ready.set()
+        await self._stop.wait()
+        await runner.cleanup()
+
+
+@dataclass
+class LevelReport:
+    mode: str
+    concurrency: int
+    calls: int
+    failed: int
+    calls_per_s: float
+    p50_ms: float
+    p95_ms: float
+    provider_peak_in_flight: int
+    pool: dict[str, Any] | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if v is not None}
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def run_level(
+    provider: FakeProvider,
+    *,
+    mode: str,
+    concurrency: int,
+    calls: int,
+    pool: LLMTransportPool | None = None,
+) -> LevelReport:
+    """``calls`` requests with at most ``concurrency`` in flight."""
+    payload = {
+        "model": _MODEL,
+        "input": [{"role": "user", "content": "ping"}],
+        "api_base": provider.base_url,
+        "api_key": "sk-bench",
+        "timeout": 60,
+    }
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failed = 0
+    provider.peak_in_flight = 0
+
+    async def one() -> None:
+        nonlocal failed
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                if mode == "native":
+                    assert pool is not None
+                    async with pool.lease(_MODEL) as client:
+                        await litellm.aresponses(**payload, client=client)
+                else:
+                    await asyncio.to_thread(litellm.responses, **payload)
+            except Exception:
+                failed += 1
+                return
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    wall = time.perf_counter() - start
+    return LevelReport(
+        mode=mode,
+        concurrency=concurrency,
+        calls=calls,
+        failed=failed,
+        calls_per_s=round((calls - failed) / wall, 1) if wall else 0.0,
+        p50_ms=round(_percentile(latencies, 0.50), 1),
+        p95_ms=round(_percentile(latencies, 0.95), 1),
+        provider_peak_in_flight=provider.peak_in_flight,
+        pool=pool.metrics().get("openai") if pool is not None else None,
+    )
+
+
+async def benchmark(
+    *,
+    levels: list[int],
+    calls_per_level: int | None = None,
+    latency_s: float = 0.2,
+    modes: tuple[str, ...] = ("thread", "native"),
+) -> list[LevelReport]:
+    reports: list[LevelReport] = []
+    with FakeProvider(latency_s=latency_s) as provider:
+        for concurrency in levels:
+            calls = calls_per_level or concurrency * 2
+            for mode in modes:
+                pool = (
+                    LLMTransportPool(max_connections=concurrency, max_keepalive_connections=concurrency)
+                    if mode == "native"
+                    else None
+                )
+                try:
+                    reports.append(
+                        await run_level(
+                            provider, mode=mode, concurrency=concurrency, calls=calls, pool=pool
+                        )
+                    )
+                finally:
+                    if pool is not None:
+                        await pool.aclose()
+    return reports
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    p.add_argument("--calls-per-level", type=int, default=None, help="default: 2 x concurrency")
+    p.add_argument("--latency-ms", type=float, default=200.0, help="fake provider latency")
+    p.add_argument("--mode", choices=("thread", "native", "both"), default="both")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    args = _parse_args(argv)
+    logging.getLogger("LiteLLM").setLevel(logging.ERROR)
+    litellm.suppress_debug_info = True
+    modes = ("thread", "native") if args.mode == "both" else (args.mode,)
+    # Keep stdout parseable: pool logs go to stderr for the run only.
+    saved = structlog.get_config()
+    structlog.configure(
+        logger_factory=structlog.PrintLoggerFactory(sys.stderr),
+        cache_logger_on_first_use=False,
+    )
+    try:
+        reports = asyncio.run(
+            benchmark(
+                levels=args.concurrency,
+                calls_per_level=args.calls_per_level,
+                latency_s=args.latency_ms / 1000.0,
+                modes=modes,
+            )
+        )
+    finally:
+        structlog.configure(**saved)
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<8}{'conc':>6}{'calls':>7}{'fail':>6}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'peak':>7}")
+    for r in reports:
+        print(
+            f"{r.mode:<8}{r.concurrency:>6}{r.calls:>7}{r.failed:>6}{r.calls_per_s:>10.1f}"
+            f"{r.p50_ms:>9.0f}{r.p95_ms:>9.0f}{r.provider_peak_in_flight:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Benchmark `GET /api/media/{id}`: blob-per-request vs the disk cache.
+
+Starts a uvicorn server per mode (a subprocess of this script) over a
+SQLite-file `media_assets` table seeded with ``--assets`` blobs of
+``--size-kb``, and drives it over TCP with ``--concurrency`` keep-alive
+clients:
+
+* ``blob`` — the previous endpoint: load the whole row, copy ``bytes_blob``
+  into a ``Response`` on every hit;
+* ``disk_cache`` — the current endpoint: metadata-only lookup, then a
+  ``FileResponse`` from the content-addressed cache (filled on warm-up).
+
+Reports requests/s, server RSS (current and peak), server CPU ms per
+request, and the blob bytes the DB shipped per request. SQLite reads the
+blob from the page cache in-process, so this harness charges the old path
+nothing for what Postgres pays per hit (detoast, asyncpg decode, the
+network hop); ``db_B/req`` is the number to read against that. Usage:
+
+    python -m scripts.benchmark_media_serving
+    python -m scripts.benchmark_media_serving --assets 20 --size-kb 512 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    requests: int
+    elapsed_ms: float
+    server_rss_kb: int
+    server_peak_rss_kb: int
+    db_bytes_per_request: int
+    server_cpu_ms_per_request: float
+
+    @property
+    def requests_per_s(self) -> float:
+        return round(self.requests / (self.elapsed_ms / 1000.0), 1) if self.elapsed_ms else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "requests_per_s": self.requests_per_s}
+
+
+def _proc_status_kb(pid: int) -> dict[str, int]:
+    out: dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    out[key] = int(rest.split()[0])
+    except OSError:
+        pass
+    return out
+
+
+def _proc_cpu_ms(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            fields = fh.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) * 1000.0 / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _compile_jsonb_for_sqlite() -> None:
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(JSONB, "sqlite")
+    def _jsonb(type_, compiler, **kw):  # pragma: no cover - dialect shim
+        return "JSON"
+
+
+def seed(db_path: str, *, assets: int, size_kb: int) -> list[str]:
+    """Create `media_assets` in a SQLite file with `assets` blobs of `size_kb`."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.models.db import MediaAsset
+
+    _compile_jsonb_for_sqlite()
+    engine = create_engine(f"sqlite:///{db_path}")
+    MediaAsset.__table__.create(engine)
+    ids: list[str] = []
+    with Session(engine) as s:
+        for i in range(assets):
+            data = hashlib.sha256(str(i).encode()).digest() * (size_kb * 32)
+            row = MediaAsset(
+                id=uuid.uuid4(), content_hash=hashlib.sha256(data).hexdigest(),
+                prompt_hash=f"bench-{i}", storage_provider="local",
+                storage_uri="", bytes_blob=data,
+                prompt_payload={"content_type": "image/webp"},
+            )
+            s.add(row)
+            ids.append(str(row.id))
+        s.commit()
+    engine.dispose()
+    return ids
+
+
+def build_app(db_path: str, mode: str, cache_dir: str) -> Any:
+    """A bare FastAPI app serving `/api/media/{id}` the `mode` way."""
+    from fastapi import Depends, FastAPI, Response
+    from sqlalchemy import event, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.api.dependencies import get_db_session
+    from app.api.endpoints import media
+    from app.models.db import MediaAsset
+    from app.services.media import disk_cache
+
+    _compile_jsonb_for_sqlite()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    db_bytes = {"n": 0}
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        # Bytes the DB had to ship for this statement (blob column only).
+        if "bytes_blob" in statement.split("FROM")[0] and "IS NOT NULL" not in statement:
+            db_bytes["n"] += int(app.state.blob_bytes)
+
+    app = FastAPI()
+    app.state.blob_bytes = 0
+    if mode == "disk_cache":
+        disk_cache._cache = disk_cache.MediaDiskCache(cache_dir, max_bytes=1 << 30)
+        disk_cache._built = True
+        app.include_router(media.router, prefix="/api")
+    else:
+        @app.get("/api/media/{asset_id}")
+        async def _blob(asset_id: uuid.UUID, db: Any = Depends(get_db_session)) -> Response:  # noqa: B008
+            row = (await db.execute(select(MediaAsset).where(MediaAsset.id == asset_id))).scalar_one()
+            return Response(
+                content=bytes(row.bytes_blob), media_type=media._content_type_for(row.prompt_payload),
+                headers={"ETag": f'"{row.content_hash}"'},
+            )
+
+    @app.get("/_bench/db_bytes")
+    async def _db_bytes(blob_bytes: int = 0) -> dict[str, int]:
+        app.state.blob_bytes = blob_bytes
+        n, db_bytes["n"] = db_bytes["n"], 0
+        return {"db_bytes": n}
+
+    async def _db():
+        async with sessions() as s:
+            yield s
+
+    app.dependency_overrides[get_db_session] = _db
+    return app
+
+
+def _serve(db_path: str, mode: str, cache_dir: str, port: int) -> None:
+    import uvicorn
+
+    uvicorn.run(build_app(db_path, mode, cache_dir), host="127.0.0.1", port=port, log_level="warning")
+
+
+async def _drive(base: str, ids: list[str], requests: int, concurrency: int) -> None:
+    import httpx
+
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30.0) as c:
+        async def one(i: int) -> None:
+            async with sem:
+                r = await c.get(f"/api/media/{ids[i % len(ids)]}")
+                assert r.status_code == 200, r.status_code
+
+        await asyncio.gather(*(one(i) for i in range(requests)))
+
+
+async def _wait_ready(base: str, proc: subprocess.Popen[bytes]) -> None:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base) as c:
+        for _ in range(200):
+            if proc.poll() is not None:
+                raise RuntimeError("benchmark server exited during startup")
+            try:
+                await c.get("/_bench/db_bytes")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise RuntimeError("benchmark server did not start")
+
+
+async def run_mode(
+    mode: str, *, db_path: str, ids: list[str], size_kb: int, requests: int,
+    concurrency: int, cache_dir: str, port: int,
+) -> ModeReport:
+    import httpx
+
+    base = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "scripts.benchmark_media_serving", "--serve", mode,
+         "--db", db_path, "--cache-dir", cache_dir, "--port", str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        await _wait_ready(base, proc)
+        async with httpx.AsyncClient(base_url=base) as c:
+            await c.get("/_bench/db_bytes", params={"blob_bytes": size_kb * 1024})
+        await _drive(base, ids, len(ids) * 2, concurrency)  # warm-up (fills the cache)
+        async with httpx.AsyncClient(base_url=base) as c:
+            await c.get("/_bench/db_bytes", params={"blob_bytes": size_kb * 1024})
+
+        cpu_before = _proc_cpu_ms(proc.pid)
+        started = time.perf_counter()
+        await _drive(base, ids, requests, concurrency)
+        elapsed = (time.perf_counter() - started) * 1000.0
+        cpu_ms = _proc_cpu_ms(proc.pid) - cpu_before
+
+        async with httpx.AsyncClient(base_url=base) as c:
+            db_bytes = (await c.get("/_bench/db_bytes")).json()["db_bytes"]
+        status = _proc_status_kb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return ModeReport(
+        mode=mode, requests=requests, elapsed_ms=round(elapsed, 1),
+        server_rss_kb=status.get("VmRSS", 0), server_peak_rss_kb=status.get("VmHWM", 0),
+        db_bytes_per_request=db_bytes // max(1, requests),
+        server_cpu_ms_per_request=round(cpu_ms / max(1, requests), 3),
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+async def benchmark(
+    *, assets: int = 10, size_kb: int = 256, requests: int = 1000, concurrency: int = 32,
+) -> list[ModeReport]:
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="bench-media-") as tmp:
+        db_path = os.path.join(tmp, "media.db")
+        ids = seed(db_path, assets=assets, size_kb=size_kb)
+        for mode in ("blob", "disk_cache"):
+            reports.append(
+                await run_mode(
+                    mode, db_path=db_path, ids=ids, size_kb=size_kb, requests=requests,
+                    concurrency=concurrency, cache_dir=os.path.join(tmp, "cache"),
+                    port=_free_port(),
+                )
+            )
+    return reports
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--assets", type=int, default=10)
+    p.add_argument("--size-kb", type=int, default=256)
+    p.add_argument("--requests", type=int, default=1000)
+    p.add_argument("--concurrency", type=int, default=32)
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--serve", choices=("blob", "disk_cache"), help=argparse.SUPPRESS)
+    p.add_argument("--db", help=argparse.SUPPRESS)
+    p.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    p.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.serve:
+        _serve(args.db, args.serve, args.cache_dir, args.port)
+        return 0
+    reports = asyncio.run(
+        benchmark(
+            assets=args.assets, size_kb=args.size_kb,
+            requests=args.requests, concurrency=args.concurrency,
+        )
+    )
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<12}{'requests':>10}{'ms':>10}{'req/s':>10}{'rss_kb':>10}{'peak_kb':>10}{'db_B/req':>10}{'cpu_ms/req':>12}")
+    for r in reports:
+        print(
+            f"{r.mode:<12}{r.requests:>10}{r.elapsed_ms:>10.1f}{r.requests_per_s:>10.1f}"
+            f"{r.server_rss_kb:>10}{r.server_peak_rss_kb:>10}{r.db_bytes_per_request:>10}{r.server_cpu_ms_per_request:>12.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Benchmark ``/quiz/next`` admission: sequential Redis calls vs the Lua pair.
+
+Calls the real ``next_question`` handler for ``--requests`` fresh
+patch-mode sessions per mode against fakeredis, counting every Redis round
+trip (a command, or a whole pipeline) and adding ``--rtt-ms`` of simulated
+network latency to each one:
+
+* ``sequential`` — lock ``SET NX``, state read, action ``INCR``/``EXPIRE``,
+  daily-cents ``GET``, merge ``EVAL``, lock-release ``EVAL``;
+* ``scripted`` — ``quiz.next_admission_script``: admission ``EVAL`` +
+  commit ``EVAL`` (``app/services/quiz_admission``).
+
+The live-cost guard is enabled with a roomy budget so the spend check is
+part of the path. Usage:
+
+    python -m scripts.benchmark_next_admission
+    python -m scripts.benchmark_next_admission --requests 500 --rtt-ms 1 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from redis.asyncio.client import Pipeline, Redis  # noqa: E402
+
+
+class RoundTrips:
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.commands)
+
+    def reset(self) -> None:
+        self.commands.clear()
+
+
+@contextmanager
+def count_round_trips(*, delay_s: float = 0.0) -> Iterator[RoundTrips]:
+    """Record (and optionally delay) every Redis round trip made through a
+    redis-py asyncio client: a command, a WATCH-mode immediate command, or
+    one pipeline ``execute``."""
+    trips = RoundTrips()
+    orig_cmd = Redis.execute_command
+    orig_immediate = Pipeline.immediate_execute_command
+    orig_execute = Pipeline.execute
+
+    async def _trip(name: str) -> None:
+        trips.commands.append(name)
+        if delay_s > 0:
+            await asyncio.sleep(delay_s)
+
+    async def execute_command(self, *args, **kw):
+        await _trip(str(args[0]).upper())
+        return await orig_cmd(self, *args, **kw)
+
+    async def immediate_execute_command(self, *args, **kw):
+        await _trip(str(args[0]).upper())
+        return await orig_immediate(self, *args, **kw)
+
+    async def execute(self, *args, **kw):
+        if self.command_stack:
+            await _trip("PIPELINE")
+        return await orig_execute(self, *args, **kw)
+
+    Redis.execute_command = execute_command  # type: ignore[method-assign]
+    Pipeline.immediate_execute_command = immediate_execute_command  # type: ignore[method-assign]
+    Pipeline.execute = execute  # type: ignore[method-assign]
+    try:
+        yield trips
+    finally:
+        Redis.execute_command = orig_cmd  # type: ignore[method-assign]
+        Pipeline.immediate_execute_command = orig_immediate  # type: ignore[method-assign]
+        Pipeline.execute = orig_execute  # type: ignore[method-assign]
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    requests: int
+    failed: int
+    round_trips_per_request: float
+    p50_ms: float
+    p99_ms: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _state(quiz_id: uuid.UUID) -> dict[str, Any]:
+    return {
+        "session_id": str(quiz_id),
+        "trace_id": "t-bench",
+        "category": "Cats",
+        "synopsis": {"title": "Cats", "summary": "x" * 600},
+        "generated_characters": [
+            {"name": f"C{i}", "short_description": "d" * 120, "profile_text": "p" * 900}
+            for i in range(6)
+        ],
+        "generated_questions": [
+            {"question_text": f"Question {i}?", "options": [{"text": f"opt {j}"} for j in range(4)]}
+            for i in range(6)
+        ],
+        "quiz_history": [],
+        "messages": [{"type": "ai", "content": "m" * 300} for _ in range(10)],
+        "ready_for_questions": True,
+        # Never reach the agent hand-off: admission + merge only.
+        "baseline_count": 6,
+    }
+
+
+async def run_mode(client: Any, *, mode: str, requests: int, delay_s: float) -> ModeReport:
+    from fastapi import BackgroundTasks
+
+    from app.api.endpoints import quiz
+    from app.core.config import settings
+    from app.models.api import NextQuestionRequest
+    from app.services.redis_cache import CacheRepository
+
+    settings.quiz.next_admission_script = mode == "scripted"
+    repo = CacheRepository(client, patch_mode=True)
+    quiz_ids = [uuid.uuid4() for _ in range(requests)]
+    for qid in quiz_ids:
+        await repo.save_quiz_state(_state(qid))
+
+    latencies: list[float] = []
+    failed = 0
+    with count_round_trips(delay_s=delay_s) as trips:
+        for qid in quiz_ids:
+            t0 = time.perf_counter()
+            try:
+                await quiz.next_question(
+                    NextQuestionRequest(quiz_id=qid, question_index=0, option_index=1),
+                    BackgroundTasks(),
+                    agent_graph=object(),
+                    redis_client=client,
+                    db_session=None,
+                )
+            except Exception:
+                failed += 1
+                continue
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+    return ModeReport(
+        mode=mode,
+        requests=requests,
+        failed=failed,
+        round_trips_per_request=round(trips.count / max(1, requests), 2),
+        p50_ms=round(_percentile(latencies, 0.50), 2),
+        p99_ms=round(_percentile(latencies, 0.99), 2),
+    )
+
+
+async def benchmark(
+    *,
+    requests: int = 200,
+    rtt_s: float = 0.0005,
+    modes: tuple[str, ...] = ("sequential", "scripted"),
+) -> list[ModeReport]:
+    import fakeredis.aioredis as fr
+
+    from app.core.config import settings
+
+    guard = settings.security.live_cost_guard
+    saved = (
+        settings.quiz.session_state_patch_mode,
+        settings.quiz.next_admission_script,
+        guard.enabled,
+        guard.daily_budget_usd,
+    )
+    settings.quiz.session_state_patch_mode = True
+    guard.enabled, guard.daily_budget_usd = True, 1_000_000.0
+    try:
+        client = fr.FakeRedis(decode_responses=True)
+        return [await run_mode(client, mode=m, requests=requests, delay_s=rtt_s) for m in modes]
+    finally:
+        (
+            settings.quiz.session_state_patch_mode,
+            settings.quiz.next_admission_script,
+            guard.enabled,
+            guard.daily_budget_usd,
+        ) = saved
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--requests", type=int, default=200, help="per mode")
+    p.add_argument("--rtt-ms", type=float, default=0.5, help="simulated latency per round trip")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    args = _parse_args(argv)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    reports = asyncio.run(benchmark(requests=args.requests, rtt_s=args.rtt_ms / 1000.0))
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<12}{'reqs':>6}{'fail':>6}{'RTT/req':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for r in reports:
+        print(
+            f"{r.mode:<12}{r.requests:>6}{r.failed:>6}{r.round_trips_per_request:>9.2f}"
+            f"{r.p50_ms:>9.2f}{r.p99_ms:>9.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Benchmark the session-state pointer bump: blob WATCH/MULTI merge vs patch mode.
+
+The ``/quiz/status`` poller bumps ``last_served_index`` on every served
+question. In the blob layout that is ``update_quiz_state_atomically``:
+WATCH, GET, a full ``model_validate_json`` + ``model_validate`` of the whole
+state, then MULTI/SET/EXEC. In patch mode (``quiz.session_state_patch_mode``)
+it is ``patch_quiz_state``: only the changed field is validated and one EVAL
+writes it to the ``quiz_session:{id}:fields`` hash.
+
+Both paths run against the same fakeredis (Lua via lupa) over a realistic
+mid-quiz state (24 questions, 12 answers, 40 messages). Reports, per mode,
+round trips and full-state validations per bump and the p50 bump latency
+over ``--rounds``. fakeredis interprets Lua through lupa, far slower than
+server-side EVAL on real Redis, so the patch-mode latency is pessimistic.
+Usage:
+
+    python -m scripts.benchmark_session_patch
+    python -m scripts.benchmark_session_patch --rounds 200 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("APP_ENVIRONMENT", "local")
+os.environ.setdefault("LOG_TO_FILE", "false")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    rounds: int
+    round_trips_per_bump: int
+    full_validations_per_bump: int
+    p50_ms: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def big_state(sid: uuid.UUID) -> dict[str, Any]:
+    """A mid-quiz session: 8 characters, 24 questions, 12 answers, 40 messages."""
+    return {
+        "session_id": str(sid),
+        "trace_id": "t-bench",
+        "category": "Cats",
+        "synopsis": {"title": "Cats", "summary": "x" * 600},
+        "generated_characters": [
+            {"name": f"C{i}", "short_description": "d" * 120, "profile_text": "p" * 900}
+            for i in range(8)
+        ],
+        "generated_questions": [
+            {
+                "question_text": f"Question {i}?" + "q" * 120,
+                "options": [{"text": f"opt {j}" + "o" * 40} for j in range(4)],
+            }
+            for i in range(24)
+        ],
+        "quiz_history": [
+            {"question_index": i, "question_text": f"Question {i}?", "answer_text": "opt 1"}
+            for i in range(12)
+        ],
+        "messages": [
+            {"type": "human" if i % 2 else "ai", "content": "m" * 300} for i in range(40)
+        ],
+        "baseline_count": 5,
+    }
+
+
+async def blob_bump(repo: Any, sid: uuid.UUID, index: int) -> bool:
+    return await repo.update_quiz_state_atomically(sid, {"last_served_index": index}) is not None
+
+
+async def patch_bump(repo: Any, sid: uuid.UUID, index: int) -> bool:
+    return await repo.patch_quiz_state(sid, {"last_served_index": index})
+
+
+class RoundTripCounter:
+    """Counts commands (or pipelined batches) sent on any redis connection."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self._orig: Any = None
+
+    def __enter__(self) -> RoundTripCounter:
+        from redis.asyncio.connection import AbstractConnection
+
+        self._orig = orig = AbstractConnection.send_packed_command
+        counter = self
+
+        async def _send(conn, *args, **kwargs):
+            counter.n += 1
+            return await orig(conn, *args, **kwargs)
+
+        AbstractConnection.send_packed_command = _send  # type: ignore[method-assign]
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        from redis.asyncio.connection import AbstractConnection
+
+        AbstractConnection.send_packed_command = self._orig  # type: ignore[method-assign]
+
+    async def count(self, fn: Callable[[], Awaitable[Any]]) -> int:
+        before = self.n
+        await fn()
+        return self.n - before
+
+
+class FullValidationCounter:
+    """Counts whole-state ``AgentGraphStateModel`` validations."""
+
+    _METHODS = ("model_validate", "model_validate_json")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self._orig: dict[str, Any] = {}
+
+    def __enter__(self) -> FullValidationCounter:
+        from app.agent.schemas import AgentGraphStateModel
+
+        for name in self._METHODS:
+            self._orig[name] = AgentGraphStateModel.__dict__.get(name)
+            orig = getattr(AgentGraphStateModel, name)
+            setattr(AgentGraphStateModel, name, classmethod(self._counted(orig)))
+        return self
+
+    def _counted(self, orig: Any) -> Any:
+        def _validate(_cls, *args, **kwargs):
+            self.n += 1
+            return orig(*args, **kwargs)
+
+        return _validate
+
+    def __exit__(self, *_exc) -> None:
+        from app.agent.schemas import AgentGraphStateModel
+
+        for name, orig in self._orig.items():
+            if orig is None:
+                delattr(AgentGraphStateModel, name)  # inherited one shows through again
+            else:
+                setattr(AgentGraphStateModel, name, orig)
+        self._orig.clear()
+
+    async def count(self, fn: Callable[[], Awaitable[Any]]) -> int:
+        before = self.n
+        await fn()
+        return self.n - before
+
+
+async def _p50_ms(fn: Callable[[int], Awaitable[Any]], rounds: int) -> float:
+    samples = []
+    for i in range(rounds):
+        t0 = time.perf_counter()
+        await fn(i)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1000.0, 3)
+
+
+async def run_mode(client: Any, *, mode: str, rounds: int) -> ModeReport:
+    from app.services.redis_cache import CacheRepository
+
+    patch_mode = mode == "patch"
+    repo = CacheRepository(client, patch_mode=patch_mode)
+    sid = uuid.uuid4()
+    await repo.save_quiz_state(big_state(sid))
+    bump = patch_bump if patch_mode else blob_bump
+
+    with RoundTripCounter() as trips, FullValidationCounter() as validations:
+        round_trips = await trips.count(lambda: bump(repo, sid, 0))
+        full_validations = await validations.count(lambda: bump(repo, sid, 1))
+    return ModeReport(
+        mode=mode,
+        rounds=rounds,
+        round_trips_per_bump=round_trips,
+        full_validations_per_bump=full_validations,
+        p50_ms=await _p50_ms(lambda i: bump(repo, sid, i), rounds),
+    )
+
+
+async def benchmark(*, rounds: int = 60, modes: tuple[str, ...] = ("blob", "patch")) -> list[ModeReport]:
+    import fakeredis.aioredis as fr
+
+    client = fr.FakeRedis(decode_responses=True)
+    return [await run_mode(client, mode=m, rounds=rounds) for m in modes]
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rounds", type=int, default=60)
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = p.parse_args(argv)
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    reports = asyncio.run(benchmark(rounds=args.rounds))
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<7}{'round trips':>13}{'full validations':>18}{'p50 ms':>9}")
+    for r in reports:
+        print(
+            f"{r.mode:<7}{r.round_trips_per_bump:>13}{r.full_validations_per_bump:>18}{r.p50_ms:>9.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
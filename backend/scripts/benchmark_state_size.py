@@ -0,0 +1,180 @@
+"""Benchmark per-session state size as a quiz goes on: unbounded vs bounded transcript.
+
+Plays ``--questions`` answer/agent-run cycles for one session against
+fakeredis and reports, per mode, the size of the final ``save_quiz_state``
+payload, the ``messages`` it carries, the messages accumulated in the
+LangGraph checkpoint channel, and the read (``get_quiz_state``) parse time:
+
+* ``unbounded`` — the old behaviour: every answer is echoed into
+  ``messages`` as a ``HumanMessage``, stored messages lose their ids (so each
+  agent run re-appends them to the checkpoint via ``add_messages``), no
+  compaction;
+* ``bounded`` — ``quiz.transcript`` on: answers live only in
+  ``quiz_history``, stored messages keep their ids, and both the stored
+  state and the checkpoint reducer keep seed + summary + recent window.
+
+Each agent run adds ``--notes`` status messages (the graph nodes'
+``AIMessage``s). Usage:
+
+    python -m scripts.benchmark_state_size
+    python -m scripts.benchmark_state_size --questions 24 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.graph.message import add_messages  # noqa: E402
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    questions: int
+    state_bytes: int
+    stored_messages: int
+    checkpoint_messages: int
+    read_ms_p50: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _question(i: int) -> dict[str, Any]:
+    return {
+        "question_text": f"Question {i}: which of these sounds most like your ideal weekend?",
+        "options": [{"text": f"Option {j} for question {i}, described in a sentence"} for j in range(4)],
+    }
+
+
+def _state(quiz_id: uuid.UUID, questions: int, history: list[dict], messages: list[Any]) -> dict[str, Any]:
+    return {
+        "session_id": str(quiz_id),
+        "trace_id": "t-bench",
+        "category": "Cats",
+        "synopsis": {"title": "Cats", "summary": "s" * 600},
+        "generated_characters": [
+            {"name": f"C{i}", "short_description": "d" * 120, "profile_text": "p" * 900}
+            for i in range(6)
+        ],
+        "generated_questions": [_question(i) for i in range(questions)],
+        "quiz_history": history,
+        "messages": messages,
+        "ready_for_questions": True,
+        "baseline_count": 5,
+    }
+
+
+def _notes(q: int, n: int) -> list[AIMessage]:
+    return [
+        AIMessage(content=f"Q{q} step {k}: decided to ask one more question; leading archetype C{k} at 0.{k}")
+        for k in range(n)
+    ]
+
+
+async def run_mode(client: Any, *, mode: str, questions: int, notes: int) -> ModeReport:
+    from app.agent.transcript import add_bounded_messages
+    from app.core.config import settings
+    from app.services.redis_cache import CacheRepository, _message_to_dict
+
+    bounded = mode == "bounded"
+    settings.quiz.transcript.enabled = bounded
+    reducer = add_bounded_messages if bounded else add_messages
+    repo = CacheRepository(client)
+    quiz_id = uuid.uuid4()
+    checkpoint: list[Any] = reducer([], [HumanMessage(content="Cats")])
+    stored: list[Any] = [_message_to_dict(m) for m in checkpoint]
+    history: list[dict] = []
+    read_ms: list[float] = []
+    state_bytes = 0
+
+    for q in range(questions):
+        history.append({"question_index": q, "question_text": f"Question {q}", "answer_text": "opt", "option_index": 1})
+        if not bounded:
+            stored.append(_message_to_dict(HumanMessage(content=f"Answer to Q{q + 1}: opt")))
+        # Agent run: the stored state is streamed back into the checkpoint,
+        # then the nodes add their status notes.
+        replay = stored if bounded else [{k: v for k, v in m.items() if k != "id"} for m in stored]
+        checkpoint = reducer(reducer(checkpoint, replay), _notes(q, notes))
+
+        await repo.save_quiz_state(_state(quiz_id, q + 1, history, stored))
+        raw = await client.get(f"quiz_session:{quiz_id}")
+        state_bytes = len(raw.encode("utf-8"))
+        t0 = time.perf_counter()
+        state = await repo.get_quiz_state(quiz_id)
+        read_ms.append((time.perf_counter() - t0) * 1000.0)
+        stored = list(state.messages)
+
+    return ModeReport(
+        mode=mode,
+        questions=questions,
+        state_bytes=state_bytes,
+        stored_messages=len(stored),
+        checkpoint_messages=len(checkpoint),
+        read_ms_p50=round(statistics.median(read_ms), 3) if read_ms else 0.0,
+    )
+
+
+async def benchmark(
+    *,
+    questions: int = 24,
+    notes: int = 3,
+    modes: tuple[str, ...] = ("unbounded", "bounded"),
+) -> list[ModeReport]:
+    import fakeredis.aioredis as fr
+
+    from app.core.config import settings
+
+    saved = (settings.quiz.session_state_patch_mode, settings.quiz.transcript.enabled)
+    settings.quiz.session_state_patch_mode = False
+    try:
+        client = fr.FakeRedis(decode_responses=True)
+        return [await run_mode(client, mode=m, questions=questions, notes=notes) for m in modes]
+    finally:
+        settings.quiz.session_state_patch_mode, settings.quiz.transcript.enabled = saved
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--questions", type=int, default=24)
+    p.add_argument("--notes", type=int, default=3, help="agent status messages per run")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    args = _parse_args(argv)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    reports = asyncio.run(benchmark(questions=args.questions, notes=args.notes))
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'mode':<11}{'qs':>4}{'state B':>9}{'stored':>8}{'ckpt':>6}{'read ms':>9}")
+    for r in reports:
+        print(
+            f"{r.mode:<11}{r.questions:>4}{r.state_bytes:>9}{r.stored_messages:>8}"
+            f"{r.checkpoint_messages:>6}{r.read_ms_p50:>9.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Benchmark `/topics/suggest` lookups: prefix index vs a full scan.
+
+Builds ``--sizes`` synthetic catalogues (multi-word names, ~1 alias per
+three topics, ranks on 80% of topics) and reports per size:
+
+* ``build ms`` — `TopicSuggestIndex.load` (fold + sort + hot prefixes);
+* ``scan µs`` — the legacy shape: lower-case every name and test
+  ``startswith`` (what ``lower(display_name) LIKE 'q%'`` does without a
+  functional index), measured in-process so no DB round trip is counted;
+* ``exact µs`` / ``fuzzy µs`` — p50 and p99 of `suggest()` over typed
+  prefixes of 1..8 characters (fuzzy: the same queries with one typo).
+
+Usage:
+
+    python -m scripts.benchmark_topic_suggest
+    python -m scripts.benchmark_topic_suggest --sizes 10000 100000 --json
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+_WORDS = (
+    "harry potter marvel pokemon taylor swift star wars disney anime cats dogs "
+    "zodiac hogwarts jedi avengers mario zelda friends office pixar studio "
+    "ghibli greek gods mythology planets dinosaurs pirates vikings knights "
+    "wizards dragons heroes villains bands kpop rappers painters poets chefs "
+    "cocktails cheeses pastas breads cities islands rivers mountains birds"
+).split()
+
+
+@dataclass
+class SizeReport:
+    topics: int
+    keys: int
+    build_ms: float
+    scan_us_p50: float
+    exact_us_p50: float
+    exact_us_p99: float
+    fuzzy_us_p50: float
+    fuzzy_us_p99: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def _catalogue(n: int, rng: random.Random) -> list[Any]:
+    from app.services.precompute.topic_suggest_index import TopicRow
+
+    rows = []
+    for i in range(n):
+        name = " ".join(rng.choice(_WORDS).title() for _ in range(rng.randint(1, 3))) + f" {i}"
+        aliases = (f"{rng.choice(_WORDS).title()} {name}",) if i % 3 == 0 else ()
+        rank = i if rng.random() < 0.8 else None
+        rows.append(TopicRow(uuid4(), f"t-{i}", name, rank, aliases))
+    return rows
+
+
+def _typo(q: str, rng: random.Random) -> str:
+    if len(q) < 3:
+        return q
+    i = rng.randrange(1, len(q) - 1)
+    return q[:i] + q[i + 1] + q[i] + q[i + 2 :]
+
+
+def _time_us(fn, queries: list[str]) -> list[float]:
+    out = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        out.append((time.perf_counter() - t0) * 1e6)
+    out.sort()
+    return out
+
+
+def _p(samples: list[float], q: float) -> float:
+    return round(samples[min(len(samples) - 1, int(len(samples) * q))], 1)
+
+
+def run_size(n: int, *, queries: int = 400, seed: int = 7) -> SizeReport:
+    from app.services.precompute.topic_suggest_index import TopicSuggestIndex
+
+    rng = random.Random(seed)
+    rows = _catalogue(n, rng)
+    idx = TopicSuggestIndex()
+    t0 = time.perf_counter()
+    idx.load(rows)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+
+    typed = [r.display_name.lower()[: rng.randint(1, 8)] for r in rng.sample(rows, min(queries, n))]
+    typos = [_typo(q, rng) for q in typed]
+
+    names = [r.display_name for r in rows]
+
+    def _scan(q: str) -> list[str]:
+        return [s for s in names if s.lower().startswith(q)][:8]
+
+    scan = _time_us(_scan, typed[:20])
+    exact = _time_us(lambda q: idx.suggest(q), typed)
+    fuzzy = _time_us(lambda q: idx.suggest(q, fuzzy=True), typos)
+    return SizeReport(
+        topics=n,
+        keys=idx.stats()["keys"],
+        build_ms=round(build_ms, 1),
+        scan_us_p50=round(statistics.median(scan), 1),
+        exact_us_p50=_p(exact, 0.5),
+        exact_us_p99=_p(exact, 0.99),
+        fuzzy_us_p50=_p(fuzzy, 0.5),
+        fuzzy_us_p99=_p(fuzzy, 0.99),
+    )
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    p.add_argument("--queries", type=int, default=400)
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import logging
+
+    import structlog
+
+    args = _parse_args(argv)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    reports = [run_size(n, queries=args.queries) for n in args.sizes]
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+        return 0
+    print(f"{'topics':>8}{'keys':>8}{'build ms':>10}{'scan µs':>10}{'exact p50/p99 µs':>19}{'fuzzy p50/p99 µs':>19}")
+    for r in reports:
+        print(
+            f"{r.topics:>8}{r.keys:>8}{r.build_ms:>10.1f}{r.scan_us_p50:>10.1f}"
+            f"{f'{r.exact_us_p50}/{r.exact_us_p99}':>19}{f'{r.fuzzy_us_p50}/{r.fuzzy_us_p99}':>19}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -4,7 +4,8 @@ Run after the dual-write window closes. For every `media_assets` row
 whose `storage_provider != 'blob'` and `bytes_blob IS NOT NULL`:
 
   1. Compute (or trust) `content_hash`.
-  2. Upload bytes to Azure Blob via `AzureBlobProvider.upload`.
+  2. Upload bytes to Azure Blob via `AzureBlobProvider.upload_many`
+     (one shared client for the run, `concurrency` uploads in flight).
   3. UPDATE the row: `storage_provider='blob'`, `storage_uri=<blob url>`,
      `pending_rehost=False`. Bytes are deliberately retained until the
      follow-up `bytes_blob` drop migration; the blob URL is now the
@@ -29,7 +30,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import select, update
 
 from app.models.db import MediaAsset
-from app.services.precompute.storage import AzureBlobProvider
+from app.services.precompute.storage import AzureBlobProvider, BlobUpload
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -40,66 +41,85 @@ async def migrate_local_to_blob(
     *,
     provider: AzureBlobProvider,
     batch_size: int = 100,
+    concurrency: int = 8,
 ) -> dict[str, int]:
     """One-shot drain. Idempotent."""
-    migrated = marked = skipped = 0
-
-    while True:
-        rows = (
-            await session.execute(
+    counts = {"migrated": 0, "marked_pending": 0, "skipped": 0}
+    last_id = None
+
+    # One shared client for the whole drain; rows are walked by id so a
+    # full batch of rows that stay local can't be re-selected forever.
+    async with provider.session():
+        while True:
+            query = (
                 select(MediaAsset)
                 .where(MediaAsset.storage_provider != "blob")
                 .where(MediaAsset.storage_provider != "blob+cdn")
+                .order_by(MediaAsset.id)
                 .limit(batch_size)
             )
-        ).scalars().all()
-        if not rows:
-            break
-
-        for asset in rows:
-            if asset.bytes_blob is None:
-                # Source unreachable → defer to async worker.
-                await session.execute(
-                    update(MediaAsset)
-                    .where(MediaAsset.id == asset.id)
-                    .values(pending_rehost=True)
-                )
-                marked += 1
-                continue
-
-            content_type = _guess_content_type(asset.prompt_payload or {})
-            try:
-                uri = await provider.upload(
-                    content_hash=asset.content_hash,
-                    data=asset.bytes_blob,
-                    content_type=content_type,
-                )
-            except Exception:
-                # Don't crash the batch; flag the row for retry.
-                await session.execute(
-                    update(MediaAsset)
-                    .where(MediaAsset.id == asset.id)
-                    .values(pending_rehost=True)
-                )
-                skipped += 1
-                continue
+            if last_id is not None:
+                query = query.where(MediaAsset.id > last_id)
+            rows = (await session.execute(query)).scalars().all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            await _migrate_batch(session, rows, provider=provider, concurrency=concurrency, counts=counts)
+            await session.commit()
+            if len(rows) < batch_size:
+                break
 
+    return counts
+
+
+async def _migrate_batch(
+    session: "AsyncSession",
+    rows: list[MediaAsset],
+    *,
+    provider: AzureBlobProvider,
+    concurrency: int,
+    counts: dict[str, int],
+) -> None:
+    # The WHERE filter already excludes migrated rows and puts are
+    # conditional, so the listing-based existence check would only add
+    # requests here.
+    report = await provider.upload_many(
+        [
+            BlobUpload(
+                content_hash=a.content_hash,
+                data=a.bytes_blob,
+                content_type=_guess_content_type(a.prompt_payload or {}),
+            )
+            for a in rows
+            if a.bytes_blob is not None
+        ],
+        concurrency=concurrency,
+        skip_existing=False,
+    )
+    for asset in rows:
+        uri = report.uris.get(asset.content_hash) if asset.bytes_blob is not None else None
+        if uri is None:
+            # No source bytes → defer to async worker; failed upload → flag
+            # the row for retry. Neither crashes the batch.
             await session.execute(
                 update(MediaAsset)
                 .where(MediaAsset.id == asset.id)
-                .values(
-                    storage_provider="blob",
-                    storage_uri=uri,
-                    pending_rehost=False,
-                )
+                .values(pending_rehost=True)
             )
-            migrated += 1
-
-        await session.commit()
-        if len(rows) < batch_size:
-            break
-
-    return {"migrated": migrated, "marked_pending": marked, "skipped": skipped}
+            counts["marked_pending" if asset.bytes_blob is None else "skipped"] += 1
+            continue
+
+        await session.execute(
+            update(MediaAsset)
+            .where(MediaAsset.id == asset.id)
+            .values(
+                storage_provider="blob",
+                storage_uri=uri,
+                pending_rehost=False,
+            )
+        )
+        counts["migrated"] += 1
 
 
 def _guess_content_type(payload: dict) -> str:
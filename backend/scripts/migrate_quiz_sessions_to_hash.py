@@ -0,0 +1,80 @@
+"""Drain legacy ``quiz_session:{id}`` blobs into the patch-mode hash layout.
+
+Patch mode (``quiz.session_state_patch_mode``) already converts a legacy
+session on its first write, and readers fall back to the blob, so this sweep
+is optional — run it after flipping the flag fleet-wide to stop paying the
+one-time full validation on the hot path. Each conversion is a single Lua
+EVAL that no-ops when the hash already exists, so the sweep is idempotent and
+safe to run against live traffic.
+
+Usage (from ``backend/``):
+
+    python -m scripts.migrate_quiz_sessions_to_hash            # uses REDIS_URL
+    python -m scripts.migrate_quiz_sessions_to_hash --dry-run
+
+Prints a counters dict::
+
+    {"scanned": N, "migrated": M, "skipped": K}
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Any
+
+from app.services.redis_cache import CacheRepository
+
+_PATTERN = "quiz_session:*"
+_FIELDS_SUFFIX = ":fields"
+
+
+def _session_id_from_key(key: str) -> str | None:
+    if not key.startswith("quiz_session:") or key.endswith(_FIELDS_SUFFIX):
+        return None
+    return key.split(":", 1)[1] or None
+
+
+async def migrate_sessions(
+    client: Any, *, dry_run: bool = False, scan_count: int = 500
+) -> dict[str, int]:
+    """SCAN every legacy string session and convert it. Idempotent."""
+    repo = CacheRepository(client, patch_mode=True)
+    scanned = migrated = skipped = 0
+    async for raw_key in client.scan_iter(match=_PATTERN, count=scan_count):
+        key = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else str(raw_key)
+        session_id = _session_id_from_key(key)
+        if session_id is None:
+            continue
+        scanned += 1
+        if dry_run:
+            continue
+        if await repo.migrate_session_to_fields(session_id):
+            migrated += 1
+        else:
+            skipped += 1
+    return {"scanned": scanned, "migrated": migrated, "skipped": skipped}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="count only; write nothing")
+    args = parser.parse_args()
+
+    import redis.asyncio as redis
+
+    from app.core.config import settings
+
+    async def _run() -> dict[str, int]:
+        client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        try:
+            return await migrate_sessions(client, dry_run=args.dry_run)
+        finally:
+            await client.aclose()
+
+    print(json.dumps(asyncio.run(_run())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
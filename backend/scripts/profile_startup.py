@@ -0,0 +1,186 @@
+"""Startup profile for ``app.main``: per-module import time + first-request latency.
+
+Two measurements, each in a FRESH interpreter so nothing is pre-imported:
+
+1. ``python -X importtime -c "import app.main"`` — parsed into
+   * the cold import total of ``app.main``;
+   * self-time summed per top-level package (``litellm``, ``openai``,
+     ``langgraph``, ``app`` ...), i.e. who actually spends the time;
+   * the slowest ``app.*`` modules by cumulative time;
+   * whether the deferred optional integrations (``DEFERRED_MODULES``)
+     stayed out of the import graph.
+2. A probe that imports ``app.main``, runs the FastAPI lifespan and issues
+   ``GET /health`` + ``GET <api>/config`` twice through an in-process ASGI
+   client: import / startup / first-request / warm-request milliseconds.
+
+The report is printed and written as JSON to ``--out`` (the CI artifact).
+The probe runs with ``USE_MEMORY_SAVER=1`` unless set, so no Redis is needed.
+Usage:
+
+    python -m scripts.profile_startup
+    python -m scripts.profile_startup --out startup_profile.json --top 25
+
+Exit code 0 always (this is a report, not a gate; see
+``tests/performance/test_import_time_perf.py`` for the budget).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+# Optional integrations ``app.main`` must not import (loaded on first use).
+DEFERRED_MODULES = (
+    "fal_client",
+    "wikipedia",
+    "langchain_community",
+    "fastembed",
+    "azure.monitor.opentelemetry",
+)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main as m
+t1 = time.perf_counter()
+
+async def _run():
+    from httpx import ASGITransport, AsyncClient
+    out = {"import_ms": (t1 - t0) * 1000.0}
+    s = time.perf_counter()
+    async with m.app.router.lifespan_context(m.app):
+        out["startup_ms"] = (time.perf_counter() - s) * 1000.0
+        async with AsyncClient(transport=ASGITransport(app=m.app), base_url="http://probe") as c:
+            for label in ("first", "warm"):
+                for path in ("/health", m.API_PREFIX.rstrip("/") + "/config"):
+                    s = time.perf_counter()
+                    r = await c.get(path)
+                    key = f"{label}_{path.rsplit('/', 1)[-1]}"
+                    out[key + "_ms"] = (time.perf_counter() - s) * 1000.0
+                    out[key + "_status"] = r.status_code
+    return out
+
+print("PROBE " + json.dumps(asyncio.run(_run())))
+"""
+
+
+@dataclass
+class ImportProfile:
+    total_ms: float
+    modules: int
+    by_package_ms: list[tuple[str, float]] = field(default_factory=list)
+    app_modules_ms: list[tuple[str, float]] = field(default_factory=list)
+    deferred_loaded: list[str] = field(default_factory=list)
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("APP_ENVIRONMENT", "local")
+    env.setdefault("LOG_TO_FILE", "false")
+    env.setdefault("USE_MEMORY_SAVER", "1")
+    env.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    return env
+
+
+def parse_importtime(stderr: str, *, top: int = 20) -> ImportProfile:
+    """Aggregate ``-X importtime`` output."""
+    self_by_pkg: dict[str, float] = defaultdict(float)
+    app_cum: dict[str, float] = {}
+    loaded: set[str] = set()
+    total = 0.0
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, name = int(m.group(1)), int(m.group(2)), m.group(4)
+        loaded.add(name)
+        self_by_pkg[name.split(".", 1)[0]] += self_us / 1000.0
+        if name.startswith("app.") or name == "app":
+            app_cum[name] = cum_us / 1000.0
+        if name == "app.main":
+            total = cum_us / 1000.0
+
+    def _top(d: dict[str, float]) -> list[tuple[str, float]]:
+        return [(k, round(v, 1)) for k, v in sorted(d.items(), key=lambda kv: -kv[1])[:top]]
+
+    return ImportProfile(
+        total_ms=round(total, 1),
+        modules=len(loaded),
+        by_package_ms=_top(self_by_pkg),
+        app_modules_ms=_top(app_cum),
+        deferred_loaded=[m for m in DEFERRED_MODULES if m in loaded],
+    )
+
+
+def profile_imports(*, top: int = 20) -> ImportProfile:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=_BACKEND_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(out.stderr, top=top)
+
+
+def profile_first_request() -> dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=_BACKEND_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    line = next(ln for ln in reversed(out.stdout.splitlines()) if ln.startswith("PROBE "))
+    return {k: round(v, 2) if isinstance(v, float) else v for k, v in json.loads(line[6:]).items()}
+
+
+def _render(imports: ImportProfile, request: dict[str, Any]) -> str:
+    lines = [f"app.main cold import: {imports.total_ms:.0f} ms ({imports.modules} modules)", ""]
+    lines.append("self time by top-level package:")
+    lines += [f"  {name:<32}{ms:>9.1f} ms" for name, ms in imports.by_package_ms]
+    lines += ["", "slowest app modules (cumulative):"]
+    lines += [f"  {name:<48}{ms:>9.1f} ms" for name, ms in imports.app_modules_ms]
+    deferred = ", ".join(imports.deferred_loaded) or "none"
+    lines += ["", f"deferred integrations imported at startup: {deferred}", "", "first request (fresh process):"]
+    lines += [f"  {k:<24}{v}" for k, v in request.items()]
+    return "\n".join(lines)
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--out", type=Path, default=Path("startup_profile.json"), help="JSON report path")
+    p.add_argument("--top", type=int, default=20, help="rows per table")
+    p.add_argument("--skip-request", action="store_true", help="import profile only")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    imports = profile_imports(top=args.top)
+    request = {} if args.skip_request else profile_first_request()
+    print(_render(imports, request))
+    args.out.write_text(
+        json.dumps({"imports": imports.__dict__, "first_request": request}, indent=2),
+        encoding="utf-8",
+    )
+    print(f"\nwrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -24,6 +24,11 @@ art drift. This script is that missing producer:
   5. Mirror every ``session_history.character_set`` JSONB snapshot that
      contains the character (name-scoped, same shape as
      ``image_pipeline._refresh_character_set_images_batch``).
+  6. Write resized WebP/AVIF derivatives of the bytes as their own
+     content-addressed ``media_assets`` rows and list them under the
+     original's ``prompt_payload.derivatives`` (``/api/v1/media/{id}?w=``
+     serves them; see ``app.services.media.derivatives``). Best-effort: a
+     missing Pillow or an undecodable image rehosts the original only.
 
 $0 FAL — this is download + store, never generation.
 
@@ -118,6 +123,101 @@ async def _fetch_image(url: str, client: Any) -> tuple[bytes, str] | None:
         return None
 
 
+async def _insert_local_asset(
+    conn: Any, *, data: bytes, prompt_hash: str, payload: dict[str, Any]
+) -> str:
+    """INSERT a local ``media_assets`` row keyed by sha256(data); returns the
+    id of whichever row owns that hash (ours, or a concurrent writer's)."""
+    from sqlalchemy import text
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    asset_id = str(uuid.uuid4())
+    await conn.execute(
+        text(
+            "INSERT INTO media_assets "
+            "  (id, content_hash, prompt_hash, storage_provider, storage_uri, "
+            "   bytes_blob, prompt_payload) "
+            "VALUES (:id, :ch, :ph, 'local', :uri, :blob, CAST(:payload AS jsonb)) "
+            "ON CONFLICT (content_hash) DO NOTHING"
+        ),
+        {
+            "id": asset_id,
+            "ch": content_hash,
+            "ph": prompt_hash,
+            "uri": MEDIA_PATH_FMT.format(asset_id=asset_id),
+            "blob": data,
+            "payload": json.dumps(payload),
+        },
+    )
+    # A concurrent writer may have won the ON CONFLICT race — re-select.
+    row = (
+        await conn.execute(
+            text("SELECT id::text AS id FROM media_assets WHERE content_hash = :ch"),
+            {"ch": content_hash},
+        )
+    ).mappings().first()
+    return row["id"] if row else asset_id
+
+
+async def _upsert_derivatives(
+    conn: Any, *, asset_id: str, data: bytes, source_url: str
+) -> list[dict[str, Any]]:
+    """Generate resized variants of ``data`` and record them on ``asset_id``.
+
+    Each variant is its own local row (sha256 dedup, like the original); the
+    original's ``prompt_payload.derivatives`` gets the manifest the media
+    endpoint selects from. Returns the manifest (empty when Pillow or the
+    encoders are unavailable, or the image is already smaller than every
+    configured width). Never raises.
+    """
+    from sqlalchemy import text
+
+    from app.core.config import settings
+    from app.services.media.derivatives import generate_derivatives
+
+    cfg = settings.precompute.image_storage
+    try:
+        variants = await asyncio.to_thread(
+            generate_derivatives,
+            data,
+            widths=cfg.derivative_widths,
+            formats=cfg.derivative_formats,
+            quality=cfg.derivative_quality,
+        )
+        manifest: list[dict[str, Any]] = []
+        if not variants:
+            return manifest
+        # SAVEPOINT: a failed variant write must not abort the batch transaction.
+        async with conn.begin_nested():
+            for v in variants:
+                vid = await _insert_local_asset(
+                    conn,
+                    data=v.data,
+                    prompt_hash=hashlib.sha256(
+                        f"derivative:{asset_id}:{v.width}:{v.content_type}".encode()
+                    ).hexdigest(),
+                    payload={
+                        "content_type": v.content_type,
+                        "derivative_of": asset_id,
+                        "width": v.width,
+                        "height": v.height,
+                        "rehost": {"source_url": source_url, "tool": "scripts.rehost_fal_images"},
+                    },
+                )
+                manifest.append(v.manifest_entry(vid))
+            await conn.execute(
+                text(
+                    "UPDATE media_assets SET prompt_payload = jsonb_set("
+                    "prompt_payload, '{derivatives}', CAST(:m AS jsonb)) WHERE id = :id"
+                ),
+                {"m": json.dumps(manifest), "id": asset_id},
+            )
+        return manifest
+    except Exception as e:  # derivatives are an optimisation, never a rehost failure
+        print(f"  derivatives skipped for {asset_id}: {str(e)[:120]}", file=sys.stderr)
+        return []
+
+
 async def _upsert_media_asset(
     conn: Any,
     *,
@@ -130,13 +230,15 @@ async def _upsert_media_asset(
     Dedup is content-addressed: sha256 over the raw bytes hits the UNIQUE
     ``content_hash`` constraint; ON CONFLICT DO NOTHING + re-select keeps the
     first row. The original FAL URL is preserved in prompt_payload.rehost.
+    Resized derivatives are written alongside when the row has none yet.
     """
     from sqlalchemy import text
 
     content_hash = hashlib.sha256(data).hexdigest()
     row = (
         await conn.execute(
-            text("SELECT id::text AS id, bytes_blob IS NOT NULL AS has_bytes "
+            text("SELECT id::text AS id, bytes_blob IS NOT NULL AS has_bytes, "
+                 "prompt_payload -> 'derivatives' IS NOT NULL AS has_derivatives "
                  "FROM media_assets WHERE content_hash = :ch"),
             {"ch": content_hash},
         )
@@ -149,9 +251,12 @@ async def _upsert_media_asset(
                 text("UPDATE media_assets SET bytes_blob = :b WHERE id = :id"),
                 {"b": data, "id": row["id"]},
             )
+        if not row["has_derivatives"]:
+            await _upsert_derivatives(
+                conn, asset_id=row["id"], data=data, source_url=source_url
+            )
         return row["id"]
 
-    asset_id = str(uuid.uuid4())
     payload = {
         "content_type": content_type,
         "rehost": {
@@ -160,33 +265,16 @@ async def _upsert_media_asset(
             "tool": "scripts.rehost_fal_images",
         },
     }
-    await conn.execute(
-        text(
-            "INSERT INTO media_assets "
-            "  (id, content_hash, prompt_hash, storage_provider, storage_uri, "
-            "   bytes_blob, prompt_payload) "
-            "VALUES (:id, :ch, :ph, 'local', :uri, :blob, CAST(:payload AS jsonb)) "
-            "ON CONFLICT (content_hash) DO NOTHING"
-        ),
-        {
-            "id": asset_id,
-            "ch": content_hash,
-            # No generation prompt is known for a rehost; key it to the source
-            # URL so identical URLs map to a stable hash.
-            "ph": hashlib.sha256(f"rehost:{source_url}".encode()).hexdigest(),
-            "uri": MEDIA_PATH_FMT.format(asset_id=asset_id),
-            "blob": data,
-            "payload": json.dumps(payload),
-        },
+    asset_id = await _insert_local_asset(
+        conn,
+        data=data,
+        # No generation prompt is known for a rehost; key it to the source
+        # URL so identical URLs map to a stable hash.
+        prompt_hash=hashlib.sha256(f"rehost:{source_url}".encode()).hexdigest(),
+        payload=payload,
     )
-    # A concurrent writer may have won the ON CONFLICT race — re-select.
-    row = (
-        await conn.execute(
-            text("SELECT id::text AS id FROM media_assets WHERE content_hash = :ch"),
-            {"ch": content_hash},
-        )
-    ).mappings().first()
-    return row["id"] if row else asset_id
+    await _upsert_derivatives(conn, asset_id=asset_id, data=data, source_url=source_url)
+    return asset_id
 
 
 async def _rewrite_character(
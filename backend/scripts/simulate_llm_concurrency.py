@@ -0,0 +1,312 @@
+"""Replay LLM call traces against a fake provider: fixed vs adaptive admission.
+
+Offline harness for sizing ``llm.max_concurrency`` and the
+``llm.adaptive_concurrency`` knobs (``app/services/llm_adaptive_concurrency``)
+without spending a cent. Each trace record is one structured call:
+
+    {"at_s": 0.12, "model": "gpt-4o-mini", "tool": "decide_next_step",
+     "prompt_tokens": 900, "max_output_tokens": 200}
+
+(``at_s`` is the offset from the start of the trace; recorded traces come
+from the ``llm.raw_response.received`` / cost-meter logs.) Without
+``--trace`` a synthetic quiz mix is generated: many small
+``decide_next_step`` / question calls plus occasional multi-thousand-token
+``write_final_user_profile`` calls.
+
+The fake provider models a per-model token-throughput ceiling:
+
+* a request is rejected with a 429 when admitting it would push the
+  model's in-flight tokens past ``capacity_tokens``;
+* latency is ``base_s + s_per_ktok × tokens/1000``, inflated as in-flight
+  load approaches capacity.
+
+Both policies retry a 429 with capped exponential backoff (like
+``retry_async``). The fixed policy is the old call-count semaphore;
+the adaptive policy wraps each attempt in ``AdaptiveTokenLimiter.admit``.
+Time is compressed by ``--time-scale`` so a minute of traffic replays in
+about a second.
+
+Usage:
+
+    python -m scripts.simulate_llm_concurrency --calls 400 --fixed 16
+    python -m scripts.simulate_llm_concurrency --trace calls.jsonl --json
+
+``tok/s`` is goodput (tokens of calls that eventually succeeded per trace
+second): a policy that drops expensive calls can finish sooner without
+doing more work, so compare goodput and failures, not just makespan.
+
+Exit code 0 always (this is a report, not a gate).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.llm_adaptive_concurrency import AdaptiveTokenLimiter
+
+
+@dataclass(frozen=True)
+class TraceCall:
+    at_s: float
+    model: str
+    tool: str
+    prompt_tokens: int
+    max_output_tokens: int
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.max_output_tokens
+
+
+class ProviderRateLimited(Exception):
+    """Fake 429 (duck-types LiteLLM's ``RateLimitError``)."""
+
+    status_code = 429
+
+
+@dataclass
+class FakeProvider:
+    """Token-throughput-limited fake model endpoint(s)."""
+
+    capacity_tokens: int = 40_000
+    base_s: float = 0.4
+    s_per_ktok: float = 0.6
+    # Latency multiplier at full load (1.0 → no queueing inflation).
+    saturation_slowdown: float = 2.0
+    time_scale: float = 0.02
+    _in_flight: dict[str, int] = field(default_factory=dict)
+    rate_limited: int = 0
+
+    async def call(self, model: str, tokens: int) -> None:
+        used = self._in_flight.get(model, 0)
+        if used > 0 and used + tokens > self.capacity_tokens:
+            self.rate_limited += 1
+            await asyncio.sleep(0.02 * self.time_scale)
+            raise ProviderRateLimited(f"429 {model}: {used}+{tokens} tokens in flight")
+        self._in_flight[model] = used + tokens
+        try:
+            load = min(1.0, self._in_flight[model] / self.capacity_tokens)
+            latency = (self.base_s + self.s_per_ktok * tokens / 1000.0) * (
+                1.0 + (self.saturation_slowdown - 1.0) * load * load
+            )
+            await asyncio.sleep(latency * self.time_scale)
+        finally:
+            self._in_flight[model] -= tokens
+
+
+@dataclass
+class SimReport:
+    policy: str
+    calls: int
+    completed: int
+    failed: int
+    provider_429s: int
+    p50_s: float
+    p95_s: float
+    makespan_s: float
+    goodput_tok_s: float
+    adaptive: dict[str, Any] | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if v is not None}
+
+
+def synthetic_trace(
+    *,
+    calls: int = 400,
+    seed: int = 7,
+    rate_per_s: float = 4.0,
+    model: str = "gpt-4o-mini",
+) -> list[TraceCall]:
+    """A bursty quiz-shaped mix: ~85 % small calls, ~15 % large profile writes."""
+    rng = random.Random(seed)
+    t = 0.0
+    out: list[TraceCall] = []
+    for _ in range(calls):
+        t += rng.expovariate(rate_per_s)
+        if rng.random() < 0.15:
+            out.append(TraceCall(t, model, "write_final_user_profile", 2_500, 3_000))
+        else:
+            tool = rng.choice(("decide_next_step", "generate_next_question"))
+            out.append(TraceCall(t, model, tool, rng.randint(600, 1_500), 200))
+    return out
+
+
+def load_trace(path: str) -> list[TraceCall]:
+    out: list[TraceCall] = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            out.append(
+                TraceCall(
+                    at_s=float(rec["at_s"]),
+                    model=str(rec.get("model") or "default"),
+                    tool=str(rec.get("tool") or "unknown"),
+                    prompt_tokens=int(rec.get("prompt_tokens") or 0),
+                    max_output_tokens=int(rec.get("max_output_tokens") or 0),
+                )
+            )
+    out.sort(key=lambda c: c.at_s)
+    return out
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _with_retries(attempt, *, max_attempts: int, base_s: float, cap_s: float) -> bool:
+    for n in range(1, max_attempts + 1):
+        try:
+            await attempt()
+            return True
+        except ProviderRateLimited:
+            if n == max_attempts:
+                return False
+            await asyncio.sleep(min(cap_s, base_s * 2 ** (n - 1)))
+    return False
+
+
+async def replay(
+    trace: list[TraceCall],
+    *,
+    policy: str,
+    provider: FakeProvider,
+    fixed_capacity: int = 16,
+    adaptive: AdaptiveTokenLimiter | None = None,
+    max_attempts: int = 3,
+) -> SimReport:
+    """Replay ``trace`` under ``policy`` ("fixed" | "adaptive")."""
+    scale = provider.time_scale
+    sem = asyncio.Semaphore(fixed_capacity)
+    if policy == "adaptive" and adaptive is None:
+        adaptive = AdaptiveTokenLimiter(cooldown_s=2.0 * scale, acquire_timeout_s=0)
+    latencies: list[float] = []
+    outcomes: list[bool] = []
+    done_tokens = 0
+    start = time.perf_counter()
+
+    async def one(call: TraceCall) -> None:
+        nonlocal done_tokens
+        await asyncio.sleep(max(0.0, call.at_s * scale - (time.perf_counter() - start)))
+        t0 = time.perf_counter()
+
+        async def attempt() -> None:
+            if policy == "adaptive":
+                assert adaptive is not None
+                async with adaptive.admit(call.model, call.tokens, tool=call.tool):
+                    await provider.call(call.model, call.tokens)
+            else:
+                await provider.call(call.model, call.tokens)
+
+        async with sem:
+            ok = await _with_retries(
+                attempt, max_attempts=max_attempts, base_s=0.2 * scale, cap_s=2.0 * scale
+            )
+        outcomes.append(ok)
+        done_tokens += call.tokens if ok else 0
+        latencies.append((time.perf_counter() - t0) / scale)
+
+    await asyncio.gather(*(one(c) for c in trace))
+    makespan_s = (time.perf_counter() - start) / scale
+    return SimReport(
+        policy=policy,
+        calls=len(trace),
+        completed=sum(outcomes),
+        failed=len(outcomes) - sum(outcomes),
+        provider_429s=provider.rate_limited,
+        p50_s=round(_percentile(latencies, 0.50), 3),
+        p95_s=round(_percentile(latencies, 0.95), 3),
+        makespan_s=round(makespan_s, 3),
+        goodput_tok_s=round(done_tokens / makespan_s, 1) if makespan_s else 0.0,
+        adaptive=adaptive.metrics() if policy == "adaptive" and adaptive else None,
+    )
+
+
+async def compare(
+    trace: list[TraceCall],
+    *,
+    fixed_capacity: int = 16,
+    provider_kwargs: dict[str, Any] | None = None,
+) -> dict[str, SimReport]:
+    """Run both policies against fresh, identical fake providers."""
+    kwargs = provider_kwargs or {}
+    fixed = await replay(
+        trace, policy="fixed", provider=FakeProvider(**kwargs), fixed_capacity=fixed_capacity
+    )
+    adaptive = await replay(
+        trace, policy="adaptive", provider=FakeProvider(**kwargs), fixed_capacity=fixed_capacity
+    )
+    return {"fixed": fixed, "adaptive": adaptive}
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--trace", help="JSONL trace (default: synthetic quiz mix)")
+    p.add_argument("--calls", type=int, default=400, help="synthetic trace length")
+    p.add_argument("--rate", type=float, default=4.0, help="synthetic arrivals per second")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--fixed", type=int, default=16, help="fixed call-count capacity")
+    p.add_argument("--capacity-tokens", type=int, default=40_000, help="fake provider ceiling")
+    p.add_argument("--time-scale", type=float, default=0.02, help="wall seconds per trace second")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import structlog
+
+    args = _parse_args(argv)
+    trace = (
+        load_trace(args.trace)
+        if args.trace
+        else synthetic_trace(calls=args.calls, seed=args.seed, rate_per_s=args.rate)
+    )
+    # Keep stdout parseable: controller logs go to stderr for the run only.
+    saved = structlog.get_config()
+    structlog.configure(
+        logger_factory=structlog.PrintLoggerFactory(sys.stderr),
+        cache_logger_on_first_use=False,
+    )
+    try:
+        reports = asyncio.run(
+            compare(
+                trace,
+                fixed_capacity=args.fixed,
+                provider_kwargs={
+                    "capacity_tokens": args.capacity_tokens,
+                    "time_scale": args.time_scale,
+                },
+            )
+        )
+    finally:
+        structlog.configure(**saved)
+    if args.json:
+        print(json.dumps({k: r.as_dict() for k, r in reports.items()}, indent=2))
+        return 0
+    print(
+        f"{'policy':<10}{'done':>6}{'fail':>6}{'429s':>7}{'p50 s':>8}{'p95 s':>8}"
+        f"{'span s':>8}{'tok/s':>9}"
+    )
+    for r in reports.values():
+        print(
+            f"{r.policy:<10}{r.completed:>6}{r.failed:>6}{r.provider_429s:>7}"
+            f"{r.p50_s:>8.2f}{r.p95_s:>8.2f}{r.makespan_s:>8.2f}{r.goodput_tok_s:>9.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
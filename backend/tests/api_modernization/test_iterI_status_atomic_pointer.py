@@ -62,6 +62,12 @@ class _StubCache:
         merged = {**self._state, **new_data}
         return AgentGraphStateModel.model_validate(merged)
 
+    async def patch_quiz_state(self, _qid, fields, ttl_seconds=3600):
+        # Field-level merge without the post-merge fetch — same atomic
+        # contract as update_quiz_state_atomically for this test's purposes.
+        self.update_called_with.append(dict(fields))
+        return True
+
 
 @pytest.fixture()
 def status_app(monkeypatch) -> tuple[FastAPI, _StubCache, uuid.UUID]:
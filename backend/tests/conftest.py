@@ -53,6 +53,17 @@ def _disable_fal_image_gen(monkeypatch):
         pass
     yield
 
+
+# The /topics/suggest prefix index is a per-process snapshot; tests seed
+# their own topics, so each one starts from an unbuilt index.
+@pytest.fixture(autouse=True)
+def _reset_topic_suggest_index():
+    from app.services.precompute.topic_suggest_index import reset_topic_suggest_index
+
+    reset_topic_suggest_index()
+    yield
+    reset_topic_suggest_index()
+
 def pytest_addoption(parser):
     parser.addoption(
         "--live-tools",
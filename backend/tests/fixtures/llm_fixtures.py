@@ -330,3 +330,32 @@ def _litellm_bg_off():
         # Older liteLLM versions may not have this; ignore.
         pass
     yield
+
+
+@pytest.fixture
+def litellm_aresponses_via_sync_stub(monkeypatch: pytest.MonkeyPatch):
+    """
+    Opt-in: route the native-async transport (``litellm.aresponses``) through
+    whatever ``litellm.responses`` is at call time.
+
+    For service tests that stub the blocking ``litellm.responses``: the same
+    stubs then drive the default async path without touching the network.
+    The pooled ``client`` must still arrive (asserted); it is dropped only
+    because a blocking stub cannot use an async handler. Tests of the
+    transport itself patch ``litellm.aresponses`` or mock its HTTP layer.
+    """
+
+    async def _aresponses(**kwargs: Any):
+        client = kwargs.pop("client", None)
+        assert client is not None, "native transport call without the pooled client"
+        result = litellm.responses(**kwargs)
+        if not kwargs.get("stream"):
+            return result
+
+        async def _events():
+            for event in result:
+                yield event
+
+        return _events()
+
+    monkeypatch.setattr(litellm, "aresponses", _aresponses, raising=True)
@@ -0,0 +1,47 @@
+"""`AzureBlobProvider` over the real Azure SDK against the Azurite-compatible stub."""
+
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from app.services.precompute.storage import AzureBlobProvider, BlobUpload
+from scripts._azurite_stub import AZURITE_CREDENTIAL, AzuriteStub
+
+pytest.importorskip("azure.storage.blob.aio")
+
+pytestmark = pytest.mark.anyio
+
+
+def _items(n: int) -> list[BlobUpload]:
+    out = []
+    for i in range(n):
+        data = f"image-{i}".encode() * 100
+        out.append(BlobUpload(hashlib.sha256(data).hexdigest(), data, "image/webp"))
+    return out
+
+
+async def test_upload_many_reuses_connections_and_skips_existing(tmp_path):
+    items = _items(24)
+    async with AzuriteStub() as stub:
+        p = AzureBlobProvider(base_url=stub.base_url, container="media", credential=AZURITE_CREDENTIAL)
+
+        first = await p.upload_many(items, concurrency=4, manifest=tmp_path / "m.jsonl")
+        assert first.uploaded == 24 and first.failed == {}
+        assert stub.connections <= 4
+        assert stub.blobs[("media", items[0].content_hash)] == (items[0].data, "image/webp")
+        assert first.uris[items[0].content_hash] == f"{stub.base_url}/media/{items[0].content_hash}"
+
+        puts = stub.requests["put"]
+        again = await p.upload_many(items + _items(26)[24:], concurrency=4)
+        assert (again.existing, again.uploaded) == (24, 2)
+        assert stub.requests["put"] == puts + 2  # existing bytes never re-sent
+
+
+async def test_single_upload_is_idempotent_over_the_wire():
+    async with AzuriteStub() as stub:
+        p = AzureBlobProvider(base_url=stub.base_url, container="media", credential=AZURITE_CREDENTIAL)
+        uri = await p.upload(content_hash="k", data=b"one", content_type="image/png")
+        assert await p.upload(content_hash="k", data=b"two", content_type="image/png") == uri
+        assert stub.blobs[("media", "k")] == (b"one", "image/png")
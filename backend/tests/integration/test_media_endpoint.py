@@ -4,6 +4,10 @@ ACs covered:
 - `AC-PRECOMP-IMG-3` / `AC-PRECOMP-PERF-4` — immutable cache + strong ETag.
 - `AC-PRECOMP-IMG-3` — `If-None-Match` returns `304 Not Modified`.
 - 404 when asset missing or has no `bytes_blob` (provider=fal).
+- Bytes are served from the content-addressed disk cache after the first
+  hit, with `Range` support; a row whose blob doesn't match its hash is
+  served from memory and never cached; a file evicted before the response
+  opens it is served from the DB blob.
 """
 
 from __future__ import annotations
@@ -15,10 +19,19 @@ import pytest
 
 from app.main import API_PREFIX
 from app.models.db import MediaAsset
+from app.services.media import disk_cache
 
 API = API_PREFIX.rstrip("/")
 
 
+@pytest.fixture(autouse=True)
+def _media_cache(tmp_path, monkeypatch):
+    cache = disk_cache.MediaDiskCache(tmp_path / "media", max_bytes=1 << 20)
+    monkeypatch.setattr(disk_cache, "_cache", cache)
+    monkeypatch.setattr(disk_cache, "_built", True)
+    return cache
+
+
 async def _insert_asset(
     sqlite_db_session,
     *,
@@ -137,3 +150,139 @@ async def test_default_content_type_png(async_client, sqlite_db_session):
     resp = await async_client.get(f"{API}/media/{asset.id}")
     assert resp.status_code == 200
     assert resp.headers["content-type"].startswith("image/png")
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_second_hit_served_from_disk_cache(async_client, sqlite_db_session, _media_cache):
+    data = b"disk-cached-bytes" * 64
+    asset = await _insert_asset(sqlite_db_session, data=data)
+
+    first = await async_client.get(f"{API}/media/{asset.id}")
+    second = await async_client.get(f"{API}/media/{asset.id}")
+
+    assert first.content == second.content == data
+    assert _media_cache.stats()["fills"] == 1
+    assert _media_cache.stats()["hits"] == 1
+    assert _media_cache.path_for(asset.content_hash).read_bytes() == data
+    assert second.headers["etag"] == f'"{asset.content_hash}"'
+    assert "immutable" in second.headers["cache-control"]
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_file_evicted_before_send_falls_back_to_db_blob(
+    async_client, sqlite_db_session, _media_cache, monkeypatch
+):
+    data = b"evicted-bytes" * 64
+    asset = await _insert_asset(sqlite_db_session, data=data)
+    assert (await async_client.get(f"{API}/media/{asset.id}")).content == data
+    real_lookup = _media_cache.lookup
+
+    async def _lookup_then_evicted(content_hash):
+        hit = await real_lookup(content_hash)
+        hit[0].unlink()  # another worker's eviction, between lookup and send
+        return hit
+
+    monkeypatch.setattr(_media_cache, "lookup", _lookup_then_evicted)
+    resp = await async_client.get(f"{API}/media/{asset.id}")
+
+    assert resp.status_code == 200
+    assert resp.content == data
+    assert resp.headers["etag"] == f'"{asset.content_hash}"'
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_range_request_returns_partial_content(async_client, sqlite_db_session):
+    data = bytes(range(256)) * 4
+    asset = await _insert_asset(sqlite_db_session, data=data)
+
+    resp = await async_client.get(
+        f"{API}/media/{asset.id}", headers={"Range": "bytes=10-19"}
+    )
+    assert resp.status_code == 206
+    assert resp.content == data[10:20]
+    assert resp.headers["content-range"] == f"bytes 10-19/{len(data)}"
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_hash_mismatch_is_served_but_not_cached(
+    async_client, sqlite_db_session, _media_cache
+):
+    asset = await _insert_asset(sqlite_db_session, data=b"original")
+    asset.bytes_blob = b"tampered"
+    sqlite_db_session.add(asset)
+    await sqlite_db_session.commit()
+
+    resp = await async_client.get(f"{API}/media/{asset.id}")
+    assert resp.status_code == 200
+    assert resp.content == b"tampered"
+    assert _media_cache.stats()["fills"] == 0
+    assert not _media_cache.path_for(asset.content_hash).exists()
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_serves_from_memory_when_cache_disabled(
+    async_client, sqlite_db_session, monkeypatch
+):
+    monkeypatch.setattr(disk_cache, "_cache", None)
+    data = b"no-cache-bytes"
+    asset = await _insert_asset(sqlite_db_session, data=data)
+
+    resp = await async_client.get(f"{API}/media/{asset.id}")
+    assert resp.status_code == 200
+    assert resp.content == data
+
+
+async def _insert_with_derivatives(sqlite_db_session):
+    """An original plus 128-px AVIF/WebP variants listed in its manifest."""
+    original = await _insert_asset(sqlite_db_session, data=b"full-size-png" * 100)
+    manifest = []
+    for ctype, data in (("image/avif", b"avif-128"), ("image/webp", b"webp-128-bytes")):
+        variant = await _insert_asset(sqlite_db_session, data=data, content_type=ctype)
+        manifest.append({
+            "id": str(variant.id), "content_hash": variant.content_hash,
+            "width": 128, "content_type": ctype, "bytes": len(data),
+        })
+    original.prompt_payload = {"derivatives": manifest}
+    sqlite_db_session.add(original)
+    await sqlite_db_session.commit()
+    return original, manifest
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_width_param_serves_accepted_derivative(async_client, sqlite_db_session):
+    original, (avif, webp) = await _insert_with_derivatives(sqlite_db_session)
+    url = f"{API}/media/{original.id}"
+
+    resp = await async_client.get(url, params={"w": 56}, headers={"Accept": "image/avif,image/webp,*/*"})
+    assert resp.content == b"avif-128"
+    assert resp.headers["content-type"].startswith("image/avif")
+    assert resp.headers["etag"] == f'"{avif["content_hash"]}"'
+    assert "Accept" in resp.headers["vary"]
+
+    resp = await async_client.get(url, params={"w": 56}, headers={"Accept": "image/webp,*/*"})
+    assert resp.content == b"webp-128-bytes"
+
+    # Not accepted, or wider than every variant → the original.
+    for params, accept in (({"w": 56}, "*/*"), ({"w": 512}, "image/avif")):
+        resp = await async_client.get(url, params=params, headers={"Accept": accept})
+        assert resp.content == b"full-size-png" * 100
+
+    resp = await async_client.get(
+        url, params={"w": 56},
+        headers={"Accept": "image/avif", "If-None-Match": f'"{avif["content_hash"]}"'},
+    )
+    assert resp.status_code == 304
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_width_param_is_bounded(async_client, sqlite_db_session):
+    asset = await _insert_asset(sqlite_db_session, data=b"png")
+    resp = await async_client.get(f"{API}/media/{asset.id}", params={"w": 0})
+    assert resp.status_code == 422
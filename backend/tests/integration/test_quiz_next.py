@@ -138,3 +138,47 @@ async def test_next_400_when_index_out_of_range(client, fake_redis):
     resp = await client.post(f"{api}/quiz/next", json=payload)
     assert resp.status_code == 400
     assert "out of range" in resp.text.lower()
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("use_fake_agent_graph", "override_redis_dep", "override_db_dependency")
+async def test_next_serves_a_speculative_branch_without_the_agent(
+    client,
+    fake_redis,
+    fake_cache_store,
+    capture_background_tasks,
+    monkeypatch,
+):
+    """A prepared branch for the recorded answer lands in the same write and
+    replaces the agent run; the next speculation round is queued instead."""
+    import fakeredis.aioredis as fa
+
+    from app.api.endpoints import quiz as quiz_mod
+    from app.services.speculative_questions import QuestionSpeculator
+
+    async def step(state):
+        answer = state["quiz_history"][-1]
+        return {"question_text": f"After {answer['answer_text']}?", "options": [{"text": "a"}, {"text": "b"}]}, 0.55
+
+    spec_redis = fa.FakeRedis(decode_responses=True)
+    spec = QuestionSpeculator(redis_factory=lambda: spec_redis, step_fn=step)
+    monkeypatch.setattr(quiz_mod, "get_question_speculator", lambda: spec)
+
+    api = API_PREFIX.rstrip("/")
+    quiz_id = uuid.uuid4()
+    state = make_questions_state(quiz_id=quiz_id, baseline_count=2, answers=[0])
+    seed_quiz_state(fake_redis, quiz_id, state)
+    assert await spec.launch(state) == 2  # options 0 and 1 (no cast to rank by)
+    for task in [t for group in spec._inflight.values() for t in group.values()]:
+        await task
+
+    q = state["generated_questions"][1]
+    display = quiz_mod._display_option_order(2, q["question_text"], len(q["options"])).index(1)
+    resp = await client.post(f"{api}/quiz/next", json=next_question_payload(quiz_id, index=1, option_idx=display))
+    assert resp.status_code == 202
+
+    cached = json.loads(fake_cache_store.get(f"quiz_session:{quiz_id}"))
+    assert cached["generated_questions"][-1]["question_text"] == f"After {q['options'][1]['text']}?"
+    assert cached["current_confidence"] == 0.55
+    assert [func for func, _, _ in capture_background_tasks] == [quiz_mod._after_speculative_hit]
+    assert spec.metrics()["hits"] == 1
@@ -0,0 +1,132 @@
+"""/quiz/next admission in two Lua round trips (`quiz_admission.py`).
+
+- A patch-mode session is locked, capped, budget-checked, read, merged and
+  unlocked in exactly two EVALs.
+- Busy / action-capped / over-budget sessions are refused from the script
+  (the lock is never leaked); legacy-blob sessions and script faults take the
+  sequential path.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import fakeredis.aioredis as fa
+import pytest
+
+from app.api.dependencies import get_redis_client
+from app.core.config import settings
+from app.main import API_PREFIX
+from app.services import cost_meter, quiz_admission
+from app.services.redis_cache import CacheRepository
+from scripts.benchmark_next_admission import count_round_trips
+from tests.helpers.sample_payloads import next_question_payload
+from tests.helpers.state_builders import make_questions_state
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.usefixtures("use_fake_agent_graph", "override_db_dependency"),
+]
+
+API = API_PREFIX.rstrip("/")
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    from app.main import app as fastapi_app
+
+    r = fa.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(settings.quiz, "session_state_patch_mode", True, raising=False)
+    monkeypatch.setattr(settings.quiz, "next_admission_script", True, raising=False)
+
+    async def _dep():
+        return r
+
+    fastapi_app.dependency_overrides[get_redis_client] = _dep
+    yield r
+    fastapi_app.dependency_overrides.pop(get_redis_client, None)
+
+
+async def _seed(redis, *, patch_mode: bool = True) -> uuid.UUID:
+    quiz_id = uuid.uuid4()
+    state = make_questions_state(
+        quiz_id=quiz_id, category="History", questions=["Q1", "Q2", "Q3"], baseline_count=3, answers=[]
+    )
+    await CacheRepository(redis, patch_mode=patch_mode).save_quiz_state(state)
+    return quiz_id
+
+
+async def _answer(client, quiz_id, index=0):
+    return await client.post(f"{API}/quiz/next", json=next_question_payload(quiz_id, index=index, option_idx=1))
+
+
+async def test_scripted_admission_records_answer_in_two_round_trips(client, redis, monkeypatch):
+    quiz_id, legacy_id = await _seed(redis), await _seed(redis)
+    with count_round_trips() as trips:
+        resp = await _answer(client, quiz_id)
+        scripted = list(trips.commands)
+        trips.reset()
+        monkeypatch.setattr(settings.quiz, "next_admission_script", False, raising=False)
+        assert (await _answer(client, legacy_id)).status_code == 202
+        sequential = list(trips.commands)
+    assert resp.status_code == 202, resp.text
+    # Rate-limit EVAL + admission EVAL + commit EVAL.
+    assert scripted == ["EVAL", "EVAL", "EVAL"]
+    assert len(sequential) >= len(scripted) + 4, sequential
+
+    state = await CacheRepository(redis).get_quiz_state(quiz_id)
+    assert [h.option_index for h in state.quiz_history] == [1]
+    # The answer lives in quiz_history only, not echoed into the transcript.
+    assert not any("Answer to" in str(m.get("content")) for m in state.messages)
+    assert await redis.get(f"quiz_actions:{quiz_id}") == "1"
+    assert await redis.exists(f"qlock:{quiz_id}") == 0
+
+
+async def test_busy_session_is_refused(client, redis):
+    quiz_id = await _seed(redis)
+    await redis.set(f"qlock:{quiz_id}", "someone-else", ex=10)
+    resp = await _answer(client, quiz_id)
+    assert resp.status_code == 409, resp.text
+    assert await redis.get(f"qlock:{quiz_id}") == "someone-else"
+    assert await redis.get(f"quiz_actions:{quiz_id}") is None
+
+
+async def test_caps_are_enforced_in_the_script_and_release_the_lock(client, redis, monkeypatch):
+    quiz_id = await _seed(redis)
+    await redis.set(f"quiz_actions:{quiz_id}", "999")
+    resp = await _answer(client, quiz_id)
+    assert resp.status_code == 429, resp.text
+    assert await redis.exists(f"qlock:{quiz_id}") == 0
+
+    guard = settings.security.live_cost_guard
+    monkeypatch.setattr(guard, "enabled", True, raising=False)
+    monkeypatch.setattr(guard, "daily_budget_usd", 1.0, raising=False)
+    await redis.delete(f"quiz_actions:{quiz_id}")
+    await redis.set(cost_meter.daily_cents_key(), "100")
+    resp = await _answer(client, quiz_id)
+    assert resp.status_code == 503, resp.text
+    assert await redis.exists(f"qlock:{quiz_id}") == 0
+
+
+async def test_legacy_blob_session_takes_the_sequential_path(client, redis):
+    quiz_id = await _seed(redis, patch_mode=False)
+    resp = await _answer(client, quiz_id)
+    assert resp.status_code == 202, resp.text
+    state = await CacheRepository(redis).get_quiz_state(quiz_id)
+    assert len(state.quiz_history) == 1
+    assert await redis.get(f"quiz_actions:{quiz_id}") == "1"
+    assert await redis.exists(f"qlock:{quiz_id}") == 0
+
+
+async def test_script_fault_falls_back_to_sequential_path(client, redis, monkeypatch):
+    quiz_id = await _seed(redis)
+
+    async def _boom(*_a, **_kw):
+        raise ConnectionError("NOSCRIPT")
+
+    monkeypatch.setattr(quiz_admission, "admit_next", _boom)
+    resp = await _answer(client, quiz_id)
+    assert resp.status_code == 202, resp.text
+    state = await CacheRepository(redis).get_quiz_state(quiz_id)
+    assert len(state.quiz_history) == 1
+    assert await redis.exists(f"qlock:{quiz_id}") == 0
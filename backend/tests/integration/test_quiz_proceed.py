@@ -63,6 +63,33 @@ async def test_proceed_marks_ready_and_schedules_background(
     assert task_state["ready_for_questions"] is True
     assert str(task_state["session_id"]) == str(quiz_id)
 
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("use_fake_agent_graph", "override_redis_dep", "override_db_dependency")
+async def test_proceed_enqueues_for_worker_pool_when_queue_enabled(
+    client, fake_redis, capture_background_tasks, monkeypatch
+):
+    """With ``agent.queue`` on the API only enqueues; no in-process agent run."""
+    from app.api.endpoints import quiz as quiz_mod
+
+    queued: list = []
+
+    class _Queue:
+        async def enqueue(self, quiz_id, *, reason, attempt=1):
+            queued.append((quiz_id, reason))
+            return "1-0"
+
+    monkeypatch.setattr(quiz_mod, "get_agent_queue", lambda _client: _Queue())
+    api = API_PREFIX.rstrip("/")
+    quiz_id = uuid.uuid4()
+    seed_quiz_state(fake_redis, quiz_id, make_synopsis_state(quiz_id=quiz_id, category="Dogs"))
+
+    resp = await client.post(f"{api}/quiz/proceed", json=proceed_payload(quiz_id))
+    assert resp.status_code == 202, resp.text
+    assert queued == [(quiz_id, "proceed")]
+    assert capture_background_tasks == []
+
+
 @pytest.mark.anyio
 @pytest.mark.usefixtures("override_redis_dep")
 async def test_proceed_404_when_session_missing(client):
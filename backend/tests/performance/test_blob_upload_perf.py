@@ -0,0 +1,33 @@
+"""`AzureBlobProvider` bulk uploads — client-per-upload vs pooled `upload_many`.
+
+Runs ``scripts/benchmark_blob_upload`` against the in-process Azurite stub
+with a simulated round trip. The pooled path must hold a handful of
+connections instead of one per blob and keep several uploads on the wire
+at once, where the per-call loop sends one at a time. Throughput is left
+to the benchmark script; it is too noisy on shared runners to assert on.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import benchmark_blob_upload as bench
+
+pytest.importorskip("azure.storage.blob.aio")
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_upload_many_pools_connections_and_overlaps_uploads():
+    reports = await bench.benchmark(
+        files=60, size_kb=16, latency_ms=10.0, concurrency=8,
+        modes=("per_call", "upload_many", "rerun_existing"),
+    )
+    by_mode = {r.mode: r for r in reports}
+    per_call, pooled, rerun = by_mode["per_call"], by_mode["upload_many"], by_mode["rerun_existing"]
+
+    assert per_call.connections == 60
+    assert pooled.connections <= 8
+    assert per_call.peak_in_flight == 1
+    assert 1 < pooled.peak_in_flight <= 8, [r.as_dict() for r in reports]
+    assert rerun.bytes_sent == 0
@@ -0,0 +1,19 @@
+"""Canonical-set loading — prebuilt artifact vs in-process compile.
+
+Runs ``scripts/benchmark_canonical_index`` in-process. The compile merges
+the code catalog with the YAML overlay and builds the alias index (~100 ms);
+the artifact path is a fingerprint check plus one mapped ``marshal.loads``.
+Bounds are loose because CI runners vary; the speedup is the guard.
+"""
+
+from __future__ import annotations
+
+from scripts import benchmark_canonical_index as bench
+
+
+def test_artifact_load_beats_compile():
+    r = bench.run(runs=2, fresh=False)
+
+    assert r.artifact_bytes < 1_000_000
+    assert r.artifact_ms_p50 < 50, r.as_dict()
+    assert r.speedup > 5, r.as_dict()
@@ -0,0 +1,26 @@
+"""Q&A image build path — micro-batched embeds vs one inference per string.
+
+Runs ``scripts/benchmark_embed_batcher`` (relevance gate over every question,
+then the icon binder walk) against the synthetic fixed-plus-linear-cost
+model. Batching must cut inferences by an order of magnitude and raise
+string throughput; bounds are loose because CI runners vary.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import benchmark_embed_batcher as bench
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batched_build_path_beats_per_string_inference():
+    reports = await bench.benchmark(questions=10, options=4)
+    by_mode = {r.mode: r for r in reports}
+    unbatched, batched = by_mode["unbatched"], by_mode["batched"]
+
+    assert unbatched.strings == batched.strings > 0
+    assert unbatched.inferences == unbatched.strings
+    assert batched.inferences * 5 < unbatched.inferences
+    assert batched.strings_per_s > 1.5 * unbatched.strings_per_s, [r.as_dict() for r in reports]
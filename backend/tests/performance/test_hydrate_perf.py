@@ -0,0 +1,46 @@
+"""Cold-cache pack hydration: legacy serial SELECT walk vs the joined hydrator.
+
+Uses ``scripts/benchmark_hydrate``'s seed and legacy walk. Every SELECT is a
+network round trip in production, so the gate is the statement count: six
+serial SELECTs before, three on the portable path here (one on Postgres via
+`_HYDRATE_SQL`). Wall-clock latency and decode timings are left to the
+benchmark script; they are too noisy on shared runners to assert on.
+
+The compact cached form must be smaller than the legacy JSON object and
+decode back to the same `HydratedPack`.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.precompute.cache import (
+    _hydrated_pack_from_bytes,
+    _hydrated_pack_to_bytes,
+)
+from app.services.precompute.hydrator import hydrate_pack
+from scripts import benchmark_hydrate as bench
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cold_hydrate_needs_fewer_round_trips(sqlite_db_session):
+    db = sqlite_db_session
+    pack_id = await bench.seed(db)
+
+    with bench.SelectCounter(db.get_bind()) as counter:
+        legacy_rt = await counter.count(lambda: bench.legacy_hydrate(db, pack_id))
+        new_rt = await counter.count(lambda: hydrate_pack(db, pack_id=pack_id))
+
+    assert (legacy_rt, new_rt) == (6, 3)
+
+
+async def test_compact_cached_form_is_smaller_and_round_trips(sqlite_db_session):
+    db = sqlite_db_session
+    hydrated = await hydrate_pack(db, pack_id=await bench.seed(db))
+    assert hydrated is not None and len(hydrated.characters) == bench.CHARACTERS
+    assert len(hydrated.baseline_questions) == bench.QUESTIONS
+
+    compact = _hydrated_pack_to_bytes(hydrated)
+    assert len(compact) < len(bench.legacy_blob(hydrated).encode())
+    assert _hydrated_pack_from_bytes(compact) == hydrated
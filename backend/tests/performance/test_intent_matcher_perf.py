@@ -0,0 +1,19 @@
+"""Intent keyword scoring — compiled matcher vs the per-token loop.
+
+Runs ``scripts/benchmark_intent_matcher`` over the ``eval_resolution``
+acceptance topics. Every text must score identically; the compiled matcher
+scans the text once instead of substring-testing every configured token.
+Bounds are loose because CI runners vary; the speedup is the guard.
+"""
+
+from __future__ import annotations
+
+from scripts import benchmark_intent_matcher as bench
+
+
+def test_compiled_matcher_is_identical_and_faster():
+    r = bench.run(rounds=3)
+
+    assert r.texts > 100
+    assert r.mismatches == 0
+    assert r.speedup > 3, r.as_dict()
@@ -0,0 +1,33 @@
+"""Native-async LLM transport vs worker threads, over real HTTP.
+
+Drives real ``litellm`` calls at the local fake provider from
+``scripts/benchmark_llm_transport``. The threaded path can never have more
+calls on the wire than the default executor has threads
+(``min(32, cpu + 4)``); the pooled async path reaches the requested
+concurrency and finishes the same batch faster.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from scripts import benchmark_llm_transport as bench
+
+pytestmark = pytest.mark.anyio
+
+_CONCURRENCY = 40
+
+
+async def test_native_transport_is_not_capped_by_executor_threads():
+    executor_cap = min(32, (os.cpu_count() or 1) + 4)
+    reports = await bench.benchmark(levels=[_CONCURRENCY], calls_per_level=_CONCURRENCY, latency_s=0.15)
+    by_mode = {r.mode: r for r in reports}
+
+    assert all(r.failed == 0 for r in reports)
+    assert by_mode["thread"].provider_peak_in_flight <= executor_cap
+    assert by_mode["native"].provider_peak_in_flight > min(executor_cap, _CONCURRENCY // 2)
+    assert by_mode["native"].calls_per_s > by_mode["thread"].calls_per_s
+    assert by_mode["native"].pool["calls"] == _CONCURRENCY
+    assert by_mode["native"].pool["in_use"] == 0
@@ -0,0 +1,24 @@
+"""`GET /api/media/{id}` — blob-per-request vs the content-addressed disk cache.
+
+Runs ``scripts/benchmark_media_serving`` (one uvicorn subprocess per mode).
+Once warm, the cached path must stop shipping the blob out of the DB. The
+gate is the bytes read from the DB per request; req/s and RSS are left to
+the benchmark script, they are too noisy on shared runners to assert on.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import benchmark_media_serving as bench
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_warm_disk_cache_stops_reading_blobs_from_db():
+    reports = await bench.benchmark(assets=4, size_kb=256, requests=120, concurrency=8)
+    by_mode = {r.mode: r for r in reports}
+    blob, cached = by_mode["blob"], by_mode["disk_cache"]
+
+    assert blob.db_bytes_per_request == 256 * 1024
+    assert cached.db_bytes_per_request == 0, [r.as_dict() for r in reports]
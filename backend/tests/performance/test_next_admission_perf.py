@@ -0,0 +1,26 @@
+"""/quiz/next admission: sequential Redis calls vs the two-EVAL Lua path.
+
+Runs ``scripts/benchmark_next_admission`` (the real handler on fakeredis)
+with a simulated per-round-trip latency. The scripted path must make
+exactly two round trips per answer and, with RTT dominating, beat the
+sequential path's p99. fakeredis runs Lua through lupa, so absolute
+timings are loose.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts import benchmark_next_admission as bench
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_scripted_admission_cuts_round_trips_and_p99():
+    reports = {r.mode: r for r in await bench.benchmark(requests=40, rtt_s=0.003)}
+    seq, scripted = reports["sequential"], reports["scripted"]
+
+    assert seq.failed == 0 and scripted.failed == 0
+    assert scripted.round_trips_per_request == 2
+    assert seq.round_trips_per_request >= 6
+    assert scripted.p99_ms < seq.p99_ms, (scripted.as_dict(), seq.as_dict())
@@ -0,0 +1,77 @@
+"""Session-state pointer bump: blob WATCH/MULTI path vs field-level patch mode.
+
+Uses ``scripts/benchmark_session_patch``'s mid-quiz state (24 questions, 12
+answers, 40 messages) and counters. The poller's one-field
+``last_served_index`` bump is gated on what does not vary with the runner:
+round trips per bump, full-state re-validations, and which hash fields the
+write touches. Latency is left to the benchmark script; it is too noisy on
+shared runners to assert on.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.services.redis_cache import CacheRepository, _key_session_fields
+from scripts import benchmark_session_patch as bench
+
+try:  # pragma: no cover - platform probe
+    import fakeredis.aioredis as fr
+    import lupa  # noqa: F401
+
+    _LUA_OK = True
+except Exception:  # pragma: no cover
+    _LUA_OK = False
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(not _LUA_OK, reason="fakeredis Lua (lupa) unavailable"),
+]
+
+
+async def _seeded(r, *, patch_mode: bool) -> tuple[CacheRepository, uuid.UUID]:
+    repo = CacheRepository(r, patch_mode=patch_mode)
+    sid = uuid.uuid4()
+    await repo.save_quiz_state(bench.big_state(sid))
+    return repo, sid
+
+
+async def test_patch_bump_is_one_round_trip_without_full_validation():
+    r = fr.FakeRedis(decode_responses=True)
+    blob, blob_sid = await _seeded(r, patch_mode=False)
+    patch, patch_sid = await _seeded(r, patch_mode=True)
+
+    with bench.RoundTripCounter() as trips, bench.FullValidationCounter() as validations:
+        blob_rt = await trips.count(lambda: bench.blob_bump(blob, blob_sid, 1))
+        patch_rt = await trips.count(lambda: bench.patch_bump(patch, patch_sid, 1))
+        blob_val = await validations.count(lambda: bench.blob_bump(blob, blob_sid, 2))
+        patch_val = await validations.count(lambda: bench.patch_bump(patch, patch_sid, 2))
+
+    assert (blob_rt, patch_rt) == (3, 1)
+    assert (blob_val, patch_val) == (2, 0)
+    assert (await patch.get_quiz_state(patch_sid)).last_served_index == 2
+
+
+async def test_patch_bump_writes_only_the_pointer_field():
+    r = fr.FakeRedis(decode_responses=True)
+    patch, sid = await _seeded(r, patch_mode=True)
+    fkey = _key_session_fields(sid)
+    before = await r.hgetall(fkey)
+    evals = []
+    real_eval = r.eval
+
+    async def _eval(script, numkeys, *keys_and_args):
+        evals.append(keys_and_args)
+        return await real_eval(script, numkeys, *keys_and_args)
+
+    r.eval = _eval
+    assert await bench.patch_bump(patch, sid, 7)
+
+    # KEYS[1], ttl, return-state flag, then the field/value pairs it HSETs.
+    assert [args[3:] for args in evals] == [("last_served_index", "7")]
+    after = await r.hgetall(fkey)
+    changed = {k for k in after if after[k] != before.get(k)}
+    assert changed == {"last_served_index"}
+    assert after["last_served_index"] == "7"
@@ -0,0 +1,31 @@
+"""Per-session state size over a full quiz: unbounded vs bounded transcript.
+
+Runs ``scripts/benchmark_state_size`` for a 24-question session. With
+``quiz.transcript`` on, the stored ``messages`` and the checkpoint's message
+channel stay at seed + summary + window however long the quiz runs, and the
+stored state is smaller than the unbounded one.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import settings
+from scripts import benchmark_state_size as bench
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bounded_transcript_keeps_state_and_checkpoint_flat():
+    cfg = settings.quiz.transcript
+    short = {r.mode: r for r in await bench.benchmark(questions=6)}
+    full = {r.mode: r for r in await bench.benchmark(questions=24)}
+    unbounded, bounded = full["unbounded"], full["bounded"]
+
+    assert bounded.stored_messages <= cfg.window + 2
+    assert bounded.checkpoint_messages <= cfg.window + 2
+    assert bounded.checkpoint_messages == short["bounded"].checkpoint_messages
+    # The old path re-appends the stored transcript on every run.
+    assert unbounded.checkpoint_messages > 10 * bounded.checkpoint_messages
+    assert unbounded.stored_messages == 25
+    assert bounded.state_bytes < unbounded.state_bytes
@@ -0,0 +1,142 @@
+"""Quiz status delivery: 1 s-style polling vs the pub/sub long-poll.
+
+Simulates concurrent quizzes end to end against one fakeredis: a fake agent
+waits for each answer, "thinks" for a random delay, then lands the next
+question (and finally the result) through the real
+``_save_final_state_to_cache`` — which publishes ``quiz_status:{id}``. Clients
+either poll ``get_quiz_status`` on a fixed interval or park on
+``wait_for_quiz_status``. We measure requests per completed quiz and the
+delivery latency from the start of the agent's save to the client holding
+the payload.
+
+Time is scaled down (poll interval 200 ms, agent think 50–250 ms) so the
+run stays under a few seconds; the ratios are what the assertions guard.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import uuid
+
+import pytest
+
+from app.api.endpoints import quiz as quiz_mod
+from app.services.quiz_status_notifier import (
+    get_quiz_status_notifier,
+    reset_quiz_status_notifier,
+)
+from app.services.redis_cache import CacheRepository
+
+pytestmark = pytest.mark.anyio
+
+_QUIZZES = 12
+_QUESTIONS = 4
+_POLL_INTERVAL_S = 0.2
+_WAIT_TIMEOUT_S = 5.0
+
+
+class _NoJobDb:
+    """Stands in for the AsyncSession: no durable job rows exist."""
+
+    async def get(self, *_a, **_k):
+        return None
+
+    async def rollback(self):
+        return None
+
+
+def _question(i: int) -> dict:
+    return {"question_text": f"Q{i}?", "options": [{"text": "a"}, {"text": "b"}]}
+
+
+async def _run_quiz(redis, *, long_poll: bool, seed: int) -> tuple[int, list[float]]:
+    rng = random.Random(seed)
+    qid = uuid.uuid4()
+    state = quiz_mod._build_initial_graph_state(qid, str(uuid.uuid4()), "Cats")
+    state["ready_for_questions"] = True
+    repo = CacheRepository(redis)
+    await repo.save_quiz_state(state)
+
+    landed_at: dict[int, float] = {}
+    answered = asyncio.Event()
+
+    async def _agent() -> None:
+        questions: list[dict] = []
+        for step in range(_QUESTIONS + 1):
+            await asyncio.sleep(rng.uniform(0.05, 0.25))
+            if step < _QUESTIONS:
+                questions.append(_question(step))
+                fields = {"generated_questions": list(questions)}
+            else:
+                fields = {"final_result": {"title": "Tabby", "description": "Cozy."}}
+            landed_at[step] = time.perf_counter()
+            await quiz_mod._save_final_state_to_cache(
+                repo, str(qid), {"session_id": qid, **fields}
+            )
+            if step < _QUESTIONS:
+                await answered.wait()
+                answered.clear()
+
+    agent = asyncio.create_task(_agent())
+    db = _NoJobDb()
+    requests = 0
+    latencies: list[float] = []
+    history: list[dict] = []
+    while True:
+        requests += 1
+        if long_poll:
+            resp = await quiz_mod.wait_for_quiz_status(
+                qid, redis, db, len(history), timeout_s=_WAIT_TIMEOUT_S
+            )
+        else:
+            resp = await quiz_mod.get_quiz_status(qid, redis, db, len(history))
+        if resp.status == "processing":
+            if not long_poll:
+                await asyncio.sleep(_POLL_INTERVAL_S)
+            continue
+        step = _QUESTIONS if resp.status == "finished" else len(history)
+        latencies.append(time.perf_counter() - landed_at[step])
+        if resp.status == "finished":
+            break
+        history.append({"question_index": step, "question_text": f"Q{step}?", "answer_text": "a"})
+        await repo.update_quiz_state_atomically(qid, {"quiz_history": list(history)})
+        answered.set()
+    await agent
+    return requests, latencies
+
+
+async def _run_fleet(redis, *, long_poll: bool) -> tuple[float, float]:
+    results = await asyncio.gather(
+        *(_run_quiz(redis, long_poll=long_poll, seed=i) for i in range(_QUIZZES))
+    )
+    per_quiz = sum(r for r, _ in results) / _QUIZZES
+    lat = sorted(x for _, lats in results for x in lats)
+    p95 = lat[int(len(lat) * 0.95) - 1]
+    return per_quiz, p95
+
+
+async def test_long_poll_cuts_requests_and_delivery_latency():
+    import fakeredis.aioredis as fa
+
+    reset_quiz_status_notifier()
+    redis = fa.FakeRedis(decode_responses=True)
+    try:
+        poll_reqs, poll_p95 = await _run_fleet(redis, long_poll=False)
+        lp_reqs, lp_p95 = await _run_fleet(redis, long_poll=True)
+    finally:
+        await get_quiz_status_notifier().aclose()
+        reset_quiz_status_notifier()
+
+    summary = (
+        f"poll: {poll_reqs:.1f} req/quiz p95={poll_p95 * 1000:.0f}ms | "
+        f"long-poll: {lp_reqs:.1f} req/quiz p95={lp_p95 * 1000:.0f}ms"
+    )
+    # One request per delivered payload (+ a rare spurious wake-up) vs a
+    # request per poll tick while the agent thinks.
+    assert lp_reqs <= (_QUESTIONS + 1) * 1.5, summary
+    assert lp_reqs * 1.5 < poll_reqs, summary
+    # Push delivery is bounded by the pub/sub hop, polling by the interval.
+    assert lp_p95 < 0.1, summary
+    assert lp_p95 * 2 < poll_p95, summary
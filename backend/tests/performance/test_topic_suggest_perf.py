@@ -0,0 +1,21 @@
+"""`/topics/suggest` prefix index — lookup latency vs a full scan.
+
+Runs ``scripts/benchmark_topic_suggest`` on a 10k-topic catalogue. The
+legacy query lower-cased and compared every name; the index answers with
+two bisects and a precomputed top-k for short prefixes. Bounds are loose
+because CI runners vary; the speedup assertion is the regression guard.
+"""
+
+from __future__ import annotations
+
+from scripts import benchmark_topic_suggest as bench
+
+
+def test_index_lookup_is_microseconds_and_beats_scan():
+    r = bench.run_size(10_000, queries=200)
+
+    assert r.keys > r.topics  # aliases are indexed too
+    assert r.exact_us_p50 < 200, r
+    assert r.fuzzy_us_p99 < 20_000, r
+    assert r.scan_us_p50 > 20 * r.exact_us_p50, r
+    assert r.build_ms < 5_000, r
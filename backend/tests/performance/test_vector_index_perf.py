@@ -0,0 +1,65 @@
+"""Topic vector index — NN lookup latency vs the legacy Python scan.
+
+The legacy `_vector_nn` path coerced and scored every stored embedding with
+pure-Python cosine on each miss. The in-process `TopicVectorIndex` answers
+the same argmax with one float32 matrix-vector product. Bounds are loose
+because CI runners vary; the speedup assertion is the regression guard.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from uuid import uuid4
+
+from app.services.precompute.lookup import _coerce_vector, _default_cosine
+from app.services.precompute.vector_index import TopicVectorIndex
+
+_N_TOPICS = 2_000
+_DIM = 384
+
+
+def _rows():
+    rng = random.Random(7)
+    return [
+        (uuid4(), [rng.uniform(-1.0, 1.0) for _ in range(_DIM)], uuid4())
+        for _ in range(_N_TOPICS)
+    ]
+
+
+def _legacy_best(rows, query):
+    best = None
+    for topic_id, emb, pack_id in rows:
+        parsed = _coerce_vector(emb)
+        sim = _default_cosine(list(query), parsed)
+        if best is None or sim > best[2]:
+            best = (topic_id, pack_id, sim)
+    return best
+
+
+def test_index_top1_matches_legacy_and_is_faster():
+    rows = _rows()
+    idx = TopicVectorIndex()
+    idx.load(rows)
+    query = list(rows[123][1])
+
+    t0 = time.perf_counter()
+    legacy = _legacy_best(rows, query)
+    legacy_s = time.perf_counter() - t0
+
+    samples: list[float] = []
+    for _ in range(50):
+        t0 = time.perf_counter()
+        hit = idx.top_k(query, k=1)[0]
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    p95_s = samples[int(len(samples) * 0.95) - 1]
+
+    assert hit.topic_id == legacy[0]
+    assert abs(hit.similarity - legacy[2]) < 1e-4
+    assert p95_s < 0.025, f"index p95={p95_s * 1000:.2f}ms over {_N_TOPICS} topics"
+    assert p95_s * 10 < legacy_s, (
+        f"index p95={p95_s * 1000:.2f}ms vs legacy={legacy_s * 1000:.2f}ms"
+    )
+    stats = idx.stats()
+    assert stats["matrix_bytes"] == _N_TOPICS * _DIM * 4
@@ -0,0 +1,90 @@
+"""Prebuilt canonical-set index (`app/agent/canonical_artifact.py`).
+
+- The build step writes an artifact that loads back equal to an in-process
+  compile, and `_compiled_config` uses it when ``CANONICAL_INDEX_PATH`` is set.
+- A stale fingerprint (YAML or settings overlay changed), a corrupt or
+  truncated file, or a missing file falls back to compiling.
+- Without ``CANONICAL_INDEX_PATH`` nothing is read.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.agent import canonical_artifact as ca
+from app.agent import canonical_sets as cs
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cs._compiled_config.cache_clear()
+    yield
+    cs._compiled_config.cache_clear()
+
+
+@pytest.fixture
+def yaml_path(monkeypatch, tmp_path):
+    path = tmp_path / "appconfig.yaml"
+    path.write_text(
+        "quizzical:\n  canonical_sets:\n    sets:\n      Quokka Moods:\n        names: [Sunny, Sleepy]\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("APP_CONFIG_LOCAL_PATH", str(path))
+    monkeypatch.setattr(cs, "_from_settings_object", lambda: {})
+    return path
+
+
+@pytest.fixture
+def artifact(monkeypatch, tmp_path, yaml_path):
+    path = tmp_path / "canonical_index.bin"
+    assert ca.main([str(path)]) == 0
+    monkeypatch.setenv(ca.ARTIFACT_ENV, str(path))
+    return path
+
+
+def _poison_compile(monkeypatch):
+    def _boom():
+        raise AssertionError("compiled in-process")
+
+    monkeypatch.setattr(cs, "_compile_config", _boom)
+
+
+def test_artifact_round_trips_and_is_used(monkeypatch, artifact):
+    expected = cs._compile_config()
+    assert ca.read_artifact(artifact, cs._source_fingerprint()) == expected
+
+    _poison_compile(monkeypatch)
+    assert cs.canonical_for("Quokka Moods") == ["Sunny", "Sleepy"]
+    assert cs.dimensions_for("MBTI") == expected["sets"][cs.canonical_title_for("MBTI")].get("dimensions")
+
+
+def test_stale_overlays_fall_back_to_compile(monkeypatch, artifact, yaml_path):
+    yaml_path.write_text(
+        "quizzical:\n  canonical_sets:\n    sets:\n      Quokka Moods:\n        names: [Grumpy]\n",
+        encoding="utf-8",
+    )
+    assert cs.canonical_for("Quokka Moods") == ["Grumpy"]
+
+    cs._compiled_config.cache_clear()
+    monkeypatch.setattr(cs, "_from_settings_object", lambda: {"sets": {"Otter Vibes": {"names": ["Floaty"]}}})
+    assert ca.read_artifact(artifact, cs._source_fingerprint()) is None
+    assert cs.canonical_for("Otter Vibes") == ["Floaty"]
+
+
+@pytest.mark.parametrize("damage", ["truncate", "magic", "missing"])
+def test_bad_artifact_falls_back_to_compile(artifact, damage):
+    blob = artifact.read_bytes()
+    if damage == "truncate":
+        artifact.write_bytes(blob[:-10])
+    elif damage == "magic":
+        artifact.write_bytes(b"XXXXXXXX" + blob[8:])
+    else:
+        artifact.unlink()
+    assert ca.read_artifact(artifact, cs._source_fingerprint()) is None
+    assert cs.canonical_for("Quokka Moods") == ["Sunny", "Sleepy"]
+
+
+def test_disabled_without_env(monkeypatch, yaml_path):
+    monkeypatch.delenv(ca.ARTIFACT_ENV, raising=False)
+    monkeypatch.setattr(ca, "read_artifact", lambda *_a: pytest.fail("artifact read"))
+    assert cs.canonical_for("Quokka Moods") == ["Sunny", "Sleepy"]
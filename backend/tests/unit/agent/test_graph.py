@@ -343,6 +343,36 @@ async def test_try_batch_generation_handles_tool_failure(monkeypatch):
     assert all(v is None for v in out.values())
 
 
+@pytest.mark.asyncio
+async def test_try_batch_generation_keeps_profiles_streamed_before_timeout(monkeypatch):
+    """Profiles that closed mid-stream survive a batch timeout; only the rest
+    fall through to the per-character fallback."""
+    from app.services.structured_stream import current_partial_sink
+
+    class StreamingThenStalls:
+        async def ainvoke(self, payload):
+            emit = current_partial_sink()
+            emit("profile_batch_writer", (0,), {
+                "name": "hero", "short_description": "s", "profile_text": "Hero profile",
+            })
+            emit("profile_batch_writer", (1,), {"name": "Sage", "short_description": "", "profile_text": ""})
+            emit("profile_batch_writer", (2,), {"name": "Stranger", "short_description": "s", "profile_text": "x"})
+            await asyncio.sleep(5)
+
+    monkeypatch.setattr(graph_mod, "tool_draft_character_profiles", StreamingThenStalls(), raising=True)
+    out = await graph_mod._try_batch_generation(
+        archetypes=["Hero", "Sage"],
+        category="Cats",
+        analysis={},
+        trace_id="t",
+        session_id="s",
+        timeout=0.05,
+    )
+    assert out["Hero"] is not None and out["Hero"].profile_text == "Hero profile"
+    assert out["Sage"] is None  # blank stays missing
+    assert "Stranger" not in out
+
+
 @pytest.mark.asyncio
 async def test_try_batch_generation_treats_blank_profile_as_missing(monkeypatch):
     """AC-EVAL-2026-07-02 (punchlist P8): a name-matched but EMPTY profile_text
@@ -674,6 +704,36 @@ async def test_generate_characters_node_orchestration(monkeypatch):
     assert chars[1].name == "B"
 
 
+@pytest.mark.asyncio
+async def test_generate_characters_node_keeps_early_profiles_and_fills_the_rest(monkeypatch):
+    """Profiles /quiz/start already returned are kept; only the missing
+    archetypes go to generation, and the roster keeps the plan's order."""
+    early = {"name": "b", "short_description": "d", "profile_text": "shown at start"}
+    state = {
+        "generated_characters": [early],
+        "ideal_archetypes": ["A", "B"],
+        "category": "Cat",
+        "session_id": uuid.uuid4(),
+        "trace_id": "t",
+    }
+    asked: list[list[str]] = []
+
+    async def mock_batch(archetypes, *args, **kwargs):
+        asked.append(list(archetypes))
+        return {n: CharacterProfile(name=n, short_description="d", profile_text="p") for n in archetypes}
+
+    async def mock_fill(results_map, *args, **kwargs):
+        return None
+
+    monkeypatch.setattr(graph_mod, "_try_batch_generation", mock_batch)
+    monkeypatch.setattr(graph_mod, "_fill_missing_with_concurrency", mock_fill)
+
+    out = await graph_mod._generate_characters_node(state)
+    assert asked == [["A"]]
+    assert out["generated_characters"][0].name == "A"
+    assert out["generated_characters"][1] is early
+
+
 # ---------------------------------------------------------------------------
 # _process_baseline_tool_output
 # ---------------------------------------------------------------------------
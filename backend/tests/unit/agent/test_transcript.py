@@ -0,0 +1,100 @@
+"""Bounded quiz transcript (`app/agent/transcript.py`, `quiz.transcript`).
+
+- The seed message is kept, older messages fold into one summary whose
+  count accumulates across compactions, the newest window stays verbatim.
+- The byte budget folds windowed messages too; in-bounds input is untouched.
+- The graph reducer bounds the checkpoint channel, and stored messages keep
+  their ids so re-streaming a stored state does not duplicate them.
+- Storage normalisation compacts; ``save_quiz_state`` feeds the size histogram.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import fakeredis.aioredis as fa
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.agent.transcript import (
+    SUMMARY_NAME,
+    add_bounded_messages,
+    compact_messages,
+    is_summary,
+)
+from app.core.config import TranscriptConfig, settings
+from app.services import redis_cache
+from app.services.redis_cache import CacheRepository, _normalize_graph_state_for_storage
+
+_BOUNDS = {"window": 3, "max_bytes": 16_384, "summary_chars": 200}
+
+
+def _msgs(n: int) -> list[dict]:
+    return [{"type": "human", "content": "Cats"}] + [{"type": "ai", "content": f"note {i}"} for i in range(n)]
+
+
+def test_keeps_seed_summary_and_window():
+    out = compact_messages(_msgs(10), **_BOUNDS)
+    assert out[0] == {"type": "human", "content": "Cats"}
+    assert is_summary(out[1]) and out[1]["additional_kwargs"] == {"compacted": 7}
+    assert out[1]["content"].startswith("[7 earlier messages compacted] note 0 | ")
+    assert [m["content"] for m in out[2:]] == ["note 7", "note 8", "note 9"]
+
+
+def test_in_bounds_is_unchanged_and_counts_accumulate():
+    assert compact_messages(_msgs(3), **_BOUNDS) == _msgs(3)
+    once = compact_messages(_msgs(10), **_BOUNDS)
+    assert compact_messages(once, **_BOUNDS) == once
+
+    again = compact_messages([*once, {"type": "ai", "content": "note 10"}], **_BOUNDS)
+    assert again[1]["additional_kwargs"] == {"compacted": 8}
+    assert "note 7" in again[1]["content"] and len(again) == 5
+
+
+def test_byte_budget_folds_window_messages():
+    big = [{"type": "human", "content": "Cats"}] + [{"type": "ai", "content": "x" * 600} for _ in range(3)]
+    out = compact_messages(big, window=3, max_bytes=1_024, summary_chars=100)
+    assert out[1]["additional_kwargs"] == {"compacted": 2}
+    assert len(out) == 3 and len(out[1]["content"]) < 160
+
+
+def test_reducer_bounds_checkpoint_and_dedupes_stored_ids(monkeypatch):
+    monkeypatch.setattr(settings.quiz, "transcript", TranscriptConfig(**_BOUNDS))
+    checkpoint = add_bounded_messages([], [HumanMessage(content="Cats")])
+    for q in range(12):
+        stored = _normalize_graph_state_for_storage({"messages": checkpoint})["messages"]
+        assert all(m.get("id") for m in stored)
+        checkpoint = add_bounded_messages(checkpoint, stored)
+        checkpoint = add_bounded_messages(checkpoint, [AIMessage(content=f"run {q}")])
+    assert len(checkpoint) == 5
+    assert checkpoint[0].content == "Cats"
+    assert isinstance(checkpoint[1], SystemMessage) and checkpoint[1].name == SUMMARY_NAME
+    assert checkpoint[1].additional_kwargs == {"compacted": 9}
+    assert [m.content for m in checkpoint[2:]] == ["run 9", "run 10", "run 11"]
+
+
+def test_disabled_leaves_messages_alone(monkeypatch):
+    monkeypatch.setattr(settings.quiz, "transcript", TranscriptConfig(enabled=False, window=1))
+    out = _normalize_graph_state_for_storage({"messages": _msgs(10)})
+    assert out["messages"] == _msgs(10)
+
+
+@pytest.mark.anyio
+async def test_save_state_compacts_and_records_size(monkeypatch):
+    monkeypatch.setattr(settings.quiz, "transcript", TranscriptConfig(**_BOUNDS))
+    monkeypatch.setattr(redis_cache, "_save_state_bytes", redis_cache._BytesHistogram())
+    repo = CacheRepository(fa.FakeRedis(decode_responses=True), patch_mode=False)
+    quiz_id = uuid.uuid4()
+    await repo.save_quiz_state({"session_id": str(quiz_id), "trace_id": "t", "category": "Cats", "messages": _msgs(30)})
+
+    state = await repo.get_quiz_state(quiz_id)
+    assert len(state.messages) == 5
+    hist = redis_cache.save_state_bytes_histogram()
+    assert hist["count"] == 1 and hist["buckets"]["le_4096"] == 1
+    assert 0 < hist["sum_bytes"] == hist["max_bytes"] < 4_096
+
+
+def test_config_bounds():
+    for bad in ({"window": -1}, {"summary_chars": -1}, {"max_bytes": 100}):
+        with pytest.raises(ValueError):
+            TranscriptConfig(**bad)
@@ -1,3 +1,4 @@
+import os
 import time
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -691,3 +692,51 @@ def test_normalize_dimension_topic_pluralizes_and_titlecases():
     assert ic._normalize_dimension_topic("Avatar", "element") == "Avatar Elements"
     # 'species' is invariant (no double-pluralization).
     assert ic._normalize_dimension_topic("Alien", "species") == "Alien Species"
+
+
+# ---------------------------------------------------------------------
+# Compiled keyword matcher
+# ---------------------------------------------------------------------
+
+def _legacy_family_scores(cfg, text):
+    return {
+        f: {k: v for k, v in ((n, ic._score_map(text, t)) for n, t in (cfg.get(f) or {}).items()) if v}
+        for f in ic._SCORED_FAMILIES
+    }
+
+
+def test_keyword_matcher_matches_score_map_on_overlapping_tokens():
+    """Nested/overlapping literals (prefix of another, same start), weighted
+    dict tokens, regexes and a bad regex score exactly as `_score_map`."""
+    cfg = {
+        "intents": {
+            "a": ["gen ", "generation", "gen", {"token": "era", "weight": 0.3}],
+            "b": ["/\\bwhich (house|team)\\b/", "/[unclosed/", "house", "ous"],
+        },
+        "shapes": {"s": ["house", "hou"]},
+        "domains": {"d": ["team", {"token": "te", "weight": 1.1}], "e": []},
+    }
+    matcher = ic._KeywordMatcher(cfg)
+    for text in ("which house era gen z", "generational teamwork", "a housing era", "nothing", ""):
+        assert matcher.scores(text) == _legacy_family_scores(cfg, text), text
+
+
+def test_keyword_matcher_compiled_once_per_reload(monkeypatch, tmp_path, mock_defaults):
+    monkeypatch.setattr(ic, "_load_from_app_settings", lambda: None)
+    yaml_file = tmp_path / "appconfig.yaml"
+    yaml_file.write_text("quizzical:\n  topic_keywords:\n    intents:\n      vibe: [mood]\n", encoding="utf-8")
+    monkeypatch.setattr(ic, "_get_appconfig_path", lambda: yaml_file)
+
+    built = []
+    real = ic._KeywordMatcher
+    monkeypatch.setattr(ic, "_KeywordMatcher", lambda cfg: built.append(cfg) or real(cfg))
+    assert ic.classify_intent("Mood board")["primary"] == "vibe"
+    ic.classify_intent("Sort me")
+    ic.analyze_topic("Movie heroes")
+    assert len(built) == 1
+
+    yaml_file.write_text("quizzical:\n  topic_keywords:\n    intents:\n      sorting: [board]\n", encoding="utf-8")
+    mtime = yaml_file.stat().st_mtime + 1
+    os.utime(yaml_file, (mtime, mtime))
+    assert ic.classify_intent("Mood board")["primary"] == "sorting"
+    assert len(built) == 2
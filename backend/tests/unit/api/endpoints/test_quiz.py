@@ -201,6 +201,69 @@ async def test_start_timeout_returns_synopsis_only(async_client, monkeypatch):
     assert duration < 0.5
 
 
+@pytest.mark.usefixtures("override_redis_dep", "turnstile_bypass", "override_db_dependency")
+async def test_start_budget_returns_profiles_that_closed_mid_batch(async_client, monkeypatch):
+    """A character batch still running at the stream budget is cut off, and
+    the profiles it had already finished are returned with the synopsis."""
+    from app.main import app as fastapi_app
+    from app.services.structured_stream import current_partial_sink
+
+    class StreamingBatchGraph:
+        async def ainvoke(self, state, config):
+            state["synopsis"] = {"title": "Slow Quiz", "summary": "..."}
+            state["ideal_archetypes"] = ["Hero", "Sage", "Rogue"]
+            state["generated_characters"] = []
+            return state
+
+        async def aget_state(self, config):
+            class Snap:
+                values = {
+                    "synopsis": {"title": "Slow Quiz", "summary": "..."},
+                    "ideal_archetypes": ["Hero", "Sage", "Rogue"],
+                    "generated_characters": [],
+                    "session_id": uuid.uuid4(),
+                    "trace_id": "t-1",
+                }
+            return Snap()
+
+        async def astream(self, state, config):
+            emit = current_partial_sink()
+            emit("profile_batch_writer", (0,), {
+                "name": "Rogue", "short_description": "r", "profile_text": "Rogue profile",
+            })
+            emit("profile_batch_writer", (1,), {
+                "name": "Hero", "short_description": "h", "profile_text": "Hero profile",
+            })
+            await asyncio.sleep(5)
+            yield {"tick": 1}
+
+    monkeypatch.setattr(fastapi_app.state, "agent_graph", StreamingBatchGraph(), raising=False)
+
+    from app.api.endpoints import quiz as quiz_module
+
+    mock_settings = type("Settings", (), {})()
+    mock_settings.quiz = type("QuizConfig", (), {"first_step_timeout_s": 5.0, "stream_budget_s": 0.05})()
+    mock_settings.app = type("AppConfig", (), {"environment": "test"})()
+    monkeypatch.setattr(quiz_module, "settings", mock_settings)
+    persisted = []
+
+    async def _persist(db, session_id, category, synopsis, characters):
+        persisted.append([c.name for c in characters])
+
+    monkeypatch.setattr(quiz_module, "_persist_streamed_characters", _persist)
+
+    t0 = time.time()
+    response = await _post_start(async_client)
+    assert time.time() - t0 < 2.0
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["initialPayload"]["data"]["title"] == "Slow Quiz"
+    # Plan order, not arrival order.
+    assert [c["name"] for c in data["charactersPayload"]["data"]] == ["Hero", "Rogue"]
+    assert persisted == [["Hero", "Rogue"]]
+
+
 @pytest.mark.usefixtures("use_fake_agent_graph", "override_redis_dep", "turnstile_bypass")
 async def test_start_503_on_graph_failure(async_client, monkeypatch):
     from app.main import app as fastapi_app
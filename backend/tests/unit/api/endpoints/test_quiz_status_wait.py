@@ -0,0 +1,93 @@
+"""Bounded long-poll ``GET /quiz/status/{id}/wait``.
+
+The long-poll answers exactly like ``/quiz/status`` but parks a 'processing'
+answer until the background agent publishes on ``quiz_status:{id}`` — these
+tests drive the handler directly against fakeredis pub/sub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.api.endpoints import quiz as quiz_mod
+from app.services.quiz_status_notifier import reset_quiz_status_notifier
+from app.services.redis_cache import CacheRepository
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture()
+async def redis():
+    import fakeredis.aioredis as fa
+
+    from app.services.quiz_status_notifier import get_quiz_status_notifier
+
+    reset_quiz_status_notifier()
+    client = fa.FakeRedis(decode_responses=True)
+    yield client
+    await get_quiz_status_notifier().aclose()
+    reset_quiz_status_notifier()
+
+
+def _seed_state(*, questions: int = 0):
+    qid = uuid.uuid4()
+    state = quiz_mod._build_initial_graph_state(qid, str(uuid.uuid4()), "Cats")
+    state["ready_for_questions"] = True
+    state["generated_questions"] = [
+        {"question_text": f"Q{i}?", "options": [{"text": "a"}, {"text": "b"}]}
+        for i in range(questions)
+    ]
+    return qid, state
+
+
+async def test_returns_immediately_when_question_ready(redis, sqlite_db_session):
+    qid, state = _seed_state(questions=1)
+    await CacheRepository(redis).save_quiz_state(state)
+
+    resp = await asyncio.wait_for(
+        quiz_mod.wait_for_quiz_status(qid, redis, sqlite_db_session, 0, timeout_s=5.0),
+        timeout=1.0,
+    )
+    assert resp.status == "active"
+    assert resp.data.text == "Q0?"
+
+
+async def test_times_out_with_processing(redis, sqlite_db_session):
+    qid, state = _seed_state()
+    await CacheRepository(redis).save_quiz_state(state)
+
+    resp = await quiz_mod.wait_for_quiz_status(qid, redis, sqlite_db_session, 0, timeout_s=0.05)
+    assert resp.status == "processing"
+
+
+async def test_agent_save_wakes_the_parked_request(redis, sqlite_db_session):
+    qid, state = _seed_state()
+    repo = CacheRepository(redis)
+    await repo.save_quiz_state(state)
+
+    waiter = asyncio.create_task(
+        quiz_mod.wait_for_quiz_status(qid, redis, sqlite_db_session, 0, timeout_s=5.0)
+    )
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    final = {**state, **_seed_state(questions=1)[1], "session_id": qid}
+    await quiz_mod._save_final_state_to_cache(repo, str(qid), final)
+
+    resp = await asyncio.wait_for(waiter, timeout=1.0)
+    assert resp.status == "active"
+
+
+async def test_timeout_is_capped_by_config(redis, sqlite_db_session, monkeypatch):
+    monkeypatch.setattr(quiz_mod.settings.quiz, "status_long_poll_max_s", 0.05)
+    qid, state = _seed_state()
+    await CacheRepository(redis).save_quiz_state(state)
+
+    resp = await asyncio.wait_for(
+        quiz_mod.wait_for_quiz_status(qid, redis, sqlite_db_session, 0, timeout_s=60.0),
+        timeout=1.0,
+    )
+    assert resp.status == "processing"
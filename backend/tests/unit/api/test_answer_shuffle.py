@@ -110,7 +110,7 @@ def test_answer_roundtrip_records_the_option_the_user_saw():
         req = NextQuestionRequest(
             quiz_id=uuid.uuid4(), question_index=0, option_index=displayed_slot
         )
-        new_history, _ = _validate_and_record_answer(state, req)
+        new_history = _validate_and_record_answer(state, req)
         assert new_history[-1]["answer_text"] == shown_text, (
             f"slot {displayed_slot}: recorded {new_history[-1]['answer_text']!r} "
             f"but the user saw {shown_text!r}"
@@ -144,7 +144,7 @@ def test_answer_roundtrip_exposes_the_raw_index_bug():
     for slot, shown in enumerate(displayed):
         state = _state_with_one_question(q)
         req = NextQuestionRequest(quiz_id=uuid.uuid4(), question_index=0, option_index=slot)
-        recorded = _validate_and_record_answer(state, req)[0][-1]["answer_text"]
+        recorded = _validate_and_record_answer(state, req)[-1]["answer_text"]
         assert recorded == shown  # de-mapped path is correct
         if raw[slot] != shown:
             mismatches += 1  # the naive raw[slot] (pre-fix) would have been wrong here
@@ -158,5 +158,5 @@ def test_answer_roundtrip_stores_canonical_option_index():
     for slot, shown in enumerate(displayed):
         state = _state_with_one_question(q)
         req = NextQuestionRequest(quiz_id=uuid.uuid4(), question_index=0, option_index=slot)
-        entry = _validate_and_record_answer(state, req)[0][-1]
+        entry = _validate_and_record_answer(state, req)[-1]
         assert raw[entry["option_index"]] == shown
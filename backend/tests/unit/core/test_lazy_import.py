@@ -0,0 +1,41 @@
+"""`app.core.lazy_import` — deferred optional-module imports."""
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from app.core.lazy_import import LazyModule, lazy_module
+
+
+def test_import_is_deferred_until_first_attribute(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    mod = lazy_module("colorsys")
+
+    assert isinstance(mod, LazyModule)
+    assert not mod.loaded
+    assert "colorsys" not in sys.modules
+    assert "not loaded" in repr(mod)
+
+    assert mod.rgb_to_hsv(0.0, 0.0, 0.0) == (0.0, 0.0, 0.0)
+    assert mod.loaded
+    assert "colorsys" in sys.modules
+
+
+def test_monkeypatch_through_proxy_patches_real_module(monkeypatch):
+    import json
+
+    proxy = lazy_module("json")
+    monkeypatch.setattr(proxy, "dumps", lambda *_a, **_k: "patched")
+
+    assert json.dumps({}) == "patched"
+    assert proxy.dumps({}) == "patched"
+
+
+def test_missing_module_raises_on_first_access_not_on_creation():
+    mod = lazy_module("definitely_not_a_real_module_xyz")
+
+    with pytest.raises(ImportError):
+        _ = mod.anything
+    assert not mod.loaded
@@ -0,0 +1,43 @@
+"""`scripts.backfill_image_derivatives` — bytes-saved report across a pack set."""
+
+from __future__ import annotations
+
+import uuid
+
+from scripts.backfill_image_derivatives import summarize_savings
+
+
+def _row(slug: str, size: int, derivatives: list[dict] | None = None) -> dict:
+    return {
+        "slug": slug, "asset_id": str(uuid.uuid4()), "bytes": size,
+        "payload": {"derivatives": derivatives} if derivatives else {},
+    }
+
+
+def _variant(width: int, ctype: str, size: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "content_hash": uuid.uuid4().hex,
+        "width": width, "content_type": ctype, "bytes": size,
+    }
+
+
+def test_summarizes_served_bytes_per_pack_and_total():
+    rows = [
+        _row("a", 100_000, [_variant(128, "image/webp", 6_000), _variant(128, "image/avif", 4_000)]),
+        _row("a", 80_000, [_variant(256, "image/webp", 12_000)]),
+        _row("b", 50_000),  # no derivatives yet → served at full size
+    ]
+
+    out = summarize_savings(rows, width=128)
+
+    assert out["packs"] == 2
+    assert out["per_pack"]["a"] == {
+        "images": 2, "with_derivatives": 2, "original_bytes": 180_000, "served_bytes": 16_000,
+    }
+    assert out["per_pack"]["b"]["served_bytes"] == 50_000
+    assert out["total"]["saved_bytes"] == 164_000
+    assert out["total"]["saved_pct"] == round(100 * 164_000 / 230_000, 1)
+
+
+def test_empty_pack_set():
+    assert summarize_savings([], width=128)["total"]["saved_pct"] == 0.0
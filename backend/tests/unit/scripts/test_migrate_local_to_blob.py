@@ -132,3 +132,42 @@ async def test_idempotent_when_re_run(sqlite_db_session):
 
     rows = (await sqlite_db_session.execute(select(MediaAsset))).scalars().all()
     assert len(rows) == 1 and rows[0].storage_provider == "blob"
+
+
+async def test_drain_shares_one_client(sqlite_db_session):
+    store: dict = {}
+    built: list = []
+
+    def factory():
+        built.append(_FakeBlobServiceClient(store))
+        return built[-1]
+
+    for i in range(5):
+        sqlite_db_session.add(_asset(provider="local", bytes_blob=bytes([i])))
+    await sqlite_db_session.commit()
+
+    p = AzureBlobProvider(base_url="https://acct.blob", container="packs", client_factory=factory)
+    out = await migrate_local_to_blob(sqlite_db_session, provider=p, batch_size=2)
+
+    assert out == {"migrated": 5, "marked_pending": 0, "skipped": 0}
+    assert len(built) == 1 and len(store) == 5
+
+
+async def test_full_batches_that_stay_local_do_not_loop(sqlite_db_session):
+    """Rows left `local` (no bytes / failed upload) must not be re-selected."""
+
+    class _Failing(_FakeBlobServiceClient):
+        def get_blob_client(self, *, container: str, blob: str):
+            raise ConnectionError("blob endpoint down")
+
+    for i in range(3):
+        sqlite_db_session.add(_asset(provider="local", bytes_blob=bytes([i])))
+        sqlite_db_session.add(_asset(provider="local", bytes_blob=None))
+    await sqlite_db_session.commit()
+
+    p = AzureBlobProvider(
+        base_url="https://acct.blob", container="packs", client_factory=lambda: _Failing({})
+    )
+    out = await migrate_local_to_blob(sqlite_db_session, provider=p, batch_size=2)
+
+    assert out == {"migrated": 0, "marked_pending": 3, "skipped": 3}
@@ -0,0 +1,36 @@
+"""Unit tests for ``scripts/profile_startup`` (``-X importtime`` parsing)."""
+
+from __future__ import annotations
+
+from scripts import profile_startup as prof
+
+_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:      2000 |       2500 |     litellm.types
+import time:      3000 |       5500 |   litellm
+import time:       400 |        400 |       app.core.config
+import time:       600 |       1000 |     app.core
+import time:       250 |        250 |     wikipedia
+import time:       500 |       7300 | app.main
+not an importtime line
+"""
+
+
+def test_parse_importtime_aggregates_packages_and_app_modules():
+    p = prof.parse_importtime(_SAMPLE, top=3)
+
+    assert p.total_ms == 7.3
+    assert p.modules == 7
+    assert p.by_package_ms[0] == ("litellm", 5.0)
+    assert dict(p.by_package_ms)["app"] == 1.5
+    assert p.app_modules_ms[0] == ("app.main", 7.3)
+    assert p.deferred_loaded == ["wikipedia"]
+
+
+def test_parse_importtime_empty_input():
+    p = prof.parse_importtime("")
+
+    assert p.total_ms == 0.0
+    assert p.modules == 0
+    assert p.deferred_loaded == []
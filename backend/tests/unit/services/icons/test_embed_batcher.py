@@ -0,0 +1,99 @@
+"""``EmbedBatcher`` — micro-batched embeds for ``icons.embedder``.
+
+Uses a fake batch primitive (no fastembed / no model download):
+- concurrent single-text embeds run as ONE ``embed_many`` call, and each
+  waiter gets its own vector back;
+- ``max_batch`` splits a burst; duplicates share a slot;
+- a failing batch raises in every waiter; results fill the ``_cached`` LRU.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.icons import embedder as emb
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeModel:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[list[str]] = []
+        self.fail = fail
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("onnx blew up")
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def _clean_lru():
+    emb._cached.cache_clear()
+    yield
+    emb._cached.cache_clear()
+
+
+async def test_concurrent_embeds_share_one_inference():
+    model = _FakeModel()
+    b = emb.EmbedBatcher(embed_many=model.embed_many, max_batch=32, window_ms=5)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    out = await asyncio.gather(*[b.embed(t) for t in texts])
+
+    assert out == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert model.calls == [texts]
+    assert b.stats.as_dict()["mean_batch"] == 4.0
+    b.shutdown()
+
+
+async def test_max_batch_splits_burst_and_duplicates_share_a_slot():
+    model = _FakeModel()
+    b = emb.EmbedBatcher(embed_many=model.embed_many, max_batch=3, window_ms=50)
+
+    out = await asyncio.gather(*[b.embed(t) for t in ["x", "x", "y", "z", "w"]])
+
+    assert out[0] == out[1] == [1.0, 1.0]
+    assert model.calls == [["x", "y", "z"], ["w"]]
+    assert b.stats.requests == 5
+    b.shutdown()
+
+
+async def test_failed_batch_raises_in_every_waiter():
+    b = emb.EmbedBatcher(embed_many=_FakeModel(fail=True).embed_many)
+
+    results = await asyncio.gather(b.embed("a"), b.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(emb._cached) == 0
+    b.shutdown()
+
+
+async def test_embed_one_batches_and_fills_lru(monkeypatch):
+    model = _FakeModel()
+    b = emb.EmbedBatcher(embed_many=model.embed_many, window_ms=5)
+    monkeypatch.setattr(emb, "_batcher", b)
+
+    first = await asyncio.gather(*[emb.embed_one(t) for t in ["cat", "dog", "cat"]])
+    again = await emb.raw_embed("dog")
+
+    assert first == [[3.0, 1.0], [3.0, 1.0], [3.0, 1.0]]
+    assert again == [3.0, 1.0]
+    assert model.calls == [["cat", "dog"]]
+    assert len(emb._cached) == 2
+    assert await emb.raw_embed("  ") is None
+    b.shutdown()
+
+
+def test_lru_evicts_least_recently_used():
+    lru = emb._LRU(maxsize=2)
+    lru.put("a", [1.0])
+    lru.put("b", [2.0])
+    assert lru.get("a") == (1.0,)
+    lru.put("c", [3.0])
+
+    assert lru.get("b") is None
+    assert lru.get("a") == (1.0,) and lru.get("c") == (3.0,)
@@ -0,0 +1,75 @@
+"""Responsive image derivatives (`app.services.media.derivatives`)."""
+
+from __future__ import annotations
+
+import io
+import uuid
+
+import pytest
+
+from app.services.media import derivatives as d
+
+PIL = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int = 256, height: int = 256) -> bytes:
+    img = PIL.new("RGB", (width, height))
+    img.putdata([((x * 7) % 256, (y * 5) % 256, (x * y) % 256) for y in range(height) for x in range(width)])
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _entry(width: int, ctype: str, size: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "content_hash": f"{width}-{ctype}",
+        "width": width, "content_type": ctype, "bytes": size,
+    }
+
+
+def test_generates_smaller_variants_at_each_narrower_width():
+    data = _png()
+    formats = d.available_formats()
+    assert "webp" in formats
+
+    out = d.generate_derivatives(data, widths=[128, 64, 512], formats=formats)
+
+    assert sorted({v.width for v in out}) == [64, 128]  # 512 ≥ source: skipped
+    assert {v.content_type for v in out} == {f"image/{f}" for f in formats}
+    for v in out:
+        assert len(v.data) < len(data)
+        assert v.height == v.width  # aspect ratio kept
+        with PIL.open(io.BytesIO(v.data)) as img:
+            assert img.size == (v.width, v.height)
+    entry = out[0].manifest_entry("abc")
+    assert entry["content_hash"] == out[0].content_hash and entry["bytes"] == len(out[0].data)
+
+
+def test_undecodable_bytes_yield_no_variants():
+    assert d.generate_derivatives(b"not an image", widths=[64], formats=["webp"]) == []
+
+
+def test_no_variants_without_an_encoder(monkeypatch):
+    monkeypatch.setattr(d, "available_formats", lambda: [])
+    assert d.generate_derivatives(_png(), widths=[64], formats=["webp", "avif"]) == []
+
+
+def test_select_picks_narrowest_fit_in_an_accepted_format():
+    avif128, webp128, webp256 = (
+        _entry(128, "image/avif", 3000), _entry(128, "image/webp", 5000), _entry(256, "image/webp", 9000),
+    )
+    payload = {"derivatives": [webp256, webp128, avif128]}
+
+    assert d.select_derivative(payload, width=100, accept="image/avif,image/webp,*/*") == avif128
+    assert d.select_derivative(payload, width=100, accept="image/webp,*/*") == webp128
+    assert d.select_derivative(payload, width=200, accept="image/webp") == webp256
+    # Too wide for every variant, no `w`, or `*/*` only → the original.
+    assert d.select_derivative(payload, width=300, accept="image/webp") is None
+    assert d.select_derivative(payload, width=None, accept="image/webp") is None
+    assert d.select_derivative(payload, width=64, accept="*/*") is None
+
+
+def test_select_ignores_malformed_manifest_entries():
+    bad = [{"id": "nope", "content_hash": "x", "width": 128, "content_type": "image/webp"}, "junk"]
+    assert d.select_derivative({"derivatives": bad}, width=64, accept="image/webp") is None
+    assert d.select_derivative("not-a-dict", width=64, accept="image/webp") is None
@@ -0,0 +1,88 @@
+"""Content-addressed media disk cache (`app.services.media.disk_cache`)."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+
+import pytest
+
+from app.services.media.disk_cache import MediaDiskCache
+
+pytestmark = pytest.mark.anyio
+
+
+def _h(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def test_fill_then_lookup_round_trips(tmp_path):
+    cache = MediaDiskCache(tmp_path, max_bytes=1 << 20)
+    data = b"png-bytes"
+
+    assert await cache.lookup(_h(data)) is None
+    path = await cache.fill(_h(data), data)
+
+    assert path == tmp_path / _h(data)[:2] / _h(data)
+    hit = await cache.lookup(_h(data))
+    assert hit is not None and hit[0] == path and hit[1].st_size == len(data)
+    assert path.read_bytes() == data
+    assert not [p for p in path.parent.iterdir() if p.name.startswith(".fill-")]
+
+
+async def test_lookup_stats_and_touches_off_the_event_loop(tmp_path, monkeypatch):
+    from app.services.media import disk_cache
+
+    cache = MediaDiskCache(tmp_path, max_bytes=1 << 20)
+    path = await cache.fill(_h(b"x"), b"x")
+    os.utime(path, (1, 1))
+    offloaded = []
+    real_to_thread = disk_cache.asyncio.to_thread
+
+    async def _to_thread(fn, *args):
+        offloaded.append(fn.__name__)
+        return await real_to_thread(fn, *args)
+
+    monkeypatch.setattr(disk_cache.asyncio, "to_thread", _to_thread)
+    assert (await cache.lookup(_h(b"x")))[0] == path
+
+    assert offloaded == ["_lookup_sync"]
+    assert path.stat().st_mtime > 1  # touched for the LRU
+
+
+@pytest.mark.parametrize("bad", ["../../etc/passwd", "ABC", "deadbeef", "", None])
+async def test_non_sha256_keys_are_never_paths(tmp_path, bad):
+    cache = MediaDiskCache(tmp_path, max_bytes=1 << 20)
+    assert cache.path_for(bad) is None
+    assert await cache.lookup(bad) is None
+    assert await cache.fill(bad, b"x") is None
+
+
+async def test_hash_mismatch_is_not_written(tmp_path):
+    cache = MediaDiskCache(tmp_path, max_bytes=1 << 20)
+    assert await cache.fill(_h(b"expected"), b"other") is None
+    assert not cache.path_for(_h(b"expected")).exists()
+
+
+async def test_evicts_least_recently_served_past_bound(tmp_path):
+    cache = MediaDiskCache(tmp_path, max_bytes=2500)
+    blobs = [bytes([i]) * 1000 for i in range(3)]
+    old, recent = await cache.fill(_h(blobs[0]), blobs[0]), await cache.fill(_h(blobs[1]), blobs[1])
+    os.utime(old, (1, 1))
+    os.utime(recent, (2, 2))
+
+    await cache.fill(_h(blobs[2]), blobs[2])
+
+    assert not old.exists()
+    assert recent.exists() and await cache.lookup(_h(blobs[2])) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["approx_bytes"] == 2000
+
+
+async def test_filesystem_fault_degrades_to_none(tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_bytes(b"")
+    cache = MediaDiskCache(blocker, max_bytes=1 << 20)
+
+    assert await cache.fill(_h(b"x"), b"x") is None
+    assert cache.stats()["errors"] == 1
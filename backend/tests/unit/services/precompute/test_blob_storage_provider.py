@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
 
 import pytest
@@ -10,6 +12,7 @@ from app.models.db import MediaAsset
 from app.services.precompute.storage import (
     AzureBlobConfigError,
     AzureBlobProvider,
+    BlobUpload,
     DualWriteResolver,
     FalProvider,
     LocalProvider,
@@ -120,6 +123,165 @@ async def test_blob_upload_idempotent_on_existing_key():
     assert store[("packs", "k")] == b"old"
 
 
+# ---------------------------------------------------------------------------
+# Shared-client session and `upload_many`.
+# ---------------------------------------------------------------------------
+
+
+class _Props:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class _FakeContainerClient:
+    def __init__(self, store: dict, container: str, calls: list):
+        self._store = store
+        self._container = container
+        self._calls = calls
+
+    async def list_blobs(self, *, name_starts_with: str):
+        self._calls.append(name_starts_with)
+        for c, name in list(self._store):
+            if c == self._container and name.startswith(name_starts_with):
+                yield _Props(name)
+
+
+class _SlowBlobClient(_FakeBlobClient):
+    """Tracks in-flight uploads; `fail` keys raise a transport-style error."""
+
+    def __init__(self, store, key, stats, fail):
+        super().__init__(store, key)
+        self._stats = stats
+        self._fail = fail
+
+    async def upload_blob(self, data, overwrite: bool, content_settings=None):
+        self._stats["in_flight"] += 1
+        self._stats["peak"] = max(self._stats["peak"], self._stats["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            if self._key[1] in self._fail:
+                raise ConnectionResetError("reset by peer")
+            await super().upload_blob(data, overwrite, content_settings)
+        finally:
+            self._stats["in_flight"] -= 1
+
+
+class _PooledFakeServiceClient(_FakeBlobServiceClient):
+    def __init__(self, store: dict, stats: dict, fail: set):
+        super().__init__(store)
+        self._stats = stats
+        self._fail = fail
+        self.list_calls: list[str] = []
+
+    def get_blob_client(self, *, container: str, blob: str) -> _FakeBlobClient:
+        return _SlowBlobClient(self._store, (container, blob), self._stats, self._fail)
+
+    def get_container_client(self, container: str) -> _FakeContainerClient:
+        return _FakeContainerClient(self._store, container, self.list_calls)
+
+
+def _pooled(store: dict, *, fail: set | None = None):
+    built: list[_PooledFakeServiceClient] = []
+    stats = {"in_flight": 0, "peak": 0}
+
+    def factory():
+        built.append(_PooledFakeServiceClient(store, stats, fail or set()))
+        return built[-1]
+
+    p = AzureBlobProvider(base_url="https://acct.blob", container="packs", client_factory=factory)
+    return p, built, stats
+
+
+def _items(n: int, prefix: str = "ab") -> list[BlobUpload]:
+    return [BlobUpload(f"{prefix}{i:04d}", b"x" * (i + 1), "image/png") for i in range(n)]
+
+
+async def test_session_shares_one_client_and_closes_it_once():
+    store: dict = {}
+    p, built, _ = _pooled(store)
+
+    async with p.session():
+        async with p.session():  # nested — reuses the outer client
+            await p.upload(content_hash="a", data=b"1", content_type="image/png")
+        await p.upload(content_hash="b", data=b"2", content_type="image/png")
+        assert not built[0].closed
+
+    assert len(built) == 1 and built[0].closed
+    await p.upload(content_hash="c", data=b"3", content_type="image/png")
+    assert len(built) == 2  # outside a session: client per call, as before
+
+
+async def test_upload_many_bounds_concurrency_over_one_client():
+    store: dict = {}
+    p, built, stats = _pooled(store)
+
+    report = await p.upload_many(_items(20), concurrency=4)
+
+    assert report.uploaded == 20 and report.failed == {}
+    assert report.bytes_uploaded == sum(range(1, 21))
+    assert stats["peak"] == 4
+    assert len(built) == 1 and built[0].closed
+    assert report.uris["ab0003"] == "https://acct.blob/packs/ab0003"
+    assert report.uploads_per_s > 0 and report.bytes_per_s > 0
+
+
+async def test_upload_many_skips_existing_via_prefix_listing():
+    store: dict = {("packs", "ab0001"): b"old", ("packs", "ab0002"): b"old"}
+    p, built, _ = _pooled(store)
+
+    report = await p.upload_many(_items(5) + [BlobUpload("zz9999", b"z", "image/png")])
+
+    assert (report.uploaded, report.existing) == (4, 2)
+    assert store[("packs", "ab0001")] == b"old"
+    # Five "ab…" hashes share one listing; the lone "zz…" lists by full name.
+    assert sorted(built[0].list_calls) == ["ab0", "zz9999"]
+
+
+async def test_upload_many_isolates_failures():
+    store: dict = {}
+    p, _, _ = _pooled(store, fail={"ab0002"})
+
+    report = await p.upload_many(_items(4))
+
+    assert report.uploaded == 3
+    assert list(report.failed) == ["ab0002"]
+    assert "ab0002" not in report.uris
+
+
+async def test_upload_many_resumes_from_manifest(tmp_path):
+    store: dict = {}
+    manifest = tmp_path / "upload.jsonl"
+    p, _, _ = _pooled(store, fail={"ab0003"})
+
+    first = await p.upload_many(_items(5), manifest=manifest)
+    assert first.uploaded == 4 and list(first.failed) == ["ab0003"]
+    lines = [json.loads(line) for line in manifest.read_text().splitlines()]
+    assert {e["content_hash"] for e in lines} == {"ab0000", "ab0001", "ab0002", "ab0004"}
+
+    with manifest.open("a") as fh:
+        fh.write('{"content_hash": "ab00')  # torn line from a killed run
+    p2, built, _ = _pooled(store)
+    second = await p2.upload_many(_items(5), manifest=manifest)
+
+    assert (second.resumed, second.uploaded, second.existing) == (4, 1, 0)
+    assert built[0].list_calls == ["ab0003"]  # only the unfinished hash is checked
+    assert len(second.uris) == 5
+
+
+async def test_upload_many_falls_back_when_listing_fails():
+    """A client that can't list (write-only SAS, old fake) still uploads."""
+    store: dict = {("packs", "k"): b"old"}
+    p = AzureBlobProvider(
+        base_url="https://acct.blob", container="packs",
+        client_factory=lambda: _FakeBlobServiceClient(store),
+    )
+
+    report = await p.upload_many([BlobUpload("k", b"new", "image/png"), BlobUpload("n", b"1", "image/png")])
+
+    assert (report.uploaded, report.existing) == (1, 1)
+    assert store[("packs", "k")] == b"old"
+
+
 # ---------------------------------------------------------------------------
 # Dual-write resolver — `AC-PRECOMP-MIGR-1`.
 # ---------------------------------------------------------------------------
@@ -135,3 +135,58 @@ async def test_ttl_is_applied():
     await set_hydrated_pack(r, p, ttl_s=1234)
     ttl = await r.ttl(HYDRATED_PACK_KEY_FMT.format(pack_id=p.pack_id))
     assert 0 < ttl <= 1234
+
+
+async def test_payload_is_compact_positional_orjson():
+    import json
+
+    import orjson
+
+    r = await _fakeredis()
+    p = _hydrated()
+    await set_hydrated_pack(r, p)
+    raw = await r.get(HYDRATED_PACK_KEY_FMT.format(pack_id=p.pack_id))
+    data = orjson.loads(raw)
+    assert isinstance(data, list) and data[0] == 1
+    legacy = json.dumps(
+        {
+            "pack_id": str(p.pack_id),
+            "topic_id": str(p.topic_id),
+            "synopsis": p.synopsis,
+            "characters": list(p.characters),
+            "baseline_questions": list(p.baseline_questions),
+        },
+        separators=(",", ":"),
+    )
+    assert len(raw) < len(legacy)
+
+
+async def test_legacy_json_object_entries_still_decode():
+    """Entries written before the compact encoding keep serving until TTL."""
+    import json
+
+    r = await _fakeredis()
+    p = _hydrated()
+    await r.set(
+        HYDRATED_PACK_KEY_FMT.format(pack_id=p.pack_id),
+        json.dumps(
+            {
+                "pack_id": str(p.pack_id),
+                "topic_id": str(p.topic_id),
+                "synopsis": p.synopsis,
+                "characters": list(p.characters),
+                "baseline_questions": list(p.baseline_questions),
+            }
+        ),
+    )
+    assert await get_hydrated_pack(r, p.pack_id) == p
+
+
+async def test_unknown_format_version_is_a_miss():
+    r = await _fakeredis()
+    pack_id = uuid.uuid4()
+    await r.set(
+        HYDRATED_PACK_KEY_FMT.format(pack_id=pack_id),
+        f'[99,"{pack_id}","{uuid.uuid4()}",["t","s"],[],[]]',
+    )
+    assert await get_hydrated_pack(r, pack_id) is None
@@ -249,3 +249,115 @@ async def test_hydrate_pack_dangling_question_ids_yields_empty_tuple(sqlite_db_s
     out = await hydrate_pack(sqlite_db_session, pack_id=pack.id)
     assert out is not None
     assert out.baseline_questions == ()
+
+
+# ---------------------------------------------------------------------------
+# Round-trip budget
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_hydrate_pack_portable_path_uses_three_statements(sqlite_db_session):
+    """Header JOIN + characters + questions (was five serial SELECTs)."""
+    from sqlalchemy import event
+
+    pack = await _seed_pack(sqlite_db_session)
+    await _attach_baseline_questions(sqlite_db_session, pack, n=2)
+    statements: list[str] = []
+
+    def _count(_conn, _cursor, statement, *_a):
+        statements.append(statement)
+
+    engine = sqlite_db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        out = await hydrate_pack(sqlite_db_session, pack_id=pack.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert out is not None and len(out.baseline_questions) == 2
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 3
+
+
+class _OneRowDb:
+    """Returns one pre-aggregated `_HYDRATE_SQL` row; records executions."""
+
+    def __init__(self, row):
+        self.row = row
+        self.calls = 0
+
+    async def execute(self, stmt, params=None):
+        from app.services.precompute import hydrator
+
+        assert stmt is hydrator._HYDRATE_SQL
+        self.calls += 1
+        row = self.row
+
+        class _Result:
+            def mappings(self):
+                return self
+
+            def first(self):
+                return row
+
+        return _Result()
+
+
+def _pg_row(**overrides):
+    row = {
+        "pack_id": uuid.uuid4(),
+        "topic_id": uuid.uuid4(),
+        "status": "published",
+        "synopsis_id": uuid.uuid4(),
+        "synopsis_body": {"title": "T", "summary": "S", "tone": "x"},
+        "characters": [
+            {"name": "A", "short_description": "a", "profile_text": "pa", "image_url": None}
+        ],
+        "questions": [{"question_text": "Q1?", "options": [{"text": "o"}]}],
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.anyio
+async def test_hydrate_pack_postgres_path_is_one_round_trip(monkeypatch):
+    from app.agent.progress_phrases import baseline_phrase_for_index
+    from app.services.precompute import hydrator
+
+    monkeypatch.setattr(hydrator, "_is_postgres", lambda _db: True)
+    row = _pg_row()
+    db = _OneRowDb(row)
+    out = await hydrate_pack(db, pack_id=str(row["pack_id"]))
+    assert db.calls == 1
+    assert out is not None
+    assert out.pack_id == row["pack_id"]
+    assert out.synopsis == {"title": "T", "summary": "S"}
+    assert out.characters[0]["name"] == "A"
+    assert out.baseline_questions == (
+        {
+            "question_text": "Q1?",
+            "options": [{"text": "o"}],
+            "progress_phrase": baseline_phrase_for_index(0),
+        },
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "overrides",
+    [{"status": "draft"}, {"synopsis_body": None}, {"characters": []}],
+)
+async def test_hydrate_pack_postgres_path_ineligible_returns_none(monkeypatch, overrides):
+    from app.services.precompute import hydrator
+
+    monkeypatch.setattr(hydrator, "_is_postgres", lambda _db: True)
+    assert await hydrate_pack(_OneRowDb(_pg_row(**overrides)), pack_id=uuid.uuid4()) is None
+
+
+def test_hydrate_sql_compiles_for_postgres():
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.precompute.hydrator import _HYDRATE_SQL
+
+    compiled = str(_HYDRATE_SQL.compile(dialect=postgresql.dialect()))
+    assert "WITH ORDINALITY" in compiled
+    assert "%(pack_id)s" in compiled
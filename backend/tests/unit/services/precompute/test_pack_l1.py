@@ -0,0 +1,225 @@
+"""In-process L1 for the pack caches (`pack_l1.py`).
+
+- LRU size bound and TTL expiry, with hit/miss/eviction counters.
+- The L1 is consulted only while the invalidation subscriber is live.
+- `invalidate_*` on one worker drops the entry on every other worker via
+  the `tk:pack:invalidate` channel (fakeredis pub/sub).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import fakeredis.aioredis as fr
+import pytest
+
+from app.services.precompute import cache as pack_cache
+from app.services.precompute.hydrator import HydratedPack
+from app.services.precompute.pack_l1 import (
+    PackL1,
+    PackL1Cache,
+    get_pack_l1,
+    reset_pack_l1,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_and_counts():
+    l1 = PackL1Cache(max_entries=2, ttl_s=60)
+    l1.put("a", 1)
+    l1.put("b", 2)
+    assert l1.get("a") == 1  # a is now most recent
+    l1.put("c", 3)
+    assert l1.get("b") is None
+    assert l1.get("a") == 1 and l1.get("c") == 3
+    stats = l1.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+    assert stats["entries"] == 2
+
+
+def test_ttl_expiry_counts_as_miss():
+    clock = _Clock()
+    l1 = PackL1Cache(max_entries=8, ttl_s=10, clock=clock)
+    l1.put("a", 1)
+    clock.now = 9.9
+    assert l1.get("a") == 1
+    clock.now = 10.0
+    assert l1.get("a") is None
+    assert l1.stats()["expirations"] == 1
+    assert len(l1) == 0
+
+
+def test_zero_size_disables():
+    l1 = PackL1Cache(max_entries=0)
+    l1.put("a", 1)
+    assert not l1.enabled and l1.get("a") is None
+
+
+def _hydrated(pack_id: uuid.UUID) -> HydratedPack:
+    return HydratedPack(
+        pack_id=pack_id,
+        topic_id=uuid.uuid4(),
+        synopsis={"title": "T", "summary": "S"},
+        characters=(
+            {"name": "A", "short_description": "a", "profile_text": "p", "image_url": None},
+        ),
+    )
+
+
+class _CountingRedis:
+    """Wraps a fakeredis client and counts GETs."""
+
+    def __init__(self, inner) -> None:
+        self._inner = inner
+        self.connection_pool = inner.connection_pool
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return await self._inner.get(key)
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+@pytest.fixture()
+async def l1():
+    reset_pack_l1()
+    yield get_pack_l1()
+    await get_pack_l1().aclose()
+    reset_pack_l1()
+
+
+async def test_repeat_reads_are_served_from_l1(l1):
+    redis = _CountingRedis(fr.FakeRedis(decode_responses=True))
+    pack = _hydrated(uuid.uuid4())
+    await pack_cache.set_hydrated_pack(redis, pack)  # warms L1 only once listening
+    assert await pack_cache.get_hydrated_pack(redis, pack.pack_id) == pack
+    gets_after_first = redis.gets
+    for _ in range(5):
+        assert await pack_cache.get_hydrated_pack(redis, pack.pack_id) == pack
+    assert redis.gets == gets_after_first
+    assert l1.stats()["hits"] >= 5
+    assert l1.stats()["listening"] is True
+
+
+async def test_l1_bypassed_without_pubsub(l1):
+    class _NoPubSub(_CountingRedis):
+        def pubsub(self):
+            raise ConnectionError("no pubsub")
+
+    redis = _NoPubSub(fr.FakeRedis(decode_responses=True))
+    pack = _hydrated(uuid.uuid4())
+    await pack_cache.set_hydrated_pack(redis, pack)
+    for _ in range(3):
+        assert await pack_cache.get_hydrated_pack(redis, pack.pack_id) == pack
+    assert redis.gets == 3
+    assert len(l1.cache) == 0
+
+
+async def test_invalidate_on_one_worker_drops_entry_on_another():
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    redis_a = fr.FakeRedis(server=server, decode_responses=True)
+    redis_b = fr.FakeRedis(server=server, decode_responses=True)
+    worker_a, worker_b = PackL1(PackL1Cache()), PackL1(PackL1Cache())
+    key = pack_cache.HYDRATED_PACK_KEY_FMT.format(pack_id=uuid.uuid4())
+    try:
+        await worker_a.get(redis_a, key)  # starts A's subscriber
+        await worker_b.get(redis_b, key)
+        worker_a.put(key, "stale")
+        assert worker_a.cache.get(key) == "stale"
+
+        await worker_b.invalidate(redis_b, key)
+        for _ in range(100):
+            if worker_a.cache.get(key) is None:
+                break
+            await asyncio.sleep(0.01)
+        assert worker_a.cache.get(key) is None
+        assert worker_a.stats()["invalidations"] == 1
+    finally:
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+
+async def test_invalidate_helpers_drop_local_entry(l1):
+    redis = fr.FakeRedis(decode_responses=True)
+    pack = _hydrated(uuid.uuid4())
+    await pack_cache.get_hydrated_pack(redis, pack.pack_id)  # start listener
+    await pack_cache.set_hydrated_pack(redis, pack)
+    assert len(l1.cache) == 1
+    assert await pack_cache.invalidate_hydrated_pack(redis, pack.pack_id) is True
+    assert len(l1.cache) == 0
+    assert await pack_cache.get_hydrated_pack(redis, pack.pack_id) is None
+
+
+async def test_concurrent_cold_reads_start_one_subscriber(l1):
+    class _YieldingPubSub:
+        """SUBSCRIBE takes a round trip, as against a real server."""
+
+        def __init__(self, inner) -> None:
+            self._inner = inner
+
+        async def subscribe(self, *channels):
+            await asyncio.sleep(0.01)
+            return await self._inner.subscribe(*channels)
+
+        def __getattr__(self, name):
+            return getattr(self._inner, name)
+
+    class _CountingPubSub(_CountingRedis):
+        pubsubs = 0
+
+        def pubsub(self):
+            type(self).pubsubs += 1
+            return _YieldingPubSub(self._inner.pubsub())
+
+    redis = _CountingPubSub(fr.FakeRedis(decode_responses=True))
+    await asyncio.gather(*(pack_cache.get_hydrated_pack(redis, uuid.uuid4()) for _ in range(5)))
+
+    assert _CountingPubSub.pubsubs == 1
+    assert l1.stats()["listener_restarts"] == 1
+
+
+async def test_invalidation_during_redis_read_is_not_overwritten(l1):
+    """A GET that returned the old pack must not re-cache it after an
+    invalidation that landed while the read was in flight."""
+
+    class _SlowGet(_CountingRedis):
+        def __init__(self, inner) -> None:
+            super().__init__(inner)
+            self.reading = asyncio.Event()
+            self.proceed = asyncio.Event()
+
+        async def get(self, key):
+            raw = await self._inner.get(key)
+            self.reading.set()
+            await self.proceed.wait()
+            return raw
+
+    redis = _SlowGet(fr.FakeRedis(decode_responses=True))
+    pack = _hydrated(uuid.uuid4())
+    await redis._inner.set(
+        pack_cache.HYDRATED_PACK_KEY_FMT.format(pack_id=pack.pack_id),
+        pack_cache._hydrated_pack_to_bytes(pack),
+    )
+    await l1.get(redis, "warm")  # start the listener
+
+    reader = asyncio.create_task(pack_cache.get_hydrated_pack(redis, pack.pack_id))
+    await redis.reading.wait()
+    await pack_cache.invalidate_hydrated_pack(redis, pack.pack_id)
+    redis.proceed.set()
+
+    assert await reader == pack  # this caller still gets what it read
+    assert len(l1.cache) == 0  # ...but the L1 didn't keep it
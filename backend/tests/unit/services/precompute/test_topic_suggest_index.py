@@ -0,0 +1,164 @@
+"""In-process typeahead prefix index (`topic_suggest_index.py`).
+
+Covers:
+  - prefix matches on names and aliases, accent/case folded, ranked by
+    `popularity_rank` (unranked last), one result per topic
+  - hot-prefix (precomputed) and range paths agree
+  - fuzzy one-edit backfill only when enabled and the query is long enough
+  - DB build + `refresh_topics` after an insert; `/topics/suggest` serves
+    from the index without a per-request SQL query
+  - a stale snapshot keeps serving while one background task rebuilds it
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.main import API_PREFIX
+from app.models.db import Topic, TopicAlias
+from app.services.precompute.topic_suggest_index import (
+    TopicRow,
+    TopicSuggestIndex,
+    get_topic_suggest_index,
+)
+
+pytestmark = pytest.mark.anyio
+
+URL = f"{API_PREFIX.rstrip('/')}/topics/suggest"
+
+
+def _row(name: str, rank: int | None = None, *aliases: str) -> TopicRow:
+    return TopicRow(uuid4(), name.lower().replace(" ", "-"), name, rank, tuple(aliases))
+
+
+def _names(hits) -> list[str]:
+    return [h.display_name for h in hits]
+
+
+def _index(*rows: TopicRow, **kw) -> TopicSuggestIndex:
+    idx = TopicSuggestIndex(**kw)
+    idx.load(rows)
+    return idx
+
+
+def test_prefix_ranked_by_popularity_with_aliases():
+    idx = _index(
+        _row("Harry Potter Houses", 3, "Hogwarts Houses"),
+        _row("Harry Styles Eras", 1),
+        _row("Harbour Towns", None),
+        _row("Hogwarts Professors", 2),
+        _row("Héroes del Silencio", 9),
+    )
+    assert _names(idx.suggest("har")) == ["Harry Styles Eras", "Harry Potter Houses", "Harbour Towns"]
+    assert _names(idx.suggest("HOGWARTS")) == ["Hogwarts Professors", "Harry Potter Houses"]
+    assert _names(idx.suggest("heroes")) == ["Héroes del Silencio"]
+    assert idx.suggest("harry potter houses x") == []
+    assert len(idx.suggest("h", limit=2)) == 2
+
+
+def test_same_topic_matched_twice_is_returned_once():
+    idx = _index(_row("Cats", 1, "Cats", "Cat Breeds"))
+    assert _names(idx.suggest("cat")) == ["Cats"]
+
+
+def test_hot_and_range_paths_agree():
+    rows = [_row(f"Topic {i:03d}", i % 7 or None) for i in range(200)]
+    hot = _index(*rows)
+    cold = _index(*rows, hot_top_k=0)
+    for q in ("t", "to", "top", "topic", "topic 1", "topic 19"):
+        assert hot.suggest(q) == cold.suggest(q), q
+
+
+def test_fuzzy_backfills_one_edit_matches():
+    idx = _index(_row("Pokemon Types", 1), _row("Pokedex Regions", 2), _row("Poker Hands", 3))
+    assert idx.suggest("pokmeon") == []
+    assert _names(idx.suggest("pokmeon", fuzzy=True)) == ["Pokemon Types"]
+    assert _names(idx.suggest("pokemn", fuzzy=True)) == ["Pokemon Types"]
+    # Exact matches first, then typo matches.
+    assert _names(idx.suggest("poked", fuzzy=True)) == ["Pokedex Regions", "Pokemon Types", "Poker Hands"]
+    assert idx.suggest("px", fuzzy=True) == []
+
+
+async def test_db_build_and_refresh(sqlite_db_session):
+    cats = Topic(slug="cats", display_name="Cats", popularity_rank=5)
+    sqlite_db_session.add(cats)
+    await sqlite_db_session.flush()
+    sqlite_db_session.add(TopicAlias(alias_normalized="felines", topic_id=cats.id, display_alias="Felines"))
+    await sqlite_db_session.commit()
+
+    idx = TopicSuggestIndex()
+    await idx.ensure_fresh(sqlite_db_session)
+    assert _names(idx.suggest("fel")) == ["Cats"]
+    assert not idx.needs_rebuild()
+
+    dogs = Topic(slug="catahoula-dogs", display_name="Catahoula Dogs", popularity_rank=1)
+    sqlite_db_session.add(dogs)
+    await sqlite_db_session.commit()
+    assert _names(idx.suggest("cat")) == ["Cats"]
+    await idx.refresh_topics(sqlite_db_session, [dogs.id])
+    assert _names(idx.suggest("cat")) == ["Catahoula Dogs", "Cats"]
+    assert idx.stats()["incremental_updates"] == 1
+
+
+async def test_stale_snapshot_serves_while_one_background_rebuild_runs(
+    sqlite_db_session, monkeypatch
+):
+    from app.api import dependencies as deps
+
+    sqlite_db_session.add(Topic(slug="cats", display_name="Cats", popularity_rank=5))
+    await sqlite_db_session.commit()
+    idx = TopicSuggestIndex()
+    await idx.ensure_fresh(sqlite_db_session)  # first build is inline
+    assert idx.stats()["rebuilds"] == 1
+
+    sqlite_db_session.add(Topic(slug="catfish", display_name="Catfish", popularity_rank=1))
+    await sqlite_db_session.commit()
+    idx.invalidate()
+
+    sessions = 0
+
+    @contextlib.asynccontextmanager
+    async def _own_session():
+        nonlocal sessions
+        sessions += 1
+        yield sqlite_db_session
+
+    monkeypatch.setattr(deps, "async_session_factory", _own_session)
+    # Concurrent stale reads return at once and share one rebuild.
+    await asyncio.gather(*(idx.ensure_fresh(None) for _ in range(5)))
+    assert _names(idx.suggest("cat")) == ["Cats"]
+    await idx._rebuild_task
+
+    assert sessions == 1
+    assert idx.stats()["rebuilds"] == 2
+    assert _names(idx.suggest("cat")) == ["Catfish", "Cats"]
+
+
+@pytest.mark.usefixtures("override_redis_dep", "override_db_dependency")
+async def test_endpoint_serves_from_index(async_client, sqlite_db_session, monkeypatch):
+    monkeypatch.setattr(settings.precompute, "topic_suggest_index", True, raising=False)
+    sqlite_db_session.add_all(
+        [
+            Topic(slug="zelda-games", display_name="Zelda Games", popularity_rank=2),
+            Topic(slug="zelda-characters", display_name="Zelda Characters", popularity_rank=1),
+        ]
+    )
+    await sqlite_db_session.commit()
+
+    resp = await async_client.get(URL, params={"q": "zel"})
+    assert resp.status_code == 200
+    assert [r["display_name"] for r in resp.json()["results"]] == ["Zelda Characters", "Zelda Games"]
+
+    # Built once; later keystrokes never reach the DB.
+    async def _no_db(*_a, **_kw):
+        raise AssertionError("suggest hit the DB")
+
+    monkeypatch.setattr(sqlite_db_session, "execute", _no_db)
+    resp = await async_client.get(URL, params={"q": "zelda g"})
+    assert [r["slug"] for r in resp.json()["results"]] == ["zelda-games"]
+    assert get_topic_suggest_index().stats()["rebuilds"] == 1
@@ -0,0 +1,223 @@
+"""In-process topic vector index (`vector_index.py`).
+
+Covers:
+  - top-k ordering / cosine parity with the pure-Python `_default_cosine`
+  - incremental upsert / remove without a full rebuild
+  - DB build only indexes topics whose current pack is `published`
+  - `PrecomputeLookup` with an injected index keeps the τ_match contract
+  - `stats()` reports footprint and rebuild timing
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+
+from app.models.db import (
+    BaselineQuestionSet,
+    CharacterSet,
+    Synopsis,
+    Topic,
+    TopicPack,
+)
+from app.services.precompute.lookup import (
+    DEFAULT_THRESHOLDS,
+    LookupThresholds,
+    PrecomputeLookup,
+    _default_cosine,
+)
+from app.services.precompute.vector_index import TopicVectorIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def _unit(i: int, dim: int = 8) -> list[float]:
+    v = [0.0] * dim
+    v[i] = 1.0
+    return v
+
+
+async def _seed(session, *, slug: str, embedding, pack_status="published"):
+    topic = Topic(slug=slug, display_name=slug.title(), embedding=embedding)
+    session.add(topic)
+    await session.flush()
+    syn = Synopsis(topic_id=topic.id, content_hash=f"syn-{slug}", body={"title": slug})
+    cs = CharacterSet(composition_hash=f"cs-{slug}", composition={"members": []})
+    bqs = BaselineQuestionSet(
+        composition_hash=f"bqs-{slug}", composition={"questions": []}
+    )
+    session.add_all([syn, cs, bqs])
+    await session.flush()
+    pack = TopicPack(
+        topic_id=topic.id,
+        version=1,
+        status=pack_status,
+        synopsis_id=syn.id,
+        character_set_id=cs.id,
+        baseline_question_set_id=bqs.id,
+        model_provenance={},
+        built_in_env="test",
+    )
+    session.add(pack)
+    await session.flush()
+    topic.current_pack_id = pack.id
+    await session.commit()
+    return topic, pack
+
+
+# ---------------------------------------------------------------------------
+# Pure index behaviour
+# ---------------------------------------------------------------------------
+
+
+def test_top_k_orders_by_cosine_and_matches_python_cosine():
+    idx = TopicVectorIndex()
+    rows = [
+        (uuid4(), [1.0, 0.0, 0.0], uuid4()),
+        (uuid4(), [0.6, 0.8, 0.0], uuid4()),
+        (uuid4(), [0.0, 0.0, 3.0], uuid4()),
+    ]
+    idx.load(rows)
+    query = [0.9, 0.3, 0.1]
+
+    hits = idx.top_k(query, k=3)
+    assert [h.topic_id for h in hits] == [rows[0][0], rows[1][0], rows[2][0]]
+    for hit, (_, emb, pack_id) in zip(hits, rows, strict=True):
+        assert hit.pack_id == pack_id
+        assert hit.similarity == pytest.approx(_default_cosine(query, emb), abs=1e-5)
+
+    assert [h.topic_id for h in idx.top_k(query, k=1)] == [rows[0][0]]
+
+
+def test_malformed_rows_and_queries_are_skipped():
+    idx = TopicVectorIndex()
+    good = uuid4()
+    idx.load(
+        [
+            (good, "[1.0, 0.0]", uuid4()),  # SQLite TEXT form
+            (uuid4(), None, uuid4()),
+            (uuid4(), [0.0, 0.0], uuid4()),  # zero vector
+            (uuid4(), [1.0, 0.0, 0.0], uuid4()),  # dim mismatch
+        ]
+    )
+    assert len(idx) == 1
+    assert idx.top_k([0.0, 0.0]) == []
+    assert idx.top_k([1.0, 0.0, 0.0]) == []
+    assert idx.top_k([2.0, 0.0])[0].topic_id == good
+
+
+def test_incremental_upsert_and_remove():
+    idx = TopicVectorIndex()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    idx.load([(a, _unit(0), uuid4()), (b, _unit(1), uuid4())])
+
+    new_pack = uuid4()
+    assert idx.upsert(c, _unit(2), new_pack)
+    assert idx.top_k(_unit(2))[0].pack_id == new_pack
+
+    # Replace b's vector in place.
+    assert idx.upsert(b, _unit(3), uuid4())
+    assert idx.top_k(_unit(3))[0].topic_id == b
+    assert len(idx) == 3
+
+    # Remove from the middle: swap-with-last keeps rows addressable.
+    assert idx.remove(a)
+    assert not idx.remove(a)
+    assert len(idx) == 2
+    assert idx.top_k(_unit(2))[0].topic_id == c
+    assert idx.top_k(_unit(3))[0].topic_id == b
+    assert idx.stats()["rebuilds"] == 1
+
+
+def test_stats_reports_footprint():
+    idx = TopicVectorIndex()
+    assert idx.stats()["stale"] is True
+    idx.load([(uuid4(), _unit(i, 384), uuid4()) for i in range(10)])
+    stats = idx.stats()
+    assert stats["topics"] == 10
+    assert stats["dim"] == 384
+    assert stats["matrix_bytes"] == 10 * 384 * 4  # float32
+    assert stats["last_rebuild_ms"] is not None
+    assert stats["stale"] is False
+
+    idx.invalidate()
+    assert idx.needs_rebuild()
+
+
+# ---------------------------------------------------------------------------
+# DB build + lookup integration
+# ---------------------------------------------------------------------------
+
+
+async def test_build_indexes_only_published_packs(sqlite_db_session):
+    live, _ = await _seed(sqlite_db_session, slug="live", embedding=_unit(0, 384))
+    await _seed(
+        sqlite_db_session,
+        slug="held",
+        embedding=_unit(1, 384),
+        pack_status="quarantined",
+    )
+    idx = TopicVectorIndex()
+    await idx.ensure_fresh(sqlite_db_session)
+    assert len(idx) == 1
+    assert idx.top_k(_unit(0, 384))[0].topic_id == live.id
+
+
+async def test_refresh_topics_picks_up_new_publish(sqlite_db_session):
+    idx = TopicVectorIndex()
+    await idx.ensure_fresh(sqlite_db_session)
+    assert len(idx) == 0
+
+    topic, pack = await _seed(
+        sqlite_db_session, slug="fresh", embedding=_unit(4, 384)
+    )
+    await idx.refresh_topics(sqlite_db_session, [topic.id])
+    hit = idx.top_k(_unit(4, 384))[0]
+    assert (hit.topic_id, hit.pack_id) == (topic.id, pack.id)
+    assert idx.stats()["rebuilds"] == 1
+
+    pack.status = "quarantined"
+    await sqlite_db_session.commit()
+    await idx.refresh_topics(sqlite_db_session, [topic.id])
+    assert len(idx) == 0
+
+
+async def test_lookup_with_index_respects_tau_match(sqlite_db_session):
+    topic, pack = await _seed(
+        sqlite_db_session, slug="tolkien", embedding=[1.0] + [0.0] * 383
+    )
+    idx = TopicVectorIndex()
+
+    async def _near(_t):
+        return [1.0] + [0.0] * 383
+
+    async def _mid(_t):
+        return [0.7, 0.7141428] + [0.0] * 382
+
+    res = await PrecomputeLookup(
+        db=sqlite_db_session, redis=None, embed_fn=_near, vector_index=idx
+    ).resolve_topic("middle earth epic")
+    assert res is not None
+    assert (res.topic_id, res.pack_id, res.via) == (topic.id, pack.id, "vector")
+    assert res.similarity == pytest.approx(1.0, abs=1e-5)
+
+    miss = await PrecomputeLookup(
+        db=sqlite_db_session,
+        redis=None,
+        thresholds=DEFAULT_THRESHOLDS,
+        embed_fn=_mid,
+        vector_index=idx,
+    ).resolve_topic("zzz")
+    assert miss is None
+
+    loose = await PrecomputeLookup(
+        db=sqlite_db_session,
+        redis=None,
+        thresholds=LookupThresholds(match=0.5),
+        embed_fn=_mid,
+        vector_index=idx,
+    ).resolve_topic("zzz")
+    assert loose is not None and loose.via == "vector"
+    # One DB build served all three lookups.
+    assert idx.stats()["rebuilds"] == 1
@@ -0,0 +1,202 @@
+"""Durable agent job queue (`agent_queue.py`) + worker (`jobs/agent_worker.py`).
+
+- A quiz is queued at most once while its job waits; a job that has started
+  no longer dedupes. Workers claim no more than their free slots.
+- A message whose worker stops refreshing it is reclaimed by another worker
+  after the visibility timeout; a touched one is not.
+- Retryable runs are re-queued with ``attempt + 1``; messages redelivered past
+  ``max_deliveries`` are dead-lettered.
+- The recovery sweeper enqueues instead of re-running when the queue is on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import fakeredis.aioredis as fa
+import pytest
+
+from app.api import dependencies as deps
+from app.core.config import AgentQueueConfig
+from app.jobs.agent_worker import AgentWorker
+from app.services import agent_recovery as ar
+from app.services.agent_queue import AgentJobQueue, get_agent_queue
+
+
+@pytest.fixture
+def redis():
+    return fa.FakeRedis(decode_responses=True)
+
+
+def _queue(redis, **kw) -> AgentJobQueue:
+    return AgentJobQueue(redis, stream="t_agent_jobs", group="t_workers", **kw)
+
+
+async def test_enqueue_dedupes_while_queued(redis):
+    q = _queue(redis)
+    qid = uuid.uuid4()
+    assert await q.enqueue(qid, reason="proceed") is not None
+    assert await q.enqueue(qid, reason="recovery") is None
+    [job] = await q.claim("w1", 5)
+    assert (job.quiz_id, job.reason, job.attempt, job.exhausted) == (qid, "proceed", 1, False)
+    await q.ack(job)
+    assert (await q.metrics())["depth"] == 0
+    assert await q.enqueue(qid, reason="answer") is not None
+
+
+async def test_enqueue_during_a_running_job_queues_a_new_run(redis):
+    """An answer recorded while a run is in flight (after it saved state,
+    before ack) must not be swallowed by the dedupe marker."""
+    q = _queue(redis)
+    qid = uuid.uuid4()
+    await q.enqueue(qid, reason="proceed")
+    [running] = await q.claim("w1", 5)
+
+    second = await q.enqueue(qid, reason="answer")
+    assert second is not None
+    assert await q.enqueue(qid, reason="recovery") is None  # the new one dedupes
+
+    await q.ack(running)  # finishing the old run keeps the new job's marker
+    assert await q.enqueue(qid, reason="recovery") is None
+    [queued] = await q.claim("w2", 5)
+    assert (queued.message_id, queued.reason) == (second, "answer")
+
+
+async def test_claim_respects_count_and_skips_malformed(redis):
+    q = _queue(redis)
+    for _ in range(3):
+        await q.enqueue(uuid.uuid4(), reason="proceed")
+    await redis.xadd("t_agent_jobs", {"quiz_id": "not-a-uuid"})
+    assert len(await q.claim("w1", 2)) == 2
+    assert len(await q.claim("w1", 5)) == 1
+    m = await q.metrics()
+    assert (m["depth"], m["pending"]) == (3, 3)
+
+
+async def test_visibility_timeout_hands_job_to_another_worker(redis):
+    q = _queue(redis, visibility_timeout_s=0.05)
+    await q.enqueue(uuid.uuid4(), reason="proceed")
+    [first] = await q.claim("dead-worker", 1)
+    await asyncio.sleep(0.03)
+    await q.touch(first, "dead-worker")
+    await asyncio.sleep(0.03)
+    assert await q.claim("w2", 1) == []
+
+    await asyncio.sleep(0.08)
+    [again] = await q.claim("w2", 1)
+    assert again.message_id == first.message_id and again.deliveries == 2
+
+
+async def test_exhausted_after_max_deliveries(redis):
+    q = _queue(redis, visibility_timeout_s=0.01, max_deliveries=1)
+    await q.enqueue(uuid.uuid4(), reason="proceed")
+    [job] = await q.claim("w1", 1)
+    assert not job.exhausted
+    await asyncio.sleep(0.03)
+    [job] = await q.claim("w2", 1)
+    assert job.exhausted
+
+
+async def _run_until(worker: AgentWorker, done, timeout: float = 2.0) -> None:
+    stop = asyncio.Event()
+    runner = asyncio.create_task(worker.run(stop))
+    try:
+        async with asyncio.timeout(timeout):
+            while not done():
+                await asyncio.sleep(0.01)
+    finally:
+        stop.set()
+        await runner
+        await worker.drain(1.0)
+
+
+async def test_worker_caps_concurrency_and_acks(redis):
+    q = _queue(redis)
+    for _ in range(6):
+        await q.enqueue(uuid.uuid4(), reason="proceed")
+    active, seen = [0], []
+
+    async def run_job(job):
+        active[0] += 1
+        seen.append(active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        return False
+
+    worker = AgentWorker(q, run_job=run_job, consumer="w1", concurrency=2, block_ms=0)
+    await _run_until(worker, lambda: worker.metrics()["processed"] == 6)
+    assert max(seen) == 2 and worker.metrics()["peak_in_flight"] == 2
+    m = await q.metrics()
+    assert (m["depth"], m["pending"]) == (0, 0)
+
+
+async def test_worker_retries_then_dead_letters(redis):
+    q = _queue(redis, max_deliveries=2)
+    qid = uuid.uuid4()
+    await q.enqueue(qid, reason="proceed")
+    attempts, failed = [], []
+
+    async def run_job(job):
+        attempts.append(job.attempt)
+        if job.attempt == 1:
+            raise RuntimeError("provider 503")
+        return True
+
+    async def on_exhausted(job):
+        failed.append(job.quiz_id)
+
+    worker = AgentWorker(q, run_job=run_job, on_exhausted=on_exhausted, consumer="w1", block_ms=0)
+    await _run_until(worker, lambda: failed)
+    assert attempts == [1, 2] and failed == [qid]
+    m = worker.metrics()
+    assert (m["retried"], m["dead_lettered"], m["processed"]) == (1, 1, 0)
+    assert (await q.metrics())["depth"] == 0
+
+
+async def test_sweeper_enqueues_when_queue_is_on(redis, monkeypatch):
+    monkeypatch.setattr(ar.settings.security.agent_recovery, "enabled", True, raising=False)
+    monkeypatch.setattr(ar.settings.agent.queue, "enabled", True, raising=False)
+    qid = uuid.uuid4()
+
+    class _FakeRepo:
+        def __init__(self, _db):
+            pass
+
+        async def fail_exhausted(self, **_kw):
+            return []
+
+        async def claim_stale(self, **_kw):
+            return [qid]
+
+    class _Ctx:
+        async def __aenter__(self):
+            return SimpleNamespace(commit=_noop)
+
+        async def __aexit__(self, *_a):
+            return False
+
+    async def _noop():
+        return None
+
+    async def _must_not_run(*_a):
+        raise AssertionError("ran in-process")
+
+    monkeypatch.setattr("app.services.database.QuizJobRepository", _FakeRepo)
+    monkeypatch.setattr(deps, "async_session_factory", lambda: _Ctx(), raising=False)
+    monkeypatch.setattr(deps, "get_redis_client", lambda: redis, raising=False)
+    monkeypatch.setattr(ar, "_recover_one", _must_not_run)
+
+    app = SimpleNamespace(state=SimpleNamespace(agent_graph=object()))
+    assert await ar.sweep_once(app) == 1
+    [job] = await get_agent_queue(redis).claim("w1", 5)
+    assert (job.quiz_id, job.reason) == (qid, "recovery")
+
+
+def test_queue_off_by_default_and_config_validation(redis):
+    assert get_agent_queue(redis) is None
+    with pytest.raises(ValueError):
+        AgentQueueConfig(worker_concurrency=0)
+    with pytest.raises(ValueError):
+        AgentQueueConfig(max_deliveries=0)
@@ -0,0 +1,131 @@
+"""Image-URL liveness cache + pooled prober (`image_liveness.py`).
+
+- Our own media / blob URLs resolve alive with no network call.
+- A second quiz start over the same pack answers from Redis: zero probes.
+- Dead URLs are cached under the (shorter) negative TTL.
+- Probes to one host share one pooled client; Redis faults fail open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis as fa
+import httpx
+import pytest
+
+from app.services import image_liveness as il
+
+CDN = "https://v3.fal.media/files"
+
+
+@pytest.fixture(autouse=True)
+def _public_dns(monkeypatch):
+    from app.services.precompute import outbound
+
+    monkeypatch.setattr(outbound, "assert_url_safe", lambda url, **_: "93.184.216.34")
+
+
+class _Cdn:
+    """MockTransport handler: HEAD 200 unless the path contains ``dead``."""
+
+    def __init__(self) -> None:
+        self.heads: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.method == "HEAD"
+        self.heads.append(str(request.url))
+        return httpx.Response(404 if "dead" in request.url.path else 200)
+
+
+def _prober(redis, cdn: _Cdn, **kw) -> il.ImageLivenessProber:
+    return il.ImageLivenessProber(
+        redis_factory=lambda: redis,
+        transport_factory=lambda: httpx.MockTransport(cdn),
+        local_prefixes=["/api/v1/media/", "https://acct.blob.core.windows.net/media/"],
+        **kw,
+    )
+
+
+async def test_local_urls_resolve_without_network():
+    cdn = _Cdn()
+    p = _prober(None, cdn)
+
+    assert await p.alive("/api/v1/media/1234")
+    assert await p.alive("https://acct.blob.core.windows.net/media/abcd")
+    assert cdn.heads == []
+    assert p.stats()["local_hits"] == 2
+
+
+async def test_second_start_is_served_from_redis():
+    redis, cdn = fa.FakeRedis(), _Cdn()
+    urls = [f"{CDN}/char-{i}.png" for i in range(20)]
+
+    with il.liveness_report() as first:
+        assert all(await asyncio.gather(*[_prober(redis, cdn).alive(u) for u in urls]))
+    # A different worker (fresh prober) shares the Redis answers.
+    other = _prober(redis, cdn)
+    with il.liveness_report() as second:
+        assert all(await asyncio.gather(*[other.alive(u) for u in urls]))
+
+    assert first.probes == 20 and len(cdn.heads) == 20
+    snap = second.snapshot(avg_probe_ms=100.0)
+    assert snap["probes"] == 0
+    assert snap["cache_hits"] == 20
+    assert snap["hit_rate"] == 1.0
+    assert snap["saved_ms_est"] == 2000.0
+
+
+async def test_dead_url_cached_with_negative_ttl():
+    redis, cdn = fa.FakeRedis(), _Cdn()
+    p = _prober(redis, cdn, alive_ttl_s=3600, dead_ttl_s=60)
+    live, dead = f"{CDN}/ok.png", f"{CDN}/dead.png"
+
+    assert await p.alive(live)
+    assert not await p.alive(dead)
+    assert not await p.alive(dead)
+
+    assert cdn.heads == [live, dead]
+    assert 3000 < await redis.ttl(f"imgalive:{il._digest(live)}") <= 3600
+    assert 0 < await redis.ttl(f"imgalive:{il._digest(dead)}") <= 60
+
+
+async def test_one_pooled_client_per_host():
+    cdn = _Cdn()
+    p = _prober(None, cdn)
+
+    await asyncio.gather(*[p.alive(f"{CDN}/c{i}.png") for i in range(5)])
+    await p.alive("https://other.example/x.png")
+
+    assert len(cdn.heads) == 6
+    assert p.stats()["pooled_hosts"] == 2
+    await p.aclose()
+    assert p.stats()["pooled_hosts"] == 0
+
+
+async def test_redis_fault_fails_open_to_probe():
+    class _Broken:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, *a, **k):
+            raise ConnectionError("down")
+
+    cdn = _Cdn()
+    p = _prober(_Broken(), cdn)
+
+    assert await p.alive(f"{CDN}/ok.png")
+    assert len(cdn.heads) == 1
+
+
+async def test_ssrf_blocked_url_is_dead_without_request(monkeypatch):
+    from app.services.precompute import outbound
+
+    def _block(url, **_):
+        raise outbound.SSRFBlockedError("10.0.0.1", reason="private")
+
+    monkeypatch.setattr(outbound, "assert_url_safe", _block)
+    cdn = _Cdn()
+
+    assert not await _prober(None, cdn).alive("http://10.0.0.1/x.png")
+    assert cdn.heads == []
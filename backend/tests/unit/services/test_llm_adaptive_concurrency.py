@@ -0,0 +1,183 @@
+"""§17.1 — token-aware AIMD admission (``llm_adaptive_concurrency``).
+
+- admission is weighted by estimated tokens and FIFO per model lane;
+- an oversize call still runs when its lane is idle (no starvation);
+- 429 / timeout cut the budget multiplicatively (once per cooldown), fast
+  successes on a busy lane grow it additively, slow successes trim it;
+- a waiter that times out raises ``LLMConcurrencyTimeoutError`` and leaks
+  nothing;
+- ``LLMService`` routes each provider attempt through the controller when
+  enabled, and the call-count limiter's ``metrics()`` exposes its state.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.services.llm_adaptive_concurrency import (
+    AdaptiveTokenLimiter,
+    classify_outcome,
+    estimate_call_tokens,
+)
+from app.services.llm_concurrency import (
+    LLMConcurrencyLimiter,
+    LLMConcurrencyTimeoutError,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def _limiter(**kw) -> AdaptiveTokenLimiter:
+    base = {"initial_tokens": 10_000, "min_tokens": 1_000, "max_tokens": 40_000, "acquire_timeout_s": 1.0}
+    base.update(kw)
+    return AdaptiveTokenLimiter(**base)
+
+
+def test_estimate_and_classify():
+    assert estimate_call_tokens("x" * 400, 200) == 300
+    assert estimate_call_tokens(None, None) == 1
+    assert classify_outcome(None) == "ok"
+    assert classify_outcome(_RateLimited()) == "rate_limited"
+    assert classify_outcome(asyncio.TimeoutError()) == "timeout"
+    assert classify_outcome(ValueError("schema")) == "error"
+
+
+async def test_admission_is_token_weighted_and_fifo():
+    lim = _limiter()
+    first = await lim.acquire("m", 6_000)
+    big = asyncio.create_task(lim.acquire("m", 6_000))
+    small = asyncio.create_task(lim.acquire("m", 3_000))  # would fit, but queued behind `big`
+    await asyncio.sleep(0)
+    assert not big.done() and not small.done()
+
+    lim.release(first, None, 0.0)
+    await asyncio.wait_for(asyncio.gather(big, small), 0.5)
+    m = lim.metrics()["lanes"]["m"]
+    assert (m["in_flight_tokens"], m["active"], m["waited"]) == (9_000, 2, 2)
+    # Separate models never block each other.
+    other = await asyncio.wait_for(lim.acquire("other", 9_000), 0.1)
+    assert other.key == "other"
+
+
+async def test_oversize_call_admitted_when_lane_idle():
+    lim = _limiter()
+    grant = await asyncio.wait_for(lim.acquire("m", 50_000), 0.1)
+    assert lim.metrics()["lanes"]["m"]["in_flight_tokens"] == 50_000
+    lim.release(grant, "ok", 1.0)
+
+
+async def test_rate_limit_cuts_once_per_cooldown_and_success_grows():
+    clock = _Clock()
+    lim = _limiter(decrease_factor=0.5, cooldown_s=2.0, clock=clock)
+    grants = [await lim.acquire("m", 2_500) for _ in range(4)]
+    lim.release(grants[0], "rate_limited", 0.1)
+    lim.release(grants[1], "rate_limited", 0.1)  # same burst — ignored
+    assert lim.limit_for("m") == 5_000
+
+    clock.now = 3.0
+    lim.release(grants[2], "timeout", 0.1)
+    assert lim.limit_for("m") == 2_500
+
+    lim.release(grants[3], None, 0.0)
+    before = lim.limit_for("m")
+    busy = [await lim.acquire("m", 1_000) for _ in range(2)]  # lane ≥ half full
+    for g in busy:
+        lim.release(g, "ok", 0.5)
+    assert lim.limit_for("m") > before
+    m = lim.metrics()["lanes"]["m"]
+    assert (m["rate_limited"], m["timeouts"], m["decreases"]) == (2, 1, 2)
+    assert m["in_flight_tokens"] == 0
+
+
+async def test_slow_success_trims_budget():
+    lim = _limiter(slow_decrease_factor=0.9, latency_tolerance=2.0, cooldown_s=0)
+    g = await lim.acquire("m", 1_000)
+    lim.release(g, "ok", 1.0)  # sets the baseline
+    g = await lim.acquire("m", 1_000)
+    lim.release(g, "ok", 5.0)  # 5× slower per token
+    assert lim.limit_for("m") == 9_000
+    assert lim.metrics()["lanes"]["m"]["slow"] == 1
+
+
+async def test_waiter_timeout_raises_and_leaks_nothing():
+    lim = _limiter(acquire_timeout_s=0.05)
+    held = await lim.acquire("m", 9_000)
+    with pytest.raises(LLMConcurrencyTimeoutError):
+        await lim.acquire("m", 5_000, tool="write_final_user_profile")
+    lim.release(held, None, 0.0)
+    m = lim.metrics()["lanes"]["m"]
+    assert (m["in_flight_tokens"], m["waiting"], m["wait_timeouts"]) == (0, 0, 1)
+    await asyncio.wait_for(lim.acquire("m", 5_000), 0.1)
+
+
+async def test_admit_feeds_back_provider_errors():
+    lim = _limiter(decrease_factor=0.5)
+    with pytest.raises(_RateLimited):
+        async with lim.admit("m", 1_000):
+            raise _RateLimited()
+    assert lim.limit_for("m") == 5_000
+    assert lim.metrics()["lanes"]["m"]["in_flight_tokens"] == 0
+
+
+def test_call_limiter_metrics_report_adaptive_disabled_by_default():
+    from app.services.llm_adaptive_concurrency import reset_adaptive_limiter_for_tests
+
+    reset_adaptive_limiter_for_tests()
+    m = LLMConcurrencyLimiter(capacity=2, acquire_timeout_s=1.0).metrics()
+    assert m["adaptive"] == {"enabled": False}
+
+
+class _Out(BaseModel):
+    name: str
+
+
+@pytest.mark.usefixtures("litellm_aresponses_via_sync_stub")
+async def test_llm_service_routes_attempts_through_controller(monkeypatch):
+    from app.core.config import settings
+    from app.services import llm_adaptive_concurrency as adaptive_mod
+    from app.services import llm_service as llm_mod
+
+    monkeypatch.setattr(settings.llm.adaptive_concurrency, "enabled", True)
+    adaptive_mod.reset_adaptive_limiter_for_tests()
+    seen: list[int] = []
+
+    def _sync_responses(**kwargs):
+        lanes = adaptive_mod.get_adaptive_limiter().metrics()["lanes"]
+        seen.append(lanes[kwargs["model"]]["in_flight_tokens"])
+        return SimpleNamespace(output_parsed={"name": "ok"})
+
+    async def _fake_to_thread(func, **kwargs):
+        return func(**kwargs)
+
+    monkeypatch.setattr(llm_mod.asyncio, "to_thread", _fake_to_thread)
+    monkeypatch.setattr(llm_mod.litellm, "responses", _sync_responses)
+    try:
+        res = await llm_mod.LLMService().get_structured_response(
+            tool_name="decide_next_step",
+            messages=[],
+            response_model=_Out,
+            model="gpt-4o-mini",
+            max_output_tokens=200,
+        )
+        assert res.name == "ok"
+        assert seen and seen[0] >= 200
+        lane = adaptive_mod.get_adaptive_limiter().metrics()["lanes"]["gpt-4o-mini"]
+        assert (lane["admitted"], lane["in_flight_tokens"]) == (1, 0)
+        assert LLMConcurrencyLimiter(capacity=1, acquire_timeout_s=1.0).metrics()["adaptive"]["enabled"]
+    finally:
+        adaptive_mod.reset_adaptive_limiter_for_tests()
@@ -143,6 +143,7 @@ async def test_metrics_never_raise_and_are_consistent() -> None:
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("litellm_aresponses_via_sync_stub")
 async def test_llm_service_uses_global_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
     """End-to-end: LLMService.get_structured_response acquires the global limiter."""
     from app.services import llm_concurrency
@@ -63,6 +63,7 @@ def _make_responses_api_response(*, model: str, input_tokens: int, output_tokens
 # 1. WRAPPER: the structured attempt meters cost off a stubbed litellm.responses.
 # ---------------------------------------------------------------------------
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("litellm_aresponses_via_sync_stub")
 async def test_structured_attempt_meters_cost_from_stubbed_responses(monkeypatch):
     """A structured attempt over a stubbed ``litellm.responses`` records cents > 0
     into the daily counter via the wrapper's ``record_llm_cost`` step."""
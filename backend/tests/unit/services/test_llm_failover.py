@@ -53,7 +53,7 @@ def _single_attempt(monkeypatch):
 
 
 @pytest.fixture
-def collector(monkeypatch):
+def collector(monkeypatch, litellm_aresponses_via_sync_stub):
     """Patch ``litellm.responses`` (run via to_thread) so we control per-model
     behaviour. ``by_model`` maps a model string to either an exception to raise
     or a response object to return; ``calls`` records (model) per invocation."""
@@ -0,0 +1,177 @@
+"""Hedged structured calls (`llm_hedging.py` + `LLMService._hedged_response`).
+
+- A primary slower than the hedge delay is raced by the fallback; the first
+  valid result wins and the loser is cancelled and charged its prompt.
+- Fast primaries, spent budgets and non-opted-in tools take the plain path
+  (including its single failover); the delay tracks observed latency.
+- A cancelled caller charges every attempt still in flight; the threaded
+  transport never hedges.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import LLMHedgingConfig, LLMTransportConfig, settings
+from app.services import cost_meter
+from app.services import llm_hedging as hedge_mod
+from app.services import llm_service as llm_mod
+from app.services import llm_transport as transport_mod
+from app.services.llm_hedging import HedgeBudget, LLMHedger
+
+PRIMARY = "gpt-4o-mini"
+FALLBACK = "gemini/gemini-flash-latest"
+
+
+class _Out(BaseModel):
+    model: str
+
+
+class _Transient(asyncio.TimeoutError):
+    pass
+
+
+@pytest.fixture
+def hedger(monkeypatch):
+    h = LLMHedger(
+        tools={"initial_planner"},
+        min_samples=3,
+        min_delay_s=0.01,
+        cold_delay_s=0.05,
+        max_delay_s=1.0,
+        budget_per_minute=5,
+    )
+    monkeypatch.setattr(hedge_mod, "get_llm_hedger", lambda: h)
+    return h
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Per-model (delay_s, error) behaviour for ``_attempt_for_model``."""
+    state = {"plan": {}, "started": [], "cancelled": [], "abandoned": []}
+
+    async def _attempt(self, *, model, **_kw):
+        state["started"].append(model)
+        delay, error = state["plan"].get(model, (0.0, None))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"].append(model)
+            raise
+        if error is not None:
+            raise error
+        return _Out(model=model)
+
+    async def _abandoned(**kw):
+        state["abandoned"].append((kw["model"], kw["prompt_tokens"]))
+
+    monkeypatch.setattr(llm_mod.LLMService, "_attempt_for_model", _attempt)
+    monkeypatch.setattr(cost_meter, "record_abandoned_llm_call", _abandoned)
+    return state
+
+
+async def _call(tool: str = "initial_planner") -> _Out:
+    return await llm_mod.LLMService().get_structured_response(
+        tool_name=tool,
+        messages=[{"role": "user", "content": "x" * 400}],
+        response_model=_Out,
+        model=PRIMARY,
+    )
+
+
+async def test_slow_primary_is_hedged_and_loser_charged(hedger, provider):
+    provider["plan"] = {PRIMARY: (5.0, None), FALLBACK: (0.01, None)}
+    out = await asyncio.wait_for(_call(), 2.0)
+    assert out.model == FALLBACK
+    assert provider["started"] == [PRIMARY, FALLBACK]
+    assert provider["cancelled"] == [PRIMARY]
+    assert provider["abandoned"] and provider["abandoned"][0][0] == PRIMARY
+    assert provider["abandoned"][0][1] >= 100
+    m = hedger.metrics()
+    assert (m["hedges_fired"], m["hedge_wins"], m["losers_cancelled"]) == (1, 1, 1)
+    assert m["budget_remaining"] == 4
+
+
+async def test_fast_primary_is_not_hedged_and_trains_delay(hedger, provider):
+    provider["plan"] = {PRIMARY: (0.02, None)}
+    for _ in range(3):
+        assert (await _call()).model == PRIMARY
+    assert provider["started"] == [PRIMARY] * 3
+    assert hedger.metrics()["hedges_fired"] == 0
+    assert 0.02 <= hedger.delay_for("initial_planner", PRIMARY) < hedger.cold_delay_s
+
+
+async def test_hedge_failure_still_returns_primary(hedger, provider):
+    provider["plan"] = {PRIMARY: (0.15, None), FALLBACK: (0.0, _Transient("down"))}
+    assert (await _call()).model == PRIMARY
+    assert provider["cancelled"] == [] and provider["abandoned"] == []
+    assert hedger.metrics()["primary_wins"] == 1
+
+
+async def test_both_failing_surfaces_fallback_error(hedger, provider):
+    provider["plan"] = {PRIMARY: (0.1, _Transient("p")), FALLBACK: (0.0, _Transient("fb"))}
+    with pytest.raises(_Transient, match="fb"):
+        await _call()
+    assert provider["started"] == [PRIMARY, FALLBACK]
+
+
+async def test_fast_failure_uses_plain_failover_once(hedger, provider):
+    provider["plan"] = {PRIMARY: (0.0, _Transient("429"))}
+    assert (await _call()).model == FALLBACK
+    assert provider["started"] == [PRIMARY, FALLBACK]
+    assert hedger.metrics()["hedges_fired"] == 0
+
+
+async def test_budget_and_tool_opt_in_gate_hedging(hedger, provider):
+    provider["plan"] = {PRIMARY: (0.1, None), FALLBACK: (0.0, None)}
+    assert (await _call(tool="decision_maker")).model == PRIMARY
+
+    hedger.budget = HedgeBudget(0)
+    assert (await _call()).model == PRIMARY
+    assert provider["started"] == [PRIMARY, PRIMARY]
+    assert hedger.metrics()["budget_denied"] == 1
+
+
+async def test_cancelled_caller_charges_both_in_flight_attempts(hedger, provider):
+    provider["plan"] = {PRIMARY: (5.0, None), FALLBACK: (5.0, None)}
+    call = asyncio.create_task(_call())
+    while len(provider["started"]) < 2:
+        await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert sorted(provider["cancelled"]) == sorted([PRIMARY, FALLBACK])
+    assert sorted(m for m, _ in provider["abandoned"]) == sorted([PRIMARY, FALLBACK])
+
+
+async def test_threaded_transport_never_hedges(hedger, provider, monkeypatch):
+    monkeypatch.setattr(settings.llm, "transport", LLMTransportConfig(native_async=False))
+    transport_mod.reset_llm_transport_for_tests()
+    try:
+        provider["plan"] = {PRIMARY: (0.1, None), FALLBACK: (0.0, None)}
+        assert (await _call()).model == PRIMARY
+        assert provider["started"] == [PRIMARY]
+        assert hedger.metrics()["hedges_fired"] == 0
+    finally:
+        transport_mod.reset_llm_transport_for_tests()
+
+
+def test_budget_is_a_rolling_minute():
+    now = [0.0]
+    budget = HedgeBudget(2, clock=lambda: now[0])
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+    now[0] = 59.9
+    assert not budget.try_spend()
+    now[0] = 60.0
+    assert budget.try_spend() and budget.remaining() == 1
+
+
+def test_config_validation():
+    with pytest.raises(ValueError):
+        LLMHedgingConfig(percentile=1.0)
+    with pytest.raises(ValueError):
+        LLMHedgingConfig(min_delay_s=5.0, cold_delay_s=2.0)
@@ -0,0 +1,169 @@
+"""Priority lanes in the LLM concurrency limiter (`llm_concurrency.py`).
+
+- Reserved slots per lane; the rest is shared headroom any lane may borrow.
+- Freed slots go to the highest-priority waiter, unless an older waiter has
+  aged past ``promote_after_s`` (starvation guard for batch work).
+- Lane chosen via the ``llm_priority`` contextvar; per-lane wait histograms
+  in ``metrics()["lanes"]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+
+from app.services.llm_concurrency import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    LLMConcurrencyLimiter,
+    LLMConcurrencyTimeoutError,
+    current_llm_priority,
+    llm_priority,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _hold(limiter: LLMConcurrencyLimiter, lane: str, release: asyncio.Event, log: list[str]):
+    async with limiter.acquire(tool=lane, priority=lane):
+        log.append(lane)
+        await release.wait()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_reservation_keeps_slots_for_interactive() -> None:
+    limiter = LLMConcurrencyLimiter(
+        capacity=4,
+        acquire_timeout_s=1.0,
+        reserved={PRIORITY_INTERACTIVE: 2, PRIORITY_BATCH: 1},
+    )
+    release = asyncio.Event()
+    log: list[str] = []
+    batch = [asyncio.create_task(_hold(limiter, PRIORITY_BATCH, release, log)) for _ in range(3)]
+    await _settle()
+    # Own reservation + the single shared slot; the third must not touch
+    # interactive's reserved pair.
+    assert log.count(PRIORITY_BATCH) == 2
+    lanes = limiter.metrics()["lanes"]
+    assert lanes[PRIORITY_BATCH]["waiting"] == 1
+
+    inter = [asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log)) for _ in range(2)]
+    await _settle()
+    assert log.count(PRIORITY_INTERACTIVE) == 2
+
+    release.set()
+    await asyncio.wait_for(asyncio.gather(*batch, *inter), 1.0)
+    m = limiter.metrics()
+    assert m["in_flight"] == 0
+    assert m["lanes"][PRIORITY_BATCH]["acquired"] == 3
+    assert m["lanes"][PRIORITY_INTERACTIVE]["in_use"] == 0
+
+
+@pytest.mark.parametrize("capacity", [1, 2, 3, 4, 6])
+async def test_small_capacity_never_starves_a_lane(capacity: int) -> None:
+    """Default reservations (6/3/1) exceed a small capacity; every lane must
+    still get a slot on an idle limiter, and while interactive holds its own."""
+    limiter = LLMConcurrencyLimiter(
+        capacity=capacity,
+        acquire_timeout_s=0.2,
+        reserved={PRIORITY_INTERACTIVE: 6, PRIORITY_BACKGROUND: 3, PRIORITY_BATCH: 1},
+    )
+    for lane in (PRIORITY_BACKGROUND, PRIORITY_BATCH, PRIORITY_INTERACTIVE):
+        async with limiter.acquire(tool=lane, priority=lane):
+            pass
+
+    reserved = limiter.metrics()["lanes"]
+    assert sum(reserved[lane]["reserved"] for lane in reserved) <= capacity
+
+    release = asyncio.Event()
+    log: list[str] = []
+    inter = asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log))
+    await _settle()
+    if capacity > 1:
+        async with limiter.acquire(tool="bg", priority=PRIORITY_BACKGROUND):
+            pass
+    release.set()
+    await asyncio.wait_for(inter, 1.0)
+    assert limiter.metrics()["in_flight"] == 0
+
+
+async def test_freed_slot_goes_to_highest_priority_waiter() -> None:
+    limiter = LLMConcurrencyLimiter(capacity=1, acquire_timeout_s=1.0)
+    release = asyncio.Event()
+    log: list[str] = []
+    holder = asyncio.create_task(_hold(limiter, PRIORITY_BATCH, release, log))
+    await _settle()
+    waiters = [
+        asyncio.create_task(_hold(limiter, lane, release, log))
+        for lane in (PRIORITY_BATCH, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE)
+    ]
+    await _settle()
+    release.set()
+    await asyncio.wait_for(asyncio.gather(holder, *waiters), 1.0)
+    assert log == [PRIORITY_BATCH, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BATCH]
+
+
+async def test_aged_batch_waiter_is_not_starved() -> None:
+    limiter = LLMConcurrencyLimiter(capacity=1, acquire_timeout_s=1.0, promote_after_s=0.05)
+    release = asyncio.Event()
+    log: list[str] = []
+    holder = asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log))
+    await _settle()
+    batch = asyncio.create_task(_hold(limiter, PRIORITY_BATCH, release, log))
+    await asyncio.sleep(0.08)
+    inter = asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log))
+    await _settle()
+    release.set()
+    await asyncio.wait_for(asyncio.gather(holder, batch, inter), 1.0)
+    assert log == [PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_INTERACTIVE]
+
+
+async def test_contextvar_selects_lane_and_histograms_record_waits() -> None:
+    limiter = LLMConcurrencyLimiter(capacity=1, acquire_timeout_s=0.05)
+    assert current_llm_priority() == PRIORITY_INTERACTIVE
+    with llm_priority(PRIORITY_BACKGROUND):
+        async with limiter.acquire(tool="agent"):
+            with pytest.raises(LLMConcurrencyTimeoutError):
+                async with limiter.acquire(tool="other", priority=PRIORITY_BATCH):
+                    pass
+    assert current_llm_priority() == PRIORITY_INTERACTIVE
+
+    lanes = limiter.metrics()["lanes"]
+    assert lanes[PRIORITY_BACKGROUND]["acquired"] == 1
+    assert lanes[PRIORITY_BACKGROUND]["queue_wait"]["buckets_ms"]["le_1"] == 1
+    assert lanes[PRIORITY_BATCH]["timeouts"] == 1
+    batch_wait = lanes[PRIORITY_BATCH]["queue_wait"]
+    assert batch_wait["count"] == 1 and batch_wait["sum_ms"] >= 40
+    assert batch_wait["buckets_ms"]["le_100"] == 1
+    assert limiter.metrics()["in_flight"] == 0
+
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+async def test_cancelled_waiter_does_not_leak_or_block_queue() -> None:
+    limiter = LLMConcurrencyLimiter(capacity=1, acquire_timeout_s=0)
+    release = asyncio.Event()
+    log: list[str] = []
+    holder = asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log))
+    await _settle()
+    doomed = asyncio.create_task(_hold(limiter, PRIORITY_INTERACTIVE, release, log))
+    after = asyncio.create_task(_hold(limiter, PRIORITY_BATCH, release, log))
+    await _settle()
+    doomed.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await doomed
+    release.set()
+    await asyncio.wait_for(asyncio.gather(holder, after), 1.0)
+    assert log == [PRIORITY_INTERACTIVE, PRIORITY_BATCH]
+    m = limiter.metrics()
+    assert m["in_flight"] == 0
+    assert all(lane["in_use"] == 0 and lane["waiting"] == 0 for lane in m["lanes"].values())
@@ -14,7 +14,11 @@ import pytest
 from app.core.config import settings
 from app.services import llm_service as llm_mod
 
-pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.asyncio,
+    pytest.mark.usefixtures("litellm_aresponses_via_sync_stub"),
+]
 
 
 class _FakeResp:
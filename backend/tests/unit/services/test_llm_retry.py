@@ -34,7 +34,7 @@ def _no_sleep(monkeypatch):
 
 
 @pytest.fixture
-def collector(monkeypatch):
+def collector(monkeypatch, litellm_aresponses_via_sync_stub):
     """Patch litellm.responses + asyncio.to_thread so we control raise/return.
 
     ``calls`` records arg payloads; ``raises`` is a list of exceptions to
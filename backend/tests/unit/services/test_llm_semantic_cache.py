@@ -0,0 +1,164 @@
+"""Topic-keyed LLM response cache (`llm_semantic_cache.py`).
+
+- Spelling / punctuation variants of a topic share one cached result.
+- Optional semantic tier serves near-duplicate topics at/above a cosine
+  threshold; below it is a miss.
+- Per-user adaptive tools are never cached (refused by the cache and by the
+  config validator); other inputs (variant, prompt version) partition keys.
+- Redis faults fail open; `invoke_structured` only pays on a miss.
+"""
+
+from __future__ import annotations
+
+import math
+
+import fakeredis.aioredis as fa
+import pytest
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.agent import llm_helpers
+from app.core.config import LLMSemanticCacheConfig
+from app.services import llm_semantic_cache as sc
+
+
+class _Plan(BaseModel):
+    title: str
+    archetypes: list[str]
+
+
+PLAN = _Plan(title="Which House?", archetypes=["Gryffindor", "Slytherin"])
+KEY = {"variant": {"outcome_kind": "types"}, "prompt_version": "v1", "model": "m"}
+
+
+def _unit(*xs: float) -> list[float]:
+    n = math.sqrt(sum(x * x for x in xs))
+    return [x / n for x in xs]
+
+
+VECTORS = {
+    "hogwarts houses": _unit(1, 0, 0),
+    "harry potter houses": _unit(0.95, 0.31, 0),  # cos ≈ 0.95
+    "star wars jedi": _unit(0, 0, 1),
+}
+
+
+async def _fake_embed(text: str):
+    return VECTORS.get(text)
+
+
+def _cache(redis, **kw) -> sc.SemanticLLMCache:
+    return sc.SemanticLLMCache(
+        redis_factory=lambda: redis,
+        namespace="t",
+        tool_ttls_s={"initial_planner": 60, "profile_batch_writer": 60},
+        embed_fn=_fake_embed,
+        **kw,
+    )
+
+
+@pytest.fixture
+def redis():
+    return fa.FakeRedis(decode_responses=True)
+
+
+async def test_topic_variants_share_an_exact_hit(redis):
+    cache = _cache(redis)
+    assert await cache.lookup("initial_planner", topic="Hogwarts Houses", response_model=_Plan, **KEY) is None
+    await cache.store("initial_planner", topic="Hogwarts Houses", response_model=_Plan, value=PLAN, **KEY)
+
+    hit = await cache.lookup("initial_planner", topic="  hogwarts-houses!! ", response_model=_Plan, **KEY)
+    assert hit == PLAN and isinstance(hit, _Plan)
+    assert await redis.ttl(next(k for k in await redis.keys("t:*") if not k.endswith(":vec"))) <= 60
+
+    stats = cache.stats()["initial_planner"]
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5 and stats["semantic_hits"] == 0
+
+
+async def test_semantic_tier_respects_threshold(redis):
+    cache = _cache(redis, semantic_threshold=0.9)
+    await cache.store("initial_planner", topic="Hogwarts houses", response_model=_Plan, value=PLAN, **KEY)
+
+    assert await cache.lookup("initial_planner", topic="Harry Potter houses", response_model=_Plan, **KEY) == PLAN
+    assert await cache.lookup("initial_planner", topic="Star Wars Jedi", response_model=_Plan, **KEY) is None
+    assert cache.stats()["initial_planner"]["semantic_hits"] == 1
+
+    strict = _cache(redis, semantic_threshold=0.99)
+    assert await strict.lookup("initial_planner", topic="Harry Potter houses", response_model=_Plan, **KEY) is None
+
+
+async def test_variant_and_prompt_version_partition_keys(redis):
+    cache = _cache(redis)
+    await cache.store("initial_planner", topic="cats", response_model=_Plan, value=PLAN, **KEY)
+    other_variant = {**KEY, "variant": {"outcome_kind": "characters"}}
+    other_prompt = {**KEY, "prompt_version": "v2"}
+    for key in (other_variant, other_prompt):
+        assert await cache.lookup("initial_planner", topic="cats", response_model=_Plan, **key) is None
+
+
+async def test_list_results_round_trip_through_type_adapter(redis):
+    cache = _cache(redis)
+    adapter = TypeAdapter(list[_Plan])
+    await cache.store("profile_batch_writer", topic="cats", response_model=adapter, value=[PLAN, PLAN], **KEY)
+    assert await cache.lookup("profile_batch_writer", topic="Cats", response_model=adapter, **KEY) == [PLAN, PLAN]
+
+
+async def test_per_user_tools_are_never_cached(redis):
+    cache = sc.SemanticLLMCache(
+        redis_factory=lambda: redis, namespace="t", tool_ttls_s={"decision_maker": 60}
+    )
+    assert not cache.cacheable("decision_maker")
+    await cache.store("decision_maker", topic="cats", response_model=_Plan, value=PLAN, **KEY)
+    assert await redis.keys("*") == []
+
+    with pytest.raises(ValidationError, match="per-user"):
+        LLMSemanticCacheConfig(tool_ttls_s={"next_question_generator": 60})
+    with pytest.raises(ValidationError):
+        LLMSemanticCacheConfig(semantic_threshold=1.5)
+
+
+async def test_redis_faults_fail_open(redis):
+    class _Broken:
+        async def get(self, *a, **k):
+            raise ConnectionError("down")
+
+        async def set(self, *a, **k):
+            raise ConnectionError("down")
+
+    cache = _cache(_Broken())
+    await cache.store("initial_planner", topic="cats", response_model=_Plan, value=PLAN, **KEY)
+    assert await cache.lookup("initial_planner", topic="cats", response_model=_Plan, **KEY) is None
+    assert cache.stats()["initial_planner"]["errors"] == 2
+
+    unconfigured = _cache(None)
+    assert await unconfigured.lookup("initial_planner", topic="cats", response_model=_Plan, **KEY) is None
+
+
+async def test_invoke_structured_pays_only_on_miss(redis, monkeypatch):
+    calls = []
+
+    class _Svc:
+        async def get_structured_response(self, **kwargs):
+            calls.append(kwargs["tool_name"])
+            return PLAN
+
+    monkeypatch.setattr(llm_helpers, "llm_service", _Svc())
+    monkeypatch.setattr(llm_helpers, "get_semantic_cache", lambda: _cache(redis))
+
+    async def run(tool: str, topic: str, variant: dict | None = None):
+        return await llm_helpers.invoke_structured(
+            tool_name=tool,
+            messages=[],
+            response_model=_Plan,
+            cache_topic=topic,
+            cache_variant=variant or {"outcome_kind": "types"},
+        )
+
+    assert await run("initial_planner", "Hogwarts Houses") == PLAN
+    assert await run("initial_planner", "hogwarts houses.") == PLAN
+    assert calls == ["initial_planner"]
+
+    await run("initial_planner", "hogwarts houses", {"outcome_kind": "characters"})
+    await run("decision_maker", "hogwarts houses")
+    await run("decision_maker", "hogwarts houses")
+    assert calls == ["initial_planner", "initial_planner", "decision_maker", "decision_maker"]
@@ -318,7 +318,7 @@ def service():
     return llm_mod.LLMService()
 
 @pytest.fixture
-def mock_litellm(monkeypatch):
+def mock_litellm(monkeypatch, litellm_aresponses_via_sync_stub):
     """Patch litellm.responses and asyncio.to_thread to run synchronously."""
 
     response_container = {"resp": None, "kwargs": None, "raise_error": None}
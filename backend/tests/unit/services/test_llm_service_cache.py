@@ -22,7 +22,7 @@ def service():
 
 
 @pytest.fixture
-def mock_litellm(monkeypatch):
+def mock_litellm(monkeypatch, litellm_aresponses_via_sync_stub):
     """Capture the kwargs passed to litellm.responses for assertion."""
     container = {"kwargs": None, "resp": SimpleNamespace(output_parsed={"ok": True})}
 
@@ -0,0 +1,177 @@
+"""Native-async LLM transport (`llm_transport.py` + `LLMService` wiring).
+
+- One pooled handler per provider, reused across calls; HTTP/2 only where
+  configured and available; in-use / call counters in ``metrics()``.
+- By default the service calls ``litellm.aresponses`` with the pooled
+  client and never touches ``asyncio.to_thread``; streaming works the same.
+- The real ``litellm.aresponses`` sends its request through the pooled
+  handler (mocked at the httpx transport).
+- ``llm.transport.native_async = False`` restores the threaded path.
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import LLMTransportConfig, settings
+from app.services import llm_service as llm_mod
+from app.services import llm_transport as transport_mod
+from app.services.llm_transport import LLMTransportPool, provider_for
+
+
+class _Out(BaseModel):
+    ok: bool
+
+
+_BODY = {"output_text": json.dumps({"ok": True})}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_transport():
+    transport_mod.reset_llm_transport_for_tests()
+    yield
+    transport_mod.reset_llm_transport_for_tests()
+
+
+@pytest.fixture
+def no_threads(monkeypatch):
+    async def _boom(*_a, **_k):
+        raise AssertionError("native transport must not use a worker thread")
+
+    monkeypatch.setattr(llm_mod.asyncio, "to_thread", _boom)
+
+
+def test_provider_for_model_names():
+    assert provider_for("gpt-4o-mini") == "openai"
+    assert provider_for("anthropic/claude-3-5-haiku-latest") == "anthropic"
+    assert provider_for("not-a-provider/some-model") == "not-a-provider"
+    assert provider_for(None) == "openai"
+
+
+async def test_pool_per_provider_is_reused_and_metered(monkeypatch):
+    monkeypatch.setattr(transport_mod, "http2_available", lambda: True)
+    pool = LLMTransportPool(max_connections=8, max_keepalive_connections=4, http2_providers={"openai"})
+    async with pool.lease("gpt-4o-mini") as first:
+        async with pool.lease("openai/gpt-4o") as second:
+            assert first is second
+            assert pool.metrics()["openai"]["in_use"] == 2
+    async with pool.lease("anthropic/claude-3-5-haiku-latest") as other:
+        assert other is not first
+
+    m = pool.metrics()
+    assert m["openai"] == {
+        "http2": True,
+        "max_connections": 8,
+        "max_keepalive_connections": 4,
+        "connections": 0,
+        "idle_connections": 0,
+        "in_use": 0,
+        "peak_in_use": 2,
+        "calls": 2,
+    }
+    assert m["anthropic"]["http2"] is False
+    await pool.aclose()
+    assert pool.metrics() == {}
+
+
+async def test_service_uses_pooled_async_client(monkeypatch, no_threads):
+    seen = []
+
+    async def _aresponses(**kwargs):
+        seen.append(kwargs)
+        return _BODY
+
+    monkeypatch.setattr(llm_mod.litellm, "aresponses", _aresponses)
+    result = await llm_mod.LLMService().get_structured_response(
+        tool_name="t", messages=[], response_model=_Out, model="gpt-4o-mini"
+    )
+    assert result == _Out(ok=True)
+    pool = transport_mod.get_llm_transport()
+    assert seen[0]["client"] is pool._pools["openai"].handler
+    assert pool.metrics()["openai"]["calls"] == 1
+
+
+async def test_real_aresponses_goes_through_the_pooled_handler(monkeypatch, no_threads):
+    requests: list[httpx.Request] = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "id": "resp_t",
+                "object": "response",
+                "created_at": 0,
+                "status": "completed",
+                "model": "gpt-4o-mini",
+                "output": [
+                    {
+                        "type": "message",
+                        "id": "msg_t",
+                        "status": "completed",
+                        "role": "assistant",
+                        "content": [
+                            {"type": "output_text", "text": '{"ok": true}', "annotations": []}
+                        ],
+                    }
+                ],
+                "usage": {"input_tokens": 3, "output_tokens": 2, "total_tokens": 5},
+            },
+        )
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(httpx, "AsyncHTTPTransport", lambda **_k: httpx.MockTransport(_handle))
+    result = await llm_mod.LLMService().get_structured_response(
+        tool_name="t", messages=[], response_model=_Out, model="gpt-4o-mini"
+    )
+    assert result == _Out(ok=True)
+    assert [(r.method, r.url.path.rsplit("/", 1)[-1]) for r in requests] == [("POST", "responses")]
+    assert transport_mod.get_llm_transport().metrics()["openai"]["calls"] == 1
+
+
+async def test_native_streaming_emits_partials(monkeypatch, no_threads):
+    text = json.dumps({"ok": True})
+
+    async def _aresponses(**kwargs):
+        assert kwargs["stream"] is True
+
+        async def _events():
+            for ch in text:
+                yield SimpleNamespace(type="response.output_text.delta", delta=ch)
+
+        return _events()
+
+    monkeypatch.setattr(llm_mod.litellm, "aresponses", _aresponses)
+    partials = []
+    result = await llm_mod.LLMService().get_structured_response(
+        tool_name="t",
+        messages=[],
+        response_model=_Out,
+        on_partial=lambda path, value: partials.append((path, value)),
+    )
+    assert result == _Out(ok=True)
+    assert partials == [(("ok",), True)]
+
+
+async def test_kill_switch_restores_threaded_path(monkeypatch):
+    monkeypatch.setattr(settings.llm, "transport", LLMTransportConfig(native_async=False))
+    calls = []
+
+    async def _to_thread(func, **kwargs):
+        calls.append(func)
+        return _BODY
+
+    monkeypatch.setattr(llm_mod.asyncio, "to_thread", _to_thread)
+    await llm_mod.LLMService().get_structured_response(tool_name="t", messages=[], response_model=_Out)
+    assert transport_mod.get_llm_transport() is None
+    assert calls == [llm_mod.litellm.responses]
+
+
+def test_config_bounds():
+    with pytest.raises(ValueError):
+        LLMTransportConfig(max_connections=4, max_keepalive_connections=8)
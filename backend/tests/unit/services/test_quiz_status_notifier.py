@@ -0,0 +1,116 @@
+"""Pub/sub wake-ups for the quiz status long-poll (``quiz_status_notifier.py``).
+
+Runs against fakeredis' real PUBLISH/PSUBSCRIBE implementation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.quiz_status_notifier import (
+    QuizStatusNotifier,
+    publish_quiz_status,
+    status_channel,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.anyio]
+
+
+@pytest.fixture()
+def redis():
+    import fakeredis.aioredis as fa
+
+    return fa.FakeRedis(decode_responses=True)
+
+
+async def test_publish_wakes_only_the_matching_session(redis):
+    notifier = QuizStatusNotifier()
+    sid, other = uuid.uuid4(), uuid.uuid4()
+    try:
+        async with notifier.watch(redis, sid) as watch, notifier.watch(redis, other) as other_watch:
+            assert notifier.listening
+            assert await publish_quiz_status(redis, sid) is True
+            assert await watch.wait(2.0) is True
+            assert await other_watch.wait(0.05) is False
+        assert notifier.stats()["waiters"] == 0
+    finally:
+        await notifier.aclose()
+
+
+async def test_notification_before_wait_is_not_lost(redis):
+    notifier = QuizStatusNotifier()
+    sid = uuid.uuid4()
+    try:
+        async with notifier.watch(redis, sid) as watch:
+            await redis.publish(status_channel(sid), "1")
+            # Let the listener deliver before the caller reaches wait().
+            for _ in range(50):
+                if notifier.stats()["delivered"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert await watch.wait(0.0) is True
+    finally:
+        await notifier.aclose()
+
+
+async def test_many_waiters_share_one_subscription(redis):
+    notifier = QuizStatusNotifier()
+    sid = uuid.uuid4()
+
+    async def _park() -> bool:
+        async with notifier.watch(redis, sid) as watch:
+            return await watch.wait(2.0)
+
+    try:
+        tasks = [asyncio.create_task(_park()) for _ in range(20)]
+        while notifier.stats()["waiters"] < 20:
+            await asyncio.sleep(0.01)
+        await publish_quiz_status(redis, sid)
+        assert await asyncio.gather(*tasks) == [True] * 20
+        assert notifier.stats()["restarts"] == 1
+    finally:
+        await notifier.aclose()
+
+
+class _NoPubSub:
+    async def publish(self, *_a):
+        raise ConnectionError("down")
+
+    def pubsub(self):
+        raise ConnectionError("down")
+
+
+async def test_degrades_to_bounded_sleep_without_pubsub():
+    notifier = QuizStatusNotifier(fallback_wait_s=0.02)
+    client = _NoPubSub()
+    assert await publish_quiz_status(client, uuid.uuid4()) is False
+    async with notifier.watch(client, uuid.uuid4()) as watch:
+        assert not notifier.listening
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        assert await watch.wait(10.0) is False
+        assert loop.time() - t0 < 1.0
+
+
+async def test_stop_tolerates_listener_from_a_closed_loop(redis):
+    """A listener task left behind by a closed event loop (test runners,
+    dev reloads) must not make the next shutdown raise."""
+    import fakeredis.aioredis as fa
+
+    notifier = QuizStatusNotifier()
+
+    def _listen_in_other_loop() -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(notifier._ensure_listener(fa.FakeRedis()))
+        finally:
+            loop.close()
+
+    await asyncio.to_thread(_listen_in_other_loop)
+    assert notifier._task is not None and not notifier._task.done()
+
+    await notifier.aclose()
+    assert not notifier.listening
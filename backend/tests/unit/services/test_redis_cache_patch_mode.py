@@ -0,0 +1,201 @@
+"""Field-level patch mode for the quiz session state (``redis_cache.py``).
+
+Runs the REAL ``_PATCH_LUA`` / ``_MIGRATE_LUA`` scripts against
+fakeredis-with-lua (lupa); skipped when lupa is unavailable on the platform
+(same probe as ``test_rate_limit_lua.py``).
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+
+import pytest
+
+from app.agent.schemas import AgentGraphStateModel
+from app.services.redis_cache import (
+    CacheRepository,
+    _key_session,
+    _key_session_fields,
+    _validate_fields,
+)
+
+
+def _fakeredis_lua_available() -> bool:
+    try:
+        import asyncio
+
+        import fakeredis.aioredis as fa
+        import lupa  # noqa: F401
+
+        async def _probe() -> list:
+            return await fa.FakeRedis().eval("return {1, 2}", 0)
+
+        return list(asyncio.run(_probe())) == [1, 2]
+    except Exception:
+        return False
+
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif(not _fakeredis_lua_available(), reason="fakeredis Lua (lupa) unavailable"),
+]
+
+
+def _state(sid: uuid.UUID) -> dict:
+    return {
+        "session_id": str(sid),
+        "trace_id": "t-patch",
+        "category": "Cats",
+        "synopsis": {"title": "Cats", "summary": "All about cats."},
+        "generated_questions": [
+            {"question_text": f"Q{i}?", "options": [{"text": "a"}, {"text": "b"}]}
+            for i in range(3)
+        ],
+        "quiz_history": [],
+        "messages": [{"type": "human", "content": "hi"}],
+        "baseline_count": 3,
+    }
+
+
+@pytest.fixture()
+def redis():
+    import fakeredis.aioredis as fa
+
+    return fa.FakeRedis(decode_responses=True)
+
+
+def test_validate_fields_only_touches_given_fields():
+    out = _validate_fields(
+        {
+            "last_served_index": "2",
+            "quiz_history": [{"question_text": " Q ", "answer_text": "a"}],
+            "not_a_state_field": 1,
+        }
+    )
+    assert set(out) == {"last_served_index", "quiz_history"}
+    assert json.loads(out["last_served_index"]) == 2
+    assert json.loads(out["quiz_history"])[0]["question_text"] == "Q"
+
+
+def test_validate_fields_rejects_bad_types():
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError):
+        _validate_fields({"last_served_index": "not-an-int"})
+
+
+async def test_save_and_get_round_trip_in_hash_layout(redis):
+    sid = uuid.uuid4()
+    repo = CacheRepository(redis, patch_mode=True)
+    await repo.save_quiz_state(_state(sid))
+
+    assert await redis.exists(_key_session(sid)) == 0
+    assert await redis.type(_key_session_fields(sid)) == "hash"
+    assert 0 < await redis.ttl(_key_session_fields(sid)) <= 3600
+
+    model = await repo.get_quiz_state(sid)
+    expected = AgentGraphStateModel.model_validate(_state(sid))
+    assert model == expected
+
+
+async def test_patch_merges_only_changed_fields(redis):
+    sid = uuid.uuid4()
+    repo = CacheRepository(redis, patch_mode=True)
+    await repo.save_quiz_state(_state(sid))
+    before_questions = await redis.hget(_key_session_fields(sid), "generated_questions")
+
+    assert await repo.patch_quiz_state(sid, {"last_served_index": 1}) is True
+    assert await redis.hget(_key_session_fields(sid), "last_served_index") == "1"
+    # Untouched fields are byte-identical (never re-serialised).
+    assert await redis.hget(_key_session_fields(sid), "generated_questions") == before_questions
+
+    merged = await repo.update_quiz_state_atomically(
+        sid,
+        {
+            "quiz_history": [{"question_index": 0, "question_text": "Q0?", "answer_text": "a"}],
+            "ready_for_questions": True,
+        },
+    )
+    assert merged is not None
+    assert merged.last_served_index == 1
+    assert merged.ready_for_questions is True
+    assert len(merged.quiz_history) == 1
+
+
+async def test_patch_on_missing_session_returns_false(redis):
+    repo = CacheRepository(redis, patch_mode=True)
+    sid = uuid.uuid4()
+    assert await repo.patch_quiz_state(sid, {"last_served_index": 0}) is False
+    assert await repo.update_quiz_state_atomically(sid, {"last_served_index": 0}) is None
+    assert await redis.exists(_key_session_fields(sid)) == 0
+
+
+async def test_legacy_blob_is_migrated_on_first_patch(redis):
+    sid = uuid.uuid4()
+    await CacheRepository(redis, patch_mode=False).save_quiz_state(_state(sid))
+    await redis.expire(_key_session(sid), 900)
+
+    repo = CacheRepository(redis, patch_mode=True)
+    # Reads fall back to the legacy blob before any write.
+    assert (await repo.get_quiz_state(sid)).category == "Cats"
+    snap = await repo.get_quiz_status_snapshot(sid)
+    assert snap is not None and len(snap.generated_questions) == 3
+
+    assert await repo.patch_quiz_state(sid, {"last_served_index": 0}) is True
+    assert await redis.exists(_key_session(sid)) == 0
+    assert 0 < await redis.ttl(_key_session_fields(sid)) <= 3600
+    model = await repo.get_quiz_state(sid)
+    assert model.last_served_index == 0
+    assert model.synopsis.title == "Cats"
+
+
+async def test_migrate_session_to_fields_is_idempotent(redis):
+    sid = uuid.uuid4()
+    await CacheRepository(redis, patch_mode=False).save_quiz_state(_state(sid))
+    repo = CacheRepository(redis, patch_mode=True)
+    assert await repo.migrate_session_to_fields(sid) is True
+    assert await repo.migrate_session_to_fields(sid) is False
+
+
+async def test_status_snapshot_reads_polled_fields_only(redis):
+    sid = uuid.uuid4()
+    repo = CacheRepository(redis, patch_mode=True)
+    await repo.save_quiz_state(_state(sid))
+    await repo.patch_quiz_state(sid, {"current_confidence": 0.5})
+
+    snap = await repo.get_quiz_status_snapshot(sid)
+    assert snap is not None
+    assert snap.trace_id == "t-patch"
+    assert snap.current_confidence == 0.5
+    assert snap.category == "Cats"
+    assert len(snap.generated_questions) == 3
+    assert "messages" not in snap.raw
+
+
+async def test_clear_final_result_in_hash_layout(redis):
+    sid = uuid.uuid4()
+    repo = CacheRepository(redis, patch_mode=True)
+    await repo.save_quiz_state({**_state(sid), "final_result": {"title": "x"}})
+    assert await repo.clear_final_result(sid) is True
+    assert await redis.hget(_key_session_fields(sid), "final_result") == "null"
+    assert await repo.clear_final_result(sid) is False
+
+
+async def test_migration_sweep_converts_legacy_sessions(redis):
+    from scripts.migrate_quiz_sessions_to_hash import migrate_sessions
+
+    blob_repo = CacheRepository(redis, patch_mode=False)
+    sids = [uuid.uuid4() for _ in range(3)]
+    for sid in sids:
+        await blob_repo.save_quiz_state(_state(sid))
+    await CacheRepository(redis, patch_mode=True).save_quiz_state(_state(uuid.uuid4()))
+
+    assert await migrate_sessions(redis, dry_run=True) == {
+        "scanned": 3, "migrated": 0, "skipped": 0,
+    }
+    assert await migrate_sessions(redis) == {"scanned": 3, "migrated": 3, "skipped": 0}
+    assert await migrate_sessions(redis) == {"scanned": 0, "migrated": 0, "skipped": 0}
+    for sid in sids:
+        assert await redis.exists(_key_session(sid)) == 0
+        assert await redis.exists(_key_session_fields(sid)) == 1
@@ -0,0 +1,170 @@
+"""Speculative next-question precompute (`speculative_questions.py`).
+
+- The most likely options are prepared in the batch lane under the
+  ``speculative`` spend bucket; a matching answer claims its branch and the
+  other in-flight branches are cancelled.
+- Digest mismatches, FINISH decisions and unranked answers are misses; late
+  branches are not stored once the question is claimed.
+- The speculative daily budget stops new branches; bucketed LLM spend also
+  lands in the aggregate counter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import fakeredis.aioredis as fa
+import pytest
+
+from app.core.config import SpeculativeQuestionsConfig
+from app.services import cost_meter
+from app.services import speculative_questions as sq
+from app.services.llm_concurrency import PRIORITY_BATCH, current_llm_priority
+
+QUIZ = "11111111-1111-1111-1111-111111111111"
+
+CHARACTERS = [
+    {"name": "Rory", "short_description": "bookish student", "profile_text": "Loves reading novels and studying."},
+    {"name": "Luke", "short_description": "diner owner", "profile_text": "Grumpy, practical, flannel, coffee."},
+]
+QUESTION = {
+    "question_text": "Pick a Saturday.",
+    "options": [
+        {"text": "Fix the diner roof"},
+        {"text": "Reading novels all afternoon"},
+        {"text": "Shopping spree"},
+        {"text": "Studying at the library"},
+    ],
+}
+
+
+def _state(**kw):
+    return {
+        "session_id": QUIZ,
+        "baseline_count": 1,
+        "generated_characters": CHARACTERS,
+        "quiz_history": [
+            {"question_index": 0, "question_text": "Q1", "answer_text": "Curled up reading a novel", "option_index": 2}
+        ],
+        "generated_questions": [{"question_text": "Q1", "options": []}, QUESTION],
+        **kw,
+    }
+
+
+DIGEST = sq.history_digest(_state()["quiz_history"], QUESTION["question_text"])
+
+
+@pytest.fixture
+def redis():
+    return fa.FakeRedis(decode_responses=True)
+
+
+def _speculator(redis, *, delay: float = 0.0, finish: bool = False, seen: list | None = None, **kw):
+    async def step(state):
+        answer = state["quiz_history"][-1]
+        if seen is not None:
+            seen.append((answer["option_index"], current_llm_priority(), cost_meter.current_spend_bucket()))
+        await asyncio.sleep(delay)
+        if finish:
+            return None, 0.95
+        return {"question_text": f"after {answer['answer_text']}", "options": []}, 0.4
+
+    return sq.QuestionSpeculator(redis_factory=lambda: redis, step_fn=step, **kw)
+
+
+async def _drain(spec: sq.QuestionSpeculator) -> None:
+    tasks = [t for group in spec._inflight.values() for t in group.values()]
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_rank_options_follows_the_leading_character():
+    assert sq.rank_options(_state(), QUESTION)[:2] == [1, 3]
+    no_cast = _state(generated_characters=[], quiz_history=[])
+    assert sq.rank_options(no_cast, QUESTION) == [0, 1, 2, 3]
+
+
+async def test_launch_then_claim_serves_the_matching_branch(redis):
+    seen: list = []
+    spec = _speculator(redis, seen=seen)
+    assert await spec.launch(_state()) == 2
+    await _drain(spec)
+    assert sorted(o for o, *_ in seen) == [1, 3]
+    assert {(lane, bucket) for _, lane, bucket in seen} == {(PRIORITY_BATCH, sq.SPECULATIVE_BUCKET)}
+
+    branch = await spec.claim(QUIZ, 1, 3, DIGEST)
+    assert branch is not None and branch.option_index == 3
+    assert branch.question["question_text"] == "after Studying at the library"
+    assert branch.confidence == 0.4
+
+    # Claimed: the other branch is gone and a late store is refused.
+    assert await redis.hkeys(f"quiz_spec:{QUIZ}:1") == ["claimed"]
+    m = spec.metrics()
+    assert (m["launched"], m["stored"], m["hits"], m["misses"], m["hit_rate"]) == (2, 2, 1, 0, 1.0)
+    assert m["latency_saved_ms"] >= 0
+
+
+async def test_unranked_answer_and_stale_digest_are_misses(redis):
+    spec = _speculator(redis)
+    await spec.launch(_state())
+    await _drain(spec)
+    assert await spec.claim(QUIZ, 1, 0, DIGEST) is None
+
+    await redis.delete(f"quiz_spec:{QUIZ}:1")
+    await spec.launch(_state())
+    await _drain(spec)
+    assert await spec.claim(QUIZ, 1, 1, "other-history") is None
+    assert spec.metrics()["misses"] == 2 and spec.metrics()["hit_rate"] == 0.0
+
+
+async def test_claim_cancels_other_branches_and_can_await_its_own(redis):
+    spec = _speculator(redis, delay=0.2)
+    await spec.launch(_state())
+    assert await spec.claim(QUIZ, 1, 1, DIGEST) is None
+    await asyncio.sleep(0)
+    assert spec.has_inflight(QUIZ, 1, 1) and not spec.has_inflight(QUIZ, 1, 3)
+
+    branch = await spec.await_inflight(QUIZ, 1, 1)
+    assert branch is not None and branch.option_index == 1
+    m = spec.metrics()
+    assert (m["hits"], m["misses"], m["cancelled"], m["stored"]) == (1, 0, 1, 0)
+
+
+async def test_finish_decisions_are_not_stored(redis):
+    spec = _speculator(redis, finish=True)
+    await spec.launch(_state())
+    await _drain(spec)
+    assert await redis.keys("quiz_spec:*") == []
+    assert spec.metrics()["finish_branches"] == 2
+
+
+async def test_only_the_displayed_adaptive_question_is_speculated(redis):
+    spec = _speculator(redis)
+    assert await spec.launch(_state(final_result={"title": "x"})) == 0
+    assert await spec.launch(_state(baseline_count=5)) == 0
+    answered = _state(generated_questions=[{"question_text": "Q1", "options": []}])
+    assert await spec.launch(answered) == 0
+
+
+async def test_budget_stops_new_branches_and_bucket_spend_is_separate(redis, monkeypatch):
+    monkeypatch.setattr(cost_meter, "_get_redis_for_metering", lambda: redis)
+    monkeypatch.setattr(cost_meter, "_completion_cost_usd", lambda _resp: 0.03)
+
+    with cost_meter.spend_bucket(sq.SPECULATIVE_BUCKET):
+        await cost_meter.record_llm_cost({}, model="m", tool="t", trace_id=None, session_id=None)
+    await cost_meter.record_llm_cost({}, model="m", tool="t", trace_id=None, session_id=None)
+    assert await cost_meter.read_daily_cents(redis) == 6
+    assert await cost_meter.read_daily_cents(redis, bucket=sq.SPECULATIVE_BUCKET) == 3
+
+    spec = _speculator(redis, daily_budget_cents=3)
+    assert await spec.launch(_state()) == 0
+    assert spec.metrics()["skipped_budget"] == 1
+    roomy = _speculator(redis, daily_budget_cents=4, branches=1)
+    assert await roomy.launch(_state()) == 1
+    await _drain(roomy)
+
+
+def test_config_validation():
+    with pytest.raises(ValueError):
+        SpeculativeQuestionsConfig(branches=3)
+    with pytest.raises(ValueError):
+        SpeculativeQuestionsConfig(daily_budget_usd=-1)
@@ -0,0 +1,176 @@
+"""Streaming structured output (`structured_stream.py` + `LLMService` streaming).
+
+- The incremental parser reports shallow values as they close, for any
+  chunking, and skips prose / broken items without raising.
+- `partial_results` sinks chain and never fail the call.
+- With a consumer, `get_structured_response` streams: partials arrive
+  before the call returns and the validated result is unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.agent import llm_helpers
+from app.services import llm_service as llm_mod
+from app.services.structured_stream import (
+    IncrementalJSONParser,
+    current_partial_sink,
+    partial_results,
+)
+
+DOC = {
+    "synopsis": {"title": "Cats \"quoted\" \\ slash", "summary": "S"},
+    "characters": [
+        {"name": "Tabby", "traits": [1, 2, {"deep": "}]"}]},
+        {"name": "Sphynx", "traits": []},
+    ],
+    "count": 2,
+    "final": True,
+}
+
+
+def _feed_all(text: str, step: int, **kw) -> list:
+    parser = IncrementalJSONParser(**kw)
+    out = []
+    for i in range(0, len(text), step):
+        out.extend(parser.feed(text[i : i + step]))
+    assert parser.done
+    return out
+
+
+@pytest.mark.parametrize("step", [1, 2, 5, 64, 10_000])
+def test_parser_reports_closed_values_for_any_chunking(step):
+    out = _feed_all("Here you go:\n```json\n" + json.dumps(DOC) + "\n```", step)
+    paths = [p for p, _ in out]
+    assert paths == [
+        ("synopsis", "title"),
+        ("synopsis", "summary"),
+        ("synopsis",),
+        ("characters", 0),
+        ("characters", 1),
+        ("characters",),
+        ("count",),
+        ("final",),
+    ]
+    values = dict(out)
+    assert values[("synopsis",)] == DOC["synopsis"]
+    assert values[("characters", 1)] == DOC["characters"][1]
+    assert values[("count",)] == 2 and values[("final",)] is True
+
+
+def test_parser_depth_limit_and_root_list():
+    out = _feed_all(json.dumps([{"name": "A"}, {"name": "B"}]), 3, max_depth=1)
+    assert out == [((0,), {"name": "A"}), ((1,), {"name": "B"})]
+
+
+def test_parser_reports_items_before_document_closes():
+    parser = IncrementalJSONParser(max_depth=1)
+    assert parser.feed('[{"name": "A"}, {"name": "B", "prof') == [((0,), {"name": "A"})]
+    assert not parser.done
+
+
+def test_parser_skips_broken_item_without_raising():
+    parser = IncrementalJSONParser(max_depth=1)
+    out = parser.feed('[{"name": "A"}, {"name": tru}, {"name": "C"}]')
+    assert out == [((0,), {"name": "A"}), ((2,), {"name": "C"})]
+
+
+def test_partial_sinks_chain_and_swallow_errors():
+    seen_outer, seen_inner = [], []
+
+    def broken(tool, path, value):
+        raise RuntimeError("consumer bug")
+
+    with partial_results(lambda *a: seen_outer.append(a)):
+        with partial_results(broken), partial_results(lambda *a: seen_inner.append(a)):
+            current_partial_sink()("tool", (0,), "v")
+    assert seen_inner == seen_outer == [("tool", (0,), "v")]
+    assert current_partial_sink() is None
+
+
+class _Profile(BaseModel):
+    name: str
+    traits: list
+
+
+class _Doc(BaseModel):
+    synopsis: dict
+    characters: list[_Profile]
+    count: int
+    final: bool
+
+
+def _events(text: str, step: int = 7):
+    for i in range(0, len(text), step):
+        yield SimpleNamespace(type="response.output_text.delta", delta=text[i : i + step])
+    yield SimpleNamespace(type="response.completed", response={"output_text": text})
+
+
+@pytest.fixture
+def streaming_litellm(monkeypatch, litellm_aresponses_via_sync_stub):
+    calls = []
+    text = json.dumps(DOC)
+
+    def _responses(**kwargs):
+        calls.append(kwargs)
+        if kwargs.get("stream"):
+            return _events(text)
+        return {"output_text": text}
+
+    monkeypatch.setattr(llm_mod.litellm, "responses", _responses)
+    return calls
+
+
+async def test_service_streams_partials_and_returns_validated_result(streaming_litellm):
+    received = []
+    main_thread = threading.get_ident()
+
+    def on_partial(path, value):
+        received.append((path, threading.get_ident()))
+
+    result = await llm_mod.LLMService().get_structured_response(
+        tool_name="synopsis_generator",
+        messages=[],
+        response_model=_Doc,
+        on_partial=on_partial,
+    )
+    assert streaming_litellm[0]["stream"] is True
+    assert result == _Doc.model_validate(DOC)
+    assert [p for p, _ in received][:3] == [
+        ("synopsis", "title"),
+        ("synopsis", "summary"),
+        ("synopsis",),
+    ]
+    assert ("characters", 1) in [p for p, _ in received]
+    # Delivered on the event loop thread, not the worker thread.
+    assert {t for _, t in received} == {main_thread}
+
+
+async def test_no_consumer_or_kill_switch_means_no_stream(streaming_litellm, monkeypatch):
+    svc = llm_mod.LLMService()
+    await svc.get_structured_response(tool_name="t", messages=[], response_model=_Doc)
+    monkeypatch.setattr(llm_mod, "_stream_structured_enabled", lambda: False)
+    await svc.get_structured_response(
+        tool_name="t", messages=[], response_model=_Doc, on_partial=lambda *a: None
+    )
+    assert all("stream" not in call for call in streaming_litellm)
+
+
+async def test_invoke_structured_streams_only_inside_partial_results(streaming_litellm, monkeypatch):
+    monkeypatch.setattr(llm_helpers, "llm_service", llm_mod.LLMService())
+    seen = []
+    with partial_results(lambda tool, path, value: seen.append((tool, path))):
+        await llm_helpers.invoke_structured(
+            tool_name="profile_batch_writer", messages=[], response_model=_Doc
+        )
+    assert ("profile_batch_writer", ("characters", 0)) in seen
+    await llm_helpers.invoke_structured(
+        tool_name="profile_batch_writer", messages=[], response_model=_Doc
+    )
+    assert [bool(c.get("stream")) for c in streaming_litellm] == [True, False]